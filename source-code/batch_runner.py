@@ -0,0 +1,481 @@
+"""
+Batch-Lauf der Simulation ohne Browser (Kommandozeile).
+
+Lädt ConfigManager, DataManager und ScenarioManager einmal, simuliert alle
+Szenario-YAMLs eines oder mehrerer Glob-Muster in einem Prozess-Pool und
+schreibt die Ergebnisse spaltenorientiert in ein Ausgabeverzeichnis. Die Worker
+erhalten nur die Datensätze, die die Szenarien lesen (nicht den DataManager):
+
+    <output>/results/<ergebnis>/scenario=<name>/year=<jahr>/part-0.parquet
+    <output>/kpis.parquet        KPI-Scores je Szenario und Jahr
+    <output>/economics.parquet   Wirtschaftlichkeits-Kennzahlen je Szenario und Jahr
+    <output>/summary.parquet     Laufzeit, Speicher und Status je Szenario
+
+Die Partitionierung (scenario=/year=) kann direkt als Dataset gelesen werden
+(z.B. pandas.read_parquet(<output>/results/balance_post_flex)). Ist pyarrow
+nicht installiert, wird CSV statt Parquet geschrieben.
+
+Speicher in der Übersicht (je Szenario gemessen, auch wenn ein Prozess mehrere
+Szenarien nacheinander rechnet):
+- rss_peak_mb: Spitzen-RSS des ausführenden Prozesses während des Szenarios
+  (inkl. der dort geladenen Basisdaten)
+- rss_delta_mb: Anstieg dieses Spitzenwerts über den RSS zu Beginn des Szenarios
+- traced_peak_mb: optional (--trace-memory), Python-Allokationen während der Simulation
+Die RSS-Werte benötigen Linux (/proc); auf anderen Plattformen bleiben sie leer.
+
+Usage:
+    python source-code/batch_runner.py "scenarios/EVL_own/*.yaml" "scenarios/Studien_rebuild/*.yaml" \\
+        --output output/batch --workers 4
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config_manager import ConfigManager
+from data_manager import DataManager
+from scenario_manager import ScenarioManager
+from data_processing.simulation_engine import SimulationEngine, required_datasets, snapshot_datasets
+from data_processing.scoring_system import get_score_and_kpis
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+SOURCE_DIR = Path(__file__).resolve().parent
+REPO_DIR = SOURCE_DIR.parent
+
+# Standard: alle Szenarien der mitgelieferten Verzeichnisse
+DEFAULT_PATTERNS = (
+    str(REPO_DIR / "scenarios" / "EVL_own" / "*.yaml"),
+    str(REPO_DIR / "scenarios" / "Studien_rebuild" / "*.yaml"),
+)
+
+# Ergebnis-DataFrames eines Jahres -> Tabellen des KPI-Scorings
+SCORING_FRAMES = {
+    "Verbrauch": "consumption",
+    "Erzeugung": "production",
+    "E-Mobility": "emobility",
+    "Speicher": "storage",
+    "Bilanz_vor_Flex": "balance_pre_flex",
+    "Bilanz_nach_Flex": "balance_post_flex",
+    "Wirtschaftlichkeit": "economics",
+}
+
+# Manager des aktuellen Worker-Prozesses (siehe _init_worker)
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def find_scenarios(patterns: List[str]) -> List[Path]:
+    """
+    Sucht Szenario-Dateien zu Glob-Mustern (sortiert, ohne Duplikate).
+
+    Args:
+        patterns: Glob-Muster oder Dateipfade (z.B. "scenarios/EVL_own/*.yaml")
+
+    Returns:
+        Liste der gefundenen Dateien in Musterreihenfolge
+    """
+    paths: List[Path] = []
+    for pattern in patterns:
+        for match in sorted(glob.glob(pattern, recursive=True)):
+            path = Path(match).resolve()
+            if path.is_file() and path not in paths:
+                paths.append(path)
+    return paths
+
+
+def scenario_labels(paths: List[Path]) -> Dict[Path, str]:
+    """Eindeutige Namen je Szenario-Datei (Dateiname, bei Kollision mit Verzeichnis)."""
+    stems = [p.stem for p in paths]
+    return {
+        p: p.stem if stems.count(p.stem) == 1 else f"{p.parent.name}_{p.stem}"
+        for p in paths
+    }
+
+
+def build_managers(config_path: Path):
+    """
+    Erzeugt ConfigManager, DataManager (lädt alle Datensätze) und ScenarioManager.
+
+    Args:
+        config_path: Pfad zur config.json
+
+    Returns:
+        Tuple (cfg, dm, sm)
+    """
+    cfg = ConfigManager(config_path)
+    dm = DataManager(config_manager=cfg)
+    sm = ScenarioManager()
+    return cfg, dm, sm
+
+
+def run_batch(
+    cfg: ConfigManager,
+    dm: DataManager,
+    sm: ScenarioManager,
+    scenario_paths: List[Path],
+    output_dir: Path,
+    workers: int = 1,
+    calculation_mode: str = "cpu_optimized",
+    file_format: str = "auto",
+    trace_memory: bool = False
+) -> pd.DataFrame:
+    """
+    Simuliert alle Szenarien und schreibt Ergebnisse, KPIs und Übersicht.
+
+    Fehler einzelner Szenarien brechen den Lauf nicht ab, sondern erscheinen
+    mit Status "error" in der Übersicht.
+
+    Args:
+        cfg: ConfigManager
+        dm: DataManager mit geladenen Datensätzen (Worker-Prozesse erhalten einen
+            Auszug der benötigten Datensätze)
+        sm: ScenarioManager (wird je Szenario neu geladen)
+        scenario_paths: Szenario-YAMLs
+        output_dir: Ausgabeverzeichnis
+        workers: Anzahl Prozesse (1 = im aktuellen Prozess)
+        calculation_mode: Berechnungsmodus der Wärmepumpen
+        file_format: "parquet", "csv" oder "auto" (Parquet, falls pyarrow installiert)
+        trace_memory: Spitzen-Speicher der Simulation je Szenario über tracemalloc messen
+            (ohne Schreiben der Ergebnisse; verlangsamt die Simulation)
+
+    Returns:
+        Übersicht je Szenario (Status, Laufzeit, Speicher - Spalten siehe Modul-Doku)
+
+    Raises:
+        ValueError: Bei unbekanntem file_format
+        ImportError: Wenn "parquet" verlangt, aber pyarrow nicht installiert ist
+    """
+    file_format = _resolve_format(file_format)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    labels = scenario_labels(scenario_paths)
+    tasks = [(str(path), labels[path], str(output_dir), file_format, trace_memory) for path in scenario_paths]
+    outcomes: Dict[str, Dict[str, Any]] = {}
+
+    def report(outcome: Dict[str, Any]) -> None:
+        outcomes[outcome["summary"]["scenario"]] = outcome
+        print(_format_summary_line(len(outcomes), len(tasks), outcome["summary"]), flush=True)
+
+    if workers <= 1 or len(tasks) <= 1:
+        _init_worker(cfg, dm, sm, calculation_mode)
+        for task in tasks:
+            report(_run_scenario_task(*task))
+    else:
+        # "spawn" wie in SimulationEngine.run_scenario(parallel=True): plattformunabhängig
+        # und ohne geerbten Numba-Thread-Zustand. Übertragen werden nur die Datensätze,
+        # die die Szenarien lesen (nicht der ganze DataManager), einmal pro Prozess
+        snapshot = snapshot_datasets(dm, _batch_datasets(scenario_paths))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(cfg, snapshot, None, calculation_mode),
+        ) as pool:
+            futures = [pool.submit(_run_scenario_task, *task) for task in tasks]
+            for future in as_completed(futures):
+                report(future.result())
+
+    # Tabellen in Eingabereihenfolge
+    ordered = [outcomes[labels[path]] for path in scenario_paths]
+    summary = pd.DataFrame([o["summary"] for o in ordered])
+    _write_table(pd.DataFrame([row for o in ordered for row in o["kpis"]]), output_dir / "kpis", file_format)
+    _write_table(pd.DataFrame([row for o in ordered for row in o["economics"]]), output_dir / "economics", file_format)
+    _write_table(summary, output_dir / "summary", file_format)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Einstiegspunkt der Kommandozeile.
+
+    Returns:
+        Exit-Code (0 = alle Szenarien erfolgreich, 1 = mindestens ein Fehler, 2 = keine Szenarien)
+    """
+    parser = argparse.ArgumentParser(
+        description="Simuliert Szenario-YAMLs ohne Browser und schreibt Ergebnisse spaltenorientiert."
+    )
+    parser.add_argument("patterns", nargs="*", default=list(DEFAULT_PATTERNS),
+                        help="Glob-Muster der Szenario-Dateien (Standard: scenarios/EVL_own und scenarios/Studien_rebuild)")
+    parser.add_argument("-o", "--output", type=Path, default=REPO_DIR / "output" / "batch",
+                        help="Ausgabeverzeichnis (Standard: output/batch)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Anzahl Prozesse (Standard: min(Szenarien, CPU-Kerne))")
+    parser.add_argument("--config", type=Path, default=SOURCE_DIR / "config.json",
+                        help="Pfad zur config.json")
+    parser.add_argument("--format", dest="file_format", choices=("auto", "parquet", "csv"), default="auto",
+                        help="Dateiformat der Tabellen (auto = Parquet, falls pyarrow installiert)")
+    parser.add_argument("--calculation-mode", default="cpu_optimized",
+                        choices=("normal", "cpu_optimized", "numpy"),
+                        help="Berechnungsmodus der Wärmepumpen")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Spitzen-Speicher der Simulation je Szenario über tracemalloc messen (langsamer)")
+    args = parser.parse_args(argv)
+
+    scenario_paths = find_scenarios(args.patterns)
+    if not scenario_paths:
+        print(f"Keine Szenarien gefunden für: {args.patterns}", file=sys.stderr)
+        return 2
+
+    workers = args.workers or min(len(scenario_paths), os.cpu_count() or 1)
+    print(f"{len(scenario_paths)} Szenarien, {workers} Prozesse, Ausgabe: {args.output}")
+
+    t0 = time.perf_counter()
+    cfg, dm, sm = build_managers(args.config)
+    print(f"Daten geladen in {time.perf_counter() - t0:.1f}s")
+
+    summary = run_batch(
+        cfg, dm, sm, scenario_paths, args.output,
+        workers=workers,
+        calculation_mode=args.calculation_mode,
+        file_format=args.file_format,
+        trace_memory=args.trace_memory,
+    )
+
+    print()
+    print(summary.drop(columns=["path", "error"]).to_string(index=False))
+    print(f"\nGesamt: {time.perf_counter() - t0:.1f}s")
+
+    failed = summary[summary["status"] != "ok"]
+    for _, row in failed.iterrows():
+        print(f"FEHLER {row['scenario']}: {row['error']}", file=sys.stderr)
+    return 1 if len(failed) else 0
+
+
+def _batch_datasets(scenario_paths: List[Path]) -> List[str]:
+    """
+    Datensätze, die die Szenarien zusammen lesen.
+
+    Nicht lesbare Szenarien werden übergangen; ihr Fehler erscheint beim
+    Simulieren in der Übersicht.
+    """
+    sm = ScenarioManager()
+    names: List[str] = []
+    for path in scenario_paths:
+        try:
+            sm.load_scenario(path)
+            names.extend(required_datasets(sm))
+        except Exception:
+            continue
+    return list(dict.fromkeys(names))
+
+
+def _init_worker(cfg, dm, sm: Optional[ScenarioManager], calculation_mode: str) -> None:
+    """
+    Legt die Manager einmal pro Prozess ab.
+
+    Args:
+        cfg: ConfigManager
+        dm: DataManager bzw. Datensatz-Auszug (snapshot_datasets)
+        sm: ScenarioManager; None = im Prozess neu anlegen
+        calculation_mode: Berechnungsmodus der Wärmepumpen
+    """
+    _WORKER_STATE.update(cfg=cfg, dm=dm, sm=sm or ScenarioManager(), calculation_mode=calculation_mode)
+
+
+def _run_scenario_task(
+    path: str,
+    label: str,
+    output_dir: str,
+    file_format: str,
+    trace_memory: bool
+) -> Dict[str, Any]:
+    """Simuliert ein Szenario im Worker und schreibt dessen Zeitreihen."""
+    summary = {
+        "scenario": label,
+        "path": path,
+        "status": "ok",
+        "years": "",
+        "wall_s": 0.0,
+        "result_mb": 0.0,
+        "rss_peak_mb": None,
+        "rss_delta_mb": None,
+        "traced_peak_mb": None,
+        "error": "",
+    }
+    kpi_rows: List[Dict[str, Any]] = []
+    econ_rows: List[Dict[str, Any]] = []
+
+    rss_start = _reset_peak_rss()
+    t0 = time.perf_counter()
+    try:
+        sm = _WORKER_STATE["sm"]
+        scenario = sm.load_scenario(path)
+        engine = SimulationEngine(
+            _WORKER_STATE["cfg"], _WORKER_STATE["dm"], sm,
+            calculation_mode=_WORKER_STATE["calculation_mode"],
+        )
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            results = engine.run_scenario()
+        finally:
+            if trace_memory:
+                summary["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+                tracemalloc.stop()
+
+        results_dir = Path(output_dir) / "results"
+        storage_cfg = _normalize_storage_config(scenario.get("target_storage_capacities", {}))
+        for year, year_result in results.items():
+            for name, value in year_result.items():
+                if isinstance(value, pd.DataFrame) and not value.empty:
+                    part_dir = results_dir / name / f"scenario={label}" / f"year={year}"
+                    part_dir.mkdir(parents=True, exist_ok=True)
+                    _write_table(value, part_dir / "part-0", file_format)
+            kpi_rows.append(_kpi_row(label, year, year_result, storage_cfg))
+            econ_rows.append(_economics_row(label, year, year_result.get("economics")))
+
+        summary["years"] = ",".join(str(y) for y in results)
+        summary["result_mb"] = round(sum(getattr(r, "nbytes", 0) for r in results.values()) / 1e6, 1)
+    except Exception as e:
+        summary["status"] = "error"
+        summary["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        summary["wall_s"] = round(time.perf_counter() - t0, 2)
+        summary["rss_peak_mb"], summary["rss_delta_mb"] = _peak_rss_since_reset(rss_start)
+
+    return {"summary": summary, "kpis": kpi_rows, "economics": econ_rows}
+
+
+def _kpi_row(label: str, year: int, year_result, storage_cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """KPI-Scores eines Jahres als flache Tabellenzeile."""
+    row: Dict[str, Any] = {"scenario": label, "year": year}
+    try:
+        scoring_results = {key: year_result[name] for key, name in SCORING_FRAMES.items()}
+        kpis = get_score_and_kpis(scoring_results, storage_cfg, year)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+        return row
+
+    for key, value in kpis.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if _is_scalar(sub_value):
+                    prefix = "raw" if key == "raw_values" else key
+                    row[f"{prefix}.{sub_key}"] = sub_value
+        elif _is_scalar(value):
+            row[key] = value
+    return row
+
+
+def _economics_row(label: str, year: int, economics: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Skalare Wirtschaftlichkeits-Kennzahlen eines Jahres (Aufschlüsselungen je Technologie flach)."""
+    row: Dict[str, Any] = {"scenario": label, "year": year}
+    for key, value in (economics or {}).items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if _is_scalar(sub_value):
+                    row[f"{key}.{sub_key}"] = sub_value
+        elif _is_scalar(value):
+            row[key] = value
+    return row
+
+
+def _normalize_storage_config(storage_cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Jahres-Schlüssel der Speicher-Konfiguration als Strings (Format des Scorings)."""
+    if not isinstance(storage_cfg, dict):
+        return {}
+    return {
+        key: {str(year): cfg for year, cfg in value.items()} if isinstance(value, dict) else value
+        for key, value in storage_cfg.items()
+    }
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def _reset_peak_rss() -> Optional[int]:
+    """
+    Setzt den Spitzen-RSS (VmHWM) des Prozesses auf den aktuellen RSS zurück.
+
+    ru_maxrss eignet sich nicht: er lässt sich nicht zurücksetzen und übernimmt in
+    per "spawn" gestarteten Workern den Höchststand des Elternprozesses. Unter Linux
+    wird VmHWM über /proc/self/clear_refs zurückgesetzt, sodass
+    _peak_rss_since_reset nur das laufende Szenario erfasst.
+
+    Returns:
+        Aktueller RSS [kB] oder None, wenn nicht unterstützt
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return _proc_status_kb("VmRSS")
+    except OSError:
+        return None
+
+
+def _peak_rss_since_reset(rss_start_kb: Optional[int]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Spitzen-RSS seit _reset_peak_rss.
+
+    Returns:
+        (Spitzenwert [MB], Anstieg über rss_start_kb [MB]) bzw. (None, None)
+    """
+    peak_kb = _proc_status_kb("VmHWM") if rss_start_kb is not None else None
+    if peak_kb is None:
+        return None, None
+    return round(peak_kb * 1024 / 1e6, 1), round(max(peak_kb - rss_start_kb, 0) * 1024 / 1e6, 1)
+
+
+def _proc_status_kb(field: str) -> Optional[int]:
+    """Wert eines Felds aus /proc/self/status [kB] (None, wenn nicht vorhanden)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _resolve_format(file_format: str) -> str:
+    if file_format == "auto":
+        return "parquet" if PARQUET_AVAILABLE else "csv"
+    if file_format == "parquet" and not PARQUET_AVAILABLE:
+        raise ImportError("Parquet-Ausgabe benötigt pyarrow (pip install pyarrow)")
+    if file_format not in ("parquet", "csv"):
+        raise ValueError(f"Unbekanntes Dateiformat: {file_format}")
+    return file_format
+
+
+def _write_table(df: pd.DataFrame, path_without_suffix: Path, file_format: str) -> Path:
+    """Schreibt eine Tabelle als Parquet oder CSV (Suffix nach Format)."""
+    path = path_without_suffix.with_name(f"{path_without_suffix.name}.{file_format}")
+    if file_format == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def _format_summary_line(done: int, total: int, summary: Dict[str, Any]) -> str:
+    line = f"[{done}/{total}] {summary['scenario']}: {summary['status']}, {summary['wall_s']:.1f}s"
+    line += f", Ergebnis {summary['result_mb']:.1f} MB"
+    if summary["rss_peak_mb"] is not None:
+        line += f", Peak-RSS {summary['rss_peak_mb']:.0f} MB (+{summary['rss_delta_mb']:.0f} MB)"
+    if summary["traced_peak_mb"] is not None:
+        line += f", tracemalloc {summary['traced_peak_mb']:.0f} MB"
+    if summary["error"]:
+        line += f" - {summary['error']}"
+    return line
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
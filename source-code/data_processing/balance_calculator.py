@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 from typing import Optional
 from data_processing.simulation_logger import SimulationLogger
+from data_processing.calendar_service import get_calendar
 
 try:
     from constants import COLUMN_NAMES
@@ -31,6 +32,10 @@ class BalanceCalculator:
     Funktionalität:
     - Bilanzberechnung (Erzeugung - Verbrauch) pro Zeitschritt
     - Berechnung von Metriken (Überschuss, Defizit, Autarkiegrad, etc.)
+    
+    Eingaben der eigenen Pipeline-Stufen liegen bereits lückenlos auf dem
+    Viertelstunden-Raster des Simulationsjahres und werden ohne Ausrichtung
+    übernommen; nur externe Daten laufen durch _align_to_quarter_hour.
     """
     
     def __init__(self, logger: Optional[SimulationLogger] = None):
@@ -65,11 +70,9 @@ class BalanceCalculator:
         
         df_local = df.copy()
         df_local["Zeitpunkt"] = pd.to_datetime(df_local["Zeitpunkt"])
-        df_local = df_local.sort_values("Zeitpunkt").drop_duplicates(subset="Zeitpunkt", keep="last")
+        df_local = df_local.sort_values("Zeitpunkt", kind="stable").drop_duplicates(subset="Zeitpunkt", keep="last")
         
-        start = pd.Timestamp(f"{simu_jahr}-01-01 00:00:00")
-        end = pd.Timestamp(f"{simu_jahr}-12-31 23:45:00")
-        target_index = pd.date_range(start=start, end=end, freq="15min")
+        target_index = get_calendar(simu_jahr).index
         
         aligned = df_local.set_index("Zeitpunkt").reindex(target_index)
         
@@ -82,6 +85,33 @@ class BalanceCalculator:
         
         return aligned, target_index
     
+    def _align_if_needed(
+        self,
+        df: pd.DataFrame,
+        simu_jahr: int,
+        label: str
+    ) -> tuple[pd.DataFrame, pd.DatetimeIndex]:
+        """
+        Wie _align_to_quarter_hour, übernimmt df aber ohne Ausrichtung, wenn es bereits
+        auf dem Zielraster liegt (datetime64[ns], sortiert, lückenlos, ohne NaN).
+        
+        Direkt aufeinanderfolgende doppelte Zeitstempel (Zeitumstellung) werden wie im
+        langsamen Weg behandelt: der letzte Eintrag bleibt erhalten.
+        """
+        target_index = get_calendar(simu_jahr).index
+        
+        if "Zeitpunkt" in df.columns and df["Zeitpunkt"].dtype == target_index.dtype:
+            zeitpunkte = df["Zeitpunkt"].to_numpy()
+            keep = np.ones(len(zeitpunkte), dtype=bool)
+            keep[:-1] = zeitpunkte[1:] != zeitpunkte[:-1]
+            
+            if keep.sum() == len(target_index) and np.array_equal(zeitpunkte[keep], target_index.values):
+                df_grid = df if keep.all() else df.loc[keep]
+                if not np.isnan(df_grid.select_dtypes(include=[np.number]).to_numpy()).any():
+                    return df_grid, target_index
+        
+        return self._align_to_quarter_hour(df, simu_jahr, label)
+    
     def calculate_balance(
         self, 
         simProd: pd.DataFrame, 
@@ -106,8 +136,8 @@ class BalanceCalculator:
         if self.logger:
             self.logger.info(f"Berechne Bilanz für Jahr {simu_jahr}")
         
-        prod_aligned, target_index = self._align_to_quarter_hour(simProd, simu_jahr, "Produktion")
-        cons_aligned, _ = self._align_to_quarter_hour(simCons, simu_jahr, "Verbrauch")
+        prod_aligned, target_index = self._align_if_needed(simProd, simu_jahr, "Produktion")
+        cons_aligned, _ = self._align_if_needed(simCons, simu_jahr, "Verbrauch")
         
         if "Gesamt [MWh]" in cons_aligned.columns:
             cons_sum = cons_aligned["Gesamt [MWh]"]
@@ -116,13 +146,51 @@ class BalanceCalculator:
         
         prod_sum = prod_aligned.select_dtypes(include=[np.number]).sum(axis=1)
         
-        bilanz = prod_sum - cons_sum
+        return self.calculate_balance_arrays(prod_sum.to_numpy(), cons_sum.to_numpy(), target_index)
+    
+    def calculate_balance_arrays(
+        self,
+        production_mwh: np.ndarray,
+        consumption_mwh: np.ndarray,
+        target_index: pd.DatetimeIndex
+    ) -> pd.DataFrame:
+        """
+        Berechnet die Bilanz aus Arrays auf einem gemeinsamen Zeitindex (ohne Ausrichtung).
+        
+        Für Stufen, die ihre Ergebnisse bereits als Arrays auf dem Zielraster halten
+        (z.B. ProductionMatrix.total_mwh).
+        
+        Args:
+            production_mwh: Erzeugung (n,) oder je Technologie (n, k) - wird über k summiert
+            consumption_mwh: Verbrauch (n,) oder je Sektor (n, k) - wird über k summiert
+            target_index: Gemeinsamer Zeitindex (n,)
+        
+        Returns:
+            DataFrame wie calculate_balance
+        
+        Raises:
+            ValueError: Wenn die Längen nicht zum Zeitindex passen
+        """
+        prod = np.asarray(production_mwh, dtype=np.float64)
+        cons = np.asarray(consumption_mwh, dtype=np.float64)
+        if prod.ndim == 2:
+            prod = prod.sum(axis=1)
+        if cons.ndim == 2:
+            cons = cons.sum(axis=1)
+        
+        if len(prod) != len(target_index) or len(cons) != len(target_index):
+            raise ValueError(
+                f"Längen passen nicht zum Zeitindex: Produktion {len(prod)}, "
+                f"Verbrauch {len(cons)}, Index {len(target_index)}"
+            )
+        
+        bilanz = prod - cons
         
         df_bilanz = pd.DataFrame({
             "Zeitpunkt": target_index,
-            "Produktion [MWh]": prod_sum.values,
-            "Verbrauch [MWh]": cons_sum.values,
-            "Bilanz [MWh]": bilanz.values
+            "Produktion [MWh]": prod,
+            "Verbrauch [MWh]": cons,
+            "Bilanz [MWh]": bilanz
         })
         
         if self.logger:
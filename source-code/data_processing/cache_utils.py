@@ -0,0 +1,222 @@
+"""
+Cache-Hilfsmittel für wiederverwendbare Zwischenergebnisse der Simulation.
+
+Stellt bereit:
+- LRUCache: Begrenzter, threadsicherer LRU-Cache mit Hit/Miss-Zählern
+- stable_hash: Stabiler Inhalts-Hash über Parameter, Arrays, DataFrames und Dataclasses
+- frame_fingerprint: Schneller Inhalts-Fingerabdruck großer Datensätze
+- readonly_array: Markiert ein NumPy-Array als schreibgeschützt
+
+Die Hashes sind über Prozessgrenzen stabil (kein Python-hash()), damit sie
+auch als Schlüssel für Caches auf der Festplatte taugen.
+
+Usage:
+    from data_processing.cache_utils import LRUCache, stable_hash
+
+    _PROFILE_CACHE = LRUCache(maxsize=16, name="Profile")
+    key = stable_hash(year, params)
+    profile = _PROFILE_CACHE.get_or_compute(key, lambda: compute_profile(year, params))
+    print(_PROFILE_CACHE.info())
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class LRUCache:
+    """
+    Begrenzter LRU-Cache (Least Recently Used) mit Hit/Miss-Statistik.
+
+    Bei Überschreiten von maxsize wird der am längsten nicht genutzte Eintrag
+    verworfen. Alle Operationen sind threadsicher.
+    """
+
+    def __init__(self, maxsize: int = 32, name: str = "Cache"):
+        """
+        Initialisiert den Cache.
+
+        Args:
+            maxsize: Maximale Anzahl Einträge (>= 1)
+            name: Anzeigename für Statistiken
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize muss >= 1 sein")
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Liefert den Eintrag zu key (zählt Hit/Miss) oder default."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Legt value unter key ab und verdrängt ggf. den ältesten Eintrag."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Liefert den Eintrag zu key oder berechnet ihn über factory() und legt ihn ab.
+
+        Args:
+            key: Cache-Schlüssel (z.B. aus stable_hash)
+            factory: Funktion ohne Argumente, die den Wert berechnet
+
+        Returns:
+            Gecachter oder neu berechneter Wert
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Berechnung außerhalb des Locks (kann lange dauern)
+        value = factory()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Leert den Cache und setzt die Zähler zurück."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        """
+        Statistik des Caches.
+
+        Returns:
+            Dictionary mit 'name', 'hits', 'misses', 'size', 'maxsize'
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __repr__(self) -> str:
+        info = self.info()
+        return (f"LRUCache(name={info['name']!r}, size={info['size']}/{info['maxsize']}, "
+                f"hits={info['hits']}, misses={info['misses']})")
+
+
+def stable_hash(*parts: Any) -> str:
+    """
+    Berechnet einen stabilen Inhalts-Hash über beliebig verschachtelte Teile.
+
+    Unterstützt: None, bool/int/float/str, NumPy-Arrays und -Skalare,
+    pandas Series/Index/DataFrame, Dataclasses, dict, list/tuple.
+    Andere Objekte gehen über repr() ein.
+
+    Returns:
+        Hex-Digest (32 Zeichen)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _hash_update(h, part)
+    return h.hexdigest()
+
+
+def frame_fingerprint(df: Optional[pd.DataFrame]) -> Optional[str]:
+    """
+    Inhalts-Fingerabdruck eines Datensatzes (z.B. aus dem DataManager).
+
+    Hasht alle Werte vektorisiert über pandas (auch Text-Spalten), dazu Form,
+    Spaltennamen, Datentypen und Index. Deutlich schneller als stable_hash auf
+    DataFrames mit Objekt-Spalten.
+
+    Returns:
+        Hex-Digest (32 Zeichen) oder None für None
+    """
+    if df is None:
+        return None
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    except TypeError:
+        # Nicht hashbare Zellen (z.B. Listen): langsamer, aber vollständiger Pfad
+        return stable_hash("frame", df)
+    return stable_hash(
+        "frame",
+        df.shape,
+        [str(c) for c in df.columns],
+        [str(d) for d in df.dtypes],
+        row_hashes
+    )
+
+
+def readonly_array(values: np.ndarray) -> np.ndarray:
+    """Markiert ein Array als schreibgeschützt (für geteilte Cache-Einträge)."""
+    values.setflags(write=False)
+    return values
+
+
+def _hash_update(h, obj: Any) -> None:
+    """Schreibt obj rekursiv und typsicher in den Hash h."""
+    if obj is None:
+        h.update(b"N;")
+    elif isinstance(obj, (bool, int, float, str, bytes)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, np.generic):
+        _hash_update(h, obj.item())
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            h.update(f"nd-obj:{obj.shape};".encode())
+            for item in obj.ravel().tolist():
+                _hash_update(h, item)
+        else:
+            h.update(f"nd:{obj.dtype.str}:{obj.shape};".encode())
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, pd.DataFrame):
+        h.update(f"df:{obj.shape};".encode())
+        _hash_update(h, [str(c) for c in obj.columns])
+        for col in obj.columns:
+            _hash_update(h, obj[col].to_numpy())
+    elif isinstance(obj, (pd.Series, pd.Index)):
+        h.update(b"pd;")
+        _hash_update(h, obj.to_numpy())
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        h.update(f"dc:{type(obj).__name__};".encode())
+        _hash_update(h, asdict(obj))
+    elif isinstance(obj, dict):
+        h.update(f"dict:{len(obj)};".encode())
+        for key in sorted(obj.keys(), key=repr):
+            _hash_update(h, key)
+            _hash_update(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}:{len(obj)};".encode())
+        for item in obj:
+            _hash_update(h, item)
+    else:
+        h.update(f"repr:{obj!r};".encode())
@@ -4,7 +4,98 @@ Berechnungs-Engine für Simulation.
 
 import pandas as pd
 import numpy as np
-from typing import Tuple, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional, Union
+from data_processing.cache_utils import LRUCache, frame_fingerprint, readonly_array
+from data_processing.calendar_service import get_calendar, rebase_to_year
+
+
+# Aufbereitete Temperatur-Arrays je (Datensatz, Spalte, Simulationsjahr)
+WEATHER_CACHE = LRUCache(maxsize=32, name="Wetter")
+
+
+@dataclass
+class HeatPumpEnsemble:
+    """
+    Wärmepumpen-Last für mehrere Wetterjahre (Ensemble-Dimension).
+    
+    Alle Arrays haben die Form (Wetterjahre × Zeitschritte); Zeile m gehört zum
+    Wetterdatensatz members[m], Spalte t zu zeitpunkte[t].
+    """
+    zeitpunkte: pd.DatetimeIndex
+    members: List[str]
+    energy_mwh: np.ndarray
+    temperatures: np.ndarray
+    norm_factors: np.ndarray
+    
+    @property
+    def n_members(self) -> int:
+        """Anzahl Wetterjahre im Ensemble."""
+        return len(self.members)
+    
+    def member_frame(self, name: str) -> pd.DataFrame:
+        """
+        Last eines Wetterjahres im Format von calculate_heatpump_load.
+        
+        Returns:
+            DataFrame mit Spalten ['Zeitpunkt', 'Wärmepumpen [MWh]']
+        """
+        m = self.members.index(name)
+        return pd.DataFrame({
+            'Zeitpunkt': self.zeitpunkte,
+            'Wärmepumpen [MWh]': self.energy_mwh[m].copy()
+        })
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Breites DataFrame: 'Zeitpunkt' und je Wetterjahr eine Spalte [MWh]."""
+        df = pd.DataFrame(self.energy_mwh.T, columns=self.members)
+        df.insert(0, 'Zeitpunkt', self.zeitpunkte)
+        return df
+    
+    def annual_twh(self) -> pd.Series:
+        """Jahres-Stromverbrauch der Wärmepumpen je Wetterjahr [TWh]."""
+        return pd.Series(self.energy_mwh.sum(axis=1) / 1e6, index=self.members, name='Wärmepumpen [TWh]')
+    
+    def peak_mw(self, dt: float = 0.25) -> pd.Series:
+        """Spitzenlast der Wärmepumpen je Wetterjahr [MW]."""
+        return pd.Series(self.energy_mwh.max(axis=1) / dt, index=self.members, name='Spitzenlast [MW]')
+    
+    def apply_to_consumption(self, df_consumption: pd.DataFrame, name: str) -> pd.DataFrame:
+        """
+        Ersetzt die Wärmepumpen-Spalte eines Verbrauchs-DataFrames durch ein Wetterjahr.
+        
+        Das Ensemble muss auf dem Zeitraster des Verbrauchs berechnet sein
+        (calculate_heatpump_ensemble mit zeitpunkte=df_consumption['Zeitpunkt']),
+        die Zuordnung erfolgt zeilenweise - ein doppelter Zeitstempel der
+        Zeitumstellung wird so nicht doppelt gezählt. 'Gesamt [MWh]' wird um die
+        Differenz korrigiert, alle übrigen Spalten (BDEW, E-Mobilität) bleiben
+        unverändert.
+        
+        Args:
+            df_consumption: Verbrauch mit 'Zeitpunkt' und 'Wärmepumpen [MWh]'
+            name: Wetterdatensatz aus members
+        
+        Returns:
+            Neues DataFrame (Eingabe bleibt unverändert)
+        
+        Raises:
+            ValueError: Wenn das Zeitraster des Verbrauchs nicht dem des Ensembles entspricht
+        """
+        zeitpunkte = df_consumption['Zeitpunkt'].to_numpy(dtype='datetime64[ns]')
+        if len(zeitpunkte) != len(self.zeitpunkte) or not np.array_equal(zeitpunkte, self.zeitpunkte.values):
+            raise ValueError(
+                f"Zeitraster des Verbrauchs ({len(zeitpunkte)} Zeitschritte) entspricht nicht dem "
+                f"Ensemble ({len(self.zeitpunkte)}); Ensemble mit zeitpunkte=df['Zeitpunkt'] berechnen"
+            )
+        
+        df = df_consumption.copy()
+        neu = self.energy_mwh[self.members.index(name)].copy()
+        
+        alt = df['Wärmepumpen [MWh]'] if 'Wärmepumpen [MWh]' in df.columns else 0.0
+        if 'Gesamt [MWh]' in df.columns:
+            df['Gesamt [MWh]'] = df['Gesamt [MWh]'] - alt + neu
+        df['Wärmepumpen [MWh]'] = neu
+        return df
 
 
 class CalculationEngine:
@@ -14,6 +105,7 @@ class CalculationEngine:
     Unterstützte Modi:
     - "normal": Standard Python (langsam, aber stabil)
     - "cpu_optimized": Numba JIT mit Parallelisierung
+    - "numpy": Vektorisiertes NumPy (schnell, ohne Compiler/JIT-Aufwärmzeit)
     
     Usage:
         engine = CalculationEngine(mode="cpu_optimized")
@@ -22,10 +114,11 @@ class CalculationEngine:
         )
     """
     
-    VALID_MODES = ["normal", "cpu_optimized"]
+    VALID_MODES = ["normal", "cpu_optimized", "numpy"]
     MODE_DISPLAY_NAMES = {
         "normal": "Normal",
         "cpu_optimized": "Numba",
+        "numpy": "NumPy",
     }
     
     def __init__(self, mode: str = "cpu_optimized"):
@@ -33,7 +126,7 @@ class CalculationEngine:
         Initialisiert die Calculation Engine.
         
         Args:
-            mode: Berechnungsmodus ("normal", "cpu_optimized")
+            mode: Berechnungsmodus ("normal", "cpu_optimized", "numpy")
         
         Raises:
             ValueError: Bei ungültigem Modus
@@ -78,7 +171,8 @@ class CalculationEngine:
         COP_avg: float,
         dt: float,
         simu_jahr: int,
-        debug: bool = False
+        debug: bool = False,
+        weather_name: Optional[str] = None
     ) -> pd.DataFrame:
         """
         Berechnet Wärmepumpen-Last mit gewähltem Modus.
@@ -92,6 +186,8 @@ class CalculationEngine:
             dt: Zeitschritt [h] (z.B. 0.25 für 15min)
             simu_jahr: Simulationsjahr
             debug: Debug-Ausgaben
+            weather_name: Name des Wetterdatensatzes (Teil des Cache-Schlüssels der
+                Wetteraufbereitung, zusätzlich zum Inhalts-Fingerabdruck)
         
         Returns:
             DataFrame mit Spalten ['Zeitpunkt', 'Wärmepumpen [MWh]']
@@ -100,18 +196,249 @@ class CalculationEngine:
         if self.mode == "normal":
             df_result = self._calculate_normal(
                 weather_df, hp_profile_matrix, n_heatpumps, 
-                Q_th_a, COP_avg, dt, simu_jahr, debug
+                Q_th_a, COP_avg, dt, simu_jahr, debug, weather_name
             )
         elif self.mode == "cpu_optimized":
             df_result = self._calculate_numba(
                 weather_df, hp_profile_matrix, n_heatpumps,
-                Q_th_a, COP_avg, dt, simu_jahr, debug
+                Q_th_a, COP_avg, dt, simu_jahr, debug, weather_name
+            )
+        elif self.mode == "numpy":
+            df_result = self._calculate_numpy(
+                weather_df, hp_profile_matrix, n_heatpumps,
+                Q_th_a, COP_avg, dt, simu_jahr, debug, weather_name
             )
         else:
             raise ValueError(f"Unbekannter Modus: {self.mode}")
         
         return df_result
     
+    def calculate_heatpump_ensemble(
+        self,
+        weather_dfs: Dict[str, pd.DataFrame],
+        hp_profile_matrix: pd.DataFrame,
+        n_heatpumps: int,
+        Q_th_a: float,
+        COP_avg: float,
+        dt: float,
+        simu_jahr: int,
+        debug: bool = False,
+        zeitpunkte: Optional[Union[pd.Series, pd.DatetimeIndex, np.ndarray]] = None
+    ) -> HeatPumpEnsemble:
+        """
+        Berechnet die Wärmepumpen-Last für mehrere Wetterdatensätze in einem Durchlauf.
+        
+        Alle Temperaturreihen werden auf ein gemeinsames Zeitraster gebracht und zu
+        einer (Wetterjahre × Zeitschritte)-Matrix gestapelt. Die Lastprofilfaktoren
+        werden in einem einzigen Lookup ermittelt, die Normierung auf Q_th_a erfolgt
+        je Reihe über das gesamte Raster. Ohne zeitpunkte ist das Raster das
+        Viertelstunden-Raster des Simulationsjahres (doppelte Zeitstempel der
+        Zeitumstellung gehen nur einmal ein). Mit zeitpunkte (z.B. 'Zeitpunkt' eines
+        Verbrauchs-DataFrames inkl. doppeltem Zeitstempel) werden die Reihen wie in
+        calculate_heatpump_load_by_station über (Zeitstempel, n-tes Vorkommen)
+        zugeordnet. Fehlende Zeitpunkte (z.B. 29.02.) werden mit dem vorherigen Wert
+        aufgefüllt. Die Berechnung ist in allen Modi vektorisiert (Numba-Kernel im
+        Modus "cpu_optimized").
+        
+        Args:
+            weather_dfs: Wetterdatensätze {Name: DataFrame mit Zeitpunkt und AVERAGE}
+            hp_profile_matrix: Lastprofilmatrix (Stunde/Minute vs. Temperatur)
+            n_heatpumps: Anzahl Wärmepumpen
+            Q_th_a: Jahreswärmebedarf pro WP [kWh]
+            COP_avg: Durchschnittlicher COP
+            dt: Zeitschritt [h] (z.B. 0.25 für 15min)
+            simu_jahr: Simulationsjahr
+            debug: Debug-Ausgaben
+            zeitpunkte: Zeitraster des Ergebnisses (None = Viertelstunden-Raster des Jahres)
+        
+        Returns:
+            HeatPumpEnsemble mit energy_mwh der Form (Wetterjahre × Zeitschritte)
+        
+        Raises:
+            ValueError: Ohne Wetterdatensätze oder bei nicht positiver Normierungssumme
+        """
+        if not weather_dfs:
+            raise ValueError("Mindestens ein Wetterdatensatz erforderlich")
+        
+        if zeitpunkte is None:
+            grid = get_calendar(simu_jahr).index.values
+        else:
+            grid = pd.DatetimeIndex(zeitpunkte).values
+        members = list(weather_dfs.keys())
+        
+        temps = np.empty((len(members), len(grid)))
+        for m, name in enumerate(members):
+            z, temperaturen = prepare_weather_temperatures(
+                weather_dfs[name], simu_jahr, location="AVERAGE",
+                dataset_name=name, drop_duplicates=zeitpunkte is None
+            )
+            if len(z) == len(grid) and np.array_equal(z, grid):
+                temps[m] = temperaturen
+            else:
+                temps[m] = _align_to_grid(z, temperaturen, grid)
+        
+        minute_of_day = (grid - grid.astype('datetime64[D]')) // np.timedelta64(1, 'm')
+        energy_mwh, f = self._stacked_hp_energy(
+            temps, minute_of_day // 60, minute_of_day % 60, hp_profile_matrix,
+            n_heatpumps, Q_th_a, COP_avg, dt, members, debug, match_single_run=True
+        )
+        
+        return HeatPumpEnsemble(
+            zeitpunkte=pd.DatetimeIndex(grid),
+            members=members,
+            energy_mwh=energy_mwh,
+            temperatures=temps,
+            norm_factors=f
+        )
+    
+    def calculate_heatpump_load_by_station(
+        self,
+        weather_df: pd.DataFrame,
+        hp_profile_matrix: pd.DataFrame,
+        n_heatpumps: int,
+        Q_th_a: float,
+        COP_avg: float,
+        dt: float,
+        simu_jahr: int,
+        station_weights: Optional[Dict[str, float]] = None,
+        debug: bool = False,
+        weather_name: Optional[str] = None,
+        detailed: bool = False
+    ) -> pd.DataFrame:
+        """
+        Berechnet die Wärmepumpen-Last je Wetterstation und aggregiert regional gewichtet.
+        
+        Statt der gemittelten Spalte "AVERAGE" wird jede Stationsspalte einzeln auf
+        Temperatur-Bins gerundet - kalte Spitzen einzelner Regionen gehen so nicht
+        im Mittelwert unter. Alle Stationen laufen als (Stationen × Zeitschritte)-Matrix
+        durch einen einzigen Lookup; jede Station wird auf Q_th_a normiert und mit
+        ihrem Anteil an den Wärmepumpen gewichtet. Zeitraster (inkl. doppeltem
+        Zeitstempel der Zeitumstellung) und Normierung entsprechen
+        calculate_heatpump_load, station_weights={"AVERAGE": 1} liefert daher dasselbe
+        Ergebnis.
+        
+        Args:
+            weather_df: Wetterdaten mit Zeitpunkt und Stationsspalten
+            hp_profile_matrix: Lastprofilmatrix (Stunde/Minute vs. Temperatur)
+            n_heatpumps: Anzahl Wärmepumpen (gesamt)
+            Q_th_a: Jahreswärmebedarf pro WP [kWh]
+            COP_avg: Durchschnittlicher COP
+            dt: Zeitschritt [h] (z.B. 0.25 für 15min)
+            simu_jahr: Simulationsjahr
+            station_weights: Anteil der Wärmepumpen je Station {Spalte: Gewicht}, wird auf
+                Summe 1 normiert. None oder leer = alle Stationen gleich gewichtet.
+            debug: Debug-Ausgaben
+            weather_name: Name des Wetterdatensatzes (Cache-Schlüssel der Wetteraufbereitung)
+            detailed: Zusätzlich je Station 'Wärmepumpen {Station} [MWh]' (gewichteter Anteil)
+        
+        Returns:
+            DataFrame mit Spalten ['Zeitpunkt', 'Wärmepumpen [MWh]']
+        
+        Raises:
+            ValueError: Bei unbekannten Stationen, ungültigen Gewichten oder nicht
+                positiver Normierungssumme
+        """
+        if station_weights:
+            stations = list(station_weights.keys())
+            weights = np.array([float(station_weights[st]) for st in stations])
+        else:
+            stations = get_weather_stations(weather_df)
+            weights = np.ones(len(stations))
+        
+        if not stations:
+            raise ValueError("Keine Stationsspalten in den Wetterdaten gefunden")
+        if np.any(weights < 0) or weights.sum() <= 0:
+            raise ValueError(f"Ungültige Stationsgewichte: {dict(zip(stations, weights))}")
+        weights = weights / weights.sum()
+        
+        zeitpunkte, temps = prepare_weather_temperature_matrix(
+            weather_df, simu_jahr, stations, dataset_name=weather_name
+        )
+        
+        minute_of_day = (zeitpunkte - zeitpunkte.astype('datetime64[D]')) // np.timedelta64(1, 'm')
+        energy_mwh, _ = self._stacked_hp_energy(
+            temps, minute_of_day // 60, minute_of_day % 60, hp_profile_matrix,
+            n_heatpumps, Q_th_a, COP_avg, dt, stations, debug, match_single_run=True
+        )
+        weighted_mwh = energy_mwh * weights[:, None]
+        
+        df_result = pd.DataFrame({
+            'Zeitpunkt': zeitpunkte.copy(),
+            'Wärmepumpen [MWh]': weighted_mwh.sum(axis=0)
+        })
+        if detailed:
+            for st, values in zip(stations, weighted_mwh):
+                df_result[f'Wärmepumpen {st} [MWh]'] = values
+        
+        if debug:
+            jahres_verbrauch_twh = df_result['Wärmepumpen [MWh]'].sum() / 1e6
+            print(f"[{self.mode_display}] Stationen: {len(stations)}, Jahres-Stromverbrauch: "
+                  f"{jahres_verbrauch_twh:.4f} TWh, Spitze: {df_result['Wärmepumpen [MWh]'].max() / dt:.0f} MW")
+        
+        return df_result
+    
+    def _stacked_hp_energy(
+        self,
+        temps: np.ndarray,
+        hours: np.ndarray,
+        minutes: np.ndarray,
+        hp_profile_matrix: pd.DataFrame,
+        n_heatpumps: int,
+        Q_th_a: float,
+        COP_avg: float,
+        dt: float,
+        labels: List[str],
+        debug: bool = False,
+        match_single_run: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        WP-Energie für eine (Reihen × Zeitschritte)-Temperaturmatrix mit Normierung je Reihe.
+        
+        Die Uhrzeit ist für alle Reihen gleich; der Lookup läuft einmal über die
+        flachgelegte Matrix.
+        
+        Args:
+            temps: Temperaturen (m, n)
+            hours: Stunden 0-23 (n,)
+            minutes: Minuten 0/15/30/45 (n,)
+            labels: Namen der Reihen (für Fehlermeldungen und Debug-Ausgaben)
+            match_single_run: Normierungssumme wie calculate_heatpump_load im aktuellen
+                Modus bilden (cpu_optimized: Numba-Summe statt NumPy-Summe)
+        
+        Returns:
+            (energy_mwh, f): Energie je Reihe und Zeitschritt (m, n), Normierungsfaktoren (m,)
+        """
+        hp_matrix_prepared = self._prep_hp_profile_matrix(hp_profile_matrix)
+        profile_array, _ = self._convert_profile_to_array(hp_matrix_prepared)
+        
+        n_rows, n_steps = temps.shape
+        hp_factors = self.lookup_hp_factors(
+            temps.ravel(),
+            np.tile(hours, n_rows),
+            np.tile(minutes, n_rows),
+            profile_array
+        ).reshape(n_rows, n_steps)
+        
+        if match_single_run:
+            # Gleiche Summation wie calculate_heatpump_load (bitgleiche Normierung je Reihe)
+            summe_lp_dt = np.array([self.sum_hp_profile(row, dt) for row in hp_factors])
+        else:
+            summe_lp_dt = hp_factors.sum(axis=1) * dt
+        if np.any(summe_lp_dt <= 0):
+            invalid = [labels[m] for m in np.flatnonzero(summe_lp_dt <= 0)]
+            raise ValueError(f"Normierungssumme summe_lp_dt ist nicht positiv für: {invalid}")
+        
+        f = Q_th_a / summe_lp_dt
+        energy_mwh = hp_factors * f[:, None] / COP_avg * n_heatpumps / 1000.0 * dt
+        
+        if debug:
+            target_twh = (Q_th_a * n_heatpumps) / (COP_avg * 1e6)
+            for m, label in enumerate(labels):
+                print(f"[{self.mode_display}] {label}: f={f[m]:.2f} kW, "
+                      f"{energy_mwh[m].sum() / 1e6:.4f} TWh (Ziel: {target_twh:.4f} TWh)")
+        
+        return energy_mwh, f
+    
     def _calculate_normal(
         self,
         weather_df: pd.DataFrame,
@@ -121,7 +448,8 @@ class CalculationEngine:
         COP_avg: float,
         dt: float,
         simu_jahr: int,
-        debug: bool = False
+        debug: bool = False,
+        weather_name: Optional[str] = None
     ) -> pd.DataFrame:
         """
         Normale Berechnung
@@ -129,7 +457,7 @@ class CalculationEngine:
         Returns:
             DataFrame mit Spalten ['Zeitpunkt', 'Wärmepumpen [MWh]']
         """
-        df_weather = self._prep_weather_data_simple(weather_df, simu_jahr)
+        df_weather = self._prep_weather_data_simple(weather_df, simu_jahr, weather_name)
         
         hp_matrix_prepared = self._prep_hp_profile_matrix(hp_profile_matrix)
         
@@ -174,7 +502,12 @@ class CalculationEngine:
         
         return df_result
     
-    def _prep_weather_data_simple(self, weather_df: pd.DataFrame, simu_jahr: int) -> pd.DataFrame:
+    def _prep_weather_data_simple(
+        self,
+        weather_df: pd.DataFrame,
+        simu_jahr: int,
+        weather_name: Optional[str] = None
+    ) -> pd.DataFrame:
         """
         Bereitet Wetterdaten vor - MIT vollständiger Jahr-Interpolation.
         
@@ -183,35 +516,7 @@ class CalculationEngine:
         Returns:
             DataFrame mit Spalten ['Zeitpunkt', 'Temperatur [°C]'] auf 15-Min Basis
         """
-        df_local = weather_df.copy()
-        
-        # Konvertiere Zeitpunkt
-        if not pd.api.types.is_datetime64_any_dtype(df_local['Zeitpunkt']):
-            df_local['Zeitpunkt'] = pd.to_datetime(df_local['Zeitpunkt'], format='%d.%m.%y %H:%M')
-        
-        location = "AVERAGE"
-        if location not in df_local.columns:
-            raise ValueError(f"Spalte '{location}' nicht gefunden")
-        
-        df_local = df_local[['Zeitpunkt', location]].copy()
-        df_local.columns = ['Zeitpunkt', 'Temperatur [°C]']
-        
-        # Entferne Zeilen mit NaT oder NaN
-        df_local = df_local.dropna(subset=['Zeitpunkt', 'Temperatur [°C]'])
-        df_local = df_local.sort_values('Zeitpunkt').reset_index(drop=True)
-        
-        weather_year = int(df_local['Zeitpunkt'].dt.year.iloc[0])
-        start = pd.Timestamp(f'{weather_year}-01-01 00:00')
-        end = pd.Timestamp(f'{weather_year}-12-31 23:45')
-        full_index = pd.date_range(start=start, end=end, freq='15min')
-        df_full = pd.DataFrame({'Zeitpunkt': full_index})
-        
-        df_local = df_full.merge(df_local, on='Zeitpunkt', how='left')
-        df_local['Temperatur [°C]'] = df_local['Temperatur [°C]'].ffill().bfill()
-        
-        df_local['Zeitpunkt'] = df_local['Zeitpunkt'].apply(lambda x: x.replace(year=simu_jahr))
-        
-        return df_local
+        return self._prep_weather_data(weather_df, simu_jahr, weather_name)
     
     def _get_hp_factor_simple(
         self,
@@ -262,7 +567,8 @@ class CalculationEngine:
         COP_avg: float,
         dt: float,
         simu_jahr: int,
-        debug: bool = False
+        debug: bool = False,
+        weather_name: Optional[str] = None
     ) -> pd.DataFrame:
         """
         Numba-optimierte Berechnung
@@ -270,7 +576,7 @@ class CalculationEngine:
         Returns:
             DataFrame mit Spalten ['Zeitpunkt', 'Wärmepumpen [MWh]']
         """
-        df_weather = self._prep_weather_data(weather_df, simu_jahr)
+        df_weather = self._prep_weather_data(weather_df, simu_jahr, weather_name)
         
         hp_matrix_prepared = self._prep_hp_profile_matrix(hp_profile_matrix)
         
@@ -280,10 +586,8 @@ class CalculationEngine:
         
         profile_array, _ = self._convert_profile_to_array(hp_matrix_prepared)
         
-        hp_factors = _calculate_hp_factors_numba(
-            temps, hours, minutes, profile_array
-        )
-        summe_lp_dt = _numba_sum_profile(hp_factors, dt)
+        hp_factors = self.lookup_hp_factors(temps, hours, minutes, profile_array)
+        summe_lp_dt = _numba_sum_profile(hp_factors, float(dt))
         
         if summe_lp_dt <= 0:
             raise ValueError(f"Normierungssumme summe_lp_dt={summe_lp_dt} ist nicht positiv!")
@@ -293,7 +597,7 @@ class CalculationEngine:
         if debug:
             print(f"[Numba] Normierungsfaktor f: {f:.2f} kW (Q_th_a={Q_th_a} kWh, summe={summe_lp_dt:.1f} h-äquiv)")
         
-        power_mw = _numba_calculate_power(hp_factors, f, COP_avg, n_heatpumps)
+        power_mw = _numba_calculate_power(hp_factors, float(f), float(COP_avg), float(n_heatpumps))
         energy_mwh = power_mw * dt
         
         df_result = pd.DataFrame({
@@ -308,45 +612,139 @@ class CalculationEngine:
         
         return df_result
     
-    def _prep_weather_data(self, weather_df: pd.DataFrame, simu_jahr: int) -> pd.DataFrame:
+    def _calculate_numpy(
+        self,
+        weather_df: pd.DataFrame,
+        hp_profile_matrix: pd.DataFrame,
+        n_heatpumps: int,
+        Q_th_a: float,
+        COP_avg: float,
+        dt: float,
+        simu_jahr: int,
+        debug: bool = False,
+        weather_name: Optional[str] = None
+    ) -> pd.DataFrame:
         """
-        Bereitet Wetterdaten vor - mit vollständiger Jahr-Interpolation.
+        Vektorisierte NumPy-Berechnung (ohne Numba)
         
-        Für Produktionsdaten: Interpoliert stündliche Daten auf 15-Minuten für ganzes Jahr.
+        Der Lookup Temperatur-Bin × Viertelstunde erfolgt als ein einziger
+        Fancy-Indexing-Gather auf dem (96, 34)-Profil-Array.
         
         Returns:
-            DataFrame mit Spalten ['Zeitpunkt', 'Temperatur [°C]'] auf 15-Min Basis
+            DataFrame mit Spalten ['Zeitpunkt', 'Wärmepumpen [MWh]']
+        """
+        df_weather = self._prep_weather_data(weather_df, simu_jahr, weather_name)
+        
+        hp_matrix_prepared = self._prep_hp_profile_matrix(hp_profile_matrix)
+        profile_array, _ = self._convert_profile_to_array(hp_matrix_prepared)
+        
+        hp_factors = _lookup_hp_factors(
+            df_weather['Temperatur [°C]'].values,
+            df_weather['Zeitpunkt'].dt.hour.values,
+            df_weather['Zeitpunkt'].dt.minute.values,
+            profile_array
+        )
+        summe_lp_dt = np.sum(hp_factors) * dt
+        
+        if summe_lp_dt <= 0:
+            raise ValueError(f"Normierungssumme summe_lp_dt={summe_lp_dt} ist nicht positiv!")
+        
+        f = Q_th_a / summe_lp_dt
+        
+        if debug:
+            print(f"[NumPy] Normierungsfaktor f: {f:.2f} kW (Q_th_a={Q_th_a} kWh, summe={summe_lp_dt:.1f} h-äquiv)")
+        
+        # kW thermisch -> kW elektrisch -> kW gesamt -> MW
+        power_mw = hp_factors * f / COP_avg * n_heatpumps / 1000.0
+        energy_mwh = power_mw * dt
+        
+        df_result = pd.DataFrame({
+            'Zeitpunkt': df_weather['Zeitpunkt'],
+            'Wärmepumpen [MWh]': energy_mwh
+        })
+        
+        if debug:
+            jahres_verbrauch_twh = energy_mwh.sum() / 1e6
+            target_twh = (Q_th_a * n_heatpumps) / (COP_avg * 1e6)
+            print(f"[NumPy] Jahres-Stromverbrauch: {jahres_verbrauch_twh:.4f} TWh (Ziel: {target_twh:.4f} TWh)")
+        
+        return df_result
+    
+    def lookup_hp_factors(
+        self,
+        temps: np.ndarray,
+        hours: np.ndarray,
+        minutes: np.ndarray,
+        profile_array: np.ndarray
+    ) -> np.ndarray:
         """
-        df_local = weather_df.copy()
+        Ermittelt die Lastprofilfaktoren je Zeitschritt über das (96, 34)-Profil-Array.
         
-        # Konvertiere Zeitpunkt falls nötig
-        if not pd.api.types.is_datetime64_any_dtype(df_local['Zeitpunkt']):
-            df_local['Zeitpunkt'] = pd.to_datetime(df_local['Zeitpunkt'], format='%d.%m.%y %H:%M')
+        Im Modus "cpu_optimized" über den Numba-Kernel, sonst als vektorisierter
+        NumPy-Gather (identische Zuordnung). Die Eingaben werden als beschreibbare
+        Kopien mit festen Datentypen (float64/int64, C-Layout) übergeben, damit je
+        Kernel genau eine kompilierte Variante entsteht (und im Disk-Cache bzw.
+        Warm-up wiederverwendet wird).
         
-        # Wähle AVERAGE Spalte
-        location = "AVERAGE"
-        if location not in df_local.columns:
-            raise ValueError(f"Spalte '{location}' nicht gefunden")
+        Args:
+            temps: Temperaturen (n,)
+            hours: Stunden 0-23 (n,)
+            minutes: Minuten 0/15/30/45 (n,)
+            profile_array: (96, 34) aus _convert_profile_to_array
         
-        df_local = df_local[['Zeitpunkt', location]].copy()
-        df_local.columns = ['Zeitpunkt', 'Temperatur [°C]']
+        Returns:
+            HP-Faktoren (n,)
+        """
+        temps = np.array(temps, dtype=np.float64, order='C')
+        hours = np.array(hours, dtype=np.int64, order='C')
+        minutes = np.array(minutes, dtype=np.int64, order='C')
+        profile_array = np.array(profile_array, dtype=np.float64, order='C')
         
-        # Entferne Zeilen mit NaT oder NaN
-        df_local = df_local.dropna(subset=['Zeitpunkt', 'Temperatur [°C]'])
-        df_local = df_local.sort_values('Zeitpunkt').reset_index(drop=True)
+        if self.mode == "cpu_optimized":
+            return _calculate_hp_factors_numba(temps, hours, minutes, profile_array)
+        return _lookup_hp_factors(temps, hours, minutes, profile_array)
+    
+    def sum_hp_profile(self, hp_factors: np.ndarray, dt: float) -> float:
+        """
+        Normierungssumme der HP-Faktoren (Summe * dt) wie im gewählten Modus.
+        
+        Im Modus "cpu_optimized" über den Numba-Kernel (sequentielle Summe), sonst
+        über np.sum (paarweise Summe) - damit Aufrufer außerhalb der Engine
+        bitgleich zu calculate_heatpump_load normieren.
         
-        weather_year = int(df_local['Zeitpunkt'].dt.year.iloc[0])
-        start = pd.Timestamp(f'{weather_year}-01-01 00:00')
-        end = pd.Timestamp(f'{weather_year}-12-31 23:45')
-        full_index = pd.date_range(start=start, end=end, freq='15min')
-        df_full = pd.DataFrame({'Zeitpunkt': full_index})
+        Args:
+            hp_factors: HP-Faktoren (n,) aus lookup_hp_factors
+            dt: Zeitschritt [h]
         
-        df_local = df_full.merge(df_local, on='Zeitpunkt', how='left')
-        df_local['Temperatur [°C]'] = df_local['Temperatur [°C]'].ffill().bfill()
+        Returns:
+            Summe der Faktoren * dt
+        """
+        if self.mode == "cpu_optimized":
+            return _numba_sum_profile(np.ascontiguousarray(hp_factors, dtype=np.float64), float(dt))
+        return np.sum(hp_factors) * dt
+    
+    def _prep_weather_data(
+        self,
+        weather_df: pd.DataFrame,
+        simu_jahr: int,
+        weather_name: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Bereitet Wetterdaten vor - mit vollständiger Jahr-Interpolation.
         
-        df_local['Zeitpunkt'] = df_local['Zeitpunkt'].apply(lambda x: x.replace(year=simu_jahr))
+        Für Produktionsdaten: Interpoliert stündliche Daten auf 15-Minuten für ganzes Jahr.
+        Das Ergebnis wird je (Datensatz, Spalte, Simulationsjahr) gecacht.
         
-        return df_local
+        Returns:
+            DataFrame mit Spalten ['Zeitpunkt', 'Temperatur [°C]'] auf 15-Min Basis
+        """
+        zeitpunkte, temperaturen = prepare_weather_temperatures(
+            weather_df, simu_jahr, location="AVERAGE", dataset_name=weather_name
+        )
+        return pd.DataFrame({
+            'Zeitpunkt': zeitpunkte.copy(),
+            'Temperatur [°C]': temperaturen.copy()
+        })
     
     def _prep_hp_profile_matrix(self, hp_profile_matrix: pd.DataFrame) -> pd.DataFrame:
         """
@@ -407,10 +805,229 @@ class CalculationEngine:
         return profile_array, np.array(final_cols)
 
 
+def prepare_weather_temperatures(
+    weather_df: pd.DataFrame,
+    simu_jahr: int,
+    location: str = "AVERAGE",
+    dataset_name: Optional[str] = None,
+    drop_duplicates: bool = False,
+    use_cache: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Liefert die aufbereitete Temperaturreihe auf dem 15-Minuten-Raster (gecacht).
+    
+    Schritte: Datums-Parsing ('%d.%m.%y %H:%M'), Entfernen von NaT/NaN, Merge auf
+    das volle Viertelstunden-Raster des Wetterjahres, ffill/bfill und Verschiebung
+    ins Simulationsjahr (vektorisiert über rebase_to_year).
+    
+    Args:
+        weather_df: Wetterdaten mit Spalte 'Zeitpunkt' und Temperaturspalten
+        simu_jahr: Simulationsjahr, in das die Zeitstempel verschoben werden
+        location: Temperaturspalte (z.B. "AVERAGE")
+        dataset_name: Name des Wetterdatensatzes (Teil des Cache-Schlüssels). Der
+            Schlüssel enthält immer einen Fingerabdruck von Zeitstempeln und Spalte.
+        drop_duplicates: Doppelte Zeitstempel (Zeitumstellung) nur einmal übernehmen
+        use_cache: Ergebnis aus dem Cache lesen bzw. dort ablegen
+    
+    Returns:
+        (zeitpunkte, temperaturen): schreibgeschützte Arrays (datetime64[ns], float64)
+    
+    Raises:
+        ValueError: Wenn die Spalte location fehlt
+    """
+    if location not in weather_df.columns:
+        raise ValueError(f"Spalte '{location}' nicht gefunden")
+    
+    def compute() -> Tuple[np.ndarray, np.ndarray]:
+        return _prepare_weather_temperatures(weather_df, simu_jahr, location, drop_duplicates)
+    
+    if not use_cache:
+        return compute()
+    
+    # Inhalts-Fingerabdruck über Zeitstempel und Temperaturen: ein unter gleichem
+    # Namen ersetzter oder geänderter Datensatz erhält immer einen neuen Eintrag
+    content = frame_fingerprint(weather_df[['Zeitpunkt', location]])
+    key = ("weather", dataset_name, content, location, int(simu_jahr), drop_duplicates)
+    return WEATHER_CACHE.get_or_compute(key, compute)
+
+
+def prepare_weather_temperature_matrix(
+    weather_df: pd.DataFrame,
+    simu_jahr: int,
+    locations: List[str],
+    dataset_name: Optional[str] = None,
+    drop_duplicates: bool = False,
+    use_cache: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Liefert mehrere Temperaturspalten als (Spalten × Zeitschritte)-Matrix (gecacht).
+    
+    Jede Spalte wird wie in prepare_weather_temperatures aufbereitet (fehlende Werte
+    je Spalte aufgefüllt); das Datums-Parsing erfolgt nur einmal. Jede Zeile der
+    Matrix ist damit identisch zu prepare_weather_temperatures mit denselben
+    Argumenten - insbesondere bleibt der doppelte Zeitstempel der Zeitumstellung
+    wie im AVERAGE-Pfad erhalten (drop_duplicates=False). Fehlt eine Spalte gerade
+    an einem doppelten Zeitstempel, wird sie auf das gemeinsame Raster aufgefüllt.
+    
+    Args:
+        weather_df: Wetterdaten mit Spalte 'Zeitpunkt' und Temperaturspalten
+        simu_jahr: Simulationsjahr, in das die Zeitstempel verschoben werden
+        locations: Temperaturspalten (z.B. Stationsnamen)
+        dataset_name: Name des Wetterdatensatzes (Cache-Schlüssel, siehe prepare_weather_temperatures)
+        drop_duplicates: Doppelte Zeitstempel (Zeitumstellung) nur einmal übernehmen
+        use_cache: Ergebnis aus dem Cache lesen bzw. dort ablegen
+    
+    Returns:
+        (zeitpunkte, temperaturen): schreibgeschützte Arrays (n,) datetime64[ns] und (m, n) float64
+    
+    Raises:
+        ValueError: Wenn eine Spalte fehlt
+    """
+    missing = [loc for loc in locations if loc not in weather_df.columns]
+    if missing:
+        raise ValueError(f"Spalten nicht gefunden: {missing}")
+    locations = list(locations)
+    
+    def compute() -> Tuple[np.ndarray, np.ndarray]:
+        return _prepare_weather_temperature_matrix(weather_df, simu_jahr, locations, drop_duplicates)
+    
+    if not use_cache:
+        return compute()
+    
+    content = frame_fingerprint(weather_df[['Zeitpunkt'] + locations])
+    key = ("weather-matrix", dataset_name, content, tuple(locations), int(simu_jahr), drop_duplicates)
+    return WEATHER_CACHE.get_or_compute(key, compute)
+
+
+def get_weather_stations(weather_df: pd.DataFrame) -> List[str]:
+    """Stationsspalten eines Wetterdatensatzes (alle außer 'Zeitpunkt' und 'AVERAGE')."""
+    return [str(c) for c in weather_df.columns if c not in ('Zeitpunkt', 'AVERAGE')]
+
+
+def _prepare_weather_temperature_matrix(
+    weather_df: pd.DataFrame,
+    simu_jahr: int,
+    locations: List[str],
+    drop_duplicates: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Berechnet die Temperaturmatrix für prepare_weather_temperature_matrix (ohne Cache)."""
+    zeitpunkte_raw = _parse_weather_timestamps(weather_df['Zeitpunkt'])
+    
+    columns = [
+        _weather_column_to_grid(zeitpunkte_raw, weather_df[location], simu_jahr, drop_duplicates)
+        for location in locations
+    ]
+    
+    # Normalfall: alle Spalten liegen auf demselben Raster
+    zeitpunkte = max((z for z, _ in columns), key=len)
+    rows = []
+    for z, temperaturen in columns:
+        if len(z) != len(zeitpunkte) or not np.array_equal(z, zeitpunkte):
+            temperaturen = _align_to_grid(z, temperaturen, zeitpunkte)
+        rows.append(temperaturen)
+    
+    return zeitpunkte, readonly_array(np.vstack(rows))
+
+
+def _align_to_grid(zeitpunkte: np.ndarray, values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """
+    Überträgt eine Reihe auf ein Raster mit ggf. mehrfachen Zeitstempeln.
+    
+    Zuordnung über (Zeitstempel, n-tes Vorkommen); nicht belegte Zeitpunkte werden
+    mit dem vorherigen Wert aufgefüllt.
+    """
+    def occurrence_index(z: np.ndarray) -> pd.MultiIndex:
+        z = pd.Series(z)
+        return pd.MultiIndex.from_arrays([z, z.groupby(z).cumcount()])
+    
+    series = pd.Series(values, index=occurrence_index(zeitpunkte))
+    return series.reindex(occurrence_index(grid)).ffill().bfill().to_numpy(dtype=np.float64)
+
+
+def _prepare_weather_temperatures(
+    weather_df: pd.DataFrame,
+    simu_jahr: int,
+    location: str,
+    drop_duplicates: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Berechnet die Temperaturreihe für prepare_weather_temperatures (ohne Cache)."""
+    zeitpunkte_raw = _parse_weather_timestamps(weather_df['Zeitpunkt'])
+    return _weather_column_to_grid(zeitpunkte_raw, weather_df[location], simu_jahr, drop_duplicates)
+
+
+def _parse_weather_timestamps(zeitpunkte: pd.Series) -> pd.Series:
+    """Konvertiert die Zeitpunkt-Spalte der Wetterdaten falls nötig ('%d.%m.%y %H:%M')."""
+    if not pd.api.types.is_datetime64_any_dtype(zeitpunkte):
+        return pd.to_datetime(zeitpunkte, format='%d.%m.%y %H:%M')
+    return zeitpunkte
+
+
+def _weather_column_to_grid(
+    zeitpunkte_raw: pd.Series,
+    values: pd.Series,
+    simu_jahr: int,
+    drop_duplicates: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Bringt eine Temperaturspalte auf das Viertelstunden-Raster und ins Simulationsjahr."""
+    df_local = pd.DataFrame({
+        'Zeitpunkt': zeitpunkte_raw.to_numpy(),
+        'Temperatur [°C]': values.to_numpy()
+    })
+    
+    # Entferne Zeilen mit NaT oder NaN
+    df_local = df_local.dropna(subset=['Zeitpunkt', 'Temperatur [°C]'])
+    df_local = df_local.sort_values('Zeitpunkt').reset_index(drop=True)
+    if drop_duplicates:
+        df_local = df_local.drop_duplicates(subset='Zeitpunkt', keep='first').reset_index(drop=True)
+    
+    weather_year = int(df_local['Zeitpunkt'].dt.year.iloc[0])
+    df_full = pd.DataFrame({'Zeitpunkt': get_calendar(weather_year).index})
+    
+    df_local = df_full.merge(df_local, on='Zeitpunkt', how='left')
+    temperaturen = df_local['Temperatur [°C]'].ffill().bfill().to_numpy(dtype=np.float64)
+    zeitpunkte = rebase_to_year(df_local['Zeitpunkt'].to_numpy(), simu_jahr)
+    
+    return readonly_array(zeitpunkte), readonly_array(temperaturen)
+
+
+def _lookup_hp_factors(
+    temps: np.ndarray,
+    hours: np.ndarray,
+    minutes: np.ndarray,
+    profile_array: np.ndarray
+) -> np.ndarray:
+    """
+    Berechnet HP-Faktoren vektorisiert per Fancy-Indexing (reines NumPy).
+    
+    Gleiche Zuordnung wie _calculate_hp_factors_numba: Zeile = Viertelstunde,
+    Spalte = gerundete Temperatur (LOW < -14, HIGH >= 18).
+    
+    Args:
+        temps: Temperaturen (n,)
+        hours: Stunden 0-23 (n,)
+        minutes: Minuten 0/15/30/45 (n,)
+        profile_array: (96, 34) - Spalten: LOW, -14..17, HIGH
+    
+    Returns:
+        HP-Faktoren (n,)
+    """
+    row_idx = np.asarray(hours, dtype=np.int64) * 4 + np.asarray(minutes, dtype=np.int64) // 15
+    
+    # np.round rundet wie round() halbe Werte auf die gerade Zahl (Banker's Rounding)
+    t_rounded = np.round(np.asarray(temps, dtype=np.float64)).astype(np.int64)
+    col_idx = np.clip(t_rounded, -15, 18) + 15
+    
+    return profile_array[row_idx, col_idx].astype(np.float64)
+
+
 try:
-    from numba import jit, prange
+    from numba import jit
+    from data_processing.numba_compat import compile_for, register_warmup
     
-    @jit(nopython=True, parallel=True)
+    # Bewusst seriell (kein parallel=True/prange): ein Gather über ~35k Werte profitiert
+    # nicht von Threads, und nur serielle Kernel kompiliert das Hintergrund-Warm-up
+    # (compile_for überspringt parallele Kernel außerhalb des Haupt-Threads).
+    @jit(nopython=True, cache=True)
     def _calculate_hp_factors_numba(
         temps: np.ndarray,
         hours: np.ndarray,
@@ -418,7 +1035,7 @@ try:
         profile_array: np.ndarray
     ) -> np.ndarray:
         """
-        Berechnet HP-Faktoren mit Numba JIT - parallelisiert.
+        Berechnet HP-Faktoren mit Numba JIT.
         
         Args:
             temps: Temperaturen (n,)
@@ -432,7 +1049,7 @@ try:
         n = len(temps)
         result = np.zeros(n)
         
-        for i in prange(n):
+        for i in range(n):
             temp = temps[i]
             hour_val = hours[i]
             minute_val = minutes[i]
@@ -456,18 +1073,18 @@ try:
         return result
     
     
-    @jit(nopython=True)
+    @jit(nopython=True, cache=True)
     def _numba_sum_profile(factors: np.ndarray, dt: float) -> float:
         """Summiere Profilfaktoren * dt."""
         return np.sum(factors) * dt
     
     
-    @jit(nopython=True, parallel=True)
+    @jit(nopython=True, cache=True)
     def _numba_calculate_power(
         factors: np.ndarray,
         f: float,
         COP_avg: float,
-        n_heatpumps: int
+        n_heatpumps: float
     ) -> np.ndarray:
         """
         Berechnet elektrische Leistung in MW.
@@ -484,13 +1101,27 @@ try:
         n = len(factors)
         result = np.zeros(n)
         
-        for i in prange(n):
+        for i in range(n):
             p_th = factors[i] * f  # kW thermisch
             p_el = p_th / COP_avg  # kW elektrisch
             p_el_ges = p_el * n_heatpumps  # kW gesamt
             result[i] = p_el_ges / 1000.0  # MW
         
         return result
+    
+    
+    def _warmup_hp_kernels() -> None:
+        """Kompiliert die WP-Kernel für die Datentypen aus lookup_hp_factors (Hintergrund-Warm-up)."""
+        factors = np.zeros(8)
+        compile_for(
+            _calculate_hp_factors_numba,
+            factors, np.zeros(8, dtype=np.int64), np.zeros(8, dtype=np.int64), np.zeros((96, 34))
+        )
+        compile_for(_numba_sum_profile, factors, 0.25)
+        compile_for(_numba_calculate_power, factors, 1.0, 1.0, 1.0)
+    
+    
+    register_warmup("heatpump", _warmup_hp_kernels)
 
 except ImportError:
     def _calculate_hp_factors_numba(*args, **kwargs):
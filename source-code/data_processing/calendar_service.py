@@ -0,0 +1,238 @@
+"""
+Kalender-Service für Simulationsjahre.
+
+Bündelt die Kalenderlogik, die sonst in mehreren Stufen separat berechnet wird
+(Verbrauch, E-Mobilität, Erzeugung, Bilanz, Wetteraufbereitung):
+- Viertelstunden-Zeitindex eines Jahres
+- Monat / Wochentag / Tag / Tag-des-Jahres / Viertelstunden-Slot als Arrays
+- Feiertage (bundeseinheitlich, via 'holidays') und Freizeit-Maske
+- BDEW-Tagestyp (0=WT Werktag, 1=SA Samstag, 2=FT Feiertag/Sonntag)
+
+Ein Kalender wird pro Jahr einmal berechnet und prozessweit gecacht. Alle Arrays
+sind schreibgeschützt und werden von allen Stufen gemeinsam genutzt.
+
+Usage:
+    from data_processing.calendar_service import get_calendar
+
+    cal = get_calendar(2030)
+    cal.index            # DatetimeIndex, 15-Minuten-Raster
+    cal.day_type         # BDEW-Tagestyp je Zeitschritt
+    cal.leisure_mask(timestamps)  # Freizeit-Maske für beliebige Zeitstempel
+"""
+
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from data_processing.cache_utils import LRUCache, readonly_array
+
+
+# BDEW-Tagestypen (Index = Wert in SimulationCalendar.day_type)
+DAY_TYPE_WT = 0
+DAY_TYPE_SA = 1
+DAY_TYPE_FT = 2
+
+_CALENDAR_CACHE = LRUCache(maxsize=32, name="Kalender")
+
+
+@dataclass(frozen=True)
+class SimulationCalendar:
+    """Schreibgeschützte Kalenderdaten eines Simulationsjahres (15-Minuten-Raster)."""
+    year: int
+    index: pd.DatetimeIndex
+    month: np.ndarray
+    weekday: np.ndarray
+    day: np.ndarray
+    day_of_year: np.ndarray
+    slot: np.ndarray
+    holiday_dates: np.ndarray
+    is_holiday: np.ndarray
+    is_weekend: np.ndarray
+    is_heiligabend_silvester: np.ndarray
+    is_leisure_day: np.ndarray
+    day_type: np.ndarray
+
+    @property
+    def n_steps(self) -> int:
+        """Anzahl Viertelstunden im Jahr (35040 bzw. 35136 im Schaltjahr)."""
+        return len(self.index)
+
+    def matches(self, timestamps: Union[pd.Series, pd.DatetimeIndex, np.ndarray]) -> bool:
+        """Prüft, ob timestamps exakt dem Viertelstunden-Raster dieses Jahres entsprechen."""
+        values = _as_datetime64(timestamps)
+        return len(values) == self.n_steps and np.array_equal(values, self.index.values)
+
+    def holiday_mask(self, timestamps: Union[pd.Series, pd.DatetimeIndex, np.ndarray]) -> np.ndarray:
+        """
+        Feiertags-Maske für beliebige Zeitstempel (Feiertage dieses Jahres).
+
+        Args:
+            timestamps: Zeitstempel (Series, DatetimeIndex oder datetime64-Array)
+
+        Returns:
+            Bool-Array gleicher Länge
+        """
+        values = _as_datetime64(timestamps)
+        if self.matches(values):
+            return self.is_holiday
+        return np.isin(values.astype('datetime64[D]'), self.holiday_dates)
+
+    def leisure_mask(self, timestamps: Union[pd.Series, pd.DatetimeIndex, np.ndarray]) -> np.ndarray:
+        """
+        Freizeit-Maske (Wochenende, Feiertag, 24.12./31.12.) für beliebige Zeitstempel.
+
+        Entspricht auf dem Jahresraster direkt is_leisure_day (ohne Neuberechnung).
+
+        Args:
+            timestamps: Zeitstempel (Series, DatetimeIndex oder datetime64-Array)
+
+        Returns:
+            Bool-Array gleicher Länge
+        """
+        values = _as_datetime64(timestamps)
+        if self.matches(values):
+            return self.is_leisure_day
+
+        idx = pd.DatetimeIndex(values)
+        month = idx.month.to_numpy()
+        day = idx.day.to_numpy()
+        is_weekend = idx.dayofweek.to_numpy() >= 5
+        is_special = (month == 12) & ((day == 24) | (day == 31))
+        return is_weekend | self.holiday_mask(values) | is_special
+
+
+def get_calendar(year: int) -> SimulationCalendar:
+    """
+    Liefert den (gecachten) Kalender eines Simulationsjahres.
+
+    Args:
+        year: Simulationsjahr (z.B. 2030)
+
+    Returns:
+        SimulationCalendar mit schreibgeschützten Arrays
+    """
+    year = int(year)
+    return _CALENDAR_CACHE.get_or_compute(year, lambda: _build_calendar(year))
+
+
+def quarter_hour_index(year: int) -> pd.DatetimeIndex:
+    """Viertelstunden-Zeitindex des Jahres (gecacht über get_calendar)."""
+    return get_calendar(year).index
+
+
+def is_leap_year(year: Union[int, np.ndarray]) -> Union[bool, np.ndarray]:
+    """Schaltjahr-Prüfung (gregorianisch), auch elementweise für Arrays."""
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+
+def rebase_to_year(timestamps: Union[pd.Series, pd.DatetimeIndex, np.ndarray], target_year: int) -> np.ndarray:
+    """
+    Verschiebt Zeitstempel vektorisiert in ein anderes Jahr (wie Timestamp.replace(year=...)).
+    
+    Monat, Tag und Uhrzeit bleiben erhalten. Der Versatz wird als Offset-Arithmetik
+    auf datetime64 berechnet; beim Wechsel zwischen Schalt- und Normaljahr werden
+    Zeitpunkte ab dem 1. März um einen Tag korrigiert.
+    
+    Args:
+        timestamps: Zeitstempel (Series, DatetimeIndex oder datetime64-Array)
+        target_year: Zieljahr
+    
+    Returns:
+        datetime64[ns]-Array gleicher Länge
+    
+    Raises:
+        ValueError: Wenn ein 29. Februar in ein Nicht-Schaltjahr verschoben werden soll
+    """
+    values = _as_datetime64(timestamps)
+    one_day = np.timedelta64(1, 'D')
+    
+    year_start = values.astype('datetime64[Y]').astype('datetime64[ns]')
+    source_year = values.astype('datetime64[Y]').astype(np.int64) + 1970
+    day_in_year = (values - year_start) // one_day
+    
+    source_leap = is_leap_year(source_year)
+    target_leap = bool(is_leap_year(int(target_year)))
+    
+    if not target_leap and np.any(source_leap & (day_in_year == 59)):
+        raise ValueError(f"29. Februar existiert nicht im Zieljahr {target_year} (day is out of range for month)")
+    
+    # Ab 1. März: Tagesversatz zwischen Schalt- und Normaljahr ausgleichen
+    after_feb = day_in_year >= 59 + source_leap.astype(np.int64)
+    shift_days = np.where(after_feb, int(target_leap) - source_leap.astype(np.int64), 0)
+    
+    target_start = np.datetime64(f'{int(target_year)}-01-01', 'ns')
+    return target_start + (values - year_start) + shift_days * one_day
+
+
+def german_holidays(year: int) -> np.ndarray:
+    """
+    Bundeseinheitliche Feiertage eines Jahres als datetime64[D]-Array (BDEW-Definition).
+
+    Ohne Package 'holidays' werden nur die festen Feiertage verwendet.
+    """
+    try:
+        import holidays
+        de_holidays = holidays.Germany(years=year, language='de')
+        dates = sorted(de_holidays.keys())
+    except ImportError:
+        print("Warnung: Package 'holidays' nicht verfügbar. Bewegliche Feiertage fehlen!")
+        dates = [
+            f'{year}-01-01',  # Neujahr
+            f'{year}-05-01',  # Tag der Arbeit
+            f'{year}-10-03',  # Tag der Deutschen Einheit
+            f'{year}-12-25',  # 1. Weihnachtstag
+            f'{year}-12-26',  # 2. Weihnachtstag
+        ]
+    return np.array(dates, dtype='datetime64[D]')
+
+
+def _build_calendar(year: int) -> SimulationCalendar:
+    """Berechnet alle Kalender-Arrays eines Jahres."""
+    index = pd.date_range(
+        start=pd.Timestamp(f'{year}-01-01 00:00:00'),
+        end=pd.Timestamp(f'{year}-12-31 23:45:00'),
+        freq='15min'
+    )
+
+    month = index.month.to_numpy()
+    weekday = index.weekday.to_numpy()  # 0=Montag, 6=Sonntag
+    day = index.day.to_numpy()
+    day_of_year = index.dayofyear.to_numpy()
+    slot = index.hour.to_numpy() * 4 + index.minute.to_numpy() // 15
+
+    holiday_dates = german_holidays(year)
+    is_holiday = np.isin(index.values.astype('datetime64[D]'), holiday_dates)
+    is_weekend = weekday >= 5
+    is_heiligabend_silvester = (month == 12) & ((day == 24) | (day == 31))
+    is_leisure_day = is_weekend | is_holiday | is_heiligabend_silvester
+
+    # BDEW: Feiertag/Sonntag -> FT, Samstag/24.12./31.12. -> SA, sonst WT
+    day_type = np.where(
+        is_holiday | (weekday == 6), DAY_TYPE_FT,
+        np.where((weekday == 5) | is_heiligabend_silvester, DAY_TYPE_SA, DAY_TYPE_WT)
+    ).astype(np.int8)
+
+    return SimulationCalendar(
+        year=year,
+        index=index,
+        month=readonly_array(month),
+        weekday=readonly_array(weekday),
+        day=readonly_array(day),
+        day_of_year=readonly_array(day_of_year),
+        slot=readonly_array(slot),
+        holiday_dates=readonly_array(holiday_dates),
+        is_holiday=readonly_array(is_holiday),
+        is_weekend=readonly_array(is_weekend),
+        is_heiligabend_silvester=readonly_array(is_heiligabend_silvester),
+        is_leisure_day=readonly_array(is_leisure_day),
+        day_type=readonly_array(day_type),
+    )
+
+
+def _as_datetime64(timestamps: Union[pd.Series, pd.DatetimeIndex, np.ndarray]) -> np.ndarray:
+    """Wandelt Zeitstempel in ein datetime64[ns]-Array um."""
+    if isinstance(timestamps, (pd.Series, pd.Index)):
+        return pd.to_datetime(timestamps).to_numpy(dtype='datetime64[ns]')
+    return np.asarray(timestamps, dtype='datetime64[ns]')
@@ -2,9 +2,57 @@
 Verbrauchssimulation für Energiesystem-Szenarien.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Any, Dict, Optional
+from data_processing.cache_utils import LRUCache, readonly_array, stable_hash
 from data_processing.calculation_engine import CalculationEngine
+from data_processing.calendar_service import get_calendar
+
+
+# BDEW-Tagestypen in der Reihenfolge der Profil-Arrays (Index = calendar_service.DAY_TYPE_*)
+BDEW_DAY_TYPES = ('WT', 'SA', 'FT')
+
+# Viertelstunden pro Tag (Slot-Index = Stunde * 4 + Minute // 15)
+SLOTS_PER_DAY = 96
+
+# Sektoren der BDEW-Verbrauchssimulation (Spaltenpräfix im Ergebnis)
+BDEW_SECTORS = ('Haushalte', 'Gewerbe', 'Landwirtschaft')
+
+# Unskalierte Jahresprofile je (Lastprofile, Jahr) - Skalierung erfolgt pro Szenario
+CONSUMPTION_SHAPE_CACHE = LRUCache(maxsize=16, name="Verbrauchsprofile")
+
+
+def bdew_profile_to_array(df_profile: pd.DataFrame) -> np.ndarray:
+    """
+    Überführt ein vorbereitetes BDEW-Lastprofil in ein dichtes Lookup-Array.
+    
+    Args:
+        df_profile: Lastprofil mit Spalten 'month', 'day_type', 'timestamp', 'value_kWh'
+        
+    Returns:
+        Array der Form (12, 3, 96) - Monat × Tagestyp (WT/SA/FT) × Viertelstunde.
+        Nicht belegte Kombinationen und fehlende Werte sind 0.0.
+    """
+    profile = np.zeros((12, len(BDEW_DAY_TYPES), SLOTS_PER_DAY), dtype=np.float64)
+    
+    month = pd.to_numeric(df_profile['month'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    day_type = pd.Categorical(df_profile['day_type'], categories=BDEW_DAY_TYPES).codes
+    ts = pd.to_datetime(df_profile['timestamp'], errors='coerce')
+    hour = ts.dt.hour.to_numpy(dtype=np.float64, na_value=np.nan)
+    minute = ts.dt.minute.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = df_profile['value_kWh'].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    # Nur Zeilen mit gültigem Schlüssel auf dem Viertelstundenraster übernehmen
+    valid = (
+        (month >= 1) & (month <= 12) &
+        (day_type >= 0) &
+        ~np.isnan(hour) & (minute % 15 == 0)
+    )
+    slot = (hour[valid] * 4 + minute[valid] // 15).astype(np.int64)
+    profile[month[valid].astype(np.int64) - 1, day_type[valid], slot] = np.nan_to_num(values[valid], nan=0.0)
+    
+    return profile
 
 
 def simulate_consumption_BDEW(
@@ -19,6 +67,10 @@ def simulate_consumption_BDEW(
     """
     Simuliert den Energieverbrauch basierend auf BDEW-Standardlastprofilen
     
+    Die unskalierten Jahresprofile hängen nur von Lastprofilen und Jahr ab und
+    werden gecacht (get_consumption_shapes); pro Aufruf erfolgt nur noch die
+    Skalierung auf die Zielwerte (scale_consumption_shapes).
+    
     Args:
         lastH: BDEW H25-Lastprofil (Haushalte)
         lastG: BDEW G25-Lastprofil (Gewerbe)
@@ -34,98 +86,125 @@ def simulate_consumption_BDEW(
         - Haushalte [MWh], Gewerbe [MWh], Landwirtschaft [MWh]
         - Gesamt [MWh]: Summe aller Sektoren
     """
+    shapes = get_consumption_shapes(lastH, lastG, lastL, simu_jahr)
+    return scale_consumption_shapes(shapes, lastZielH, lastZielG, lastZielL)
+
+
+def get_consumption_shapes(
+    lastH: pd.DataFrame,
+    lastG: pd.DataFrame,
+    lastL: pd.DataFrame,
+    simu_jahr: int,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Liefert die unskalierten BDEW-Verbrauchsprofile eines Jahres (gecacht).
     
-    def _prepare_load_profile(df: pd.DataFrame) -> pd.DataFrame:
-        """Bereitet BDEW-Lastprofil vor: Komma -> Punkt, numerische Konvertierung."""
-        df = df.copy()
-        
-        if 'value_kWh' in df.columns:
-            if df['value_kWh'].dtype == 'object':
-                df['value_kWh'] = df['value_kWh'].astype(str).str.replace(',', '.')
-            df['value_kWh'] = pd.to_numeric(df['value_kWh'], errors='coerce')
-        
-        if 'timestamp' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+    Die Profile enthalten Lookup, Haushalts-Dynamisierung und Rundung, aber noch
+    keine Skalierung auf Zielwerte. Szenarien mit gleichem Jahr und gleichen
+    Lastprofilen teilen sich denselben Cache-Eintrag.
+    
+    Args:
+        lastH: BDEW H25-Lastprofil (Haushalte)
+        lastG: BDEW G25-Lastprofil (Gewerbe)
+        lastL: BDEW L25-Lastprofil (Landwirtschaft)
+        simu_jahr: Simulationsjahr (z.B. 2030 oder 2045)
+        use_cache: Ergebnis aus dem Cache lesen bzw. dort ablegen
         
-        if 'month' in df.columns:
-            df['month'] = pd.to_numeric(df['month'], errors='coerce').astype('Int64')
+    Returns:
+        Dictionary mit:
+        - 'Zeitpunkt': DatetimeIndex des Jahres
+        - 'kWh': {Sektor: schreibgeschütztes Array [kWh] je Viertelstunde}
+        - 'sum_kWh': {Sektor: Jahressumme [kWh]}
+    """
+    if not use_cache:
+        return _compute_consumption_shapes(lastH, lastG, lastL, simu_jahr)
+    
+    key = stable_hash("bdew-shapes", lastH, lastG, lastL, int(simu_jahr))
+    return CONSUMPTION_SHAPE_CACHE.get_or_compute(
+        key, lambda: _compute_consumption_shapes(lastH, lastG, lastL, simu_jahr)
+    )
+
+
+def scale_consumption_shapes(
+    shapes: Dict[str, Any],
+    lastZielH: float,
+    lastZielG: float,
+    lastZielL: float
+) -> pd.DataFrame:
+    """
+    Skaliert unskalierte Verbrauchsprofile auf die Ziel-Jahresverbräuche.
+    
+    Args:
+        shapes: Ergebnis von get_consumption_shapes
+        lastZielH: Ziel-Jahresverbrauch Haushalte [TWh]
+        lastZielG: Ziel-Jahresverbrauch Gewerbe [TWh]
+        lastZielL: Ziel-Jahresverbrauch Landwirtschaft [TWh]
         
-        return df
+    Returns:
+        DataFrame mit Spalten Zeitpunkt, Haushalte [MWh], Gewerbe [MWh],
+        Landwirtschaft [MWh], Gesamt [MWh]
+    """
+    # Konvertiere Zielwerte TWh -> kWh
+    ziele_kWh = {
+        'Haushalte': lastZielH * 1e9,
+        'Gewerbe': lastZielG * 1e9,
+        'Landwirtschaft': lastZielL * 1e9,
+    }
     
-    lastH = _prepare_load_profile(lastH)
-    lastG = _prepare_load_profile(lastG)
-    lastL = _prepare_load_profile(lastL)
+    df_result = pd.DataFrame({'Zeitpunkt': shapes['Zeitpunkt']})
+    for sector in BDEW_SECTORS:
+        # Skalierungsfaktor und Umrechnung kWh -> MWh
+        sum_kWh = shapes['sum_kWh'][sector]
+        faktor = ziele_kWh[sector] / sum_kWh if sum_kWh > 0 else 0
+        df_result[f'{sector} [MWh]'] = shapes['kWh'][sector] * faktor / 1000.0
     
-    start_date = pd.Timestamp(f'{simu_jahr}-01-01 00:00:00')
-    end_date = pd.Timestamp(f'{simu_jahr}-12-31 23:45:00')
-    zeitpunkte = pd.date_range(start=start_date, end=end_date, freq='15min')
+    # Gesamtverbrauch
+    df_result['Gesamt [MWh]'] = (
+        df_result['Haushalte [MWh]'] + 
+        df_result['Gewerbe [MWh]'] + 
+        df_result['Landwirtschaft [MWh]']
+    )
     
-    df_result = pd.DataFrame({'Zeitpunkt': zeitpunkte})
-    df_result['month'] = df_result['Zeitpunkt'].dt.month
-    df_result['weekday'] = df_result['Zeitpunkt'].dt.weekday  # 0=Montag, 6=Sonntag
-    df_result['day'] = df_result['Zeitpunkt'].dt.day
+    return df_result
+
+
+def _prepare_load_profile(df: pd.DataFrame) -> pd.DataFrame:
+    """Bereitet BDEW-Lastprofil vor: Komma -> Punkt, numerische Konvertierung."""
+    df = df.copy()
     
-    # Deutsche Feiertage für das Simulationsjahr (BDEW-Definition)
-    try:
-        import holidays
-        # Bundeseinheitliche Feiertage (9 Tage)
-        de_holidays = holidays.Germany(years=simu_jahr, language='de')
-        feiertage = [pd.Timestamp(date) for date in de_holidays.keys()]
-    except ImportError:
-        print("Warnung: Package 'holidays' nicht verfügbar. Bewegliche Feiertage fehlen!")
-        feiertage = [
-            pd.Timestamp(f'{simu_jahr}-01-01'),  # Neujahr
-            pd.Timestamp(f'{simu_jahr}-05-01'),  # Tag der Arbeit
-            pd.Timestamp(f'{simu_jahr}-10-03'),  # Tag der Deutschen Einheit
-            pd.Timestamp(f'{simu_jahr}-12-25'),  # 1. Weihnachtstag
-            pd.Timestamp(f'{simu_jahr}-12-26'),  # 2. Weihnachtstag
-        ]
+    if 'value_kWh' in df.columns:
+        if df['value_kWh'].dtype == 'object':
+            df['value_kWh'] = df['value_kWh'].astype(str).str.replace(',', '.')
+        df['value_kWh'] = pd.to_numeric(df['value_kWh'], errors='coerce')
     
-    # Bestimme Tagestyp (WT=Werktag, SA=Samstag, FT=Feiertag/Sonntag)
-    def _get_day_type(row):
-        date = row['Zeitpunkt'].date()
-        is_holiday = pd.Timestamp(date) in feiertage
-        is_sunday = row['weekday'] == 6
-        
-        is_heiligabend_silvester = (row['month'] == 12) and (row['day'] in [24, 31])
-        
-        if is_holiday or is_sunday:
-            return 'FT'
-        elif row['weekday'] == 5 or is_heiligabend_silvester:
-            return 'SA'
-        else:
-            return 'WT'
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
     
-    df_result['day_type'] = df_result.apply(_get_day_type, axis=1)
+    if 'month' in df.columns:
+        df['month'] = pd.to_numeric(df['month'], errors='coerce').astype('Int64')
     
-    # Funktion zum Mappen von Lastprofilwerten auf Zeitpunkte
-    def _map_load_profile(df_result: pd.DataFrame, df_profile: pd.DataFrame, sector_name: str) -> pd.Series:
-        """Ordnet jedem Zeitpunkt den passenden Lastprofilwert zu (via merge)."""
-        df_work = df_result.copy()
-        df_work['hour'] = df_work['Zeitpunkt'].dt.hour
-        df_work['minute'] = df_work['Zeitpunkt'].dt.minute
-        
-        df_prof = df_profile.copy()
-        df_prof['hour'] = df_prof['timestamp'].dt.hour
-        df_prof['minute'] = df_prof['timestamp'].dt.minute
-        
-        # Merge basierend auf Monat, Tagestyp, Stunde, Minute
-        df_merged = df_work.merge(
-            df_prof[['month', 'day_type', 'hour', 'minute', 'value_kWh']],
-            on=['month', 'day_type', 'hour', 'minute'],
-            how='left'
-        )
-        
-        # Fehlende Werte mit 0 füllen
-        if df_merged['value_kWh'].isna().sum() > 0:
-            df_merged['value_kWh'].fillna(0.0, inplace=True)
-        
-        return df_merged['value_kWh']
+    return df
+
+
+def _compute_consumption_shapes(
+    lastH: pd.DataFrame,
+    lastG: pd.DataFrame,
+    lastL: pd.DataFrame,
+    simu_jahr: int
+) -> Dict[str, Any]:
+    """Berechnet die unskalierten BDEW-Profile (Lookup, Dynamisierung, Rundung)."""
+    # Kalender des Simulationsjahres (Zeitindex, Tagestypen, Feiertage - gecacht)
+    cal = get_calendar(simu_jahr)
     
-    df_result['Haushalte_kWh'] = _map_load_profile(df_result, lastH, 'Haushalte')
+    # Ein gemeinsamer Gather-Index für alle Sektoren (Monat × Tagestyp × Viertelstunde)
+    lookup = (cal.month - 1, cal.day_type, cal.slot)
+    profile_H = bdew_profile_to_array(_prepare_load_profile(lastH))
+    profile_G = bdew_profile_to_array(_prepare_load_profile(lastG))
+    profile_L = bdew_profile_to_array(_prepare_load_profile(lastL))
     
     # Dynamisierung für Haushalte
-    t = df_result['Zeitpunkt'].dt.dayofyear.astype(float)
+    t = pd.Series(cal.day_of_year, dtype=float)
     
     dyn_faktor = (
         -3.92e-10 * t**4 + 
@@ -136,48 +215,19 @@ def simulate_consumption_BDEW(
     )
     
     dyn_faktor = dyn_faktor.round(4)
-    df_result['Haushalte_kWh'] = (df_result['Haushalte_kWh'] * dyn_faktor).round(3)
-    
-    df_result['Gewerbe_kWh'] = _map_load_profile(df_result, lastG, 'Gewerbe')
-    df_result['Landwirtschaft_kWh'] = _map_load_profile(df_result, lastL, 'Landwirtschaft')
-    
-    # Berechne Skalierungsfaktoren
-    sum_H_kWh = df_result['Haushalte_kWh'].sum()
-    sum_G_kWh = df_result['Gewerbe_kWh'].sum()
-    sum_L_kWh = df_result['Landwirtschaft_kWh'].sum()
-    
-    # Konvertiere Zielwerte TWh -> kWh
-    ziel_H_kWh = lastZielH * 1e9
-    ziel_G_kWh = lastZielG * 1e9
-    ziel_L_kWh = lastZielL * 1e9
+    haushalte_kWh = (pd.Series(profile_H[lookup]) * dyn_faktor).round(3)
     
-    # Skalierungsfaktoren
-    faktor_H = ziel_H_kWh / sum_H_kWh if sum_H_kWh > 0 else 0
-    faktor_G = ziel_G_kWh / sum_G_kWh if sum_G_kWh > 0 else 0
-    faktor_L = ziel_L_kWh / sum_L_kWh if sum_L_kWh > 0 else 0
+    sectors_kWh = {
+        'Haushalte': haushalte_kWh.to_numpy(),
+        'Gewerbe': profile_G[lookup],
+        'Landwirtschaft': profile_L[lookup],
+    }
     
-    # Skaliere und konvertiere zu MWh
-    df_result['Haushalte [MWh]'] = df_result['Haushalte_kWh'] * faktor_H / 1000.0
-    df_result['Gewerbe [MWh]'] = df_result['Gewerbe_kWh'] * faktor_G / 1000.0
-    df_result['Landwirtschaft [MWh]'] = df_result['Landwirtschaft_kWh'] * faktor_L / 1000.0
-    
-    # Gesamtverbrauch
-    df_result['Gesamt [MWh]'] = (
-        df_result['Haushalte [MWh]'] + 
-        df_result['Gewerbe [MWh]'] + 
-        df_result['Landwirtschaft [MWh]']
-    )
-    
-    # Bereinige DataFrame - nur finale Spalten
-    df_result = df_result[[
-        'Zeitpunkt',
-        'Haushalte [MWh]',
-        'Gewerbe [MWh]',
-        'Landwirtschaft [MWh]',
-        'Gesamt [MWh]'
-    ]]
-    
-    return df_result
+    return {
+        'Zeitpunkt': cal.index,
+        'kWh': {sector: readonly_array(values) for sector, values in sectors_kWh.items()},
+        'sum_kWh': {sector: pd.Series(values).sum() for sector, values in sectors_kWh.items()},
+    }
 
 
 def simulate_consumption_all(
@@ -195,7 +245,9 @@ def simulate_consumption_all(
     dt: float,
     simu_jahr: int,
     debug: bool = False,
-    calculation_mode: str = "cpu_optimized"
+    calculation_mode: str = "cpu_optimized",
+    wetter_name: Optional[str] = None,
+    station_weights: Optional[Dict[str, float]] = None
 ) -> pd.DataFrame:
     """
     Simuliert den gesamten Energieverbrauch (BDEW + Wärmepumpen) für ein Jahr.
@@ -219,7 +271,10 @@ def simulate_consumption_all(
         dt: Zeitintervall [h] (z.B. 0.25 für Viertelstunden)
         simu_jahr: Simulationsjahr (z.B. 2030 oder 2045)
         debug: Debug-Informationen ausgeben
-        calculation_mode: Berechnungsmodus ("normal" oder "cpu_optimized")
+        calculation_mode: Berechnungsmodus ("normal", "cpu_optimized" oder "numpy")
+        wetter_name: Name des Wetterdatensatzes (Cache-Schlüssel der Wetteraufbereitung)
+        station_weights: Wenn gesetzt, Wärmepumpen je Wetterstation berechnen und mit diesen
+            Anteilen gewichten ({} = alle Stationen gleich); None = Spalte "AVERAGE"
         
     Returns:
         DataFrame mit Spalten:
@@ -240,16 +295,31 @@ def simulate_consumption_all(
     if wetter_df is not None and hp_profile_matrix is not None and anzahl_heatpumps > 0:
         try:
             engine = CalculationEngine(mode=calculation_mode)
-            df_heatpump = engine.calculate_heatpump_load(
-                weather_df=wetter_df,
-                hp_profile_matrix=hp_profile_matrix,
-                n_heatpumps=anzahl_heatpumps,
-                Q_th_a=Q_th_a,
-                COP_avg=COP_avg,
-                dt=dt,
-                simu_jahr=simu_jahr,
-                debug=debug
-            )
+            if station_weights is not None:
+                df_heatpump = engine.calculate_heatpump_load_by_station(
+                    weather_df=wetter_df,
+                    hp_profile_matrix=hp_profile_matrix,
+                    n_heatpumps=anzahl_heatpumps,
+                    Q_th_a=Q_th_a,
+                    COP_avg=COP_avg,
+                    dt=dt,
+                    simu_jahr=simu_jahr,
+                    station_weights=station_weights,
+                    debug=debug,
+                    weather_name=wetter_name
+                )
+            else:
+                df_heatpump = engine.calculate_heatpump_load(
+                    weather_df=wetter_df,
+                    hp_profile_matrix=hp_profile_matrix,
+                    n_heatpumps=anzahl_heatpumps,
+                    Q_th_a=Q_th_a,
+                    COP_avg=COP_avg,
+                    dt=dt,
+                    simu_jahr=simu_jahr,
+                    debug=debug,
+                    weather_name=wetter_name
+                )
             
             df_result = df_result.merge(df_heatpump, on='Zeitpunkt', how='outer')
             df_result['Wärmepumpen [MWh]'] = df_result['Wärmepumpen [MWh]'].fillna(0.0)
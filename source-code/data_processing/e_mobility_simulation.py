@@ -34,10 +34,16 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
+from data_processing.numba_compat import jit, prange, compile_for, register_warmup
+from data_processing.cache_utils import LRUCache, readonly_array, stable_hash
+from data_processing.calendar_service import get_calendar
 
 # GLOBALE KONSTANTEN
 WORKPLACE_V2G_FACTOR = 0.15 # V2G-Faktor am Arbeitsplatz (nur 15% der Autos können V2G)
 
+# Prozessweiter Cache für EV-Profile (Phase A), siehe get_ev_profile_arrays
+EV_PROFILE_CACHE = LRUCache(maxsize=16, name="EV-Profile")
+
 
 @dataclass
 class EVConfigParams:
@@ -128,13 +134,119 @@ def _is_between_times_over_midnight(time_of_day: float, t_start: float, t_end: f
         return time_of_day >= t_start or time_of_day < t_end
 
 
-def generate_ev_profile(
+def _work_time_mask(time_of_day: np.ndarray, t_start: float, t_end: float) -> np.ndarray:
+    """
+    Vektorisierte Variante von _is_between_times_over_midnight für ein ganzes Array.
+    
+    Args:
+        time_of_day: Tageszeiten als Dezimalzahlen (0.0 - <1.0)
+        t_start: Startzeit als Dezimalzahl
+        t_end: Endzeit als Dezimalzahl
+        
+    Returns:
+        Bool-Array, True wenn time_of_day im Intervall liegt
+    """
+    if t_start <= t_end:
+        return (t_start <= time_of_day) & (time_of_day < t_end)
+    else:
+        return (time_of_day >= t_start) | (time_of_day < t_end)
+
+
+def ev_profile_cache_key(
     timestamps: pd.Series,
     scenario_params: EVScenarioParams,
     config_params: EVConfigParams
+) -> str:
+    """
+    Cache-Schlüssel eines EV-Profils.
+    
+    Das Profil hängt nur von den Zeitstempeln (Kalenderjahr), den Abfahrts-/Ankunftszeiten,
+    Flottengröße, Fahrverbrauch, Anschlussquote, SOC-Parametern und dt_h ab - nicht von
+    V2G-Quote, Schwellwerten oder Batteriegröße.
+    """
+    ts = pd.DatetimeIndex(timestamps)
+    return stable_hash(
+        "ev_profile",
+        int(ts[0].year) if len(ts) > 0 else None,
+        ts.asi8,
+        str(scenario_params.t_depart),
+        str(scenario_params.t_arrive),
+        float(scenario_params.s_EV),
+        float(scenario_params.N_cars),
+        float(scenario_params.E_drive_car_year),
+        float(scenario_params.plug_share_max),
+        float(scenario_params.SOC_min_day),
+        float(scenario_params.SOC_min_night),
+        float(scenario_params.SOC_target_depart),
+        float(config_params.dt_h),
+    )
+
+
+def get_ev_profile_arrays(
+    timestamps: pd.Series,
+    scenario_params: EVScenarioParams,
+    config_params: EVConfigParams,
+    use_cache: bool = True
+) -> Dict[str, np.ndarray]:
+    """
+    PHASE A als Arrays: Liefert das EV-Profil aus dem Cache oder berechnet es.
+    
+    Die Einträge sind über EV_PROFILE_CACHE (LRU, begrenzt) prozessweit geteilt und
+    daher schreibgeschützt. Hit/Miss-Zähler: EV_PROFILE_CACHE.info()
+    
+    Args:
+        timestamps: Pandas Series mit datetime-Objekten
+        scenario_params: Szenario-Parameter
+        config_params: Config-Parameter
+        use_cache: False = immer neu berechnen (ohne Cache)
+        
+    Returns:
+        Dictionary Spaltenname -> schreibgeschütztes Array (Spalten wie generate_ev_profile
+        ohne 'Zeitpunkt')
+    """
+    def compute() -> Dict[str, np.ndarray]:
+        arrays = _compute_ev_profile_arrays(timestamps, scenario_params, config_params)
+        return {name: readonly_array(values) for name, values in arrays.items()}
+    
+    if not use_cache:
+        return compute()
+    
+    key = ev_profile_cache_key(timestamps, scenario_params, config_params)
+    return EV_PROFILE_CACHE.get_or_compute(key, compute)
+
+
+def generate_ev_profile(
+    timestamps: pd.Series,
+    scenario_params: EVScenarioParams,
+    config_params: EVConfigParams,
+    use_cache: bool = True
 ) -> pd.DataFrame:
     """
-    PHASE A: Generiert das EV-Profil für alle Zeitschritte.
+    PHASE A: Generiert das EV-Profil für alle Zeitschritte als DataFrame.
+    
+    Die Berechnung selbst liegt in _compute_ev_profile_arrays und wird über
+    get_ev_profile_arrays gecacht.
+    
+    Args:
+        timestamps: Pandas Series mit datetime-Objekten
+        scenario_params: Szenario-Parameter
+        config_params: Config-Parameter
+        use_cache: False = Profil ohne Cache neu berechnen
+        
+    Returns:
+        DataFrame mit allen EV-Profil-Spalten
+    """
+    arrays = get_ev_profile_arrays(timestamps, scenario_params, config_params, use_cache=use_cache)
+    return pd.DataFrame({'Zeitpunkt': timestamps.values, **arrays})
+
+
+def _compute_ev_profile_arrays(
+    timestamps: pd.Series,
+    scenario_params: EVScenarioParams,
+    config_params: EVConfigParams
+) -> Dict[str, np.ndarray]:
+    """
+    Berechnet das EV-Profil für alle Zeitschritte.
     
     Berechnet für jeden Zeitschritt:
     - plug_share: Angeschlossene Quote
@@ -150,7 +262,8 @@ def generate_ev_profile(
         config_params: Config-Parameter
         
     Returns:
-        DataFrame mit allen EV-Profil-Spalten
+        Dictionary Spaltenname -> Array (plug_share, drive_power_kw, soc_min_share,
+        preload_flag, soc_target_share, time_to_depart_h, is_leisure_day)
     """
     # Zeit-Dezimalwerte vorberechnen
     t_depart_dec = _time_str_to_decimal(scenario_params.t_depart)
@@ -177,35 +290,10 @@ def generate_ev_profile(
     ts_vals = ts_hour.values  # numpy array für Performance
     
     # === FEIERTAGS- & WOCHENEND-LOGIK ===
+    # "Freizeit"-Tage (Wochenende, Feiertag oder 24.12./31.12. nach BDEW-Regel)
+    # aus dem gemeinsamen Kalender des Simulationsjahres
     simu_jahr = timestamps.iloc[0].year
-    
-    # Feiertage ermitteln (BDEW-Definition via 'holidays')
-    try:
-        import holidays
-        de_holidays = holidays.Germany(years=simu_jahr, language='de')
-        feiertage_set = set(de_holidays.keys()) # für schnellen Lookup
-        
-        # Check ob Datum in Feiertagen (vektorisiert durch map)
-        # Dates extrahieren
-        dates = timestamps.dt.date
-        is_holiday = dates.isin(feiertage_set).values
-        
-    except ImportError:
-        # Fallback ohne Feiertage
-        print("Warnung: Package 'holidays' nicht installiert. Nutze vereinfachte Logik.")
-        is_holiday = np.zeros(len(timestamps), dtype=bool)
-
-    # Wochenende (Samstag=5, Sonntag=6)
-    is_weekend = (timestamps.dt.dayofweek >= 5).values
-
-    # BDEW-Regel für Lastprofile: 24.12. und 31.12. gelten wie Samstage (also Leisure)
-    # unabhängig vom Wochentag
-    da = timestamps.dt.day.values
-    mo = timestamps.dt.month.values
-    is_heiligabend_silvester = (mo == 12) & ((da == 24) | (da == 31))
-    
-    # "Freizeit"-Tage (Wochenende oder Feiertag oder Heiligabend/Silvester)
-    is_leisure_day = is_weekend | is_holiday | is_heiligabend_silvester
+    is_leisure_day = get_calendar(simu_jahr).leisure_mask(timestamps)
     
     # === 1. Aktivitäts-Profil generieren ===
     
@@ -331,26 +419,23 @@ def generate_ev_profile(
     # ENDE NEUER ANSATZ
     # -------------------------------------------------------------------------
 
-    # DataFrame erstellen
-    df_profile = pd.DataFrame({
-        'Zeitpunkt': timestamps.values,
-        'plug_share': plug_share,
-        'drive_power_kw': drive_power,
+    return {
+        'plug_share': np.asarray(plug_share, dtype=np.float64),
+        'drive_power_kw': np.asarray(drive_power, dtype=np.float64),
         'soc_min_share': soc_min,
         'preload_flag': preload_flag,
         'soc_target_share': soc_target,
-        'time_to_depart_h': time_to_depart,  # NEU
-        'is_leisure_day': is_leisure_day  # WICHTIG für V2G-Logik
-    })
-    
-    return df_profile
+        'time_to_depart_h': np.asarray(time_to_depart, dtype=np.float64),  # NEU
+        'is_leisure_day': np.asarray(is_leisure_day, dtype=bool)  # WICHTIG für V2G-Logik
+    }
 
 
 def simulate_emobility_fleet(
     df_balance: pd.DataFrame,
     scenario_params: EVScenarioParams = None,
     config_params: EVConfigParams = None,
-    df_ev_profile: pd.DataFrame = None
+    df_ev_profile: pd.DataFrame = None,
+    use_numba: bool = True
 ) -> pd.DataFrame:
     """
     PHASE B: Hauptsimulation der E-Auto-Flotte mit V2G-Funktionalität.
@@ -378,6 +463,8 @@ def simulate_emobility_fleet(
         config_params: Config-Parameter (EVConfigParams)
         df_ev_profile: Optional - Vorberechnetes EV-Profil aus Phase A
                       Wenn None, wird es automatisch generiert
+        use_numba: True = kompilierter Kernel (_fleet_kernel),
+                   False = Python-Referenzimplementierung (_simulate_fleet_reference)
     
     Returns:
         DataFrame mit Original-Daten + EV-Simulation-Ergebnissen
@@ -414,20 +501,23 @@ def simulate_emobility_fleet(
     n = len(df_balance)
     
     # EV-Profil generieren falls nicht übergeben
+    # (gecachte, schreibgeschützte Arrays - kein DataFrame nötig)
     if df_ev_profile is None:
-        df_ev_profile = generate_ev_profile(timestamps, scenario_params, config_params)
+        ev_profile = get_ev_profile_arrays(timestamps, scenario_params, config_params)
+    else:
+        ev_profile = df_ev_profile
     
     # Profil-Daten extrahieren
-    plug_share = df_ev_profile['plug_share'].values
-    drive_power_kw = df_ev_profile['drive_power_kw'].values
-    soc_min_share = df_ev_profile['soc_min_share'].values
-    preload_flag = df_ev_profile['preload_flag'].values
-    soc_target_share = df_ev_profile['soc_target_share'].values
-    time_to_depart_h = df_ev_profile['time_to_depart_h'].values
+    plug_share = np.asarray(ev_profile['plug_share'])
+    drive_power_kw = np.asarray(ev_profile['drive_power_kw'])
+    soc_min_share = np.asarray(ev_profile['soc_min_share'])
+    preload_flag = np.asarray(ev_profile['preload_flag'])
+    soc_target_share = np.asarray(ev_profile['soc_target_share'])
+    time_to_depart_h = np.asarray(ev_profile['time_to_depart_h'])
     
     # NEU: Freizeit-Flag extrahieren für V2G-Logik
-    if 'is_leisure_day' in df_ev_profile.columns:
-        is_leisure_day = df_ev_profile['is_leisure_day'].values
+    if 'is_leisure_day' in ev_profile:
+        is_leisure_day = np.asarray(ev_profile['is_leisure_day'])
     else:
         # Fallback falls externes Profil ohne diese Spalte kommt (Default: Alles ist Arbeitstag)
         is_leisure_day = np.zeros(n, dtype=bool)
@@ -470,17 +560,6 @@ def simulate_emobility_fleet(
     thr_surplus = scenario_params.thr_surplus  # kW
     thr_deficit = scenario_params.thr_deficit  # kW
     
-    # Initialer Energieinhalt
-    energy = SOC0 * capacity_kwh  # [kWh]
-    
-    # Ergebnis-Arrays
-    res_energy = np.zeros(n)       # Energie [kWh]
-    res_soc = np.zeros(n)          # SOC [0-1]
-    res_actual_power = np.zeros(n) # Leistung [kW] (neg=Laden, pos=Entladen)
-    res_charge = np.zeros(n)       # Geladene Energie [kWh]
-    res_discharge = np.zeros(n)    # Entladene Energie [kWh]
-    res_drive = np.zeros(n)        # Fahrverbrauch [kWh]
-    
     # =====================================================================
     # HAUPTSIMULATION - Zeitschrittweise Iteration
     # =====================================================================
@@ -499,26 +578,123 @@ def simulate_emobility_fleet(
     time_dec_array = (time_hours + time_minutes / 60.0) / 24.0
     
     # BDEW-Regel auch hier sicherstellen (falls nicht über is_leisure_day übergeben)
-    if 'is_leisure_day' not in df_ev_profile.columns:
-        # Fallback calc
+    if 'is_leisure_day' not in ev_profile:
+        # Fallback über den gemeinsamen Kalender (Wochenende, Feiertag, 24.12./31.12.)
         sim_year = timestamps.iloc[0].year
-        try:
-            import holidays
-            de_holidays = holidays.Germany(years=sim_year, language='de')
-            feiertage_set = set(de_holidays.keys())
-            idx_holiday = np.isin(timestamps.dt.date, list(feiertage_set))
-        except ImportError:
-            idx_holiday = np.zeros(n, dtype=bool)
-            
-        idx_weekend = (timestamps.dt.dayofweek >= 5).values
-        
-        # BDEW 24.12 / 31.12
-        mo = timestamps.dt.month.values
-        da = timestamps.dt.day.values
-        idx_special = (mo == 12) & ((da == 24) | (da == 31))
-        
-        is_leisure_day = idx_weekend | idx_holiday | idx_special
+        is_leisure_day = get_calendar(sim_year).leisure_mask(timestamps)
+
+    if use_numba:
+        # Arbeitszeit-Maske vektorisiert (statt _is_between_times_over_midnight je Zeitschritt)
+        is_work_time = _work_time_mask(time_dec_array, t_depart_dec, t_arrive_dec)
 
+        # Zeitschleife im kompilierten Kernel (Numba) bzw. Python/NumPy-Fallback
+        res_energy, res_actual_power, res_charge, res_discharge, res_drive = _fleet_kernel(
+            np.ascontiguousarray(residual_load_kw, dtype=np.float64),
+            np.ascontiguousarray(plug_share, dtype=np.float64),
+            np.ascontiguousarray(drive_power_kw, dtype=np.float64),
+            np.ascontiguousarray(soc_min_share, dtype=np.float64),
+            np.ascontiguousarray(preload_flag, dtype=np.int64),
+            np.ascontiguousarray(soc_target_share, dtype=np.float64),
+            np.ascontiguousarray(time_to_depart_h, dtype=np.float64),
+            is_work_time,
+            np.ascontiguousarray(is_leisure_day, dtype=np.bool_),
+            float(n_ev), float(capacity_kwh), float(SOC0),
+            float(v2g_share), float(thr_surplus), float(thr_deficit),
+            float(eta_ch), float(eta_dis), float(P_ch_car_max), float(P_dis_car_max), float(dt_h)
+        )
+    else:
+        # Python-Referenzimplementierung (Zeitschritt für Zeitschritt)
+        res_energy, res_actual_power, res_charge, res_discharge, res_drive = _simulate_fleet_reference(
+            residual_load_kw, plug_share, drive_power_kw, soc_min_share, preload_flag,
+            soc_target_share, time_to_depart_h, time_dec_array, is_leisure_day,
+            t_depart_dec, t_arrive_dec, n_ev, capacity_kwh, SOC0,
+            v2g_share, thr_surplus, thr_deficit, eta_ch, eta_dis, P_ch_car_max, P_dis_car_max, dt_h
+        )
+    
+    # =====================================================================
+    # ERGEBNIS-DATAFRAME ERSTELLEN
+    # =====================================================================
+    df_res = df_balance.copy()
+    
+    # Neue Spalten hinzufügen (in MWh für Konsistenz)
+    df_res['EMobility SOC [MWh]'] = res_energy / 1000.0
+    df_res['EMobility Charge [MWh]'] = res_charge / 1000.0
+    df_res['EMobility Discharge [MWh]'] = res_discharge / 1000.0
+    df_res['EMobility Drive [MWh]'] = res_drive / 1000.0
+    df_res['EMobility Power [MW]'] = res_actual_power / 1000.0
+    
+    # Aktualisierte Residuallast berechnen
+    # Neue Residuallast = Alte Residuallast - actual_power
+    # (bei Laden sinkt Residuallast, bei Entladen steigt sie)
+    residual_load_new_kw = residual_load_kw - res_actual_power
+    
+    # Zurück in MWh konvertieren
+    residual_load_new_mwh = residual_load_new_kw * config_params.dt_h / 1000.0
+    
+    # KRITISCH: Zurück zur Bilanz-Konvention!
+    # Am Anfang wurde: residual_load = -bilanz
+    # Daher muss am Ende: bilanz = -residual_load
+    # 
+    # Bilanz-Konvention (für nachgelagerte Speichermodule):
+    #   Bilanz > 0 = Überschuss (Laden möglich)
+    #   Bilanz < 0 = Defizit (Entladen möglich)
+    rest_bilanz_mwh = -residual_load_new_mwh
+    
+    # Rest Bilanz aktualisieren oder erstellen
+    if 'Rest Bilanz [MWh]' not in df_res.columns:
+        df_res['Rest Bilanz [MWh]'] = df_res['Bilanz [MWh]']
+    
+    df_res['Rest Bilanz [MWh]'] = rest_bilanz_mwh
+    
+    return df_res
+
+
+def _simulate_fleet_reference(
+    residual_load_kw: np.ndarray,
+    plug_share: np.ndarray,
+    drive_power_kw: np.ndarray,
+    soc_min_share: np.ndarray,
+    preload_flag: np.ndarray,
+    soc_target_share: np.ndarray,
+    time_to_depart_h: np.ndarray,
+    time_dec_array: np.ndarray,
+    is_leisure_day: np.ndarray,
+    t_depart_dec: float,
+    t_arrive_dec: float,
+    n_ev: float,
+    capacity_kwh: float,
+    SOC0: float,
+    v2g_share: float,
+    thr_surplus: float,
+    thr_deficit: float,
+    eta_ch: float,
+    eta_dis: float,
+    P_ch_car_max: float,
+    P_dis_car_max: float,
+    dt_h: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Python-Referenzimplementierung der Flotten-Zeitschleife (PHASE B).
+
+    Dient als Referenz für den kompilierten _fleet_kernel (siehe
+    tests/test_emobility_kernel.py). Alle Leistungen in kW, Energien in kWh.
+
+    Returns:
+        (res_energy, res_actual_power, res_charge, res_discharge, res_drive) je Zeitschritt
+    """
+    n = len(residual_load_kw)
+
+    # Initialer Energieinhalt
+    energy = SOC0 * capacity_kwh  # [kWh]
+    
+    # Ergebnis-Arrays
+    res_energy = np.zeros(n)       # Energie [kWh]
+    res_soc = np.zeros(n)          # SOC [0-1]
+    res_actual_power = np.zeros(n) # Leistung [kW] (neg=Laden, pos=Entladen)
+    res_charge = np.zeros(n)       # Geladene Energie [kWh]
+    res_discharge = np.zeros(n)    # Entladene Energie [kWh]
+    res_drive = np.zeros(n)        # Fahrverbrauch [kWh]
+    
     for i in range(n):
         # --- Initialisierung aus vorherigem Zeitschritt ---
         if i > 0:
@@ -713,43 +889,283 @@ def simulate_emobility_fleet(
         res_charge[i] = energy_charged
         res_discharge[i] = energy_discharged
         res_drive[i] = drive_consumption
+
+    return res_energy, res_actual_power, res_charge, res_discharge, res_drive
+
+def simulate_emobility_cohorts(
+    df_balance: pd.DataFrame,
+    cohorts: Dict[str, EVScenarioParams],
+    config_params: EVConfigParams = None
+) -> pd.DataFrame:
+    """
+    Simuliert mehrere Fahrzeug-Kohorten (z.B. Pendler, Schichtarbeiter, Flotten,
+    Fahrzeuge ohne V2G) gemeinsam in einer kompilierten Zeitschleife.
+    
+    Jede Kohorte hat eigene Szenario-Parameter (Abfahrt/Ankunft, Batteriegröße,
+    V2G-Quote, ...) und wird als eigene aggregierte Batterie modelliert. Alle
+    Kohorten werden als (Kohorten x Zeitschritte)-Arrays gemeinsam berechnet.
+    Innerhalb eines Zeitschritts werden die Kohorten in der Reihenfolge von
+    `cohorts` disponiert: Kohorte k sieht die Residuallast nach den Kohorten 0..k-1.
+    Mit genau einer Kohorte ist das Ergebnis identisch zu simulate_emobility_fleet.
+    
+    Args:
+        df_balance: DataFrame mit 'Rest Bilanz [MWh]' oder 'Bilanz [MWh]'
+                   und 'Zeitpunkt' Spalte
+        cohorts: Kohortenname -> EVScenarioParams (Reihenfolge = Priorität)
+        config_params: Config-Parameter (EVConfigParams, für alle Kohorten gleich)
+    
+    Returns:
+        DataFrame mit Original-Daten + EV-Simulation-Ergebnissen
+        Neue Spalten je Kohorte:
+        - 'EMobility {Kohorte} SOC [MWh]', 'EMobility {Kohorte} Charge [MWh]',
+          'EMobility {Kohorte} Discharge [MWh]', 'EMobility {Kohorte} Drive [MWh]',
+          'EMobility {Kohorte} Power [MW]'
+        Aggregiert über alle Kohorten:
+        - 'EMobility SOC [MWh]', 'EMobility Charge [MWh]', 'EMobility Discharge [MWh]',
+          'EMobility Drive [MWh]', 'EMobility Power [MW]'
+        - 'Rest Bilanz [MWh]': Aktualisierte Residuallast nach allen Kohorten
+    """
+    if config_params is None:
+        config_params = EVConfigParams()
+    
+    if 'Zeitpunkt' in df_balance.columns:
+        timestamps = df_balance['Zeitpunkt']
+    else:
+        raise ValueError("DataFrame muss 'Zeitpunkt' Spalte enthalten")
+    
+    if 'Rest Bilanz [MWh]' in df_balance.columns:
+        bilanz_mwh = df_balance['Rest Bilanz [MWh]'].values.copy()
+    elif 'Bilanz [MWh]' in df_balance.columns:
+        bilanz_mwh = df_balance['Bilanz [MWh]'].values.copy()
+    else:
+        raise ValueError("DataFrame muss 'Rest Bilanz [MWh]' oder 'Bilanz [MWh]' enthalten")
+    
+    n = len(df_balance)
+    dt_h = config_params.dt_h
+    
+    # Residuallast = -Bilanz, in kW
+    residual_load_kw = -bilanz_mwh * 1000.0 / dt_h
+    
+    # Kohorten ohne Fahrzeuge/Kapazität tragen nichts bei
+    names = list(cohorts.keys())
+    active = [name for name in names
+              if cohorts[name].s_EV * cohorts[name].N_cars * cohorts[name].E_batt_car > 0]
+    k = len(active)
+    
+    time_dec_array = (timestamps.dt.hour.values + timestamps.dt.minute.values / 60.0) / 24.0
+    
+    # Profil-Arrays (Kohorten x Zeitschritte)
+    plug_share = np.zeros((k, n))
+    drive_power_kw = np.zeros((k, n))
+    soc_min_share = np.zeros((k, n))
+    preload_flag = np.zeros((k, n), dtype=np.int64)
+    soc_target_share = np.zeros((k, n))
+    time_to_depart_h = np.zeros((k, n))
+    is_work_time = np.zeros((k, n), dtype=np.bool_)
+    is_leisure_day = np.zeros(n, dtype=np.bool_)
+    
+    # Skalare Parameter je Kohorte
+    n_ev = np.zeros(k)
+    capacity_kwh = np.zeros(k)
+    v2g_share = np.zeros(k)
+    thr_surplus = np.zeros(k)
+    thr_deficit = np.zeros(k)
+    
+    for j, name in enumerate(active):
+        params = cohorts[name]
+        ev_profile = get_ev_profile_arrays(timestamps, params, config_params)
+        plug_share[j] = ev_profile['plug_share']
+        drive_power_kw[j] = ev_profile['drive_power_kw']
+        soc_min_share[j] = ev_profile['soc_min_share']
+        preload_flag[j] = ev_profile['preload_flag']
+        soc_target_share[j] = ev_profile['soc_target_share']
+        time_to_depart_h[j] = ev_profile['time_to_depart_h']
+        is_leisure_day = ev_profile['is_leisure_day']  # Kalender, für alle Kohorten gleich
+        is_work_time[j] = _work_time_mask(
+            time_dec_array,
+            _time_str_to_decimal(params.t_depart),
+            _time_str_to_decimal(params.t_arrive)
+        )
+        
+        n_ev[j] = params.s_EV * params.N_cars
+        capacity_kwh[j] = n_ev[j] * params.E_batt_car
+        v2g_share[j] = params.v2g_share
+        thr_surplus[j] = params.thr_surplus
+        thr_deficit[j] = params.thr_deficit
+    
+    res_energy, res_actual_power, res_charge, res_discharge, res_drive, residual_load_new_kw = _cohort_fleet_kernel(
+        np.ascontiguousarray(residual_load_kw, dtype=np.float64),
+        plug_share, drive_power_kw, soc_min_share, preload_flag, soc_target_share,
+        time_to_depart_h, is_work_time, np.ascontiguousarray(is_leisure_day, dtype=np.bool_),
+        n_ev, capacity_kwh, v2g_share, thr_surplus, thr_deficit,
+        float(config_params.SOC0), float(config_params.eta_ch), float(config_params.eta_dis),
+        float(config_params.P_ch_car_max), float(config_params.P_dis_car_max), float(dt_h)
+    )
     
     # =====================================================================
     # ERGEBNIS-DATAFRAME ERSTELLEN
     # =====================================================================
+    columns = {}
+    for name in names:
+        if name in active:
+            j = active.index(name)
+            energy, charge, discharge = res_energy[j], res_charge[j], res_discharge[j]
+            drive, power = res_drive[j], res_actual_power[j]
+        else:
+            energy = charge = discharge = drive = power = np.zeros(n)
+        columns[f'EMobility {name} SOC [MWh]'] = energy / 1000.0
+        columns[f'EMobility {name} Charge [MWh]'] = charge / 1000.0
+        columns[f'EMobility {name} Discharge [MWh]'] = discharge / 1000.0
+        columns[f'EMobility {name} Drive [MWh]'] = drive / 1000.0
+        columns[f'EMobility {name} Power [MW]'] = power / 1000.0
+    
+    columns['EMobility SOC [MWh]'] = res_energy.sum(axis=0) / 1000.0
+    columns['EMobility Charge [MWh]'] = res_charge.sum(axis=0) / 1000.0
+    columns['EMobility Discharge [MWh]'] = res_discharge.sum(axis=0) / 1000.0
+    columns['EMobility Drive [MWh]'] = res_drive.sum(axis=0) / 1000.0
+    columns['EMobility Power [MW]'] = res_actual_power.sum(axis=0) / 1000.0
+    
+    # Zurück zur Bilanz-Konvention: Bilanz = -Residuallast
+    columns['Rest Bilanz [MWh]'] = -(residual_load_new_kw * dt_h / 1000.0)
+    
     df_res = df_balance.copy()
+    for col, values in columns.items():
+        df_res[col] = values
     
-    # Neue Spalten hinzufügen (in MWh für Konsistenz)
-    df_res['EMobility SOC [MWh]'] = res_energy / 1000.0
-    df_res['EMobility Charge [MWh]'] = res_charge / 1000.0
-    df_res['EMobility Discharge [MWh]'] = res_discharge / 1000.0
-    df_res['EMobility Drive [MWh]'] = res_drive / 1000.0
-    df_res['EMobility Power [MW]'] = res_actual_power / 1000.0
+    return df_res
+
+
+def sweep_v2g_parameters(
+    df_balance: pd.DataFrame,
+    scenario_params: EVScenarioParams = None,
+    config_params: EVConfigParams = None,
+    v2g_share=None,
+    thr_surplus=None,
+    thr_deficit=None,
+    SOC_target_depart=None
+) -> pd.DataFrame:
+    """
+    V2G-Sensitivität: simuliert viele Parametervarianten der Flotte in einem Kernel-Aufruf.
     
-    # Aktualisierte Residuallast berechnen
-    # Neue Residuallast = Alte Residuallast - actual_power
-    # (bei Laden sinkt Residuallast, bei Entladen steigt sie)
-    residual_load_new_kw = residual_load_kw - res_actual_power
+    Variiert werden v2g_share, thr_surplus, thr_deficit und SOC_target_depart; alle
+    übrigen Parameter stammen aus scenario_params. Die Vektoren werden nach NumPy-Regeln
+    gegeneinander gebroadcastet (None = Wert aus scenario_params). Je Variante werden
+    nur Kennzahlen zurückgegeben, keine Zeitreihen. Jede Variante entspricht exakt
+    einem Lauf von simulate_emobility_fleet mit den jeweiligen Parametern.
     
-    # Zurück in MWh konvertieren
-    residual_load_new_mwh = residual_load_new_kw * config_params.dt_h / 1000.0
+    Args:
+        df_balance: DataFrame mit 'Rest Bilanz [MWh]' oder 'Bilanz [MWh]'
+                   und 'Zeitpunkt' Spalte
+        scenario_params: Basis-Szenario-Parameter (EVScenarioParams)
+        config_params: Config-Parameter (EVConfigParams)
+        v2g_share: V2G-Teilnahmequote(n) (Skalar oder Array)
+        thr_surplus: Schwellwert(e) für Überschuss [kW] (Skalar oder Array)
+        thr_deficit: Schwellwert(e) für Defizit [kW] (Skalar oder Array)
+        SOC_target_depart: Ziel-SOC(s) bei Abfahrt (Skalar oder Array)
     
-    # KRITISCH: Zurück zur Bilanz-Konvention!
-    # Am Anfang wurde: residual_load = -bilanz
-    # Daher muss am Ende: bilanz = -residual_load
-    # 
-    # Bilanz-Konvention (für nachgelagerte Speichermodule):
-    #   Bilanz > 0 = Überschuss (Laden möglich)
-    #   Bilanz < 0 = Defizit (Entladen möglich)
-    rest_bilanz_mwh = -residual_load_new_mwh
+    Returns:
+        DataFrame mit einer Zeile je Variante und Spalten:
+        - 'v2g_share', 'thr_surplus', 'thr_deficit', 'SOC_target_depart'
+        - 'Spitzen-Residuallast [MW]': Maximale Residuallast nach E-Mobility
+        - 'Ungedeckte Energie [MWh]': Summe der verbleibenden Defizite (Rest Bilanz < 0)
+        - 'Entladene Energie [MWh]': V2G-Entladung der Flotte
+        - 'Geladene Energie [MWh]': Ladung der Flotte
+    """
+    kernel_args, (v2g, thr_s, thr_d, soc_target) = _v2g_sweep_inputs(
+        df_balance, scenario_params, config_params,
+        v2g_share, thr_surplus, thr_deficit, SOC_target_depart
+    )
+    stats = _v2g_sweep_kernel(*kernel_args)
+    
+    return pd.DataFrame({
+        'v2g_share': v2g,
+        'thr_surplus': thr_s,
+        'thr_deficit': thr_d,
+        'SOC_target_depart': soc_target,
+        'Spitzen-Residuallast [MW]': stats[:, 0] / 1000.0,
+        'Ungedeckte Energie [MWh]': stats[:, 1],
+        'Entladene Energie [MWh]': stats[:, 2] / 1000.0,
+        'Geladene Energie [MWh]': stats[:, 3] / 1000.0,
+    })
+
+
+def _v2g_sweep_inputs(
+    df_balance: pd.DataFrame,
+    scenario_params: Optional[EVScenarioParams],
+    config_params: Optional[EVConfigParams],
+    v2g_share=None,
+    thr_surplus=None,
+    thr_deficit=None,
+    SOC_target_depart=None
+) -> Tuple[tuple, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Bereitet die Eingaben für _v2g_sweep_kernel vor (siehe sweep_v2g_parameters).
     
-    # Rest Bilanz aktualisieren oder erstellen
-    if 'Rest Bilanz [MWh]' not in df_res.columns:
-        df_res['Rest Bilanz [MWh]'] = df_res['Bilanz [MWh]']
+    Returns:
+        Tuple: (Argumente für _v2g_sweep_kernel,
+                gebroadcastete Varianten (v2g_share, thr_surplus, thr_deficit, SOC_target_depart))
+    """
+    if scenario_params is None:
+        scenario_params = EVScenarioParams()
+    if config_params is None:
+        config_params = EVConfigParams()
     
-    df_res['Rest Bilanz [MWh]'] = rest_bilanz_mwh
+    v2g, thr_s, thr_d, soc_target = np.broadcast_arrays(
+        np.asarray(scenario_params.v2g_share if v2g_share is None else v2g_share, dtype=np.float64),
+        np.asarray(scenario_params.thr_surplus if thr_surplus is None else thr_surplus, dtype=np.float64),
+        np.asarray(scenario_params.thr_deficit if thr_deficit is None else thr_deficit, dtype=np.float64),
+        np.asarray(scenario_params.SOC_target_depart if SOC_target_depart is None else SOC_target_depart,
+                   dtype=np.float64),
+    )
+    v2g, thr_s, thr_d, soc_target = (np.ascontiguousarray(a.ravel()) for a in (v2g, thr_s, thr_d, soc_target))
     
-    return df_res
+    if 'Zeitpunkt' in df_balance.columns:
+        timestamps = df_balance['Zeitpunkt']
+    else:
+        raise ValueError("DataFrame muss 'Zeitpunkt' Spalte enthalten")
+    
+    if 'Rest Bilanz [MWh]' in df_balance.columns:
+        bilanz_mwh = df_balance['Rest Bilanz [MWh]'].values.copy()
+    elif 'Bilanz [MWh]' in df_balance.columns:
+        bilanz_mwh = df_balance['Bilanz [MWh]'].values.copy()
+    else:
+        raise ValueError("DataFrame muss 'Rest Bilanz [MWh]' oder 'Bilanz [MWh]' enthalten")
+    
+    dt_h = config_params.dt_h
+    residual_load_kw = -bilanz_mwh * 1000.0 / dt_h
+    
+    n_ev = scenario_params.s_EV * scenario_params.N_cars
+    capacity_kwh = n_ev * scenario_params.E_batt_car
+    if capacity_kwh <= 0:
+        # Keine E-Autos → Residuallast bleibt unverändert
+        n_ev, capacity_kwh = 0.0, 0.0
+    
+    # Profil ist unabhängig von den variierten Parametern (SOC_target_depart wird im
+    # Kernel für die Parkzeiten eingesetzt)
+    ev_profile = get_ev_profile_arrays(timestamps, scenario_params, config_params)
+    time_dec_array = (timestamps.dt.hour.values + timestamps.dt.minute.values / 60.0) / 24.0
+    is_work_time = _work_time_mask(
+        time_dec_array,
+        _time_str_to_decimal(scenario_params.t_depart),
+        _time_str_to_decimal(scenario_params.t_arrive)
+    )
+    
+    kernel_args = (
+        np.ascontiguousarray(residual_load_kw, dtype=np.float64),
+        np.ascontiguousarray(ev_profile['plug_share'], dtype=np.float64),
+        np.ascontiguousarray(ev_profile['drive_power_kw'], dtype=np.float64),
+        np.ascontiguousarray(ev_profile['soc_min_share'], dtype=np.float64),
+        np.ascontiguousarray(ev_profile['preload_flag'], dtype=np.int64),
+        np.ascontiguousarray(ev_profile['soc_target_share'], dtype=np.float64),
+        np.ascontiguousarray(ev_profile['time_to_depart_h'], dtype=np.float64),
+        is_work_time,
+        np.ascontiguousarray(ev_profile['is_leisure_day'], dtype=np.bool_),
+        v2g, thr_s, thr_d, soc_target,
+        float(n_ev), float(capacity_kwh), float(config_params.SOC0),
+        float(config_params.eta_ch), float(config_params.eta_dis),
+        float(config_params.P_ch_car_max), float(config_params.P_dis_car_max), float(dt_h)
+    )
+    return kernel_args, (v2g, thr_s, thr_d, soc_target)
 
 
 def validate_ev_results(df_results: pd.DataFrame, capacity_mwh: float) -> Dict[str, bool]:
@@ -845,4 +1261,343 @@ def simulate_emobility_fleet_legacy(
         scenario_params=scenario_params,
         config_params=config_params,
         df_ev_profile=df_ev_profile
-    )
\ No newline at end of file
+    )
+
+
+def _warmup_ev_kernels() -> None:
+    """Kompiliert die Flotten-Kernel auf einer Mini-Zeitreihe (Hintergrund-Warm-up)."""
+    df_balance = pd.DataFrame({
+        'Zeitpunkt': pd.date_range('2030-01-01', periods=8, freq='15min'),
+        'Bilanz [MWh]': np.array([1.0, -1.0] * 4),
+    })
+    scenario_params = EVScenarioParams(N_cars=10)
+    config_params = EVConfigParams()
+    simulate_emobility_fleet(df_balance, scenario_params, config_params)
+    simulate_emobility_cohorts(df_balance, {"Warm-up": scenario_params}, config_params)
+    
+    # Paralleler Sweep-Kernel: nur kompilieren (gleiche Eingaben wie sweep_v2g_parameters)
+    kernel_args, _ = _v2g_sweep_inputs(df_balance, scenario_params, config_params, v2g_share=[0.1, 0.3])
+    compile_for(_v2g_sweep_kernel, *kernel_args)
+
+
+# =============================================================================
+# KOMPILIERTE RECHENKERNEL
+# =============================================================================
+
+@jit(nopython=True)
+def _fleet_step(
+    energy: float,
+    capacity_kwh: float,
+    n_ev: float,
+    plug_share: float,
+    drive_power_kw: float,
+    soc_min_share: float,
+    preload_flag: int,
+    soc_target_share: float,
+    time_to_depart_h: float,
+    is_work_time: bool,
+    is_leisure_day: bool,
+    res_load: float,
+    v2g_share: float,
+    thr_surplus: float,
+    thr_deficit: float,
+    eta_ch: float,
+    eta_dis: float,
+    P_ch_car_max: float,
+    P_dis_car_max: float,
+    dt_h: float
+) -> Tuple[float, float, float, float, float]:
+    """
+    Ein Zeitschritt der Flottensimulation (identisch zur Schleife in _simulate_fleet_reference).
+    
+    Returns:
+        (energy_new, actual_power, energy_charged, energy_discharged, drive_consumption)
+        in kWh bzw. kW
+    """
+    # --- Leistungsgrenzen [kW] ---
+    charge_limit = plug_share * n_ev * P_ch_car_max
+    
+    # V2G-Beschränkung nur an Arbeitstagen während der Arbeitszeit
+    if is_work_time and not is_leisure_day:
+        current_v2g_share = v2g_share * WORKPLACE_V2G_FACTOR
+    else:
+        current_v2g_share = v2g_share
+    discharge_limit = plug_share * n_ev * P_dis_car_max * current_v2g_share
+    
+    # --- Dispatch-Sollwert (negativ = Laden, positiv = Entladen) ---
+    if res_load < -thr_surplus:
+        dispatch_target = -min(abs(res_load), charge_limit)
+    elif res_load > thr_deficit:
+        dispatch_target = min(res_load, discharge_limit)
+    else:
+        dispatch_target = 0.0
+    
+    # --- Verfügbare Kapazitäten ---
+    surplus_energy = max(0.0, energy - soc_min_share * capacity_kwh)
+    available_discharge_power = (surplus_energy * eta_dis) / dt_h
+    
+    # --- Adaptive Vorlade-Logik ---
+    has_target = (not np.isnan(soc_target_share)) and time_to_depart_h > 0
+    min_charge_power_needed = 0.0
+    is_preload_priority = False
+    
+    if has_target:
+        target_energy = soc_target_share * capacity_kwh
+        energy_deficit = max(0.0, target_energy - energy)
+        
+        if energy_deficit > 0:
+            remaining_hours = max(time_to_depart_h, dt_h)
+            min_charge_power_needed = energy_deficit / (remaining_hours * eta_ch)
+            
+            if preload_flag == 1:
+                is_preload_priority = True
+            elif min_charge_power_needed > 0.5 * charge_limit:
+                is_preload_priority = True
+    
+    # --- Tatsächliche Leistung (Mobilitätsgarantie hat Vorrang) ---
+    if is_preload_priority and min_charge_power_needed > 0:
+        actual_power = -min(charge_limit, min_charge_power_needed)
+    elif min_charge_power_needed > 0:
+        actual_power = -min(charge_limit, min_charge_power_needed)
+    elif dispatch_target > 0:
+        potential_discharge = min(dispatch_target, discharge_limit, available_discharge_power)
+        
+        if has_target:
+            # V2G nur aus dem Puffer über dem Mindest-Ladepfad (+ 70% Sicherheitsmarge)
+            target_energy = soc_target_share * capacity_kwh
+            remaining_hours = max(time_to_depart_h, dt_h)
+            max_chargeable = charge_limit * remaining_hours * eta_ch
+            min_energy_required = target_energy - max_chargeable
+            safety_margin = 0.70
+            min_energy_with_safety = min_energy_required + safety_margin * target_energy
+            v2g_budget_energy = max(0.0, energy - min_energy_with_safety)
+            v2g_budget_power = v2g_budget_energy / dt_h * eta_dis
+            allowed_discharge = min(potential_discharge, v2g_budget_power)
+            
+            if allowed_discharge > 0:
+                actual_power = allowed_discharge
+            else:
+                actual_power = 0.0
+        else:
+            actual_power = potential_discharge
+    elif dispatch_target < 0:
+        actual_power = max(dispatch_target, -charge_limit)
+    else:
+        actual_power = 0.0
+    
+    # --- Energiebilanz ---
+    drive_consumption = drive_power_kw * dt_h
+    energy_charged = max(0.0, -actual_power) * dt_h * eta_ch
+    energy_discharged = max(0.0, actual_power) * dt_h / eta_dis
+    
+    energy_new = energy + energy_charged - energy_discharged - drive_consumption
+    energy_new = max(0.0, min(energy_new, capacity_kwh))
+    
+    return energy_new, actual_power, energy_charged, energy_discharged, drive_consumption
+
+
+@jit(nopython=True)
+def _fleet_kernel(
+    residual_load_kw: np.ndarray,
+    plug_share: np.ndarray,
+    drive_power_kw: np.ndarray,
+    soc_min_share: np.ndarray,
+    preload_flag: np.ndarray,
+    soc_target_share: np.ndarray,
+    time_to_depart_h: np.ndarray,
+    is_work_time: np.ndarray,
+    is_leisure_day: np.ndarray,
+    n_ev: float,
+    capacity_kwh: float,
+    SOC0: float,
+    v2g_share: float,
+    thr_surplus: float,
+    thr_deficit: float,
+    eta_ch: float,
+    eta_dis: float,
+    P_ch_car_max: float,
+    P_dis_car_max: float,
+    dt_h: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Kompilierte Flotten-Zeitschleife (PHASE B) auf den Profil-Arrays aus generate_ev_profile.
+    
+    Returns:
+        (res_energy, res_actual_power, res_charge, res_discharge, res_drive) je Zeitschritt
+    """
+    n = residual_load_kw.shape[0]
+    res_energy = np.zeros(n)
+    res_actual_power = np.zeros(n)
+    res_charge = np.zeros(n)
+    res_discharge = np.zeros(n)
+    res_drive = np.zeros(n)
+    
+    energy = SOC0 * capacity_kwh
+    
+    for i in range(n):
+        if i > 0:
+            energy = max(0.0, min(res_energy[i-1], capacity_kwh))
+        
+        energy_new, actual_power, energy_charged, energy_discharged, drive_consumption = _fleet_step(
+            energy, capacity_kwh, n_ev, plug_share[i], drive_power_kw[i], soc_min_share[i],
+            preload_flag[i], soc_target_share[i], time_to_depart_h[i], is_work_time[i],
+            is_leisure_day[i], residual_load_kw[i], v2g_share, thr_surplus, thr_deficit,
+            eta_ch, eta_dis, P_ch_car_max, P_dis_car_max, dt_h
+        )
+        
+        res_energy[i] = energy_new
+        res_actual_power[i] = actual_power
+        res_charge[i] = energy_charged
+        res_discharge[i] = energy_discharged
+        res_drive[i] = drive_consumption
+    
+    return res_energy, res_actual_power, res_charge, res_discharge, res_drive
+
+
+@jit(nopython=True)
+def _cohort_fleet_kernel(
+    residual_load_kw: np.ndarray,
+    plug_share: np.ndarray,
+    drive_power_kw: np.ndarray,
+    soc_min_share: np.ndarray,
+    preload_flag: np.ndarray,
+    soc_target_share: np.ndarray,
+    time_to_depart_h: np.ndarray,
+    is_work_time: np.ndarray,
+    is_leisure_day: np.ndarray,
+    n_ev: np.ndarray,
+    capacity_kwh: np.ndarray,
+    v2g_share: np.ndarray,
+    thr_surplus: np.ndarray,
+    thr_deficit: np.ndarray,
+    SOC0: float,
+    eta_ch: float,
+    eta_dis: float,
+    P_ch_car_max: float,
+    P_dis_car_max: float,
+    dt_h: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Kompilierte Zeitschleife für k Kohorten auf (k, n)-Profil-Arrays.
+    
+    Je Zeitschritt werden die Kohorten nacheinander disponiert; jede Kohorte sieht
+    die Residuallast nach den vorherigen Kohorten.
+    
+    Returns:
+        (res_energy, res_actual_power, res_charge, res_discharge, res_drive) als (k, n)-Arrays
+        und die Residuallast nach allen Kohorten (n,) [kW]
+    """
+    k = plug_share.shape[0]
+    n = residual_load_kw.shape[0]
+    res_energy = np.zeros((k, n))
+    res_actual_power = np.zeros((k, n))
+    res_charge = np.zeros((k, n))
+    res_discharge = np.zeros((k, n))
+    res_drive = np.zeros((k, n))
+    residual_after = np.empty(n)
+    
+    energy = np.empty(k)
+    for j in range(k):
+        energy[j] = SOC0 * capacity_kwh[j]
+    
+    for i in range(n):
+        res_load = residual_load_kw[i]
+        for j in range(k):
+            if i > 0:
+                energy[j] = max(0.0, min(res_energy[j, i-1], capacity_kwh[j]))
+            
+            energy_new, actual_power, energy_charged, energy_discharged, drive_consumption = _fleet_step(
+                energy[j], capacity_kwh[j], n_ev[j], plug_share[j, i], drive_power_kw[j, i],
+                soc_min_share[j, i], preload_flag[j, i], soc_target_share[j, i],
+                time_to_depart_h[j, i], is_work_time[j, i], is_leisure_day[i], res_load,
+                v2g_share[j], thr_surplus[j], thr_deficit[j],
+                eta_ch, eta_dis, P_ch_car_max, P_dis_car_max, dt_h
+            )
+            
+            res_energy[j, i] = energy_new
+            res_actual_power[j, i] = actual_power
+            res_charge[j, i] = energy_charged
+            res_discharge[j, i] = energy_discharged
+            res_drive[j, i] = drive_consumption
+            
+            # Residuallast für die nächste Kohorte (Laden senkt, Entladen erhöht die Bilanz)
+            res_load = res_load - actual_power
+        residual_after[i] = res_load
+    
+    return res_energy, res_actual_power, res_charge, res_discharge, res_drive, residual_after
+
+
+@jit(nopython=True, parallel=True)
+def _v2g_sweep_kernel(
+    residual_load_kw: np.ndarray,
+    plug_share: np.ndarray,
+    drive_power_kw: np.ndarray,
+    soc_min_share: np.ndarray,
+    preload_flag: np.ndarray,
+    soc_target_share: np.ndarray,
+    time_to_depart_h: np.ndarray,
+    is_work_time: np.ndarray,
+    is_leisure_day: np.ndarray,
+    v2g_share: np.ndarray,
+    thr_surplus: np.ndarray,
+    thr_deficit: np.ndarray,
+    soc_target_depart: np.ndarray,
+    n_ev: float,
+    capacity_kwh: float,
+    SOC0: float,
+    eta_ch: float,
+    eta_dis: float,
+    P_ch_car_max: float,
+    P_dis_car_max: float,
+    dt_h: float
+) -> np.ndarray:
+    """
+    Simuliert m V2G-Varianten parallel und akkumuliert nur Kennzahlen.
+    
+    Returns:
+        (m, 4)-Array: Spitzen-Residuallast [kW], ungedeckte Energie [MWh],
+        entladene Energie [kWh], geladene Energie [kWh]
+    """
+    m = v2g_share.shape[0]
+    n = residual_load_kw.shape[0]
+    stats = np.zeros((m, 4))
+    
+    for v in prange(m):
+        energy = SOC0 * capacity_kwh
+        peak_residual = -np.inf
+        unserved = 0.0
+        discharged = 0.0
+        charged = 0.0
+        
+        for i in range(n):
+            # Ziel-SOC der Variante gilt in den Parkzeiten (dort, wo das Profil ein Ziel hat)
+            soc_target = soc_target_share[i]
+            if not np.isnan(soc_target):
+                soc_target = soc_target_depart[v]
+            
+            energy_new, actual_power, energy_charged, energy_discharged, drive_consumption = _fleet_step(
+                energy, capacity_kwh, n_ev, plug_share[i], drive_power_kw[i], soc_min_share[i],
+                preload_flag[i], soc_target, time_to_depart_h[i], is_work_time[i],
+                is_leisure_day[i], residual_load_kw[i], v2g_share[v], thr_surplus[v], thr_deficit[v],
+                eta_ch, eta_dis, P_ch_car_max, P_dis_car_max, dt_h
+            )
+            energy = max(0.0, min(energy_new, capacity_kwh))
+            
+            residual_new_kw = residual_load_kw[i] - actual_power
+            if residual_new_kw > peak_residual:
+                peak_residual = residual_new_kw
+            rest_bilanz_mwh = -(residual_new_kw * dt_h / 1000.0)
+            if rest_bilanz_mwh < 0:
+                unserved -= rest_bilanz_mwh
+            discharged += energy_discharged
+            charged += energy_charged
+        
+        stats[v, 0] = peak_residual
+        stats[v, 1] = unserved
+        stats[v, 2] = discharged
+        stats[v, 3] = charged
+    
+    return stats
+
+
+register_warmup("e_mobility", _warmup_ev_kernels)
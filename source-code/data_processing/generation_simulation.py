@@ -2,10 +2,101 @@
 Erzeugungssimulation für Energiesystem-Szenarien.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional
 from config_manager import ConfigManager
 from constants import ENERGY_SOURCES, SOURCES_GROUPS
+from data_processing.cache_utils import LRUCache, readonly_array, stable_hash
+from data_processing.calendar_service import get_calendar
+
+
+# Kapazitätsfaktor-Profile je (Referenzjahr, Technologie-Set, Rasterlänge, SMARD-Daten)
+CF_PROFILE_CACHE = LRUCache(maxsize=32, name="Kapazitätsfaktoren")
+
+# Technologien der Erzeugungssimulation: (Schlüssel in capacity_dict, Ergebnisspalte, Profilgruppe).
+# Wind und PV nutzen je ein eigenes Referenzjahr (Wetterprofil), alle übrigen das Standardjahr.
+PRODUCTION_TECHNOLOGIES = (
+    ("Wind_Onshore", "Wind Onshore [MWh]", "Wind_Onshore"),
+    ("Wind_Offshore", "Wind Offshore [MWh]", "Wind_Offshore"),
+    ("Photovoltaik", "Photovoltaik [MWh]", "Photovoltaik"),
+    ("Biomasse", "Biomasse [MWh]", "default"),
+    ("Wasserkraft", "Wasserkraft [MWh]", "default"),
+    ("Erdgas", "Erdgas [MWh]", "default"),
+    ("Steinkohle", "Steinkohle [MWh]", "default"),
+    ("Braunkohle", "Braunkohle [MWh]", "default"),
+    ("Kernenergie", "Kernenergie [MWh]", "default"),
+    ("Sonstige Erneuerbare", "Sonstige Erneuerbare [MWh]", "default"),
+)
+
+# Verarbeitungsfaktor: 0.25 für Viertelstunden (CF * Kapazität_MW * 0.25h = Energie_MWh)
+QUARTER_HOUR_FACTOR = 0.25
+
+
+@dataclass
+class ProductionMatrix:
+    """
+    Kapazitätsfaktoren eines Simulationsjahres als (Zeitschritte × Technologien)-Matrix.
+    
+    Die Erzeugung ergibt sich als Produkt mit Kapazitäten [MW]: ein Vektor (K,)
+    liefert die Erzeugung je Technologie, eine Matrix (K × Szenarien) über ein
+    einziges Matrixprodukt die Gesamterzeugung aller Szenarien.
+    """
+    zeitpunkte: pd.DatetimeIndex
+    technologies: List[str]
+    columns: List[str]
+    cf: np.ndarray
+    
+    def capacity_vector(self, capacity_dict: Dict, simu_jahr: int) -> np.ndarray:
+        """
+        Ziel-Kapazitäten [MW] eines Szenarios in der Technologie-Reihenfolge der Matrix.
+        
+        Args:
+            capacity_dict: {"Photovoltaik": {"2030": 150000, ...}, ...} (Jahr als str oder int)
+            simu_jahr: Simulationsjahr
+        
+        Returns:
+            Kapazitäten (K,), fehlende Technologien = 0
+        """
+        return np.array([_target_capacity(capacity_dict, tech, simu_jahr) for tech in self.technologies],
+                        dtype=np.float64)
+    
+    def capacity_matrix(self, capacity_dicts: List[Dict], simu_jahr: int) -> np.ndarray:
+        """Kapazitäten mehrerer Szenarien als (Technologien × Szenarien)-Matrix [MW]."""
+        if not capacity_dicts:
+            return np.zeros((len(self.technologies), 0))
+        return np.column_stack([self.capacity_vector(cd, simu_jahr) for cd in capacity_dicts])
+    
+    def generation_mwh(self, capacities: np.ndarray) -> np.ndarray:
+        """Erzeugung je Zeitschritt und Technologie [MWh] (T × K) für Kapazitäten (K,)."""
+        return self.cf * np.asarray(capacities, dtype=np.float64)[None, :] * QUARTER_HOUR_FACTOR
+    
+    def total_mwh(self, capacities: np.ndarray) -> np.ndarray:
+        """
+        Gesamterzeugung [MWh] als Matrixprodukt.
+        
+        Args:
+            capacities: Kapazitäten (K,) oder (K × Szenarien) [MW]
+        
+        Returns:
+            (T,) bzw. (T × Szenarien)
+        """
+        return (self.cf @ np.asarray(capacities, dtype=np.float64)) * QUARTER_HOUR_FACTOR
+    
+    def to_frame(self, capacities: np.ndarray) -> pd.DataFrame:
+        """
+        Erzeugung eines Szenarios im Format von simulate_production.
+        
+        Nur Technologien mit Kapazität > 0 erscheinen als Spalte.
+        """
+        capacities = np.asarray(capacities, dtype=np.float64)
+        active = np.flatnonzero(capacities > 0)
+        values = self.cf[:, active] * capacities[active][None, :] * QUARTER_HOUR_FACTOR
+        
+        df_result = pd.DataFrame(values, columns=[self.columns[k] for k in active])
+        df_result.insert(0, 'Zeitpunkt', pd.Series(self.zeitpunkte))
+        return df_result
 
 
 def _generate_generation_profile(
@@ -75,6 +166,165 @@ def _generate_generation_profile(
     return capacity_factor_df
 
 
+def get_capacity_factor_profiles(
+    smardGeneration: pd.DataFrame,
+    smardCapacity: pd.DataFrame,
+    ref_jahr: int,
+    include_conv: bool,
+    n_steps: int,
+    data_key: Optional[Hashable] = None,
+    use_cache: bool = True
+) -> Dict[str, np.ndarray]:
+    """
+    Liefert die Kapazitätsfaktoren eines Referenzjahres auf n_steps Viertelstunden (gecacht).
+    
+    Die Profile hängen nur vom Referenzjahr, dem Technologie-Set und der Rasterlänge
+    (35040 bzw. 35136) ab und werden prozessweit für alle Jahre und Szenarien geteilt.
+    
+    Args:
+        smardGeneration: SMARD Erzeugungsdaten (MWh, Viertelstunden) mit Spalte 'Zeitpunkt'
+        smardCapacity: Installierte Kapazitäten mit Spalte 'Jahr'
+        ref_jahr: Referenzjahr der SMARD-Daten
+        include_conv: Konventionelle Kraftwerke einbeziehen
+        n_steps: Länge des Ziel-Rasters (Viertelstunden im Simulationsjahr)
+        data_key: Fingerabdruck der SMARD-Daten (siehe smard_fingerprint); wird sonst berechnet
+        use_cache: Ergebnis aus dem Cache lesen bzw. dort ablegen
+    
+    Returns:
+        Dictionary {Spaltenname [MWh]: schreibgeschützte float64-Kapazitätsfaktoren (n_steps,)}
+    """
+    def compute() -> Dict[str, np.ndarray]:
+        return _compute_capacity_factor_profiles(smardGeneration, smardCapacity, ref_jahr, include_conv, n_steps)
+    
+    if not use_cache:
+        return compute()
+    
+    if data_key is None:
+        data_key = smard_fingerprint(smardGeneration, smardCapacity)
+    key = ("cf", int(ref_jahr), bool(include_conv), int(n_steps), data_key)
+    return CF_PROFILE_CACHE.get_or_compute(key, compute)
+
+
+def smard_fingerprint(smardGeneration: pd.DataFrame, smardCapacity: pd.DataFrame) -> str:
+    """
+    Günstiger Fingerabdruck der SMARD-Daten für den Profil-Cache.
+    
+    Form, Spalten, Zeitraum und Spaltensummen der Erzeugung sowie die (kleine)
+    Kapazitätstabelle vollständig - schützt vor veralteten Einträgen, wenn
+    Datensätze ersetzt werden.
+    """
+    zeitraum = smardGeneration['Zeitpunkt'].iloc[[0, -1]] if len(smardGeneration) else None
+    return stable_hash(
+        smardGeneration.shape,
+        [str(c) for c in smardGeneration.columns],
+        zeitraum,
+        smardGeneration.sum(numeric_only=True),
+        smardCapacity
+    )
+
+
+def _compute_capacity_factor_profiles(
+    smardGeneration: pd.DataFrame,
+    smardCapacity: pd.DataFrame,
+    ref_jahr: int,
+    include_conv: bool,
+    n_steps: int
+) -> Dict[str, np.ndarray]:
+    """Berechnet die Profile für get_capacity_factor_profiles (ohne Cache)."""
+    df_generation = smardGeneration.set_index("Zeitpunkt")
+    df_generation.index = pd.to_datetime(df_generation.index)
+    
+    df_ref = df_generation.loc[str(ref_jahr)]
+    df_refCap = smardCapacity[smardCapacity["Jahr"] == ref_jahr]
+    df_profile = _generate_generation_profile(df_ref, df_refCap, include_conv)
+    
+    values = _align_to_steps(df_profile.to_numpy(dtype=np.float64), n_steps)
+    return {
+        col: readonly_array(np.ascontiguousarray(values[:, i]))
+        for i, col in enumerate(df_profile.columns)
+    }
+
+
+def build_production_matrix(
+    cfg: ConfigManager,
+    smardGeneration: pd.DataFrame,
+    smardCapacity: pd.DataFrame,
+    wind_on_weather: str,
+    wind_off_weather: str,
+    pv_weather: str,
+    simu_jahr: int
+) -> ProductionMatrix:
+    """
+    Stellt die Kapazitätsfaktor-Matrix eines Simulationsjahres zusammen.
+    
+    Args:
+        cfg: ConfigManager Instanz (Referenzjahre je Wetterprofil)
+        smardGeneration: DataFrame mit SMARD Erzeugungsdaten (MWh, Viertelstunden)
+        smardCapacity: DataFrame mit installierten Kapazitäten
+        wind_on_weather: Weather-Profil für Wind Onshore ("good", "average", "bad")
+        wind_off_weather: Weather-Profil für Wind Offshore ("good", "average", "bad")
+        pv_weather: Weather-Profil für Photovoltaik ("good", "average", "bad")
+        simu_jahr: Das Zieljahr für die Simulation
+    
+    Returns:
+        ProductionMatrix mit allen Technologien, für die ein Profil vorliegt
+    """
+    # Referenzjahre für das Filtern der SMARD-Daten basierend auf Wetterprofil
+    ref_years = {
+        "Wind_Onshore": cfg.get_generation_year("Wind_Onshore", wind_on_weather),
+        "Wind_Offshore": cfg.get_generation_year("Wind_Offshore", wind_off_weather),
+        "Photovoltaik": cfg.get_generation_year("Photovoltaik", pv_weather),
+        "default": cfg.config["GENERATION_SIMULATION"]["optimal_reference_years_by_technology"]["default"],
+    }
+    
+    target_time_index = get_calendar(simu_jahr).index
+    n_steps = len(target_time_index)
+    
+    # Kapazitätsfaktor-Profile (prozessweit gecacht, bereits auf Zieljahr-Länge);
+    # konventionelle Kraftwerke nur im Standardjahr
+    data_key = smard_fingerprint(smardGeneration, smardCapacity)
+    profiles = {
+        group: get_capacity_factor_profiles(
+            smardGeneration, smardCapacity, ref_year, group == "default", n_steps, data_key
+        )
+        for group, ref_year in ref_years.items()
+    }
+    
+    technologies, columns, cf_columns = [], [], []
+    for tech, col, group in PRODUCTION_TECHNOLOGIES:
+        if col in profiles[group]:
+            technologies.append(tech)
+            columns.append(col)
+            cf_columns.append(profiles[group][col])
+    
+    cf = np.column_stack(cf_columns) if cf_columns else np.zeros((n_steps, 0))
+    return ProductionMatrix(
+        zeitpunkte=target_time_index,
+        technologies=technologies,
+        columns=columns,
+        cf=cf
+    )
+
+
+def _target_capacity(capacity_dict: Dict, tech: str, simu_jahr: int) -> float:
+    """Ziel-Kapazität [MW] einer Technologie (Jahresschlüssel als str oder int, sonst 0)."""
+    if tech not in capacity_dict:
+        return 0.0
+    by_year = capacity_dict[tech]
+    return float(by_year.get(str(simu_jahr), by_year.get(int(simu_jahr), 0)))
+
+
+def _align_to_steps(values: np.ndarray, n_steps: int) -> np.ndarray:
+    """Passt ein Profil (Zeitschritte × Spalten) an die Länge des Zieljahres an (kürzt oder wiederholt)."""
+    if len(values) == n_steps:
+        return values
+    if len(values) > n_steps:
+        # Schaltjahr-Profil auf Normaljahr kürzen
+        return values[:n_steps]
+    # Normaljahr-Profil auf Schaltjahr erweitern (letzten Tag wiederholen, 96 Viertelstunden)
+    return np.concatenate([values, values[-96:]])[:n_steps]
+
+
 def simulate_production(
     cfg: ConfigManager,
     smardGeneration: pd.DataFrame,
@@ -105,141 +355,46 @@ def simulate_production(
         Spalten: Zeitpunkt, Wind Onshore [MWh], Wind Offshore [MWh], 
                 Photovoltaik [MWh], Biomasse [MWh], etc.
     """
+    matrix = build_production_matrix(
+        cfg, smardGeneration, smardCapacity,
+        wind_on_weather, wind_off_weather, pv_weather, simu_jahr
+    )
+    return matrix.to_frame(matrix.capacity_vector(capacity_dict, simu_jahr))
 
-    # Suche Referenzjahre für das Filtern der SMARD-Daten basierend auf Wetterprofil
-    windOn_smard_ref_jahr = cfg.get_generation_year("Wind_Onshore", wind_on_weather)
-    windOff_smard_ref_jahr = cfg.get_generation_year("Wind_Offshore", wind_off_weather)
-    pv_smard_ref_jahr = cfg.get_generation_year("Photovoltaik", pv_weather)
-    ref_jahr = cfg.config["GENERATION_SIMULATION"]["optimal_reference_years_by_technology"]["default"]
-
-    # Bereite SMARD-Daten vor (setze Zeitpunkt als Index)
-    smardGeneration = smardGeneration.set_index("Zeitpunkt")
-    smardGeneration.index = pd.to_datetime(smardGeneration.index)
-
-    # Filtere Referenzjahre aus SMARD-Daten
-    df_windOn_ref = smardGeneration.loc[str(windOn_smard_ref_jahr)].copy()
-    df_windOff_ref = smardGeneration.loc[str(windOff_smard_ref_jahr)].copy()
-    df_pv_ref = smardGeneration.loc[str(pv_smard_ref_jahr)].copy()
-    df_ref = smardGeneration.loc[str(ref_jahr)].copy()
-
-    df_windOn_refCap = smardCapacity[smardCapacity["Jahr"] == windOn_smard_ref_jahr]
-    df_windOff_refCap = smardCapacity[smardCapacity["Jahr"] == windOff_smard_ref_jahr]
-    df_pv_refCap = smardCapacity[smardCapacity["Jahr"] == pv_smard_ref_jahr]
-    df_refCap = smardCapacity[smardCapacity["Jahr"] == ref_jahr]
 
-    # Generiere Kapazitätsfaktor-Profile für alle Technologien
-    df_windOn_Profile = _generate_generation_profile(df_windOn_ref, df_windOn_refCap, False)
-    df_windOff_Profile = _generate_generation_profile(df_windOff_ref, df_windOff_refCap, False)
-    df_pv_Profile = _generate_generation_profile(df_pv_ref, df_pv_refCap, False)
-    df_other_Profile = _generate_generation_profile(df_ref, df_refCap, True)
-    
-    # Erstelle Ziel-Zeitindex für das Simulationsjahr
-    start_date = pd.Timestamp(year=simu_jahr, month=1, day=1)
-    end_date = pd.Timestamp(year=simu_jahr, month=12, day=31, hour=23, minute=45)
-    target_time_index = pd.date_range(start=start_date, end=end_date, freq='15min')
-    
-    # Funktion zum Anpassen der Profile auf Zieljahr-Länge
-    def align_profile_to_target_year(df_profile, target_index):
-        """Passt ein Profil an die Länge des Zieljahres an (kürzt oder wiederholt)."""
-        profile_len = len(df_profile)
-        target_len = len(target_index)
-        
-        if profile_len == target_len:
-            return df_profile
-        elif profile_len > target_len:
-            # Schaltjahr-Profil auf Normaljahr kürzen
-            return df_profile.iloc[:target_len].copy()
-        else:
-            # Normaljahr-Profil auf Schaltjahr erweitern (letzten Tag wiederholen)
-            repeat_data = df_profile.iloc[-96:].copy()  # 96 Viertelstunden = 24h
-            df_extended = pd.concat([df_profile, repeat_data], ignore_index=True)
-            return df_extended.iloc[:target_len].copy()
-    
-    # Profile auf Zieljahr-Länge anpassen
-    df_windOn_Profile = align_profile_to_target_year(df_windOn_Profile, target_time_index)
-    df_windOff_Profile = align_profile_to_target_year(df_windOff_Profile, target_time_index)
-    df_pv_Profile = align_profile_to_target_year(df_pv_Profile, target_time_index)
-    df_other_Profile = align_profile_to_target_year(df_other_Profile, target_time_index)
-    
-    # Simuliere Produktion für alle Technologien durch Skalierung auf Ziel-Kapazitäten
-    target_year_str = str(simu_jahr)
-    target_year_int = int(simu_jahr)
-    
-    # Initialisiere Ergebnis-DataFrame
-    df_result = pd.DataFrame({'Zeitpunkt': target_time_index})
-    
-    # Verarbeitungsfaktor: 0.25 für Viertelstunden (CF * Kapazität_MW * 0.25h = Energie_MWh)
-    quarter_hour_factor = 0.25
-    
-    # 1. Wind Onshore
-    if 'Wind_Onshore' in capacity_dict:
-        target_capacity = capacity_dict['Wind_Onshore'].get(target_year_str, 
-                         capacity_dict['Wind_Onshore'].get(target_year_int, 0))
-        if target_capacity > 0:
-            possible_cols = ['Wind Onshore [MWh]', 'Wind_Onshore [MWh]', 'Wind Onshore', 'Wind_Onshore', 'Onshore [MWh]']
-            wind_on_col = None
-            for col in possible_cols:
-                if col in df_windOn_Profile.columns:
-                    wind_on_col = col
-                    break
-            
-            if wind_on_col:
-                df_result['Wind Onshore [MWh]'] = (
-                    df_windOn_Profile[wind_on_col].values * target_capacity * quarter_hour_factor
-                )
-    
-    # 2. Wind Offshore
-    if 'Wind_Offshore' in capacity_dict:
-        target_capacity = capacity_dict['Wind_Offshore'].get(target_year_str,
-                         capacity_dict['Wind_Offshore'].get(target_year_int, 0))
-        if target_capacity > 0:
-            possible_cols = ['Wind Offshore [MWh]', 'Wind_Offshore [MWh]', 'Wind Offshore', 'Wind_Offshore', 'Offshore [MWh]']
-            wind_off_col = None
-            for col in possible_cols:
-                if col in df_windOff_Profile.columns:
-                    wind_off_col = col
-                    break
-            
-            if wind_off_col:
-                df_result['Wind Offshore [MWh]'] = (
-                    df_windOff_Profile[wind_off_col].values * target_capacity * quarter_hour_factor
-                )
-    
-    # 3. Photovoltaik
-    if 'Photovoltaik' in capacity_dict:
-        target_capacity = capacity_dict['Photovoltaik'].get(target_year_str,
-                         capacity_dict['Photovoltaik'].get(target_year_int, 0))
-        if target_capacity > 0:
-            possible_cols = ['Photovoltaik [MWh]', 'PV [MWh]', 'Photovoltaik', 'Solar [MWh]']
-            pv_col = None
-            for col in possible_cols:
-                if col in df_pv_Profile.columns:
-                    pv_col = col
-                    break
-            
-            if pv_col:
-                df_result['Photovoltaik [MWh]'] = (
-                    df_pv_Profile[pv_col].values * target_capacity * quarter_hour_factor
-                )
-    
-    # 4. andere Technologien
-    other_technologies = [
-        'Biomasse', 'Wasserkraft', 'Erdgas', 'Steinkohle', 'Braunkohle', 
-        'Kernenergie', 'Sonstige Erneuerbare'
-    ]
-    
-    for tech in other_technologies:
-        tech_col_name = f'{tech} [MWh]'
-        if tech in capacity_dict and tech_col_name in df_other_Profile.columns:
-            target_capacity = capacity_dict[tech].get(target_year_str,
-                             capacity_dict[tech].get(target_year_int, 0))
-            if target_capacity > 0:
-                df_result[tech_col_name] = (
-                    df_other_Profile[tech_col_name].values * target_capacity * quarter_hour_factor
-                )
-    
-    # Setze das Jahr in der Zeitpunkt-Spalte auf das Simulationsjahr
-    df_result['Zeitpunkt'] = pd.to_datetime(df_result['Zeitpunkt'])
-    df_result['Zeitpunkt'] = df_result['Zeitpunkt'].apply(lambda x: x.replace(year=simu_jahr))
+def simulate_production_batch(
+    cfg: ConfigManager,
+    smardGeneration: pd.DataFrame,
+    smardCapacity: pd.DataFrame,
+    capacity_dicts: Dict[str, Dict],
+    wind_on_weather: str,
+    wind_off_weather: str,
+    pv_weather: str,
+    simu_jahr: int
+) -> pd.DataFrame:
+    """
+    Gesamterzeugung mehrerer Szenarien (gleiche Wetterprofile) in einem Matrixprodukt.
+    
+    Args:
+        cfg: ConfigManager Instanz
+        smardGeneration: DataFrame mit SMARD Erzeugungsdaten (MWh, Viertelstunden)
+        smardCapacity: DataFrame mit installierten Kapazitäten
+        capacity_dicts: {Szenarioname: capacity_dict} (Format wie in simulate_production)
+        wind_on_weather: Weather-Profil für Wind Onshore ("good", "average", "bad")
+        wind_off_weather: Weather-Profil für Wind Offshore ("good", "average", "bad")
+        pv_weather: Weather-Profil für Photovoltaik ("good", "average", "bad")
+        simu_jahr: Das Zieljahr für die Simulation
+    
+    Returns:
+        DataFrame mit 'Zeitpunkt' und je Szenario einer Spalte Gesamterzeugung [MWh]
+    """
+    matrix = build_production_matrix(
+        cfg, smardGeneration, smardCapacity,
+        wind_on_weather, wind_off_weather, pv_weather, simu_jahr
+    )
+    names = list(capacity_dicts.keys())
+    capacities = matrix.capacity_matrix([capacity_dicts[name] for name in names], simu_jahr)
     
+    df_result = pd.DataFrame(matrix.total_mwh(capacities), columns=names)
+    df_result.insert(0, 'Zeitpunkt', pd.Series(matrix.zeitpunkte))
     return df_result
@@ -0,0 +1,187 @@
+"""
+Numba-Kompatibilitätsschicht für JIT-kompilierte Rechenkernel.
+
+Stellt `jit` und `prange` zentral bereit. Ist Numba installiert, werden die
+Kernel im nopython-Modus kompiliert. Fehlt Numba, wirken `jit` als No-Op-Decorator
+und `prange` als `range` - die Kernel laufen dann unverändert als reines
+Python/NumPy (langsamer, aber mit identischen Ergebnissen).
+
+Kompilierte Kernel werden standardmäßig persistent auf der Festplatte gecacht
+(`cache=True`, Ablage im __pycache__ der Module bzw. in NUMBA_CACHE_DIR). Module
+können zusätzlich eine Warm-up-Funktion registrieren, die ihre Kernel auf einer
+winzigen synthetischen Eingabe kompiliert; `start_background_warmup` führt alle
+registrierten Warm-ups einmal pro Prozess in einem Hintergrund-Thread aus.
+Kernel werden im Warm-up über `compile_for` nur kompiliert, nicht ausgeführt.
+Parallele Kernel (prange) werden dabei ausschließlich im Haupt-Thread kompiliert:
+mit dem TBB-Threading-Layer blockiert sonst das Interpreter-Ende. Im Hintergrund-
+Thread werden sie übersprungen und beim ersten Aufruf aus dem Disk-Cache geladen.
+
+Usage:
+    from data_processing.numba_compat import jit, prange, NUMBA_AVAILABLE, register_warmup
+
+    @jit(nopython=True)
+    def _kernel(values: np.ndarray) -> np.ndarray:
+        ...
+
+    register_warmup("mein_kernel", lambda: compile_for(_kernel, np.zeros(4)))
+"""
+
+import importlib
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+try:
+    import numba
+    from numba import prange
+    NUMBA_AVAILABLE = True
+
+    def jit(*args, **kwargs):
+        """numba.jit mit persistentem Disk-Cache (cache=True) als Voreinstellung."""
+        kwargs.setdefault("cache", True)
+        return numba.jit(*args, **kwargs)
+
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def jit(*args, **kwargs):
+        """No-Op-Ersatz für numba.jit (Python/NumPy-Fallback)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+# Module mit Rechenkerneln - werden vor dem Warm-up importiert (registrieren sich dabei)
+KERNEL_MODULES = (
+    "data_processing.calculation_engine",
+    "data_processing.storage_simulation",
+    "data_processing.e_mobility_simulation",
+)
+
+_WARMUP_REGISTRY: Dict[str, Callable[[], None]] = {}
+_warmup_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_timings: Dict[str, float] = {}
+
+
+def register_warmup(name: str, func: Callable[[], None]) -> None:
+    """
+    Registriert eine Warm-up-Funktion für Rechenkernel.
+
+    Die Funktion sollte die Kernel über denselben Aufrufpfad wie im Betrieb
+    aufrufen (gleiche Datentypen), nur mit winziger Eingabe.
+
+    Args:
+        name: Eindeutiger Name (z.B. "storage_cascade")
+        func: Funktion ohne Argumente
+    """
+    _WARMUP_REGISTRY[name] = func
+
+
+def compile_for(kernel: Callable, *args) -> bool:
+    """
+    Kompiliert einen Kernel für die Datentypen von args, ohne ihn auszuführen.
+
+    Liegt die Variante bereits im Disk-Cache, wird sie von dort geladen. Ohne
+    Numba (oder für nicht kompilierte Funktionen) passiert nichts. Parallele
+    Kernel werden außerhalb des Haupt-Threads übersprungen (siehe Modul-Doku).
+
+    Args:
+        kernel: Mit @jit dekorierte Funktion
+        *args: Beispielargumente mit denselben Datentypen wie im Betrieb
+
+    Returns:
+        True, wenn kompiliert (bzw. aus dem Cache geladen) wurde
+    """
+    if not NUMBA_AVAILABLE or not hasattr(kernel, "compile"):
+        return False
+    if kernel.targetoptions.get("parallel") and threading.current_thread() is not threading.main_thread():
+        return False
+    kernel.compile(tuple(numba.typeof(arg) for arg in args))
+    return True
+
+
+def warm_up_kernels(verbose: bool = False) -> Dict[str, float]:
+    """
+    Kompiliert alle registrierten Kernel (bzw. lädt sie aus dem Disk-Cache).
+
+    Fehler einzelner Warm-ups werden abgefangen - der Kernel wird dann beim
+    ersten echten Aufruf kompiliert.
+
+    Args:
+        verbose: Dauer bzw. Fehler je Warm-up ausgeben
+
+    Returns:
+        Dictionary Name -> Dauer [s] (NaN bei Fehler)
+    """
+    if not NUMBA_AVAILABLE:
+        return {}
+
+    for module_name in KERNEL_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            if verbose:
+                print(f"Warm-up: Modul {module_name} nicht importierbar: {e}")
+
+    timings = {}
+    for name, func in list(_WARMUP_REGISTRY.items()):
+        t0 = time.perf_counter()
+        try:
+            func()
+            timings[name] = time.perf_counter() - t0
+        except Exception as e:
+            timings[name] = float("nan")
+            if verbose:
+                print(f"Warm-up '{name}' fehlgeschlagen: {e}")
+            continue
+        if verbose:
+            print(f"Warm-up '{name}': {timings[name]:.2f}s")
+
+    _warmup_timings.update(timings)
+    return timings
+
+
+def start_background_warmup(verbose: bool = False) -> Optional[threading.Thread]:
+    """
+    Startet das Kernel-Warm-up einmal pro Prozess in einem Daemon-Thread.
+
+    Weitere Aufrufe liefern den bereits gestarteten Thread zurück.
+
+    Returns:
+        Warm-up-Thread oder None, wenn Numba nicht installiert ist
+    """
+    global _warmup_thread
+    if not NUMBA_AVAILABLE:
+        return None
+
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=warm_up_kernels,
+                kwargs={"verbose": verbose},
+                name="numba-warmup",
+                daemon=True,
+            )
+            _warmup_thread.start()
+        return _warmup_thread
+
+
+def warmup_status() -> Dict[str, object]:
+    """
+    Status des Hintergrund-Warm-ups.
+
+    Returns:
+        Dictionary mit 'started', 'running' und 'timings' (Name -> Dauer [s])
+    """
+    thread = _warmup_thread
+    return {
+        "started": thread is not None,
+        "running": thread is not None and thread.is_alive(),
+        "timings": dict(_warmup_timings),
+    }
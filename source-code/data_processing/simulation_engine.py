@@ -8,27 +8,42 @@ Dieser Engine führt die komplette Simulationspipeline aus:
 4. Speichersimulation (Batterie -> Pumpspeicher -> Wasserstoff)
 5. Wirtschaftlichkeitsanalyse (CAPEX/OPEX/LCOE)
 
+Die Stufen eines Jahres bilden einen Abhängigkeitsgraphen (stage_scheduler);
+unabhängige Stufen wie Verbrauch und Erzeugung laufen gleichzeitig. Über einen
+inhaltsadressierten Stufen-Cache (stage_cache) werden sie wiederverwendet:
+Ändert sich z.B. nur die Speicherkonfiguration, laufen nur Speicher und
+Wirtschaftlichkeit neu.
 """
 
 import pandas as pd
+import copy
 import io
+import multiprocessing
+import os
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional
 from config_manager import ConfigManager
-from data_processing.storage_simulation import StorageSimulation
+from data_processing.storage_simulation import StorageSimulation, StorageConfig
 from data_processing.heat_pump_simulation import HeatPumpSimulation
+from data_processing.calculation_engine import CalculationEngine, HeatPumpEnsemble, prepare_weather_temperatures
 from data_processing.balance_calculator import BalanceCalculator
 from data_processing.generation_simulation import simulate_production
 from data_processing.consumption_simulation import simulate_consumption_all
 from data_processing.economic_calculator import calculate_economics_from_simulation
+from data_processing.cache_utils import frame_fingerprint
+from data_processing.stage_cache import StageCache, STAGE_CACHE, configure_stage_cache
+from data_processing.simulation_result import SimulationResult, RESULT_DTYPES
+from data_processing.stage_scheduler import PipelineStage, StageScheduler, StageTiming
 from data_processing.e_mobility_simulation import (
     simulate_emobility_fleet, 
-    generate_ev_profile,
+    get_ev_profile_arrays,
     EVConfigParams, 
     EVScenarioParams,
     validate_ev_results
 )
 from constants import HEATPUMP_LOAD_PROFILE_NAME
+from scenario_manager import ScenarioManager
 
 
 class _SimpleLogger:
@@ -54,6 +69,105 @@ class _SimpleLogger:
         pass  # Optional: implement if needed
 
 
+class _DatasetSnapshot:
+    """
+    Schlanker Ersatz für den DataManager in Worker-Prozessen.
+    
+    Enthält nur die benötigten Datensätze (siehe snapshot_datasets) und ist
+    ohne UI-Callbacks picklebar.
+    """
+    
+    def __init__(self, dataframes: Dict[str, pd.DataFrame]):
+        self.dataframes = dataframes
+    
+    def get(self, identifier):
+        """Liefert einen Datensatz nach Name (KeyError wie im DataManager)."""
+        if identifier in self.dataframes:
+            return self.dataframes[identifier]
+        raise KeyError(f"Dataset with name '{identifier}' not found.")
+
+
+# Namen der SMARD-Basisdatensätze im DataManager
+SMARD_GENERATION_DATASETS = ("SMARD_2015-2019_Erzeugung", "SMARD_2020-2025_Erzeugung")
+SMARD_CAPACITY_DATASETS = ("SMARD_Installierte Leistung 2015-2019", "SMARD_Installierte Leistung 2020-2025")
+
+
+def snapshot_datasets(data_manager, names) -> _DatasetSnapshot:
+    """
+    Picklebarer Auszug aus dem DataManager für Worker-Prozesse.
+    
+    Args:
+        data_manager: DataManager (oder _DatasetSnapshot)
+        names: Namen der benötigten Datensätze; fehlende werden übergangen
+            (der Worker meldet sie dann wie der DataManager mit KeyError)
+    
+    Returns:
+        _DatasetSnapshot mit genau diesen Datensätzen
+    """
+    dataframes = {}
+    for name in names:
+        try:
+            dataframes[name] = data_manager.get(name)
+        except Exception:
+            pass
+    return _DatasetSnapshot(dataframes)
+
+
+def required_datasets(scenario_manager, years: Optional[List[int]] = None) -> List[str]:
+    """
+    Namen aller Datensätze, die run_scenario für das geladene Szenario aus dem DataManager liest.
+    
+    Args:
+        scenario_manager: ScenarioManager mit geladenem Szenario
+        years: Simulationsjahre (Standard: valid_for_years des Szenarios)
+    
+    Returns:
+        Liste der Datensatznamen ohne Duplikate
+    """
+    scenario = scenario_manager.scenario_data or {}
+    if years is None:
+        years = scenario.get("metadata", {}).get("valid_for_years", [])
+    
+    load_cfg = scenario.get("target_load_demand_twh", {})
+    names = [
+        load_cfg[sector]["load_profile"]
+        for sector in ("Haushalt_Basis", "Gewerbe_Basis", "Landwirtschaft_Basis")
+        if isinstance(load_cfg.get(sector), dict) and load_cfg[sector].get("load_profile")
+    ]
+    names += list(SMARD_GENERATION_DATASETS) + list(SMARD_CAPACITY_DATASETS)
+    names += _year_datasets(scenario_manager, years)
+    return list(dict.fromkeys(names))
+
+
+def _year_datasets(scenario_manager, years: List[int]) -> List[str]:
+    """Datensätze, die _simulate_year über self.dm abfragt (WP-Lastprofile, Wetterdaten je Jahr)."""
+    names = [HEATPUMP_LOAD_PROFILE_NAME]
+    for year in years:
+        if hasattr(scenario_manager, "get_heat_pump_parameters"):
+            hp_config = scenario_manager.get_heat_pump_parameters(year) or {}
+        else:
+            hp_config = scenario_manager.scenario_data.get("target_heat_pump_parameters", {}).get(year, {})
+        if hp_config.get("weather_data"):
+            names.append(hp_config["weather_data"])
+    return list(dict.fromkeys(names))
+
+
+# Engine-Kopie des aktuellen Worker-Prozesses (siehe _init_year_worker)
+_WORKER_ENGINE = None
+
+
+def _init_year_worker(engine: "SimulationEngine") -> None:
+    """Initialisiert einen Worker-Prozess mit der Engine-Kopie (einmal pro Prozess)."""
+    global _WORKER_ENGINE
+    engine._init_modules()
+    _WORKER_ENGINE = engine
+
+
+def _simulate_year_in_worker(year: int, year_num: int, total_years: int) -> SimulationResult:
+    """Simuliert ein Jahr im Worker-Prozess."""
+    return _WORKER_ENGINE._simulate_year(year, year_num, total_years)
+
+
 class SimulationEngine:
     """
     Zentrale Engine für die Energiesystem-Simulation.
@@ -69,7 +183,10 @@ class SimulationEngine:
         scenario_manager,
         verbose: bool = False,
         calculation_mode: str = "cpu_optimized",
-        progress_callback=None
+        progress_callback=None,
+        stage_cache: Optional[StageCache] = STAGE_CACHE,
+        result_dtype: str = "float64",
+        stage_workers: int = 2
     ):
         """
         Initialisiert die Simulation Engine mit benötigten Managern.
@@ -79,30 +196,66 @@ class SimulationEngine:
             data_manager: DataManager für Rohdaten (SMARD, BDEW, Wetter)
             scenario_manager: ScenarioManager für Szenario-Parameter
             verbose: Wenn True, detaillierte Logging-Ausgaben
-            calculation_mode: Berechnungsmodus für Wärmepumpen ("normal", "cpu_optimized")
+            calculation_mode: Berechnungsmodus für Wärmepumpen ("normal", "cpu_optimized", "numpy")
             progress_callback: Callback function(message, progress) für Progress-Updates
+            stage_cache: Cache für Stufenergebnisse (Standard: prozessweiter STAGE_CACHE,
+                dessen Festplatten-Ebene der Abschnitt "STAGE_CACHE" der Config schaltet;
+                None = jede Stufe neu berechnen)
+            result_dtype: Speicher-Datentyp der Ergebnis-Zeitreihen ("float64" oder "float32")
+            stage_workers: Gleichzeitig laufende Stufen innerhalb eines Jahres (1 = sequentiell)
+        
+        Raises:
+            ValueError: Bei nicht unterstütztem result_dtype
         """
+        if result_dtype not in RESULT_DTYPES:
+            raise ValueError(f"result_dtype muss einer von {RESULT_DTYPES} sein, nicht '{result_dtype}'")
+
         self.cfg = cfg
         self.dm = data_manager
         self.sm = scenario_manager
         self.logger = _SimpleLogger(verbose=verbose)
         self.calculation_mode = calculation_mode
         self.progress_callback = progress_callback
+        self.stage_cache = stage_cache
+        if stage_cache is STAGE_CACHE:
+            configure_stage_cache(cfg.config.get("STAGE_CACHE", {}))
+        self.result_dtype = result_dtype
+        self.stage_workers = stage_workers
+        # Zeitleiste der Stufen je Jahr (nur bei sequentieller Jahresverarbeitung)
+        self.stage_timelines: Dict[int, List[StageTiming]] = {}
+        self._fingerprints: Dict[str, Optional[str]] = {}
         
         # Initialisiere spezialisierte Module
+        self._init_modules()
+    
+    def _init_modules(self):
+        """Erzeugt die spezialisierten Simulationsmodule (auch in Worker-Prozessen)."""
         self.storage_sim = StorageSimulation()
-        self.heatpump_sim = HeatPumpSimulation()
+        self.heatpump_sim = HeatPumpSimulation(calculation_mode=self.calculation_mode)
         self.balance_calc = BalanceCalculator()
     
-    def run_scenario(self, years: Optional[List[int]] = None) -> Dict[int, Dict[str, Any]]:
+    def run_scenario(
+        self,
+        years: Optional[List[int]] = None,
+        parallel: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Dict[int, SimulationResult]:
         """
         Führt die vollständige Simulation für alle Jahre aus.
         
+        Die Jahre sind unabhängig voneinander (kein Speicher- oder E-Mobility-Zustand
+        wird übertragen). Mit parallel=True werden sie auf einen Prozess-Pool verteilt;
+        Ergebnisreihenfolge, Progress-Meldungen und Rückgabeformat bleiben gleich.
+        
         Args:
             years: Liste der zu simulierenden Jahre. Wenn None, aus Szenario entnommen.
+            parallel: Jahre in separaten Prozessen simulieren (opt-in)
+            max_workers: Anzahl Prozesse (Standard: min(Jahre, CPU-Kerne)). Ein explizit
+                gesetzter Wert wird auch über der Kernzahl verwendet; bei 1 wird
+                sequentiell simuliert und der Rückfall gemeldet (Logger und Progress)
         
         Returns:
-            Dictionary mit Struktur:
+            Dictionary mit Struktur (SimulationResult verhält sich wie ein Dict):
             {
                 jahr: {
                     "consumption": pd.DataFrame,
@@ -131,14 +284,28 @@ class SimulationEngine:
         self._load_base_data()
         
         # Simuliere jedes Jahr
-        results = {}
-        for idx, year in enumerate(years, 1):
-            year_result = self._simulate_year(year, idx, len(years))
-            results[year] = year_result
-            
-            # Progress nach jedem Jahr
-            progress = 20 + int((idx / len(years)) * 75)
-            self._report_progress(progress, f"Jahr {year} abgeschlossen ({idx}/{len(years)})")
+        if max_workers is None:
+            max_workers = min(len(years), os.cpu_count() or 1)
+            fallback_reason = "nur 1 CPU-Kern verfügbar"
+        else:
+            fallback_reason = f"max_workers={max_workers}"
+        
+        if parallel and len(years) > 1 and max_workers <= 1:
+            # Angeforderte Parallelisierung nicht möglich - Rückfall sichtbar machen
+            self.logger.warning(f"Parallele Jahressimulation nicht möglich ({fallback_reason}) - simuliere sequentiell")
+            self._report_progress(20, f"{len(years)} Jahre werden sequentiell simuliert ({fallback_reason})...")
+        
+        if parallel and max_workers > 1 and len(years) > 1:
+            results = self._run_years_parallel(years, max_workers)
+        else:
+            results = {}
+            for idx, year in enumerate(years, 1):
+                year_result = self._simulate_year(year, idx, len(years))
+                results[year] = year_result
+                
+                # Progress nach jedem Jahr
+                progress = 20 + int((idx / len(years)) * 75)
+                self._report_progress(progress, f"Jahr {year} abgeschlossen ({idx}/{len(years)})")
         
         # Abschließende Zusammenfassung
         self._report_progress(98, "Simulation wird finalisiert...")
@@ -146,6 +313,53 @@ class SimulationEngine:
         self._report_progress(100, "Simulation abgeschlossen!")
         return results
     
+    def _run_years_parallel(self, years: List[int], max_workers: int) -> Dict[int, SimulationResult]:
+        """
+        Simuliert die Jahre in einem Prozess-Pool.
+        
+        Ergebnisse werden in der Reihenfolge von years eingesammelt, damit die
+        Progress-Meldungen geordnet und monoton bleiben (ein früher fertiges
+        späteres Jahr wird erst nach seinen Vorgängern gemeldet). Die Worker
+        starten per "spawn" (plattformunabhängig, keine Vererbung von Numba-Threads).
+        """
+        self._report_progress(20, f"{len(years)} Jahre werden parallel simuliert ({max_workers} Prozesse)...")
+        
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_year_worker,
+            initargs=(self._worker_copy(years),)
+        )
+        try:
+            futures = [
+                pool.submit(_simulate_year_in_worker, year, idx, len(years))
+                for idx, year in enumerate(years, 1)
+            ]
+            results = {}
+            for idx, (year, future) in enumerate(zip(years, futures), 1):
+                results[year] = future.result()
+                
+                progress = 20 + int((idx / len(years)) * 75)
+                self._report_progress(progress, f"Jahr {year} abgeschlossen ({idx}/{len(years)})")
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        
+        return results
+    
+    def _worker_copy(self, years: List[int]) -> "SimulationEngine":
+        """
+        Picklebare Kopie der Engine für Worker-Prozesse.
+        
+        Ohne Progress-Callback und Simulationsmodule (werden im Worker neu erzeugt);
+        der DataManager wird durch die Datensätze ersetzt, die für die Jahre
+        abgefragt werden.
+        """
+        worker = copy.copy(self)
+        worker.progress_callback = None
+        worker.dm = snapshot_datasets(self.dm, _year_datasets(self.sm, years))
+        worker.storage_sim = worker.heatpump_sim = worker.balance_calc = None
+        return worker
+    
     def _report_progress(self, progress: int, message: str):
         """Ruft den Progress-Callback auf, falls vorhanden."""
         if self.progress_callback:
@@ -171,14 +385,8 @@ class SimulationEngine:
         # SMARD-Daten laden
         self.logger.start_step("SMARD-Erzeugungsdaten werden geladen")
         try:
-            self.smard_generation = pd.concat([
-                self.dm.get("SMARD_2015-2019_Erzeugung"),
-                self.dm.get("SMARD_2020-2025_Erzeugung"),
-            ])
-            self.smard_installed = pd.concat([
-                self.dm.get("SMARD_Installierte Leistung 2015-2019"),
-                self.dm.get("SMARD_Installierte Leistung 2020-2025"),
-            ])
+            self.smard_generation = pd.concat([self.dm.get(name) for name in SMARD_GENERATION_DATASETS])
+            self.smard_installed = pd.concat([self.dm.get(name) for name in SMARD_CAPACITY_DATASETS])
             self.logger.finish_step(True)
         except Exception as e:
             self.logger.finish_step(False, str(e))
@@ -187,8 +395,19 @@ class SimulationEngine:
         # Ziel-Kapazitäten und Wetterprofile
         self.capacity_dict = self.sm.get_generation_capacities()
         self.weather_profiles = self.sm.scenario_data.get("weather_generation_profiles", {})
+        
+        # Fingerabdrücke der Basisdaten für die Stufen-Schlüssel (einmal pro Lauf)
+        self._fingerprints = {}
+        if self.stage_cache is not None:
+            self._fingerprints["load_profiles"] = [
+                frame_fingerprint(df) for df in (self.last_H, self.last_G, self.last_L)
+            ]
+            self._fingerprints["smard"] = [
+                frame_fingerprint(self.smard_generation),
+                frame_fingerprint(self.smard_installed),
+            ]
     
-    def _simulate_year(self, year: int, year_num: int, total_years: int) -> Dict[str, Any]:
+    def _simulate_year(self, year: int, year_num: int, total_years: int) -> SimulationResult:
         """
         Simuliert ein einzelnes Jahr komplett.
         
@@ -198,7 +417,7 @@ class SimulationEngine:
             total_years: Gesamtzahl der Jahre
         
         Returns:
-            Dictionary mit allen Simulationsergebnissen für dieses Jahr:
+            SimulationResult (dict-kompatibel) mit allen Simulationsergebnissen für dieses Jahr:
             - consumption: BDEW + Wärmepumpen + E-Mobility Verbrauch
             - production: Erzeugung
             - emobility: E-Mobility Details (Verbrauch + V2G/SOC/Charge/Discharge)
@@ -208,39 +427,151 @@ class SimulationEngine:
             - balance_post_flex: Bilanz NACH allen Flexibilitäten (nur Bilanz-Spalten)
             - economics: Wirtschaftlichkeit
         """
-        # 1) Verbrauchssimulation (BDEW + Wärmepumpen)
-        df_cons = self._simulate_consumption(year, year_num, total_years)
+        keys = self._stage_keys(year) if self.stage_cache is not None else {}
         
-        # 2) Erzeugungssimulation
-        df_prod = self._simulate_production(year, year_num, total_years)
+        def stage(name, factory, inputs=(), outputs=(), main_thread=False):
+            def run(*args):
+                return self._run_stage(name, keys.get(name), lambda: factory(*args), year, year_num, total_years)
+            return PipelineStage(name, run, tuple(inputs), tuple(outputs), main_thread)
         
-        # 3) E-MOBILITY-VERBRAUCH (gehört zur Last!)
-        df_cons, df_emobility_consumption = self._simulate_emobility_consumption(df_cons, year, year_num, total_years)
+        scheduler = StageScheduler([
+            # 1) Verbrauchssimulation (BDEW + Wärmepumpen)
+            stage("consumption",
+                  lambda: self._simulate_consumption(year, year_num, total_years),
+                  outputs=["cons_base"]),
+            # 2) Erzeugungssimulation (unabhängig vom Verbrauch)
+            stage("production",
+                  lambda: self._simulate_production(year, year_num, total_years),
+                  outputs=["prod"]),
+            # 3) E-MOBILITY-VERBRAUCH (gehört zur Last!)
+            stage("emobility_consumption",
+                  lambda cons: self._simulate_emobility_consumption(cons, year, year_num, total_years),
+                  inputs=["cons_base"], outputs=["cons", "emob_cons"]),
+            # 4) BILANZ VOR FLEXIBILITÄTEN (Erzeugung - Gesamt-Verbrauch inkl. E-Mobility)
+            stage("balance",
+                  lambda prod, cons: self._calculate_balance(prod, cons, year, year_num, total_years),
+                  inputs=["prod", "cons"], outputs=["balance_pre"]),
+            # 5) E-MOBILITY V2G FLEXIBILITÄT (bidirektionales Laden)
+            stage("v2g",
+                  lambda bal, emob: self._simulate_emobility_flexibility(bal.copy(), emob, year, year_num, total_years),
+                  inputs=["balance_pre", "emob_cons"], outputs=["emob_full", "balance_after_emob"]),
+            # 6) SPEICHER-FLEXIBILITÄT (Batterie -> Pumpspeicher -> H2)
+            stage("storage",
+                  lambda bal: self._simulate_storage(bal, year, year_num, total_years),
+                  inputs=["balance_after_emob"], outputs=["storage", "balance_post"]),
+            # 7) Wirtschaftlichkeitsanalyse
+            stage("economics",
+                  lambda prod, cons, pre, post: self._calculate_economics(prod, cons, pre, post, year, year_num, total_years),
+                  inputs=["prod", "cons", "balance_pre", "balance_post"], outputs=["economics"]),
+        ], max_workers=self.stage_workers)
         
-        # 4) BILANZ VOR FLEXIBILITÄTEN (Erzeugung - Gesamt-Verbrauch inkl. E-Mobility)
-        df_balance_pre = self._calculate_balance(df_prod, df_cons, year, year_num, total_years)
-
-        # 5) E-MOBILITY V2G FLEXIBILITÄT (bidirektionales Laden)
-        df_emobility_full, df_balance_after_emob = self._simulate_emobility_flexibility(
-            df_balance_pre.copy(), df_emobility_consumption, year, year_num, total_years
+        values = scheduler.run()
+        self.stage_timelines[year] = list(scheduler.timeline)
+        if self.logger.verbose:
+            print(scheduler.format_timeline())
+        
+        return SimulationResult.from_frames({
+            "consumption": values["cons"],                        # BDEW + Wärmepumpen + E-Mobility Verbrauch
+            "production": values["prod"],                         # Erzeugung
+            "emobility": values["emob_full"],                     # E-Mobility mit ALLEN Daten (Verbrauch + V2G)
+            "storage": values["storage"],                         # Separate Speicher-Daten
+            "balance_pre_flex": values["balance_pre"],            # Bilanz vor Flexibilitäten (ursprünglich)
+            "balance_after_emob": values["balance_after_emob"],   # Bilanz nach E-Mobility V2G, VOR Speichern
+            "balance_post_flex": values["balance_post"],          # Finale Bilanz nach allen Flexibilitäten
+            "economics": values["economics"],
+        }, dtype=self.result_dtype)
+    
+    def _run_stage(
+        self,
+        stage: str,
+        key: Optional[str],
+        factory,
+        year: int,
+        year_num: int,
+        total_years: int
+    ) -> Any:
+        """Führt eine Stufe aus oder holt ihr Ergebnis aus dem Stufen-Cache."""
+        if self.stage_cache is None or key is None:
+            return factory()
+        
+        computed = []
+        
+        def compute():
+            computed.append(True)
+            return factory()
+        
+        result = self.stage_cache.get_or_compute(stage, key, compute)
+        if not computed:
+            self.logger.start_step(f"[{year_num}/{total_years}] Stufe '{stage}' {year}", "aus Cache")
+            self.logger.finish_step(True)
+        return result
+    
+    def _stage_keys(self, year: int) -> Dict[str, str]:
+        """
+        Inhaltsadressierte Schlüssel aller Stufen eines Jahres.
+        
+        Jeder Schlüssel hasht die Szenario-Abschnitte und Datensätze, die die Stufe
+        liest, sowie die Schlüssel der Stufen, deren Ergebnisse sie verarbeitet.
+        
+        Returns:
+            Dictionary Stufe -> Schlüssel
+        """
+        make_key = StageCache.make_key
+        scenario = self.sm.scenario_data
+        if hasattr(self.sm, "get_heat_pump_parameters"):
+            hp_params = self.sm.get_heat_pump_parameters(year) or {}
+        else:
+            hp_params = scenario.get("target_heat_pump_parameters", {}).get(year, {})
+        em_params = self.sm.get_emobility_parameters(year) or {}
+        storage_params = [
+            self.sm.get_storage_capacities(storage_type, year)
+            for storage_type in ("battery_storage", "pumped_hydro_storage", "h2_storage")
+        ]
+        
+        keys = {}
+        keys["consumption"] = make_key(
+            "consumption", year, self.calculation_mode,
+            scenario.get("target_load_demand_twh", {}),
+            self._fingerprints.get("load_profiles"),
+            hp_params,
+            self._dataset_fingerprint(hp_params.get("weather_data")),
+            self._dataset_fingerprint(HEATPUMP_LOAD_PROFILE_NAME),
         )
-
-        # 6) SPEICHER-FLEXIBILITÄT (Batterie -> Pumpspeicher -> H2)
-        df_storage, df_balance_post = self._simulate_storage(df_balance_after_emob.copy(), year, year_num, total_years)
-        
-        # 7) Wirtschaftlichkeitsanalyse
-        econ_result = self._calculate_economics(df_prod, df_cons, df_balance_pre, df_balance_post, year, year_num, total_years)
-        
-        return {
-            "consumption": df_cons,                    # BDEW + Wärmepumpen + E-Mobility Verbrauch
-            "production": df_prod,                     # Erzeugung
-            "emobility": df_emobility_full,            # E-Mobility mit ALLEN Daten (Verbrauch + V2G)
-            "storage": df_storage,                     # Separate Speicher-Daten
-            "balance_pre_flex": df_balance_pre,        # Bilanz vor Flexibilitäten (ursprünglich)
-            "balance_after_emob": df_balance_after_emob,  # Bilanz nach E-Mobility V2G, VOR Speichern
-            "balance_post_flex": df_balance_post,      # Finale Bilanz nach allen Flexibilitäten
-            "economics": econ_result,
-        }
+        keys["production"] = make_key(
+            "production", year,
+            self.capacity_dict,
+            self.weather_profiles.get(year, {}),
+            self._fingerprints.get("smard"),
+            self.cfg.config.get("GENERATION_SIMULATION", {}),
+        )
+        keys["emobility_consumption"] = make_key(
+            "emobility_consumption", keys["consumption"],
+            em_params,
+            self.cfg.config.get("EV_PARAMETERS", {}),
+        )
+        keys["balance"] = make_key("balance", keys["production"], keys["emobility_consumption"])
+        keys["v2g"] = make_key("v2g", keys["balance"], keys["emobility_consumption"])
+        keys["storage"] = make_key("storage", keys["v2g"], storage_params)
+        keys["economics"] = make_key(
+            "economics", keys["production"], keys["emobility_consumption"],
+            keys["balance"], keys["storage"],
+            scenario.get("metadata", {}).get("valid_for_years"),
+            scenario.get("target_generation_capacities_mw", {}),
+            scenario.get("target_storage_capacities", {}),
+        )
+        return keys
+    
+    def _dataset_fingerprint(self, name: Optional[str]) -> Optional[str]:
+        """Fingerabdruck eines Datensatzes aus dem DataManager (pro Lauf gemerkt, None wenn fehlend)."""
+        if not name:
+            return None
+        if name not in self._fingerprints:
+            try:
+                df = self.dm.get(name)
+            except Exception:
+                df = None
+            self._fingerprints[name] = frame_fingerprint(df) if isinstance(df, pd.DataFrame) else None
+        return self._fingerprints[name]
     
     def _simulate_consumption(self, year: int, year_num: int, total_years: int) -> pd.DataFrame:
         """Führt die Verbrauchssimulation aus (BDEW + Wärmepumpen)."""
@@ -268,7 +599,9 @@ class SimulationEngine:
                 dt=0.25,
                 simu_jahr=year,
                 debug=self.logger.verbose,
-                calculation_mode=self.calculation_mode
+                calculation_mode=self.calculation_mode,
+                wetter_name=hp_config.get("wetter_name") if hp_config else None,
+                station_weights=hp_config.get("station_weights") if hp_config else None
             )
             
             cons_twh = df_result['Gesamt [MWh]'].sum() / 1e6 if 'Gesamt [MWh]' in df_result.columns else 0
@@ -381,12 +714,12 @@ class SimulationEngine:
             # Berechne E-Mobility Verbrauch
             n_ev = scenario_params.s_EV * scenario_params.N_cars
             
-            # Generiere EV-Profil
-            df_ev_profile = generate_ev_profile(timestamps, scenario_params, config_params)
+            # EV-Profil (gecacht, schreibgeschützte Arrays)
+            ev_profile = get_ev_profile_arrays(timestamps, scenario_params, config_params)
             
             # Berechne Fahrverbrauch in MWh (drive_power_kw ist in kW)
             # drive_power_kw [kW] * dt_h [h] = Energie pro Zeitschritt [kWh] -> / 1000 = [MWh]
-            e_mobility_drive_mwh = df_ev_profile['drive_power_kw'].values * config_params.dt_h / 1000.0
+            e_mobility_drive_mwh = ev_profile['drive_power_kw'] * config_params.dt_h / 1000.0
             
             # Ladeverluste: 5-10% vom Fahrverbrauch (verwende 7.5% als Mittelwert)
             charging_loss_factor = 0.075
@@ -402,8 +735,8 @@ class SimulationEngine:
                 'Ladeverluste [MWh]': e_mobility_loss_mwh,
                 'Gesamt Verbrauch [MWh]': e_mobility_total_mwh,
                 'Anzahl Fahrzeuge': n_ev,
-                'Angeschlossene Quote': df_ev_profile['plug_share'].values,
-                'Fahrleistung [kW]': df_ev_profile['drive_power_kw'].values
+                'Angeschlossene Quote': ev_profile['plug_share'],
+                'Fahrleistung [kW]': ev_profile['drive_power_kw']
             })
             
             # Füge NUR die Summe zu df_cons hinzu (Details sind im E-Mobility Tab)
@@ -586,37 +919,47 @@ class SimulationEngine:
             stor_pump = self.sm.get_storage_capacities("pumped_hydro_storage", year) or {}
             stor_h2 = self.sm.get_storage_capacities("h2_storage", year) or {}
             
-            # Kaskade: Batterie -> Pumpspeicher -> Wasserstoff
-            res_bat = self.storage_sim.simulate_battery_storage(
-                df_bal,
-                stor_bat.get("installed_capacity_mwh", 0.0),
-                stor_bat.get("max_charge_power_mw", 0.0),
-                stor_bat.get("max_discharge_power_mw", 0.0),
-                stor_bat.get("initial_soc", 0.0),
-            )
-            
-            res_pump = self.storage_sim.simulate_pump_storage(
-                res_bat,
-                stor_pump.get("installed_capacity_mwh", 0.0),
-                stor_pump.get("max_charge_power_mw", 0.0),
-                stor_pump.get("max_discharge_power_mw", 0.0),
-                stor_pump.get("initial_soc", 0.0),
+            # Kaskade: Batterie -> Pumpspeicher -> Wasserstoff (Prioritätsreihenfolge)
+            configs = [
+                StorageConfig.battery(
+                    stor_bat.get("installed_capacity_mwh", 0.0),
+                    stor_bat.get("max_charge_power_mw", 0.0),
+                    stor_bat.get("max_discharge_power_mw", 0.0),
+                    stor_bat.get("initial_soc", 0.0),
+                ),
+                StorageConfig.pump(
+                    stor_pump.get("installed_capacity_mwh", 0.0),
+                    stor_pump.get("max_charge_power_mw", 0.0),
+                    stor_pump.get("max_discharge_power_mw", 0.0),
+                    stor_pump.get("initial_soc", 0.0),
+                ),
+                StorageConfig.hydrogen(
+                    stor_h2.get("installed_capacity_mwh", 0.0),
+                    stor_h2.get("max_charge_power_mw", 0.0),
+                    stor_h2.get("max_discharge_power_mw", 0.0),
+                    stor_h2.get("initial_soc", 0.0),
+                ),
+            ]
+
+            # Startbilanz: Restbilanz nach E-Mobility (falls vorhanden), sonst Bilanz
+            if 'Rest Bilanz [MWh]' in df_bal.columns:
+                balance = df_bal['Rest Bilanz [MWh]'].to_numpy(dtype=float)
+            else:
+                balance = df_bal['Bilanz [MWh]'].to_numpy(dtype=float)
+
+            # Ein Durchlauf über alle Speicher, Ergebnisse als Spalten-Arrays
+            storage_columns, rest_balance = self.storage_sim.simulate_cascade(
+                balance, df_bal['Zeitpunkt'], configs
             )
-            
-            res_h2 = self.storage_sim.simulate_hydrogen_storage(
-                res_pump,
-                stor_h2.get("installed_capacity_mwh", 0.0),
-                stor_h2.get("max_charge_power_mw", 0.0),
-                stor_h2.get("max_discharge_power_mw", 0.0),
-                stor_h2.get("initial_soc", 0.0),
+
+            df_storage = pd.DataFrame(
+                {'Zeitpunkt': df_bal['Zeitpunkt'], **storage_columns},
+                index=df_bal.index
             )
-            
-            # Trenne Speicher-Spalten von Bilanz-Spalten
-            storage_cols = ['Zeitpunkt'] + [c for c in res_h2.columns if 'speicher' in c.lower() or 'SOC' in c or 'Geladene' in c or 'Entladene' in c]
-            balance_cols = ['Zeitpunkt', 'Produktion [MWh]', 'Verbrauch [MWh]', 'Bilanz [MWh]', 'Rest Bilanz [MWh]']
-            
-            df_storage = res_h2[storage_cols].copy()
-            df_balance = res_h2[[c for c in balance_cols if c in res_h2.columns]].copy()
+
+            balance_cols = ['Zeitpunkt', 'Produktion [MWh]', 'Verbrauch [MWh]', 'Bilanz [MWh]']
+            df_balance = df_bal[[c for c in balance_cols if c in df_bal.columns]].copy()
+            df_balance['Rest Bilanz [MWh]'] = rest_balance
             
             self.logger.finish_step(True)
             return df_storage, df_balance
@@ -676,6 +1019,67 @@ class SimulationEngine:
                 "error": str(e)
             }
     
+    def simulate_heatpump_ensemble(
+        self,
+        year: int,
+        weather_names: Optional[List[str]] = None
+    ) -> Optional[HeatPumpEnsemble]:
+        """
+        Berechnet die Wärmepumpen-Last eines Jahres für mehrere Wetterjahre.
+        
+        Nutzt die WP-Parameter des Szenarios, ersetzt aber den einen Wetterdatensatz
+        ('weather_data') durch alle angegebenen. Das Ergebnis ist eine Auswertung der
+        Wärmepumpen-Last (Jahresverbrauch, Spitzenlast je Wetterjahr); Bilanz, Speicher
+        und Wirtschaftlichkeit von run_scenario nutzen weiterhin nur 'weather_data'.
+        Das Ensemble liegt auf dem Zeitraster des Verbrauchs (inkl. doppeltem
+        Zeitstempel der Zeitumstellung aus 'weather_data'), sodass
+        HeatPumpEnsemble.apply_to_consumption den Verbrauch aus run_scenario
+        zeilengenau je Wetterjahr umrechnen kann.
+        
+        Args:
+            year: Simulationsjahr
+            weather_names: Wetterdatensätze; None = alle Temperature-Datensätze der config
+        
+        Returns:
+            HeatPumpEnsemble oder None, wenn keine WP bzw. keine Wetterdaten vorhanden
+        """
+        hp_config = self._get_heatpump_config(year)
+        if hp_config is None:
+            return None
+        
+        if weather_names is None:
+            weather_names = ScenarioManager.get_available_temperature_datasets(self.cfg)
+        
+        weather_dfs = {}
+        for name in weather_names:
+            try:
+                df_weather = self.dm.get(name)
+            except Exception:
+                df_weather = None
+            if df_weather is None:
+                self.logger.warning(f"Wetterdatensatz '{name}' nicht verfügbar")
+                continue
+            weather_dfs[name] = df_weather
+        if not weather_dfs:
+            return None
+        
+        # Zeitraster der Verbrauchsstufe (AVERAGE-Pfad auf 'weather_data')
+        zeitpunkte, _ = prepare_weather_temperatures(
+            hp_config["wetter_df"], year, location="AVERAGE", dataset_name=hp_config["wetter_name"]
+        )
+        
+        engine = CalculationEngine(mode=self.calculation_mode)
+        return engine.calculate_heatpump_ensemble(
+            weather_dfs=weather_dfs,
+            hp_profile_matrix=hp_config["hp_profile_matrix"],
+            n_heatpumps=hp_config["n_heatpumps"],
+            Q_th_a=hp_config["Q_th_a"],
+            COP_avg=hp_config["COP_avg"],
+            dt=0.25,
+            simu_jahr=year,
+            zeitpunkte=zeitpunkte
+        )
+    
     def _get_heatpump_config(self, year: int) -> Optional[Dict[str, Any]]:
         """
         Lädt Wärmepumpen-Konfiguration für ein Jahr.
@@ -715,10 +1119,12 @@ class SimulationEngine:
             
             return {
                 "wetter_df": wetter_df,
+                "wetter_name": wd_name,
                 "hp_profile_matrix": hp_profile_matrix,
                 "n_heatpumps": hp_config.get("installed_units", 0),
                 "Q_th_a": hp_config.get("annual_heat_demand_kwh", 51000),
                 "COP_avg": hp_config.get("cop_avg", 3.4),
+                "station_weights": hp_config.get("station_weights"),
             }
             
         except Exception:
@@ -0,0 +1,290 @@
+"""
+Kompakter Ergebnis-Container für ein Simulationsjahr.
+
+Die SimulationEngine liefert je Jahr mehrere DataFrames (Verbrauch, Erzeugung,
+E-Mobility, Speicher, drei Bilanzen), die jeweils eine eigene Zeitpunkt-Spalte
+tragen und teils identische Spalten wiederholen (z.B. Produktion/Verbrauch in
+allen Bilanzen). SimulationResult speichert stattdessen:
+
+- je Zeitachse einen gemeinsamen Zeitindex (datetime64)
+- alle Float-Spalten dieser Zeitachse in einem zusammenhängenden Puffer
+  (Spalten x Zeitschritte), inhaltsgleiche Spalten nur einmal
+- optional als float32 (halber Speicher, für Vergleichsansichten)
+
+DataFrames werden erst beim Zugriff als schreibgeschützte Sichten auf den
+Puffer erzeugt (ohne Kopie). Der Container verhält sich wie ein Dict
+(results[year]["consumption"], .get, .keys, .items), damit UI und Export
+unverändert weiterarbeiten. Werte, die nicht in das Schema passen (z.B. das
+Wirtschaftlichkeits-Dict oder leere DataFrames), werden unverändert abgelegt.
+
+Usage:
+    from data_processing.simulation_result import SimulationResult
+
+    result = SimulationResult.from_frames(year_frames, dtype="float32")
+    df = result["balance_post_flex"]           # Sicht, schreibgeschützt
+    df_edit = result.frame("storage", copy=True)
+    print(result.nbytes, result.frames_nbytes())
+"""
+
+import hashlib
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_processing.cache_utils import readonly_array
+
+
+# Name der gemeinsamen Zeitspalte aller Ergebnis-DataFrames
+TIME_COLUMN = "Zeitpunkt"
+
+# Zulässige Speicher-Datentypen der Float-Spalten
+RESULT_DTYPES = ("float64", "float32")
+
+
+@dataclass
+class _FrameLayout:
+    """Aufbau eines gepackten DataFrames: Zeitachse und Pufferzeile je Spalte (-1 = Zeitspalte)."""
+    group: int
+    columns: List[Any]
+    slots: List[int]
+
+
+class SimulationResult(Mapping):
+    """
+    Dict-kompatibler, Array-basierter Container für die Ergebnisse eines Jahres.
+
+    Erzeugung über SimulationResult.from_frames; Zugriff wie auf ein Dict von
+    DataFrames.
+    """
+
+    def __init__(
+        self,
+        time_indices: List[np.ndarray],
+        buffers: List[np.ndarray],
+        layouts: Dict[str, _FrameLayout],
+        objects: Dict[str, Any],
+        order: List[str]
+    ):
+        """
+        Initialisiert den Container aus bereits gepackten Daten (siehe from_frames).
+
+        Args:
+            time_indices: Zeitindex je Zeitachse (datetime64[ns])
+            buffers: Puffer je Zeitachse, Form (Spalten, Zeitschritte)
+            layouts: Aufbau der gepackten DataFrames
+            objects: Unverändert abgelegte Werte
+            order: Reihenfolge der Schlüssel
+        """
+        self._time_indices = [readonly_array(t) for t in time_indices]
+        self._buffers = [readonly_array(b) for b in buffers]
+        self._layouts = layouts
+        self._objects = objects
+        self._order = list(order)
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, Any], dtype: str = "float64") -> "SimulationResult":
+        """
+        Packt ein Ergebnis-Dict eines Jahres in den Container.
+
+        Gepackt werden DataFrames mit Standard-RangeIndex, einer datetime64-Spalte
+        'Zeitpunkt' und ansonsten ausschließlich Float-Spalten. DataFrames mit
+        gleicher Zeitachse teilen sich Zeitindex und Puffer.
+
+        Args:
+            frames: Dictionary Name -> DataFrame bzw. beliebiger Wert
+            dtype: Speicher-Datentyp der Float-Spalten ("float64" oder "float32")
+
+        Returns:
+            SimulationResult
+
+        Raises:
+            ValueError: Bei nicht unterstütztem dtype
+        """
+        if str(dtype) not in RESULT_DTYPES:
+            raise ValueError(f"dtype muss einer von {RESULT_DTYPES} sein, nicht '{dtype}'")
+        dtype = np.dtype(dtype)
+
+        time_indices: List[np.ndarray] = []
+        group_columns: List[List[np.ndarray]] = []
+        group_lookup: List[Dict[bytes, int]] = []
+        layouts: Dict[str, _FrameLayout] = {}
+        objects: Dict[str, Any] = {}
+
+        for name, value in frames.items():
+            if not _is_packable(value):
+                objects[name] = value
+                continue
+
+            times = value[TIME_COLUMN].to_numpy()
+            group = _find_group(time_indices, times)
+            if group is None:
+                group = len(time_indices)
+                time_indices.append(times.copy())
+                group_columns.append([])
+                group_lookup.append({})
+
+            slots = []
+            for col in value.columns:
+                if col == TIME_COLUMN:
+                    slots.append(-1)
+                    continue
+                values = np.ascontiguousarray(value[col].to_numpy(), dtype=dtype)
+                slots.append(_add_column(group_columns[group], group_lookup[group], values))
+            layouts[name] = _FrameLayout(group=group, columns=list(value.columns), slots=slots)
+
+        buffers = []
+        for times, columns in zip(time_indices, group_columns):
+            buffer = np.empty((len(columns), len(times)), dtype=dtype)
+            for slot, values in enumerate(columns):
+                buffer[slot] = values
+            buffers.append(buffer)
+
+        return cls(time_indices, buffers, layouts, objects, list(frames.keys()))
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Speicher-Datentyp der Float-Spalten."""
+        return self._buffers[0].dtype if self._buffers else np.dtype("float64")
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Speicherbedarf [Byte] von Zeitindizes, Puffern und unverändert abgelegten DataFrames.
+
+        Sonstige Objekte (z.B. das Wirtschaftlichkeits-Dict) sind nicht enthalten.
+        """
+        total = sum(t.nbytes for t in self._time_indices) + sum(b.nbytes for b in self._buffers)
+        for value in self._objects.values():
+            if isinstance(value, pd.DataFrame):
+                total += int(value.memory_usage(index=True, deep=True).sum())
+        return total
+
+    def frames_nbytes(self) -> int:
+        """
+        Speicherbedarf [Byte], den dieselben Ergebnisse als Dict von float64-DataFrames hätten.
+
+        Vergleichswert zu nbytes (jede Spalte einzeln, ohne gemeinsame Nutzung).
+        """
+        total = 0
+        for layout in self._layouts.values():
+            n_steps = len(self._time_indices[layout.group])
+            total += len(layout.columns) * n_steps * 8
+        for value in self._objects.values():
+            if isinstance(value, pd.DataFrame):
+                total += int(value.memory_usage(index=True, deep=True).sum())
+        return total
+
+    def frame(self, name: str, copy: bool = False) -> pd.DataFrame:
+        """
+        Erzeugt den DataFrame zu name.
+
+        Args:
+            name: Ergebnisname (z.B. "consumption")
+            copy: True = beschreibbare Kopie, False = schreibgeschützte Sicht auf den Puffer
+
+        Returns:
+            DataFrame mit den ursprünglichen Spalten (Reihenfolge wie beim Packen)
+
+        Raises:
+            KeyError: Wenn name kein gepackter DataFrame ist
+        """
+        layout = self._layouts[name]
+        times = self._time_indices[layout.group]
+        buffer = self._buffers[layout.group]
+        data = {
+            col: times if slot < 0 else buffer[slot]
+            for col, slot in zip(layout.columns, layout.slots)
+        }
+        return pd.DataFrame(data, copy=copy)
+
+    def time_index(self, name: str) -> pd.DatetimeIndex:
+        """Zeitindex des gepackten DataFrames name."""
+        return pd.DatetimeIndex(self._time_indices[self._layouts[name].group], name=TIME_COLUMN)
+
+    def column(self, name: str, col: Any) -> np.ndarray:
+        """
+        Einzelne Spalte als schreibgeschütztes Array (ohne DataFrame-Aufbau).
+
+        Raises:
+            KeyError: Wenn name oder col nicht vorhanden ist
+        """
+        layout = self._layouts[name]
+        try:
+            slot = layout.slots[layout.columns.index(col)]
+        except ValueError:
+            raise KeyError(col)
+        if slot < 0:
+            return self._time_indices[layout.group]
+        return self._buffers[layout.group][slot]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Ergebnis als klassisches Dict mit beschreibbaren DataFrame-Kopien."""
+        return {
+            name: self.frame(name, copy=True) if name in self._layouts else self._objects[name]
+            for name in self._order
+        }
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._layouts:
+            return self.frame(name)
+        return self._objects[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._layouts or name in self._objects
+
+    def __setstate__(self, state):
+        # Nach dem Entpicklen (z.B. aus Worker-Prozessen) wieder schreibgeschützt
+        self.__dict__.update(state)
+        self._time_indices = [readonly_array(t) for t in self._time_indices]
+        self._buffers = [readonly_array(b) for b in self._buffers]
+
+    def __repr__(self) -> str:
+        return (f"SimulationResult(keys={self._order}, dtype={self.dtype}, "
+                f"nbytes={self.nbytes / 1e6:.1f} MB)")
+
+
+def _is_packable(value: Any) -> bool:
+    """Prüft, ob ein Wert dem Schema Zeitpunkt + Float-Spalten mit RangeIndex entspricht."""
+    if not isinstance(value, pd.DataFrame) or value.empty:
+        return False
+    index = value.index
+    if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1):
+        return False
+    if not value.columns.is_unique or TIME_COLUMN not in value.columns:
+        return False
+    for col, col_dtype in value.dtypes.items():
+        if col == TIME_COLUMN:
+            if col_dtype != np.dtype("datetime64[ns]"):
+                return False
+        elif not (isinstance(col_dtype, np.dtype) and col_dtype.kind == "f"):
+            return False
+    return True
+
+
+def _find_group(time_indices: List[np.ndarray], times: np.ndarray) -> Optional[int]:
+    """Index der Zeitachse mit identischen Zeitpunkten oder None."""
+    for group, existing in enumerate(time_indices):
+        if len(existing) == len(times) and np.array_equal(existing, times):
+            return group
+    return None
+
+
+def _add_column(columns: List[np.ndarray], lookup: Dict[bytes, int], values: np.ndarray) -> int:
+    """Fügt eine Spalte hinzu bzw. liefert die Pufferzeile einer inhaltsgleichen Spalte."""
+    digest = hashlib.blake2b(values.tobytes(), digest_size=16).digest()
+    slot = lookup.get(digest)
+    if slot is not None and np.array_equal(columns[slot], values, equal_nan=True):
+        return slot
+    columns.append(values)
+    slot = len(columns) - 1
+    lookup.setdefault(digest, slot)
+    return slot
@@ -0,0 +1,302 @@
+"""
+Inhaltsadressierter Cache für die Stufen der Simulationspipeline.
+
+Jede Stufe der SimulationEngine (Verbrauch, Erzeugung, E-Mobility-Verbrauch,
+Bilanz, V2G, Speicher, Wirtschaftlichkeit) ist eine reine Funktion aus
+Szenario-Abschnitten und Basisdatensätzen. Der Schlüssel einer Stufe ist ein
+stabiler Hash über genau diese Eingaben (YAML-Teilbaum, Datensatz-Fingerabdrücke,
+Berechnungsmodus) und die Schlüssel der vorgelagerten Stufen. Ändert sich nur
+ein Abschnitt, werden nur die davon abhängigen Stufen neu berechnet.
+
+Zwei Ebenen:
+- Speicher: LRUCache (immer aktiv)
+- Festplatte: optional, Pickle-Dateien mit größenbasierter Verdrängung
+  (zuletzt genutzte Dateien bleiben erhalten); für den prozessweiten
+  STAGE_CACHE über den Abschnitt "STAGE_CACHE" der config.json aktiviert
+
+Alle Schlüssel enthalten STAGE_CACHE_VERSION. Ändert sich eine Stufe oder das
+Format ihres Ergebnisses, wird die Version erhöht - alte Einträge (v.a. auf der
+Festplatte) werden dann nicht mehr gefunden.
+
+Werte werden beim Ablegen und beim Auslesen kopiert, damit Aufrufer (z.B. die
+UI) gecachte DataFrames nicht verändern können.
+
+Usage:
+    from data_processing.stage_cache import STAGE_CACHE
+
+    configure_stage_cache(cfg.config.get("STAGE_CACHE", {}))
+    key = STAGE_CACHE.make_key("storage", upstream_key, storage_params)
+    df = STAGE_CACHE.get_or_compute("storage", key, lambda: run_storage(...))
+    print(STAGE_CACHE.stats())
+"""
+
+import copy
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from data_processing.cache_utils import LRUCache, stable_hash
+
+
+# Version der Stufen-Schlüssel: erhöhen, wenn sich Berechnung oder Ergebnisformat
+# einer Stufe ändert (macht alle gespeicherten Einträge ungültig)
+STAGE_CACHE_VERSION = 1
+
+# Präfix der Cache-Dateien (Schutz vor versehentlichem Löschen fremder Dateien)
+_DISK_PREFIX = "stage-"
+_DISK_SUFFIX = ".pkl"
+
+# Markiert "kein Eintrag" (None ist ein gültiger Stufenwert)
+_MISSING = object()
+
+
+class StageCache:
+    """
+    Zweistufiger Cache (Speicher + optional Festplatte) für Pipeline-Stufen.
+
+    Zählt je Stufe Speicher-Treffer, Festplatten-Treffer, Fehlschläge und die
+    Rechenzeit der Fehlschläge. Alle Operationen sind threadsicher.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 64,
+        disk_dir: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = 1024 ** 3,
+        name: str = "Stufen"
+    ):
+        """
+        Initialisiert den Cache.
+
+        Args:
+            maxsize: Maximale Anzahl Einträge im Speicher
+            disk_dir: Verzeichnis der Festplatten-Ebene (None = deaktiviert)
+            max_disk_bytes: Maximale Gesamtgröße der Festplatten-Ebene [Byte]
+            name: Anzeigename für Statistiken
+        """
+        self.memory = LRUCache(maxsize=maxsize, name=name)
+        self.disk_dir: Optional[Path] = None
+        self.max_disk_bytes = max_disk_bytes
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.RLock()
+        if disk_dir is not None:
+            self.enable_disk(disk_dir, max_disk_bytes)
+
+    def enable_disk(self, disk_dir: Union[str, Path], max_bytes: Optional[int] = None) -> None:
+        """
+        Aktiviert die Festplatten-Ebene.
+
+        Args:
+            disk_dir: Verzeichnis für die Cache-Dateien (wird angelegt)
+            max_bytes: Maximale Gesamtgröße [Byte]; None = bisheriger Wert
+        """
+        path = Path(disk_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.disk_dir = path
+            if max_bytes is not None:
+                self.max_disk_bytes = max_bytes
+        self._evict_disk()
+
+    def disable_disk(self) -> None:
+        """Deaktiviert die Festplatten-Ebene (Dateien bleiben erhalten)."""
+        with self._lock:
+            self.disk_dir = None
+
+    @staticmethod
+    def make_key(stage: str, *parts: Any) -> str:
+        """
+        Schlüssel einer Stufe aus ihren Eingaben.
+
+        Args:
+            stage: Name der Stufe
+            *parts: Eingaben (YAML-Teilbäume, Fingerabdrücke, Schlüssel vorgelagerter Stufen)
+
+        Returns:
+            Hex-Digest (32 Zeichen), abhängig von STAGE_CACHE_VERSION
+        """
+        return stable_hash("stage", STAGE_CACHE_VERSION, stage, *parts)
+
+    def get_or_compute(self, stage: str, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Liefert das Ergebnis einer Stufe aus dem Cache oder berechnet es.
+
+        Args:
+            stage: Name der Stufe (für Statistik und Dateinamen)
+            key: Schlüssel aus make_key
+            factory: Funktion ohne Argumente, die das Ergebnis berechnet
+
+        Returns:
+            Kopie des gecachten bzw. das neu berechnete Ergebnis
+        """
+        # Eine einzige Abfrage unter dem Lock des LRUCache: zwischen Prüfung und Zugriff
+        # könnte ein anderer Thread (StageScheduler) den Eintrag sonst verdrängen
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count(stage, "memory_hits")
+            return copy.deepcopy(value)
+
+        value = self._read_disk(stage, key)
+        if value is not _MISSING:
+            self.memory.put(key, value)
+            self._count(stage, "disk_hits")
+            return copy.deepcopy(value)
+
+        t0 = time.perf_counter()
+        value = factory()
+        self._count(stage, "misses", compute_s=time.perf_counter() - t0)
+
+        stored = copy.deepcopy(value)
+        self.memory.put(key, stored)
+        self._write_disk(stage, key, stored)
+        return value
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Statistik je Stufe.
+
+        Returns:
+            Dictionary Stufe -> {'memory_hits', 'disk_hits', 'misses', 'compute_s'}
+        """
+        with self._lock:
+            return {stage: dict(counts) for stage, counts in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        """Setzt die Statistik je Stufe zurück."""
+        with self._lock:
+            self._stats.clear()
+
+    def disk_usage(self) -> int:
+        """Gesamtgröße der Festplatten-Ebene [Byte] (0 wenn deaktiviert)."""
+        return sum(size for _, _, size in self._disk_entries())
+
+    def clear(self, disk: bool = False) -> None:
+        """
+        Leert den Speicher-Cache und die Statistik.
+
+        Args:
+            disk: Auch die Cache-Dateien der Festplatten-Ebene löschen
+        """
+        self.memory.clear()
+        self.reset_stats()
+        if disk:
+            for path, _, _ in self._disk_entries():
+                path.unlink(missing_ok=True)
+
+    def __getstate__(self):
+        # Für Worker-Prozesse: nur Konfiguration, keine Einträge und kein Lock
+        return {
+            "maxsize": self.memory.maxsize,
+            "name": self.memory.name,
+            "disk_dir": self.disk_dir,
+            "max_disk_bytes": self.max_disk_bytes,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(
+            maxsize=state["maxsize"],
+            disk_dir=state["disk_dir"],
+            max_disk_bytes=state["max_disk_bytes"],
+            name=state["name"],
+        )
+
+    def __repr__(self) -> str:
+        return (f"StageCache(memory={self.memory!r}, disk_dir={self.disk_dir}, "
+                f"max_disk_bytes={self.max_disk_bytes})")
+
+    def _count(self, stage: str, field: str, compute_s: float = 0.0) -> None:
+        with self._lock:
+            counts = self._stats.setdefault(
+                stage, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "compute_s": 0.0}
+            )
+            counts[field] += 1
+            counts["compute_s"] += compute_s
+
+    def _disk_path(self, stage: str, key: str) -> Optional[Path]:
+        disk_dir = self.disk_dir
+        if disk_dir is None:
+            return None
+        return disk_dir / f"{_DISK_PREFIX}{stage}-{key}{_DISK_SUFFIX}"
+
+    def _read_disk(self, stage: str, key: str) -> Any:
+        path = self._disk_path(stage, key)
+        if path is None or not path.exists():
+            return _MISSING
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            # Zugriffszeit für die LRU-Verdrängung auffrischen
+            os.utime(path)
+            return value
+        except Exception:
+            # Defekte oder inkompatible Datei: als Fehlschlag behandeln
+            path.unlink(missing_ok=True)
+            return _MISSING
+
+    def _write_disk(self, stage: str, key: str, value: Any) -> None:
+        path = self._disk_path(stage, key)
+        if path is None:
+            return
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._evict_disk()
+
+    def _disk_entries(self):
+        disk_dir = self.disk_dir
+        if disk_dir is None or not disk_dir.exists():
+            return []
+        entries = []
+        for path in disk_dir.glob(f"{_DISK_PREFIX}*{_DISK_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, st.st_mtime, st.st_size))
+        return entries
+
+    def _evict_disk(self) -> None:
+        """Löscht die am längsten nicht genutzten Dateien, bis max_disk_bytes eingehalten ist."""
+        with self._lock:
+            entries = sorted(self._disk_entries(), key=lambda e: e[1])
+            total = sum(size for _, _, size in entries)
+            for path, _, size in entries:
+                if total <= self.max_disk_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+# Prozessweiter Stufen-Cache der SimulationEngine (Festplatten-Ebene über configure_stage_cache)
+STAGE_CACHE = StageCache(maxsize=64, name="Pipeline-Stufen")
+
+
+def configure_stage_cache(settings: Dict[str, Any], cache: StageCache = STAGE_CACHE) -> StageCache:
+    """
+    Schaltet die Festplatten-Ebene gemäß Abschnitt "STAGE_CACHE" der config.json.
+
+    Args:
+        settings: {"disk_enabled": bool, "disk_dir": str, "max_disk_gb": float};
+            relative Verzeichnisse gelten ab dem Arbeitsverzeichnis (wie output_dir)
+        cache: Zu konfigurierender Cache (Standard: STAGE_CACHE)
+
+    Returns:
+        Der konfigurierte Cache
+    """
+    if not settings.get("disk_enabled", False):
+        cache.disable_disk()
+        return cache
+
+    disk_dir = str(settings.get("disk_dir", "output/stage_cache")).replace("\\", "/")
+    max_bytes = int(float(settings.get("max_disk_gb", 1.0)) * 1024 ** 3)
+    if cache.disk_dir != Path(disk_dir) or cache.max_disk_bytes != max_bytes:
+        cache.enable_disk(disk_dir, max_bytes)
+    return cache
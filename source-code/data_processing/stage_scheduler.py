@@ -0,0 +1,234 @@
+"""
+Abhängigkeitsgraph-Scheduler für die Stufen eines Simulationsjahres.
+
+Eine Stufe deklariert ihre Eingaben und Ausgaben als Namen. Der Scheduler
+startet jede Stufe, sobald alle Eingaben vorliegen; unabhängige Stufen (z.B.
+Verbrauch und Erzeugung) laufen gleichzeitig in einem Thread-Pool. NumPy- und
+Numba-Kernel geben dabei den GIL frei.
+
+Stufen mit main_thread=True laufen immer im aufrufenden Thread. Das ist für
+Stufen mit parallelen Numba-Kerneln nötig: mit dem TBB-Threading-Layer blockiert
+sonst das Interpreter-Ende (siehe numba_compat). Der aufrufende Thread arbeitet
+auch sonst mit, sodass max_workers=2 nur einen Zusatz-Thread startet.
+
+Pro Lauf wird eine Zeitleiste (Start, Ende, Thread je Stufe) aufgezeichnet.
+
+Usage:
+    from data_processing.stage_scheduler import PipelineStage, StageScheduler
+
+    scheduler = StageScheduler([
+        PipelineStage("a", load_a, outputs=("a",)),
+        PipelineStage("b", load_b, outputs=("b",)),
+        PipelineStage("sum", lambda a, b: a + b, inputs=("a", "b"), outputs=("total",)),
+    ], max_workers=2)
+    values = scheduler.run()
+    print(scheduler.format_timeline())
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PipelineStage:
+    """
+    Eine Stufe im Abhängigkeitsgraphen.
+
+    func erhält die Werte von inputs als Positionsargumente (in dieser
+    Reihenfolge). Bei einer Ausgabe wird der Rückgabewert direkt abgelegt,
+    bei mehreren muss func ein Tupel passender Länge liefern.
+    """
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    main_thread: bool = False
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    """Zeitleisten-Eintrag einer Stufe (Zeiten relativ zum Start des Laufs)."""
+    name: str
+    start_s: float
+    end_s: float
+    thread: str
+
+    @property
+    def duration_s(self) -> float:
+        """Laufzeit der Stufe [s]."""
+        return self.end_s - self.start_s
+
+
+class StageScheduler:
+    """
+    Führt einen Abhängigkeitsgraphen von PipelineStages mit einem Thread-Pool aus.
+
+    Der Graph wird beim Anlegen geprüft (eindeutige Namen und Ausgaben, keine
+    Zyklen). Mit max_workers=1 laufen alle Stufen nacheinander im aufrufenden
+    Thread (jeweils die erste bereite Stufe in Deklarationsreihenfolge).
+    """
+
+    def __init__(self, stages: List[PipelineStage], max_workers: int = 2):
+        """
+        Initialisiert den Scheduler.
+
+        Args:
+            stages: Stufen des Graphen (Reihenfolge = Priorität bei gleichzeitig bereiten Stufen)
+            max_workers: Gleichzeitig laufende Stufen inkl. aufrufendem Thread (>= 1)
+
+        Raises:
+            ValueError: Bei doppelten Namen/Ausgaben, Zyklen oder max_workers < 1
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers muss >= 1 sein")
+        self.stages = list(stages)
+        self.max_workers = max_workers
+        self.timeline: List[StageTiming] = []
+        self._producers = _validate_graph(self.stages)
+        self._timeline_lock = threading.Lock()
+
+    @property
+    def external_inputs(self) -> List[str]:
+        """Eingaben, die keine Stufe erzeugt (müssen an run übergeben werden)."""
+        names = []
+        for stage in self.stages:
+            for name in stage.inputs:
+                if name not in self._producers and name not in names:
+                    names.append(name)
+        return names
+
+    def run(self, initial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Führt alle Stufen aus.
+
+        Args:
+            initial: Werte der externen Eingaben
+
+        Returns:
+            Dictionary mit initial und allen Ausgaben der Stufen
+
+        Raises:
+            ValueError: Wenn externe Eingaben fehlen
+            Exception: Der erste Fehler einer Stufe (laufende Stufen werden abgewartet,
+                noch nicht gestartete nicht mehr ausgeführt)
+        """
+        values: Dict[str, Any] = dict(initial or {})
+        missing = [name for name in self.external_inputs if name not in values]
+        if missing:
+            raise ValueError(f"Fehlende Eingaben für den Stufen-Graphen: {missing}")
+
+        self.timeline = []
+        t0 = time.perf_counter()
+        pending = list(self.stages)
+
+        if self.max_workers == 1:
+            while pending:
+                stage = next(s for s in pending if all(name in values for name in s.inputs))
+                pending.remove(stage)
+                self._store(stage, self._execute(stage, values, t0), values)
+            return values
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers - 1, thread_name_prefix="stage")
+        running: Dict[Future, PipelineStage] = {}
+        try:
+            while pending or running:
+                # Fertige Stufen einsammeln (Fehler werden hier weitergereicht)
+                for future in [f for f in running if f.done()]:
+                    self._store(running.pop(future), future.result(), values)
+
+                # Eine bereite Stufe läuft im aufrufenden Thread (Haupt-Thread-Stufen zuerst),
+                # weitere bereite Stufen gehen an den Pool
+                ready = [s for s in pending if all(name in values for name in s.inputs)]
+                inline = next((s for s in ready if s.main_thread), None)
+                if inline is None and ready:
+                    inline = ready[0]
+                for stage in ready:
+                    if stage.main_thread or stage is inline:
+                        continue
+                    if len(running) < self.max_workers - 1:
+                        pending.remove(stage)
+                        running[pool.submit(self._execute, stage, values, t0)] = stage
+
+                if inline is not None:
+                    pending.remove(inline)
+                    self._store(inline, self._execute(inline, values, t0), values)
+                elif running:
+                    wait(list(running), return_when=FIRST_COMPLETED)
+                elif pending:
+                    # Kann nach _validate_graph nicht auftreten
+                    raise RuntimeError(f"Stufen ohne erfüllbare Eingaben: {[s.name for s in pending]}")
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        return values
+
+    def format_timeline(self) -> str:
+        """Zeitleiste des letzten Laufs als Text (eine Zeile pro Stufe, nach Startzeit)."""
+        lines = []
+        for entry in sorted(self.timeline, key=lambda e: e.start_s):
+            lines.append(
+                f"{entry.name:<24} {entry.start_s * 1000:8.1f} ms -> {entry.end_s * 1000:8.1f} ms "
+                f"({entry.duration_s * 1000:7.1f} ms, {entry.thread})"
+            )
+        return "\n".join(lines)
+
+    def _execute(self, stage: PipelineStage, values: Dict[str, Any], t0: float) -> Any:
+        args = [values[name] for name in stage.inputs]
+        start = time.perf_counter() - t0
+        try:
+            return stage.func(*args)
+        finally:
+            entry = StageTiming(
+                name=stage.name,
+                start_s=start,
+                end_s=time.perf_counter() - t0,
+                thread=threading.current_thread().name,
+            )
+            with self._timeline_lock:
+                self.timeline.append(entry)
+
+    @staticmethod
+    def _store(stage: PipelineStage, result: Any, values: Dict[str, Any]) -> None:
+        if len(stage.outputs) == 1:
+            values[stage.outputs[0]] = result
+        elif stage.outputs:
+            if not isinstance(result, tuple) or len(result) != len(stage.outputs):
+                raise ValueError(
+                    f"Stufe '{stage.name}' muss {len(stage.outputs)} Werte liefern ({stage.outputs})"
+                )
+            values.update(zip(stage.outputs, result))
+
+
+def _validate_graph(stages: List[PipelineStage]) -> Dict[str, str]:
+    """
+    Prüft den Graphen und liefert Ausgabe -> erzeugende Stufe.
+
+    Raises:
+        ValueError: Bei doppelten Stufennamen, mehrfach erzeugten Ausgaben oder Zyklen
+    """
+    names = set()
+    producers: Dict[str, str] = {}
+    for stage in stages:
+        if stage.name in names:
+            raise ValueError(f"Doppelter Stufenname: '{stage.name}'")
+        names.add(stage.name)
+        for output in stage.outputs:
+            if output in producers:
+                raise ValueError(f"Ausgabe '{output}' wird von '{producers[output]}' und '{stage.name}' erzeugt")
+            producers[output] = stage.name
+
+    # Kahn: Stufen ohne offene interne Abhängigkeiten nacheinander entfernen
+    available = set()
+    remaining = list(stages)
+    while remaining:
+        ready = [s for s in remaining
+                 if all(name in available or name not in producers for name in s.inputs)]
+        if not ready:
+            raise ValueError(f"Zyklische Abhängigkeit zwischen Stufen: {[s.name for s in remaining]}")
+        for stage in ready:
+            available.update(stage.outputs)
+            remaining.remove(stage)
+    return producers
@@ -19,8 +19,10 @@ Alle Speicher-Spalten folgen dem Muster: "{Speichertyp} {Metrik} MWh"
 
 import pandas as pd
 import numpy as np
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 from data_processing.simulation_logger import SimulationLogger
+from data_processing.numba_compat import jit, prange, compile_for, register_warmup
 
 # Import zentrale Spaltennamen (für Referenz, direkte Nutzung im generischen Modell nicht praktikabel)
 try:
@@ -28,6 +30,125 @@ try:
 except ImportError:
     COLUMN_NAMES = {}  # Fallback falls constants nicht verfügbar
 
+# Dispatch-Strategien der Speicher (als int kodiert für die kompilierten Kernel)
+DISPATCH_GENERIC = 0        # Generisches Bucket-Modell (Batterie, Pumpspeicher)
+DISPATCH_H2_SEASONAL = 1    # H2 mit saisonaler "Sommer-Fill"-Strategie
+
+# Spaltenindizes der Parametermatrix für _storage_cascade_kernel
+_P_CAPACITY = 0
+_P_MIN_SOC = 1
+_P_MAX_SOC = 2
+_P_ETA_CH = 3
+_P_ETA_DIS = 4
+_P_MAX_CHARGE = 5
+_P_MAX_DISCHARGE = 6
+_P_INITIAL_SOC = 7
+_P_TARGET_SOC = 8
+_N_PARAMS = 9
+
+# Spaltenindizes der Kennzahlen aus _storage_sweep_kernel
+_S_UNSERVED = 0
+_S_CURTAILED = 1
+_S_CHARGED = 2
+_S_DISCHARGED = 3
+_S_STORED = 4
+_S_FINAL_SOC = 5
+_N_STATS = 6
+
+
+@dataclass
+class StorageConfig:
+    """
+    Parameter eines Speichers innerhalb der Speicherkaskade.
+
+    Alle Energiewerte in absoluten MWh, Leistungen in MW. Die Factory-Methoden
+    battery/pump/hydrogen liefern die typischen Parameter der jeweiligen
+    simulate_*_storage Methoden.
+    """
+    type_name: str                      # Spaltenpräfix, z.B. "Batteriespeicher"
+    capacity_mwh: float
+    max_charge_mw: float
+    max_discharge_mw: float
+    charge_efficiency: float
+    discharge_efficiency: float
+    initial_soc_mwh: float = 0.0
+    min_soc_mwh: float = 0.0
+    max_soc_mwh: Optional[float] = None  # None = capacity_mwh
+    dispatch: int = DISPATCH_GENERIC
+    target_soc_mwh: float = 0.0          # Nur H2: Ziel-SOC am 01.11.
+
+    @classmethod
+    def battery(cls, capacity_mwh: float, max_charge_mw: float,
+                max_discharge_mw: float, initial_soc: float = 0.0) -> "StorageConfig":
+        """Batteriespeicher: 95% Wirkungsgrad, SOC 5-95%. initial_soc als Anteil (0.0-1.0)."""
+        return cls(
+            type_name="Batteriespeicher",
+            capacity_mwh=capacity_mwh,
+            max_charge_mw=max_charge_mw,
+            max_discharge_mw=max_discharge_mw,
+            charge_efficiency=0.95,
+            discharge_efficiency=0.95,
+            initial_soc_mwh=initial_soc * capacity_mwh,
+            min_soc_mwh=0.05 * capacity_mwh,
+            max_soc_mwh=0.95 * capacity_mwh,
+        )
+
+    @classmethod
+    def pump(cls, capacity_mwh: float, max_charge_mw: float,
+             max_discharge_mw: float, initial_soc: float = 0.0) -> "StorageConfig":
+        """Pumpspeicher: 88% Wirkungsgrad, SOC 0-100%. initial_soc als Anteil (0.0-1.0)."""
+        return cls(
+            type_name="Pumpspeicher",
+            capacity_mwh=capacity_mwh,
+            max_charge_mw=max_charge_mw,
+            max_discharge_mw=max_discharge_mw,
+            charge_efficiency=0.88,
+            discharge_efficiency=0.88,
+            initial_soc_mwh=initial_soc * capacity_mwh,
+            min_soc_mwh=0.0,
+            max_soc_mwh=capacity_mwh,
+        )
+
+    @classmethod
+    def hydrogen(cls, capacity_mwh: float, max_charge_mw: float,
+                 max_discharge_mw: float, initial_soc: float = 0.0) -> "StorageConfig":
+        """H2-Speicher (IPJ-Logik): 67% Elektrolyse, 58% Rückverstromung, Ziel 80% SOC am 01.11."""
+        return cls(
+            type_name="Wasserstoffspeicher",
+            capacity_mwh=capacity_mwh,
+            max_charge_mw=max_charge_mw,
+            max_discharge_mw=max_discharge_mw,
+            charge_efficiency=0.67,
+            discharge_efficiency=0.58,
+            initial_soc_mwh=initial_soc * capacity_mwh,
+            min_soc_mwh=0.0,
+            max_soc_mwh=capacity_mwh,
+            dispatch=DISPATCH_H2_SEASONAL,
+            target_soc_mwh=capacity_mwh * 0.80,
+        )
+
+    def to_param_row(self) -> np.ndarray:
+        """Packt die Parameter in eine Zeile der Parametermatrix (Reihenfolge siehe _P_*)."""
+        row = np.zeros(_N_PARAMS)
+        row[_P_CAPACITY] = self.capacity_mwh
+        row[_P_MIN_SOC] = self.min_soc_mwh
+        row[_P_MAX_SOC] = self.capacity_mwh if self.max_soc_mwh is None else self.max_soc_mwh
+        row[_P_ETA_CH] = self.charge_efficiency
+        row[_P_ETA_DIS] = self.discharge_efficiency
+        row[_P_MAX_CHARGE] = self.max_charge_mw
+        row[_P_MAX_DISCHARGE] = self.max_discharge_mw
+        row[_P_INITIAL_SOC] = self.initial_soc_mwh
+        row[_P_TARGET_SOC] = self.target_soc_mwh
+        return row
+
+
+# Speicher-Presets nach Szenario-Schlüssel (target_storage_capacities)
+STORAGE_PRESETS = {
+    "battery_storage": StorageConfig.battery,
+    "pumped_hydro_storage": StorageConfig.pump,
+    "h2_storage": StorageConfig.hydrogen,
+}
+
 
 class StorageSimulation:
     """
@@ -98,55 +219,28 @@ class StorageSimulation:
         
         if max_soc_mwh is None:
             max_soc_mwh = capacity_mwh
-        
+
         # DataFrame kopieren und initiale Balance berechnen
         df = df_balance.copy()
         if 'Rest Bilanz [MWh]' not in df.columns:
             balance_series = df['Bilanz [MWh]']
         else:
             balance_series = df['Rest Bilanz [MWh]']
-        
-        # Initialisiere Arrays für Ergebnisse
-        n = len(balance_series)
-        soc = np.zeros(n)
-        charged = np.zeros(n)  # Geladene Energie pro Zeitschritt
-        discharged = np.zeros(n)  # Entladene Energie pro Zeitschritt
-        
-        current_soc = initial_soc_mwh
+
         dt = 0.25  # 15 Minuten
-        
-        # Konvertiere min/max SOC in absolute Werte
-        max_charge_energy_per_step = max_charge_mw * dt
-        max_discharge_energy_per_step = max_discharge_mw * dt
-        
-        # Iteriere durch alle Zeitschritte
-        for i in range(n):
-            bal = balance_series.iloc[i]
-            
-            if bal > 0:
-                # Fall A: Überschuss - Versucht zu laden
-                free_space = max_soc_mwh - current_soc
-                max_grid_intake_by_capacity = free_space / charge_efficiency
-                energy_in_from_grid = min(bal, max_charge_energy_per_step, max_grid_intake_by_capacity)
-                
-                # Berechne soc stand nach dem Laden
-                current_soc += energy_in_from_grid * charge_efficiency
-                charged[i] = energy_in_from_grid
-                
-            elif bal < 0:
-                deficit = abs(bal)
-                # Fall B: Defizit - Versucht zu entladen
-                available_energy_above_min = current_soc - min_soc_mwh
-                max_grid_output_by_power = max_discharge_energy_per_step
-                max_grid_output_by_content = available_energy_above_min * discharge_efficiency
-                energy_out_to_grid = min(deficit, max_grid_output_by_power, max_grid_output_by_content)
-                
-                # Berechne soc stand nach dem Entladen
-                current_soc -= energy_out_to_grid / discharge_efficiency
-                discharged[i] = energy_out_to_grid
-                
-            soc[i] = current_soc
-        
+
+        # Zeitschleife im kompilierten Kernel (Numba) bzw. Python/NumPy-Fallback
+        soc, charged, discharged = _generic_storage_kernel(
+            balance_series.to_numpy(dtype=np.float64),
+            float(initial_soc_mwh),
+            float(min_soc_mwh),
+            float(max_soc_mwh),
+            float(charge_efficiency),
+            float(discharge_efficiency),
+            float(max_charge_mw * dt),
+            float(max_discharge_mw * dt),
+        )
+
         if 'Rest Bilanz [MWh]' not in df.columns:
             # Baue Ergebnis-DataFrame für das erste Mal
             result = pd.DataFrame({
@@ -287,195 +381,726 @@ class StorageSimulation:
             max_charge_mw: Max. Elektrolyseleistung (P_el_max)
             max_discharge_mw: Max. Rückverstromung (P_fc_max)
         """
-        # --- Parameter Setup ---
-        # Wirkungsgrade gemäß Methoden-Docstring (67% / 58%) oder IPJ Logik
-        ETA_EL = 0.67  # charge_efficiency (Strom -> H2)
-        ETA_FC = 0.58  # discharge_efficiency (H2 -> Strom)
-        SOC_TARGET_RATIO = 0.80  # 80% Ziel
-        
-        # Konvertiere initial_soc
-        initial_soc_absolute = initial_soc_mwh * capacity_mwh
-        
-        target_soc_mwh = capacity_mwh * SOC_TARGET_RATIO
-        
+        config = StorageConfig.hydrogen(capacity_mwh, max_charge_mw, max_discharge_mw, initial_soc_mwh)
+
         # Daten vorbereiten
         if 'Rest Bilanz [MWh]' in df_balance.columns:
             balance_series = df_balance['Rest Bilanz [MWh]'].values
         else:
             balance_series = df_balance['Bilanz [MWh]'].values
-            
-        timestamps = df_balance['Zeitpunkt']
-        n = len(balance_series)
-        dt = 0.25  # 15 min
-        
-        # Ergebnis-Arrays
-        soc = np.zeros(n)
-        charged = np.zeros(n)      # MWh_in (Stromaufnahme)
-        discharged = np.zeros(n)   # MWh_out (Stromabgabe)
-        p_must_run = np.zeros(n)   # Logging für Must-Run Anteil
-        
-        current_soc = initial_soc_absolute
-        
+
         if self.logger:
             self.logger.info(f"Simuliere H2-Speicher (IPJ-Logik): {capacity_mwh:.0f} MWh, "
-                           f"Ziel 01.11.: {target_soc_mwh:.0f} MWh")
+                           f"Ziel 01.11.: {config.target_soc_mwh:.0f} MWh")
+
+        # --- Simulation (Zeitschleife im kompilierten Kernel) ---
+        columns, _ = self.simulate_cascade(balance_series, df_balance['Zeitpunkt'], [config])
 
-        # --- Simulation ---
-        for i in range(n):
-            ts = timestamps.iloc[i]
-            bal = balance_series[i] # +Surplus, -Deficit
-            
-            # 1. Bestimme Phase & Zeit bis Winter
-            # Sommer: Mai (5) bis Okt (10) inkl. -> < 1.11.
-            is_summer = (ts.month >= 5) and (ts.month < 11)
-            
-            p_el_actual = 0.0 # MW (Positiv = Verbrauch/Laden)
-            p_fc_actual = 0.0 # MW (Positiv = Erzeugung/Entladen)
-            
-            if is_summer:
-                # === PHASE FILL ===
-                
-                # a) Berechne Restzeit bis 1.11. des aktuellen Jahres
-                # Konstruiere Ziel-Datum: 1. Nov dieses Jahres
-                t_winter_start = pd.Timestamp(year=ts.year, month=11, day=1)
-                
-                # Differenz in Stunden
-                delta_t = t_winter_start - ts
-                t_rem_h = delta_t.total_seconds() / 3600.0
-                
-                # Safety: falls wir genau drauf oder drüber sind (sollte durch is_summer gefangen sein, aber sicher ist sicher)
-                if t_rem_h < dt:
-                    t_rem_h = dt
-                
-                # b) Erforderliche Must-Run Leistung
-                # Wieviel fehlt noch zum Ziel?
-                e_missing = max(0.0, target_soc_mwh - current_soc)
-                
-                # Benötigte H2-Ladeleistung (Output der Elektrolyse, also chemisch)
-                # SOC_delta = P_el_input * ETA * time
-                # Wir berechnen P_el_req (Input Strom)
-                # P_el_req * ETA * t_rem = E_missing
-                # -> P_el_req = E_missing / (t_rem * ETA)
-                
-                p_el_req = e_missing / (t_rem_h * ETA_EL)
-                
-                # Begrenzung auf installierte Leistung
-                p_el_must = min(p_el_req, max_charge_mw)
-                
-                # c) Integration in Bilanz (als Last)
-                # Load_eff = Load + P_must -> Bal_eff = Bal - P_must
-                bal_eff = bal - (p_el_must * dt) # MWh Bilanz minus Must-Run Energie
-                
-                # d) Dispatching (Sommer-Logik)
-                
-                if bal_eff > 0:
-                    # -- ÜBERSCHUSS FALL --
-                    
-                    surplus_mwh = bal_eff
-                    surplus_mw = surplus_mwh / dt
-                    
-                    # Freie Ladekapazität (Leistung)
-                    p_el_free_cap = max_charge_mw - p_el_must
-                    
-                    # Freie Speicherkapazität (Energie) bis voll (100%, nicht nur 80%)
-                    e_space_chem = capacity_mwh - current_soc
-
-                    
-                    # Wir berechnen die ZUSÄTZLICHE Leistung:
-                    p_el_add = min(p_el_free_cap, surplus_mw)
-                    
-
-                    
-                    p_el_actual = p_el_must + p_el_add
-                    p_fc_actual = 0.0 # Keine Rückverstromung im Sommer
-                    
-                else:
-                    # -- DEFIZIT FALL --
-                    # Wir haben durch Must-Run das Defizit ggf. vergrößert oder erzeugt.
-                    # H2 hilft NICHT aus (P_fc = 0).
-                    # Der Speicher LÄDT stur mit Must-Run (oder weniger wenn voll).
-                    
-                    p_el_actual = p_el_must
-                    p_fc_actual = 0.0
-                
-            else:
-                # === PHASE DISPATCH (Winter) ===
-                # Ganz normale Speicherlogik: Bal > 0 Laden, Bal < 0 Entladen
-                
-                if bal > 0:
-                    # Überschuss -> Laden
-                    surplus_mw = bal / dt
-                    p_el_actual = min(surplus_mw, max_charge_mw)
-                    p_fc_actual = 0.0
-                else:
-                    # Defizit -> Entladen
-                    deficit_mw = abs(bal) / dt
-                    p_el_actual = 0.0
-                    p_fc_actual = min(deficit_mw, max_discharge_mw)
-
-            # --- Physik-Update (Generic Bucket Limit) ---
-            
-            # 1. Energie Input (Strom)
-            e_in_el = p_el_actual * dt
-            # 2. Energie Output (Strom)
-            e_out_el = p_fc_actual * dt
-            
-            # 3. SOC Änderung (Chemisch)
-            # SOC_new = SOC + (In * Eta_In) - (Out / Eta_Out)
-            delta_soc = (e_in_el * ETA_EL) - (e_out_el / ETA_FC)
-            
-            next_soc = current_soc + delta_soc
-            
-            # 4. Limits Check (Überlauf/Unterlauf)
-            # Wenn next_soc > Cap: Ladeleistung reduzieren
-            if next_soc > capacity_mwh:
-                overflow = next_soc - capacity_mwh
-                # Reduziere Input
-                # overflow ist chemisch -> e_in_reduced = e_in - overflow / ETA
-                reduce_in = overflow / ETA_EL
-                e_in_el -= reduce_in
-                # Korrigiere next_soc
-                next_soc = capacity_mwh
-                
-            # Wenn next_soc < 0: Entladeleistung reduzieren
-            if next_soc < 0.0:
-                underflow = 0.0 - next_soc # positiv
-                # Reduziere Output
-                # underflow ist chemisch -> e_out_reduced = e_out - underflow * ETA_FC 
-                # (Moment: Out/Eta = Chem. Also Out_chem = Out_el / Eta_el_out?? Nein)
-                # Formel oben: Out_chem = e_out_el / ETA_FC
-                # Wir müssen Out_chem um 'underflow' verringern.
-                reduce_out_chem = underflow
-                reduce_out_el = reduce_out_chem * ETA_FC
-                e_out_el -= reduce_out_el
-                
-                next_soc = 0.0
-                
-            # Speichern für nächsten Step
-            current_soc = next_soc
-            
-            soc[i] = current_soc
-            charged[i] = e_in_el
-            discharged[i] = e_out_el
-            if is_summer:
-                 p_must_run[i] = p_el_must if 'p_el_must' in locals() else 0.0
-        
         # --- Ergebnis DataFrame ---
         df_res = df_balance.copy()
-        
-        type_name = "Wasserstoffspeicher"
-        df_res[f'{type_name} SOC MWh'] = soc
+
+        type_name = config.type_name
+        charged = columns[f'{type_name} Geladene MWh']
+        discharged = columns[f'{type_name} Entladene MWh']
+        df_res[f'{type_name} SOC MWh'] = columns[f'{type_name} SOC MWh']
         df_res[f'{type_name} Geladene MWh'] = charged
         df_res[f'{type_name} Entladene MWh'] = discharged
-        
+
         # Bilanz Update
         # Rest = Alt - Geladen + Entladen
         # (Geladen = Verbrauch, Entladen = Erzeugung)
-        
+
         # Achtung: balance_series war die Input-Bilanz.
         # Wenn wir "Must-Run" machen, sinkt die Bilanz (wird negativer).
         # Wir müssen sicherstellen, dass wir konsistent zur Input-Series rechnen.
         df_res['Rest Bilanz [MWh]'] = balance_series - charged + discharged
-        
+
         return df_res
 
+    def simulate_cascade(
+        self,
+        balance: np.ndarray,
+        timestamps: pd.Series,
+        configs: List[StorageConfig],
+        dt: float = 0.25
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Simuliert eine Speicherkaskade in einem einzigen Durchlauf über die Zeitreihe.
+
+        Die Speicher werden in Prioritätsreihenfolge (Reihenfolge von configs)
+        je Zeitschritt nacheinander disponiert: Speicher k sieht die Restbilanz
+        nach Speicher k-1. Die Ergebnisse werden direkt in vorallokierte Arrays
+        geschrieben - es entstehen keine Zwischen-DataFrames. Die Ergebnisse sind
+        identisch zur Verkettung der einzelnen simulate_*_storage Methoden.
+
+        Args:
+            balance: Bilanz je Zeitschritt [MWh] (+ Überschuss, - Defizit)
+            timestamps: Zeitstempel je Zeitschritt (für die H2-Saisonlogik)
+            configs: Speicher in Prioritätsreihenfolge (siehe StorageConfig)
+            dt: Zeitschrittlänge in Stunden (Default: 0.25 = 15 Minuten)
+
+        Returns:
+            Tuple: (Spalten-Dictionary "{type_name} SOC/Geladene/Entladene MWh" -> Array,
+                    Restbilanz nach allen Speichern [MWh])
+        """
+        balance = np.ascontiguousarray(balance, dtype=np.float64)
+        n = balance.shape[0]
+
+        kinds = np.array([c.dispatch for c in configs], dtype=np.int64)
+        params = np.zeros((len(configs), _N_PARAMS))
+        for k, config in enumerate(configs):
+            params[k] = config.to_param_row()
+
+        # Saisonphase nur berechnen, wenn ein H2-Speicher in der Kaskade ist
+        if np.any(kinds == DISPATCH_H2_SEASONAL):
+            is_summer, t_rem_h = _seasonal_fill_phase(timestamps, dt)
+        else:
+            is_summer = np.zeros(n, dtype=np.bool_)
+            t_rem_h = np.ones(n)
+
+        soc, charged, discharged, rest = _storage_cascade_kernel(
+            balance, kinds, params, is_summer, t_rem_h, float(dt)
+        )
+
+        columns = {}
+        for k, config in enumerate(configs):
+            columns[f'{config.type_name} SOC MWh'] = soc[k]
+            columns[f'{config.type_name} Geladene MWh'] = charged[k]
+            columns[f'{config.type_name} Entladene MWh'] = discharged[k]
+
+        return columns, rest
+
+    def sweep_storage_sizing(
+        self,
+        df_balance: pd.DataFrame,
+        storage_type: str,
+        capacity_mwh,
+        max_charge_mw,
+        max_discharge_mw,
+        initial_soc: float = 0.0,
+        upstream: Optional[List[StorageConfig]] = None,
+        dt: float = 0.25
+    ) -> pd.DataFrame:
+        """
+        Dimensionierungs-Sweep: simuliert einen Speicher für viele Parameterpunkte auf einmal.
+
+        Alle Parameterpunkte laufen in einem (parallelisierten) Kernel über dieselbe
+        Restbilanz - ohne DataFrames je Punkt und ohne erneuten Pipeline-Lauf.
+        capacity_mwh, max_charge_mw und max_discharge_mw werden nach NumPy-Regeln
+        gegeneinander gebroadcastet, z.B. für ein 50x50-Raster:
+
+            cap, power = np.meshgrid(np.linspace(1e4, 5e5, 50), np.linspace(1e3, 5e4, 50))
+            df = sim.sweep_storage_sizing(df_bal, "battery_storage", cap, power, power)
+
+        Args:
+            df_balance: DataFrame mit 'Zeitpunkt' und 'Rest Bilanz [MWh]' bzw. 'Bilanz [MWh]'
+                (z.B. balance_after_emob aus SimulationEngine)
+            storage_type: Szenario-Schlüssel des Speichers (siehe STORAGE_PRESETS)
+            capacity_mwh: Speicherkapazität(en) in MWh (Skalar oder Array)
+            max_charge_mw: Maximale Ladeleistung(en) in MW (Skalar oder Array)
+            max_discharge_mw: Maximale Entladeleistung(en) in MW (Skalar oder Array)
+            initial_soc: Initialer Ladestand als Anteil der Kapazität (0.0-1.0)
+            upstream: Optional vorgelagerte Speicher der Kaskade (z.B. Batterie und
+                Pumpspeicher vor H2), die einmalig vorab disponiert werden
+            dt: Zeitschrittlänge in Stunden (Default: 0.25 = 15 Minuten)
+
+        Returns:
+            DataFrame mit einer Zeile je Parameterpunkt und Spalten:
+            - 'Kapazität [MWh]', 'Ladeleistung [MW]', 'Entladeleistung [MW]'
+            - 'Ungedeckte Energie [MWh]': Summe der verbleibenden Defizite
+            - 'Abregelung [MWh]': Summe der verbleibenden Überschüsse
+            - 'Geladene Energie [MWh]', 'Entladene Energie [MWh]'
+            - 'Vollzyklen': Eingespeicherte Energie / nutzbare Kapazität
+            - 'End-SOC [MWh]': Ladestand im letzten Zeitschritt
+        """
+        if storage_type not in STORAGE_PRESETS:
+            raise ValueError(f"Unbekannter Speichertyp '{storage_type}'. "
+                             f"Verfügbar: {list(STORAGE_PRESETS.keys())}")
+
+        capacity, charge, discharge = np.broadcast_arrays(
+            np.asarray(capacity_mwh, dtype=np.float64),
+            np.asarray(max_charge_mw, dtype=np.float64),
+            np.asarray(max_discharge_mw, dtype=np.float64),
+        )
+        capacity = capacity.ravel()
+        charge = charge.ravel()
+        discharge = discharge.ravel()
+
+        balance, timestamps = self._residual_balance(df_balance, upstream, dt)
+
+        # Parametermatrix (m, _N_PARAMS) aus den Presets
+        preset = STORAGE_PRESETS[storage_type]
+        configs = [preset(capacity[m], charge[m], discharge[m], initial_soc) for m in range(capacity.shape[0])]
+        params = np.zeros((len(configs), _N_PARAMS))
+        for m, config in enumerate(configs):
+            params[m] = config.to_param_row()
+        kind = configs[0].dispatch if configs else DISPATCH_GENERIC
+
+        if kind == DISPATCH_H2_SEASONAL:
+            is_summer, t_rem_h = _seasonal_fill_phase(timestamps, dt)
+        else:
+            is_summer = np.zeros(balance.shape[0], dtype=np.bool_)
+            t_rem_h = np.ones(balance.shape[0])
+
+        if self.logger:
+            self.logger.info(f"Speicher-Sweep {storage_type}: {len(configs)} Parameterpunkte")
+
+        stats = _storage_sweep_kernel(balance, kind, params, is_summer, t_rem_h, float(dt))
+
+        usable = params[:, _P_MAX_SOC] - params[:, _P_MIN_SOC]
+        cycles = np.divide(stats[:, _S_STORED], usable, out=np.zeros_like(usable), where=usable > 0)
+
+        return pd.DataFrame({
+            'Kapazität [MWh]': capacity,
+            'Ladeleistung [MW]': charge,
+            'Entladeleistung [MW]': discharge,
+            'Ungedeckte Energie [MWh]': stats[:, _S_UNSERVED],
+            'Abregelung [MWh]': stats[:, _S_CURTAILED],
+            'Geladene Energie [MWh]': stats[:, _S_CHARGED],
+            'Entladene Energie [MWh]': stats[:, _S_DISCHARGED],
+            'Vollzyklen': cycles,
+            'End-SOC [MWh]': stats[:, _S_FINAL_SOC],
+        })
+
+    def find_min_capacity(
+        self,
+        df_balance: pd.DataFrame,
+        storage_type: str,
+        max_charge_mw: Optional[float] = None,
+        max_discharge_mw: Optional[float] = None,
+        initial_soc: float = 0.0,
+        target_unserved_mwh: float = 0.0,
+        upstream: Optional[List[StorageConfig]] = None,
+        capacity_upper_mwh: Optional[float] = None,
+        rel_tol: float = 1e-3,
+        max_iter: int = 100,
+        dt: float = 0.25
+    ) -> Dict[str, Any]:
+        """
+        Sucht die minimale Speicherkapazität, die die ungedeckte Energie auf ein Ziel senkt.
+
+        Suche auf dem Speicherkernel: Ausgehend von einer kleinen Kapazität (größtes
+        Defizit eines Zeitschritts) wird die Kapazität verdoppelt, bis das Ziel erreicht
+        ist, danach wird das Intervall zwischen letzter unzureichender und erster
+        ausreichender Kapazität per Bisektion bis auf rel_tol eingegrenzt. Jede
+        Auswertung ist ein einzelner Kernel-Lauf über die vorberechnete Restbilanz
+        (z.B. balance_after_emob).
+
+        Hinweis: Die ungedeckte Energie ist nicht für alle Speicher monoton in der
+        Kapazität. Bei der Batterie wächst das SOC-Mindestband (5% der Kapazität) mit,
+        das bei leerem Start erst gefüllt werden muss; beim H2-Speicher erhöht die
+        Must-Run-Elektrolyse im Sommer die Last mit wachsender Kapazität. Die Suche
+        liefert daher die kleinste ausreichende Kapazität im ersten Intervall, in dem
+        das Ziel erreicht wird. Wird das Ziel bis zur oberen Grenze der Suche nicht
+        erreicht (z.B. Energiedefizit im Jahressaldo), ist 'capacity_mwh' NaN und
+        'converged' False.
+
+        Args:
+            df_balance: DataFrame mit 'Zeitpunkt' und 'Rest Bilanz [MWh]' bzw. 'Bilanz [MWh]'
+            storage_type: Szenario-Schlüssel des Speichers (siehe STORAGE_PRESETS)
+            max_charge_mw: Maximale Ladeleistung in MW (None = nicht begrenzend)
+            max_discharge_mw: Maximale Entladeleistung in MW (None = nicht begrenzend)
+            initial_soc: Initialer Ladestand als Anteil der Kapazität (0.0-1.0)
+            target_unserved_mwh: Zulässige ungedeckte Energie im Jahr [MWh] (Default: 0.0)
+            upstream: Optional vorgelagerte Speicher der Kaskade
+            capacity_upper_mwh: Obergrenze der Suche (None = doppelte Kapazität, deren nutzbarer
+                Inhalt alle Defizite des Jahres decken könnte)
+            rel_tol: Relative Toleranz der Kapazität (Default: 0.1%)
+            max_iter: Maximale Anzahl Kernel-Auswertungen
+            dt: Zeitschrittlänge in Stunden (Default: 0.25 = 15 Minuten)
+
+        Returns:
+            Dictionary mit:
+            - 'storage_type', 'target_unserved_mwh'
+            - 'capacity_mwh': Minimale Kapazität (NaN, wenn nicht konvergiert)
+            - 'unserved_mwh': Ungedeckte Energie bei dieser Kapazität (bzw. bei der
+              zuletzt geprüften Kapazität, wenn nicht konvergiert)
+            - 'binding_start', 'binding_end': Zeitraum der tiefsten Entladung (vom letzten
+              Höchststand bis zum SOC-Minimum), der die Kapazität bestimmt
+            - 'binding_drawdown_mwh': Entnommene Energie in diesem Zeitraum
+            - 'iterations': Anzahl Kernel-Auswertungen
+            - 'converged': True, wenn das Ziel innerhalb der Toleranz erreicht wurde
+        """
+        if storage_type not in STORAGE_PRESETS:
+            raise ValueError(f"Unbekannter Speichertyp '{storage_type}'. "
+                             f"Verfügbar: {list(STORAGE_PRESETS.keys())}")
+
+        preset = STORAGE_PRESETS[storage_type]
+        balance, timestamps = self._residual_balance(df_balance, upstream, dt)
+        n = balance.shape[0]
+
+        # Ohne Leistungsgrenze: Spitzenwert der Bilanz ist nie begrenzend
+        peak_mw = float(np.max(np.abs(balance))) / dt if n > 0 else 0.0
+        if max_charge_mw is None:
+            max_charge_mw = peak_mw
+        if max_discharge_mw is None:
+            max_discharge_mw = peak_mw
+
+        kind = preset(1.0, max_charge_mw, max_discharge_mw, initial_soc).dispatch
+        if kind == DISPATCH_H2_SEASONAL:
+            is_summer, t_rem_h = _seasonal_fill_phase(timestamps, dt)
+        else:
+            is_summer = np.zeros(n, dtype=np.bool_)
+            t_rem_h = np.ones(n)
+
+        iterations = 0
+
+        def unserved_at(capacity: float) -> float:
+            nonlocal iterations
+            iterations += 1
+            params = preset(capacity, max_charge_mw, max_discharge_mw, initial_soc).to_param_row()[None, :]
+            stats = _storage_sweep_kernel(balance, kind, params, is_summer, t_rem_h, float(dt))
+            return float(stats[0, _S_UNSERVED])
+
+        def is_feasible(unserved: float) -> bool:
+            return unserved <= target_unserved_mwh
+
+        # Untere Schranke: ohne Speicher
+        lo = 0.0
+        unserved_hi = unserved_at(lo)
+        if is_feasible(unserved_hi):
+            hi = lo
+        else:
+            # Obergrenze der Suche: doppelte Kapazität, deren nutzbarer Inhalt (bzw.
+            # Anfangsinhalt über dem Mindest-SOC) alle Defizite des Jahres deckt
+            if capacity_upper_mwh:
+                upper = float(capacity_upper_mwh)
+            else:
+                unit = preset(1.0, max_charge_mw, max_discharge_mw, initial_soc)
+                usable = unit.max_soc_mwh - unit.min_soc_mwh
+                if unit.initial_soc_mwh > unit.min_soc_mwh:
+                    usable = min(usable, unit.initial_soc_mwh - unit.min_soc_mwh)
+                deficit_mwh = float(-balance[balance < 0].sum())
+                upper = 2.0 * deficit_mwh / (unit.discharge_efficiency * usable)
+
+            # Obere Schranke suchen: ab dem größten Einzeldefizit verdoppeln
+            hi = min(max(float(-balance.min()), 1.0), upper)
+            unserved_hi = unserved_at(hi)
+            while not is_feasible(unserved_hi) and hi < upper and iterations < max_iter:
+                lo = hi
+                hi = min(2.0 * hi, upper)
+                unserved_hi = unserved_at(hi)
+
+            # Bisektion zwischen letzter unzureichender und erster ausreichender Kapazität
+            if is_feasible(unserved_hi):
+                while hi - lo > rel_tol * hi and iterations < max_iter:
+                    mid = 0.5 * (lo + hi)
+                    unserved_mid = unserved_at(mid)
+                    if is_feasible(unserved_mid):
+                        hi, unserved_hi = mid, unserved_mid
+                    else:
+                        lo = mid
+
+        converged = is_feasible(unserved_hi) and (hi == 0.0 or hi - lo <= rel_tol * hi)
+        capacity = hi if converged else float('nan')
+
+        # Bindender Zeitraum: größte Entladung (Drawdown) bei gefundener Kapazität
+        binding_start = binding_end = None
+        drawdown_mwh = 0.0
+        if converged and n > 0 and hi > 0.0:
+            config = preset(hi, max_charge_mw, max_discharge_mw, initial_soc)
+            columns, _ = self.simulate_cascade(balance, timestamps, [config], dt)
+            soc = columns[f'{config.type_name} SOC MWh']
+            running_peak = np.maximum.accumulate(soc)
+            drawdown = running_peak - soc
+            end = int(np.argmax(drawdown))
+            start = int(np.flatnonzero(soc[:end + 1] == running_peak[end])[-1])
+            binding_start = timestamps.iloc[start]
+            binding_end = timestamps.iloc[end]
+            drawdown_mwh = float(drawdown[end])
+
+        if self.logger:
+            if converged:
+                self.logger.info(f"Minimale Kapazität {storage_type}: {capacity:.0f} MWh "
+                               f"({iterations} Iterationen)")
+            else:
+                self.logger.warning(f"Minimale Kapazität {storage_type} nicht gefunden: Ziel bis "
+                                  f"{hi:.0f} MWh nicht erreicht ({iterations} Iterationen)")
+
+        return {
+            'storage_type': storage_type,
+            'capacity_mwh': capacity,
+            'unserved_mwh': unserved_hi,
+            'target_unserved_mwh': target_unserved_mwh,
+            'binding_start': binding_start,
+            'binding_end': binding_end,
+            'binding_drawdown_mwh': drawdown_mwh,
+            'iterations': iterations,
+            'converged': converged,
+        }
+
+    def _residual_balance(
+        self,
+        df_balance: pd.DataFrame,
+        upstream: Optional[List[StorageConfig]] = None,
+        dt: float = 0.25
+    ) -> Tuple[np.ndarray, pd.Series]:
+        """
+        Liefert die Restbilanz als Array (nach optional vorgelagerten Speichern) und die Zeitstempel.
+        """
+        if 'Rest Bilanz [MWh]' in df_balance.columns:
+            balance = df_balance['Rest Bilanz [MWh]'].to_numpy(dtype=np.float64)
+        else:
+            balance = df_balance['Bilanz [MWh]'].to_numpy(dtype=np.float64)
+        timestamps = df_balance['Zeitpunkt']
+
+        if upstream:
+            _, balance = self.simulate_cascade(balance, timestamps, upstream, dt)
+
+        return np.ascontiguousarray(balance), timestamps
+
+
+def _seasonal_fill_phase(timestamps: pd.Series, dt: float = 0.25) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Berechnet die H2-Saisonphase vektorisiert für alle Zeitstempel.
+
+    Sommer: Mai (5) bis Okt (10) inkl. -> < 1.11. des jeweiligen Jahres.
+
+    Returns:
+        (is_summer, t_rem_h): Sommer-Maske und Restzeit bis 01.11. in Stunden
+        (mindestens dt, nur im Sommer relevant)
+    """
+    ts = pd.DatetimeIndex(timestamps)
+    month = ts.month.to_numpy()
+    is_summer = (month >= 5) & (month < 11)
+
+    # 1. Nov des jeweiligen Jahres: Jahresbeginn + 10 Monate
+    t_winter_start = ((ts.year.to_numpy() - 1970).astype('datetime64[Y]')
+                      + np.timedelta64(10, 'M')).astype('datetime64[ns]')
+    delta_ns = (t_winter_start - ts.to_numpy()).astype(np.int64)
+    t_rem_h = delta_ns / 1e9 / 3600.0
+
+    # Safety: falls wir genau drauf oder drüber sind
+    t_rem_h = np.where(t_rem_h < dt, dt, t_rem_h)
+
+    return is_summer, t_rem_h
+
+
+def _warmup_storage_kernels() -> None:
+    """Kompiliert die Speicherkernel auf einer Mini-Zeitreihe (Hintergrund-Warm-up)."""
+    df_balance = pd.DataFrame({
+        'Zeitpunkt': pd.date_range('2030-01-01', periods=8, freq='15min'),
+        'Bilanz [MWh]': np.array([1.0, -1.0] * 4),
+    })
+    sim = StorageSimulation()
+    sim.simulate_generic_storage(df_balance, "Batteriespeicher", 1.0, 1.0, 1.0, 0.95, 0.95)
+    sim.simulate_cascade(
+        df_balance['Bilanz [MWh]'].to_numpy(), df_balance['Zeitpunkt'],
+        [StorageConfig.battery(1.0, 1.0, 1.0), StorageConfig.hydrogen(1.0, 1.0, 1.0)]
+    )
+    
+    # Paralleler Sweep-Kernel: nur kompilieren (Datentypen wie in sweep_storage_sizing)
+    balance, _ = sim._residual_balance(df_balance)
+    n = balance.shape[0]
+    compile_for(
+        _storage_sweep_kernel,
+        balance, DISPATCH_GENERIC, np.zeros((2, _N_PARAMS)), np.zeros(n, dtype=np.bool_), np.ones(n), 0.25
+    )
+
+
+# =============================================================================
+# KOMPILIERTE RECHENKERNEL
+# =============================================================================
+
+@jit(nopython=True)
+def _generic_storage_step(
+    bal: float,
+    current_soc: float,
+    min_soc_mwh: float,
+    max_soc_mwh: float,
+    charge_efficiency: float,
+    discharge_efficiency: float,
+    max_charge_energy_per_step: float,
+    max_discharge_energy_per_step: float
+) -> Tuple[float, float, float]:
+    """
+    Ein Zeitschritt des generischen Bucket-Modells.
+
+    Returns:
+        (neuer SOC, geladene Energie, entladene Energie) [MWh]
+    """
+    energy_in_from_grid = 0.0
+    energy_out_to_grid = 0.0
+
+    if bal > 0:
+        # Fall A: Überschuss - Versucht zu laden
+        free_space = max_soc_mwh - current_soc
+        max_grid_intake_by_capacity = free_space / charge_efficiency
+        energy_in_from_grid = min(bal, max_charge_energy_per_step, max_grid_intake_by_capacity)
+
+        current_soc += energy_in_from_grid * charge_efficiency
+
+    elif bal < 0:
+        # Fall B: Defizit - Versucht zu entladen
+        deficit = abs(bal)
+        available_energy_above_min = current_soc - min_soc_mwh
+        max_grid_output_by_content = available_energy_above_min * discharge_efficiency
+        energy_out_to_grid = min(deficit, max_discharge_energy_per_step, max_grid_output_by_content)
+
+        current_soc -= energy_out_to_grid / discharge_efficiency
+
+    return current_soc, energy_in_from_grid, energy_out_to_grid
+
+
+@jit(nopython=True)
+def _h2_storage_step(
+    bal: float,
+    current_soc: float,
+    is_summer: bool,
+    t_rem_h: float,
+    capacity_mwh: float,
+    target_soc_mwh: float,
+    max_charge_mw: float,
+    max_discharge_mw: float,
+    eta_el: float,
+    eta_fc: float,
+    dt: float
+) -> Tuple[float, float, float]:
+    """
+    Ein Zeitschritt des H2-Speichers mit saisonaler "Sommer-Fill"-Strategie (IPJ-Logik).
+
+    Returns:
+        (neuer SOC, geladene Energie, entladene Energie) [MWh]
+    """
+    p_el_actual = 0.0  # MW (Positiv = Verbrauch/Laden)
+    p_fc_actual = 0.0  # MW (Positiv = Erzeugung/Entladen)
+
+    if is_summer:
+        # === PHASE FILL ===
+        # Erforderliche Must-Run Leistung: P_el_req * ETA * t_rem = E_missing
+        e_missing = max(0.0, target_soc_mwh - current_soc)
+        p_el_req = e_missing / (t_rem_h * eta_el)
+
+        # Begrenzung auf installierte Leistung
+        p_el_must = min(p_el_req, max_charge_mw)
+
+        # Integration in Bilanz (als Last): Bal_eff = Bal - P_must
+        bal_eff = bal - (p_el_must * dt)
+
+        if bal_eff > 0:
+            # -- ÜBERSCHUSS FALL -- zusätzliche Ladeleistung
+            surplus_mw = bal_eff / dt
+            p_el_free_cap = max_charge_mw - p_el_must
+            p_el_add = min(p_el_free_cap, surplus_mw)
+            p_el_actual = p_el_must + p_el_add
+        else:
+            # -- DEFIZIT FALL -- H2 hilft NICHT aus, lädt stur mit Must-Run
+            p_el_actual = p_el_must
+    else:
+        # === PHASE DISPATCH (Winter) ===
+        if bal > 0:
+            # Überschuss -> Laden
+            surplus_mw = bal / dt
+            p_el_actual = min(surplus_mw, max_charge_mw)
+        else:
+            # Defizit -> Entladen
+            deficit_mw = abs(bal) / dt
+            p_fc_actual = min(deficit_mw, max_discharge_mw)
+
+    # --- Physik-Update (Generic Bucket Limit) ---
+    e_in_el = p_el_actual * dt
+    e_out_el = p_fc_actual * dt
+
+    # SOC_new = SOC + (In * Eta_In) - (Out / Eta_Out)
+    delta_soc = (e_in_el * eta_el) - (e_out_el / eta_fc)
+    next_soc = current_soc + delta_soc
+
+    # Überlauf: Ladeenergie reduzieren (overflow ist chemisch)
+    if next_soc > capacity_mwh:
+        overflow = next_soc - capacity_mwh
+        e_in_el -= overflow / eta_el
+        next_soc = capacity_mwh
+
+    # Unterlauf: Entladeenergie reduzieren (underflow ist chemisch)
+    if next_soc < 0.0:
+        underflow = 0.0 - next_soc
+        e_out_el -= underflow * eta_fc
+        next_soc = 0.0
+
+    return next_soc, e_in_el, e_out_el
+
+
+@jit(nopython=True)
+def _generic_storage_kernel(
+    balance: np.ndarray,
+    initial_soc_mwh: float,
+    min_soc_mwh: float,
+    max_soc_mwh: float,
+    charge_efficiency: float,
+    discharge_efficiency: float,
+    max_charge_energy_per_step: float,
+    max_discharge_energy_per_step: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Zeitschleife des generischen Bucket-Modells auf NumPy-Arrays.
+
+    Mit Numba im nopython-Modus kompiliert, ohne Numba als reines Python/NumPy
+    ausgeführt. Die Rechenschritte entsprechen exakt der ursprünglichen
+    Schleife in simulate_generic_storage (bitgleiche Ergebnisse).
+
+    Args:
+        balance: Bilanz je Zeitschritt [MWh] (+ Überschuss, - Defizit)
+        initial_soc_mwh: Initialer Ladestand [MWh]
+        min_soc_mwh: Minimaler SOC [MWh]
+        max_soc_mwh: Maximaler SOC [MWh]
+        charge_efficiency: Ladewirkungsgrad (0.0-1.0)
+        discharge_efficiency: Entladewirkungsgrad (0.0-1.0)
+        max_charge_energy_per_step: Max. Ladeenergie pro Zeitschritt [MWh]
+        max_discharge_energy_per_step: Max. Entladeenergie pro Zeitschritt [MWh]
+
+    Returns:
+        (soc, charged, discharged) als Arrays der Länge n [MWh]
+    """
+    n = balance.shape[0]
+    soc = np.zeros(n)
+    charged = np.zeros(n)  # Geladene Energie pro Zeitschritt
+    discharged = np.zeros(n)  # Entladene Energie pro Zeitschritt
+
+    current_soc = initial_soc_mwh
+
+    for i in range(n):
+        current_soc, charged[i], discharged[i] = _generic_storage_step(
+            balance[i], current_soc, min_soc_mwh, max_soc_mwh,
+            charge_efficiency, discharge_efficiency,
+            max_charge_energy_per_step, max_discharge_energy_per_step
+        )
+        soc[i] = current_soc
+
+    return soc, charged, discharged
+
+
+@jit(nopython=True)
+def _storage_cascade_kernel(
+    balance: np.ndarray,
+    kinds: np.ndarray,
+    params: np.ndarray,
+    is_summer: np.ndarray,
+    t_rem_h: np.ndarray,
+    dt: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Speicherkaskade in einem Durchlauf: je Zeitschritt alle Speicher in Prioritätsreihenfolge.
+
+    Args:
+        balance: Bilanz je Zeitschritt [MWh] (+ Überschuss, - Defizit)
+        kinds: Dispatch-Strategie je Speicher (DISPATCH_*), Länge k
+        params: Parametermatrix (k, _N_PARAMS), Spalten siehe _P_*
+        is_summer: H2-Sommerphase je Zeitschritt
+        t_rem_h: Restzeit bis 01.11. je Zeitschritt [h]
+        dt: Zeitschrittlänge [h]
+
+    Returns:
+        (soc, charged, discharged) als (k, n)-Arrays [MWh] und Restbilanz (n,) [MWh]
+    """
+    k = kinds.shape[0]
+    n = balance.shape[0]
+    soc = np.zeros((k, n))
+    charged = np.zeros((k, n))
+    discharged = np.zeros((k, n))
+    rest = np.empty(n)
+
+    current_soc = np.empty(k)
+    for j in range(k):
+        current_soc[j] = params[j, _P_INITIAL_SOC]
+
+    for i in range(n):
+        bal = balance[i]
+        for j in range(k):
+            if kinds[j] == DISPATCH_H2_SEASONAL:
+                new_soc, e_in, e_out = _h2_storage_step(
+                    bal, current_soc[j], is_summer[i], t_rem_h[i],
+                    params[j, _P_CAPACITY], params[j, _P_TARGET_SOC],
+                    params[j, _P_MAX_CHARGE], params[j, _P_MAX_DISCHARGE],
+                    params[j, _P_ETA_CH], params[j, _P_ETA_DIS], dt
+                )
+            else:
+                new_soc, e_in, e_out = _generic_storage_step(
+                    bal, current_soc[j], params[j, _P_MIN_SOC], params[j, _P_MAX_SOC],
+                    params[j, _P_ETA_CH], params[j, _P_ETA_DIS],
+                    params[j, _P_MAX_CHARGE] * dt, params[j, _P_MAX_DISCHARGE] * dt
+                )
+            current_soc[j] = new_soc
+            soc[j, i] = new_soc
+            charged[j, i] = e_in
+            discharged[j, i] = e_out
+            # Restbilanz für den nächsten Speicher der Kaskade
+            bal = bal - e_in + e_out
+        rest[i] = bal
+
+    return soc, charged, discharged, rest
+
+
+@jit(nopython=True, parallel=True)
+def _storage_sweep_kernel(
+    balance: np.ndarray,
+    kind: int,
+    params: np.ndarray,
+    is_summer: np.ndarray,
+    t_rem_h: np.ndarray,
+    dt: float
+) -> np.ndarray:
+    """
+    Simuliert m Parameterpunkte eines Speichers parallel über dieselbe Bilanz.
+
+    Je Punkt werden nur Kennzahlen akkumuliert (keine Zeitreihen gespeichert).
+
+    Args:
+        balance: Bilanz je Zeitschritt [MWh] (+ Überschuss, - Defizit)
+        kind: Dispatch-Strategie (DISPATCH_*)
+        params: Parametermatrix (m, _N_PARAMS), Spalten siehe _P_*
+        is_summer: H2-Sommerphase je Zeitschritt
+        t_rem_h: Restzeit bis 01.11. je Zeitschritt [h]
+        dt: Zeitschrittlänge [h]
+
+    Returns:
+        Kennzahlen (m, _N_STATS), Spalten siehe _S_*
+    """
+    m = params.shape[0]
+    n = balance.shape[0]
+    stats = np.zeros((m, _N_STATS))
+
+    for p in prange(m):
+        current_soc = params[p, _P_INITIAL_SOC]
+        eta_ch = params[p, _P_ETA_CH]
+        unserved = 0.0
+        curtailed = 0.0
+        charged = 0.0
+        discharged = 0.0
+        stored = 0.0
+
+        for i in range(n):
+            bal = balance[i]
+            if kind == DISPATCH_H2_SEASONAL:
+                current_soc, e_in, e_out = _h2_storage_step(
+                    bal, current_soc, is_summer[i], t_rem_h[i],
+                    params[p, _P_CAPACITY], params[p, _P_TARGET_SOC],
+                    params[p, _P_MAX_CHARGE], params[p, _P_MAX_DISCHARGE],
+                    eta_ch, params[p, _P_ETA_DIS], dt
+                )
+            else:
+                current_soc, e_in, e_out = _generic_storage_step(
+                    bal, current_soc, params[p, _P_MIN_SOC], params[p, _P_MAX_SOC],
+                    eta_ch, params[p, _P_ETA_DIS],
+                    params[p, _P_MAX_CHARGE] * dt, params[p, _P_MAX_DISCHARGE] * dt
+                )
+
+            rest = bal - e_in + e_out
+            if rest < 0:
+                unserved -= rest
+            else:
+                curtailed += rest
+            charged += e_in
+            discharged += e_out
+            stored += e_in * eta_ch
+
+        stats[p, _S_UNSERVED] = unserved
+        stats[p, _S_CURTAILED] = curtailed
+        stats[p, _S_CHARGED] = charged
+        stats[p, _S_DISCHARGED] = discharged
+        stats[p, _S_STORED] = stored
+        stats[p, _S_FINAL_SOC] = current_soc
+
+    return stats
+
+
+register_warmup("storage", _warmup_storage_kernels)
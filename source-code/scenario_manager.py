@@ -311,6 +311,8 @@ class ScenarioManager:
             - cop_avg: Durchschnittlicher COP
             - weather_data: Wetterdatensatz (aus DataManager)
             - load_profile: HP-Lastprofilmatrix
+            - station_weights: optional, Anteil der WP je Wetterstation ({} = gleich verteilt);
+              ohne Angabe wird die Spalte AVERAGE verwendet
         """
         hp_data = self.current_scenario.get("target_heat_pump_parameters", {})
         
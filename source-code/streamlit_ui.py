@@ -7,6 +7,7 @@ from ui.simulation_diff import diff_simulation_page
 from ui.simulation_comparison import comparison_simulation_page
 from ui.scenario_generation import scenario_generation_page
 from ui.debug_scoring import debug_scoring_page
+from data_processing.numba_compat import start_background_warmup
 
 
 st.set_page_config(
@@ -74,6 +75,10 @@ def ensure_base_session_state() -> None:
                     progress_placeholder.progress(progress, f"Loading {current}/{total} datasets...")
                     dataset_placeholder.caption(f"📊 Loading: **{name}**")
                 
+                # Numba-Kernel parallel zum Datenladen im Hintergrund kompilieren
+                # (einmal pro Prozess, danach aus dem Disk-Cache)
+                start_background_warmup()
+                
                 # Load Data mit Callback
                 success = load_data_manager(progress_callback=on_dataset_loaded)
                 
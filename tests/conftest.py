@@ -0,0 +1,82 @@
+"""
+Gemeinsame pytest-Konfiguration.
+
+Die Module liegen in source-code/ und importieren sich gegenseitig über
+Top-Level-Pakete (data_processing, constants, ...). Das Verzeichnis wird daher
+wie beim Start der App in den Suchpfad aufgenommen.
+
+Für Tests der gesamten Simulation stellen die Fixtures simulation_managers und
+scenario_manager Rohdaten, synthetische SMARD-Erzeugung und das Szenario S0 bereit.
+"""
+
+import contextlib
+import io
+import sys
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "source-code"
+
+if str(SOURCE_DIR) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIR))
+
+REPO_DIR = SOURCE_DIR.parent
+SCENARIO_PATH = REPO_DIR / "scenarios" / "EVL_own" / "S0_Balanced_Reference_1.0.yaml"
+
+SMARD_GENERATION_COLUMNS = [
+    "Biomasse", "Wasserkraft", "Wind Offshore", "Wind Onshore", "Photovoltaik",
+    "Sonstige Erneuerbare", "Kernenergie", "Braunkohle", "Steinkohle", "Erdgas",
+    "Pumpspeicher", "Sonstige Konventionelle",
+]
+
+
+def synthetic_smard_generation(start_year: int, end_year: int, seed: int) -> pd.DataFrame:
+    """
+    Synthetische SMARD-Erzeugungsdaten (MWh je Viertelstunde).
+    
+    Die Original-Dateien liegen wegen ihrer Größe nicht im Repository.
+    """
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range(f"{start_year}-01-01 00:00", f"{end_year}-12-31 23:45", freq="15min")
+    hours = idx.hour.values + idx.minute.values / 60
+    df = pd.DataFrame({"Datum von": idx, "Datum bis": idx + pd.Timedelta("15min")})
+    for k, name in enumerate(SMARD_GENERATION_COLUMNS):
+        shape = 0.4 + 0.6 * rng.random(len(idx))
+        if name == "Photovoltaik":
+            shape *= np.clip(np.sin((hours - 6) / 12 * np.pi), 0, None)
+        df[f"{name} [MWh]"] = (400.0 + 300.0 * k) * shape
+    df["Zeitpunkt"] = df["Datum von"] + (df["Datum bis"] - df["Datum von"]) / 2
+    return df
+
+
+@pytest.fixture(scope="session")
+def simulation_managers():
+    """
+    ConfigManager und DataManager mit den Rohdaten des Repositorys und
+    synthetischen SMARD-Erzeugungsdaten.
+    """
+    from config_manager import ConfigManager
+    from data_manager import DataManager
+    
+    # Fehlende SMARD-Erzeugungsdateien werden vom DataManager nur gewarnt
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        cfg = ConfigManager(SOURCE_DIR / "config.json")
+        dm = DataManager(config_manager=cfg)
+    dm.add(synthetic_smard_generation(2015, 2019, 1), "SMARD_2015-2019_Erzeugung", datatype="SMARD")
+    dm.add(synthetic_smard_generation(2020, 2025, 2), "SMARD_2020-2025_Erzeugung", datatype="SMARD")
+    return cfg, dm
+
+
+@pytest.fixture
+def scenario_manager():
+    """Frisch geladenes Referenzszenario (S0)."""
+    from scenario_manager import ScenarioManager
+    
+    sm = ScenarioManager()
+    sm.load_scenario(SCENARIO_PATH)
+    return sm
@@ -0,0 +1,184 @@
+"""
+Tests für den BalanceCalculator.
+
+_align_if_needed übernimmt Eingaben, die bereits auf dem Viertelstunden-Raster
+liegen, ohne Ausrichtung. Das Ergebnis muss dem von _align_to_quarter_hour
+entsprechen; alle anderen Eingaben (NaN, Lücken, unsortiert, Zeitstempel als
+Text) laufen weiter durch den langsamen Weg.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing.balance_calculator import BalanceCalculator
+from data_processing.calendar_service import get_calendar
+
+YEAR = 2030
+# Zeitumstellung 2030: 27.10. 02:00-02:45 doppelt
+DST_DUPLICATE = pd.Timestamp("2030-10-27 02:00")
+
+
+def _frame(columns, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = get_calendar(YEAR).index
+    df = pd.DataFrame({"Zeitpunkt": index})
+    for col in columns:
+        df[col] = 1000.0 * rng.random(len(index))
+    return df
+
+
+def _with_dst_duplicate(df: pd.DataFrame) -> pd.DataFrame:
+    """Fügt hinter DST_DUPLICATE eine zweite Zeile mit abweichenden Werten ein."""
+    pos = int(np.flatnonzero(df["Zeitpunkt"] == DST_DUPLICATE)[0])
+    duplicate = df.iloc[[pos]].copy()
+    numeric = duplicate.columns.drop("Zeitpunkt")
+    duplicate[numeric] = duplicate[numeric] + 1.0
+    return pd.concat([df.iloc[:pos + 1], duplicate, df.iloc[pos + 1:]], ignore_index=True)
+
+
+@pytest.fixture
+def production() -> pd.DataFrame:
+    return _frame(["Wind Onshore [MWh]", "Photovoltaik [MWh]", "Biomasse [MWh]"], 1)
+
+
+@pytest.fixture
+def consumption() -> pd.DataFrame:
+    df = _frame(["Haushalte [MWh]", "Gewerbe [MWh]"], 2)
+    df["Gesamt [MWh]"] = df["Haushalte [MWh]"] + df["Gewerbe [MWh]"]
+    return df
+
+
+@pytest.fixture
+def slow_calls(monkeypatch):
+    """Zählt Aufrufe von _align_to_quarter_hour (Rückfall auf den langsamen Weg)."""
+    calls = []
+    original = BalanceCalculator._align_to_quarter_hour
+
+    def spy(self, df, simu_jahr, label):
+        calls.append(label)
+        return original(self, df, simu_jahr, label)
+
+    monkeypatch.setattr(BalanceCalculator, "_align_to_quarter_hour", spy)
+    return calls
+
+
+def _reference_calculate_balance(simProd: pd.DataFrame, simCons: pd.DataFrame, simu_jahr: int) -> pd.DataFrame:
+    """Ursprüngliche Bilanzberechnung (beide Eingaben immer über _align_to_quarter_hour)."""
+    calc = BalanceCalculator()
+    prod_aligned, target_index = calc._align_to_quarter_hour(simProd, simu_jahr, "Produktion")
+    cons_aligned, _ = calc._align_to_quarter_hour(simCons, simu_jahr, "Verbrauch")
+
+    if "Gesamt [MWh]" in cons_aligned.columns:
+        cons_sum = cons_aligned["Gesamt [MWh]"]
+    else:
+        cons_sum = cons_aligned.select_dtypes(include=[np.number]).sum(axis=1)
+    prod_sum = prod_aligned.select_dtypes(include=[np.number]).sum(axis=1)
+    bilanz = prod_sum - cons_sum
+
+    return pd.DataFrame({
+        "Zeitpunkt": target_index,
+        "Produktion [MWh]": prod_sum.values,
+        "Verbrauch [MWh]": cons_sum.values,
+        "Bilanz [MWh]": bilanz.values
+    })
+
+
+def _assert_same_alignment(df: pd.DataFrame):
+    calc = BalanceCalculator()
+    fast, fast_index = calc._align_if_needed(df, YEAR, "Test")
+    slow, slow_index = calc._align_to_quarter_hour(df, YEAR, "Test")
+
+    assert fast_index.equals(slow_index)
+    if "Zeitpunkt" in fast.columns:
+        assert np.array_equal(fast["Zeitpunkt"].to_numpy(), slow.index.values)
+        fast = fast.drop(columns="Zeitpunkt")
+    assert list(fast.columns) == list(slow.columns)
+    assert np.array_equal(fast.to_numpy(), slow.to_numpy())
+
+
+def test_grid_aligned_input_skips_alignment(production, slow_calls):
+    _assert_same_alignment(production)
+    assert slow_calls == ["Test"]  # nur der Vergleichsaufruf
+
+    aligned, _ = BalanceCalculator()._align_if_needed(production, YEAR, "Produktion")
+    assert aligned is production
+
+
+def test_dst_duplicate_keeps_last_entry(production, slow_calls):
+    df = _with_dst_duplicate(production)
+    assert len(df) == len(production) + 1
+
+    _assert_same_alignment(df)
+    assert slow_calls == ["Test"]
+
+    aligned, _ = BalanceCalculator()._align_if_needed(df, YEAR, "Produktion")
+    row = aligned.loc[aligned["Zeitpunkt"] == DST_DUPLICATE]
+    assert len(row) == 1
+    expected = production.loc[production["Zeitpunkt"] == DST_DUPLICATE, "Biomasse [MWh]"].iloc[0] + 1.0
+    assert row["Biomasse [MWh]"].iloc[0] == expected
+
+
+def test_unsorted_and_text_timestamps_fall_back(production, slow_calls):
+    calc = BalanceCalculator()
+
+    shuffled = production.sample(frac=1.0, random_state=3)
+    _assert_same_alignment(shuffled)
+    text = production.assign(Zeitpunkt=production["Zeitpunkt"].dt.strftime("%Y-%m-%d %H:%M:%S"))
+    _assert_same_alignment(text)
+
+    slow_calls.clear()
+    calc._align_if_needed(shuffled, YEAR, "Unsortiert")
+    calc._align_if_needed(text, YEAR, "Text")
+    assert slow_calls == ["Unsortiert", "Text"]
+
+
+def test_nan_input_falls_back_and_raises(production, slow_calls):
+    df = production.copy()
+    df.loc[500, "Photovoltaik [MWh]"] = np.nan
+
+    with pytest.raises(ValueError, match="lückenhaft"):
+        BalanceCalculator()._align_if_needed(df, YEAR, "Produktion")
+    assert slow_calls == ["Produktion"]
+
+
+def test_gap_falls_back_and_raises(production, slow_calls):
+    df = production.drop(index=[1000, 1001]).reset_index(drop=True)
+
+    with pytest.raises(ValueError, match="2 Viertelstunden fehlen"):
+        BalanceCalculator()._align_if_needed(df, YEAR, "Produktion")
+    assert slow_calls == ["Produktion"]
+
+
+@pytest.mark.parametrize("with_total", [True, False])
+@pytest.mark.parametrize("dst", [False, True])
+def test_calculate_balance_matches_reference(production, consumption, with_total, dst):
+    if not with_total:
+        consumption = consumption.drop(columns="Gesamt [MWh]")
+    if dst:
+        production = _with_dst_duplicate(production)
+        consumption = _with_dst_duplicate(consumption)
+
+    result = BalanceCalculator().calculate_balance(production, consumption, YEAR)
+    expected = _reference_calculate_balance(production, consumption, YEAR)
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True, check_freq=False)
+
+
+def test_calculate_balance_arrays_sums_columns(production, consumption):
+    target_index = get_calendar(YEAR).index
+    prod = production.drop(columns="Zeitpunkt").to_numpy()
+    cons = consumption["Gesamt [MWh]"].to_numpy()
+
+    result = BalanceCalculator().calculate_balance_arrays(prod, cons, target_index)
+
+    assert list(result.columns) == ["Zeitpunkt", "Produktion [MWh]", "Verbrauch [MWh]", "Bilanz [MWh]"]
+    assert np.array_equal(result["Produktion [MWh]"].to_numpy(), prod.sum(axis=1))
+    assert np.array_equal(result["Bilanz [MWh]"].to_numpy(), prod.sum(axis=1) - cons)
+
+
+@pytest.mark.parametrize("prod_len, cons_len", [(35039, 35040), (35040, 35041), (35136, 35136)])
+def test_calculate_balance_arrays_rejects_length_mismatch(prod_len, cons_len):
+    target_index = get_calendar(YEAR).index
+    with pytest.raises(ValueError, match="Längen passen nicht"):
+        BalanceCalculator().calculate_balance_arrays(np.zeros(prod_len), np.zeros(cons_len), target_index)
@@ -0,0 +1,183 @@
+"""
+Tests für den Batch-Lauf: Ausgabe-Layout, Fehlerberichte, Worker-Daten und
+die Speichermessung je Szenario.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+import batch_runner
+
+SCENARIO_PATH = batch_runner.REPO_DIR / "scenarios" / "EVL_own" / "S0_Balanced_Reference_1.0.yaml"
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="benötigt /proc (Linux)")
+
+
+@linux_only
+def test_peak_rss_is_measured_per_task():
+    """Ein großer vorheriger Peak darf nicht in die Messung des nächsten Szenarios eingehen."""
+    rss_start = batch_runner._reset_peak_rss()
+    big = np.ones(40_000_000)  # ~320 MB
+    big.sum()
+    del big
+    first_peak, first_delta = batch_runner._peak_rss_since_reset(rss_start)
+
+    rss_start = batch_runner._reset_peak_rss()
+    small = np.ones(5_000_000)  # ~40 MB
+    small.sum()
+    del small
+    second_peak, second_delta = batch_runner._peak_rss_since_reset(rss_start)
+
+    assert first_delta > 250
+    assert 30 < second_delta < 150
+    assert second_peak < first_peak
+
+
+def test_peak_rss_without_reset_support():
+    assert batch_runner._peak_rss_since_reset(None) == (None, None)
+
+
+def test_summary_line_reports_scenario_memory():
+    summary = {
+        "scenario": "S0", "status": "ok", "wall_s": 1.0, "result_mb": 10.0,
+        "rss_peak_mb": 512.0, "rss_delta_mb": 80.0, "traced_peak_mb": None, "error": "",
+    }
+    line = batch_runner._format_summary_line(1, 2, summary)
+    assert "Peak-RSS 512 MB (+80 MB)" in line
+
+
+def _scenario_copy(directory, name, **changes):
+    """S0 auf ein Jahr (2030) reduziert, optional mit geänderten Abschnitten."""
+    with open(SCENARIO_PATH, encoding="utf-8") as f:
+        scenario = yaml.safe_load(f)
+    scenario["metadata"]["valid_for_years"] = [2030]
+    scenario.update(changes)
+    path = directory / f"{name}.yaml"
+    path.write_text(yaml.safe_dump(scenario, allow_unicode=True), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def scenario_paths(tmp_path):
+    scenario_dir = tmp_path / "scenarios"
+    scenario_dir.mkdir()
+    return [
+        _scenario_copy(scenario_dir, "Referenz"),
+        # Fehlendes Lastprofil: Szenario schlägt fehl, der Lauf geht weiter
+        _scenario_copy(scenario_dir, "Kaputt", target_load_demand_twh={}),
+        _scenario_copy(scenario_dir, "Ohne_Speicher", target_storage_capacities={}),
+    ]
+
+
+def _run(simulation_managers, scenario_paths, output_dir, **kwargs):
+    from scenario_manager import ScenarioManager
+
+    cfg, dm = simulation_managers
+    return batch_runner.run_batch(
+        cfg, dm, ScenarioManager(), scenario_paths, output_dir,
+        calculation_mode="numpy", file_format="csv", **kwargs
+    )
+
+
+def test_run_batch_writes_partitioned_results_and_reports_failures(simulation_managers, scenario_paths, tmp_path):
+    output_dir = tmp_path / "batch"
+    summary = _run(simulation_managers, scenario_paths, output_dir)
+
+    assert list(summary["scenario"]) == ["Referenz", "Kaputt", "Ohne_Speicher"]
+    assert list(summary["status"]) == ["ok", "error", "ok"]
+    failed = summary.set_index("scenario").loc["Kaputt"]
+    assert failed["error"].startswith("KeyError") and "Load-Profile" in failed["error"]
+    assert failed["years"] == ""
+    assert (summary.loc[summary["status"] == "ok", "years"] == "2030").all()
+
+    # Zeitreihen je Ergebnis partitioniert nach Szenario und Jahr
+    results_dir = output_dir / "results"
+    for name in ("consumption", "production", "balance_pre_flex", "balance_post_flex", "storage"):
+        part = results_dir / name / "scenario=Referenz" / "year=2030" / "part-0.csv"
+        assert part.is_file(), part
+        df = pd.read_csv(part)
+        assert "Zeitpunkt" in df.columns
+        assert len(df) >= 35040
+    assert not list(results_dir.glob("*/scenario=Kaputt"))
+
+    # Tabellen in Eingabereihenfolge, nur erfolgreiche Szenarien mit KPIs
+    assert sorted(p.name for p in output_dir.iterdir()) == [
+        "economics.csv", "kpis.csv", "results", "summary.csv"
+    ]
+    written = pd.read_csv(output_dir / "summary.csv", keep_default_na=False)
+    assert list(written["scenario"]) == list(summary["scenario"])
+    assert list(written["status"]) == list(summary["status"])
+    kpis = pd.read_csv(output_dir / "kpis.csv")
+    assert list(kpis["scenario"]) == ["Referenz", "Ohne_Speicher"]
+    assert list(kpis["year"]) == [2030, 2030]
+    economics = pd.read_csv(output_dir / "economics.csv")
+    assert list(economics["scenario"]) == ["Referenz", "Ohne_Speicher"]
+
+
+def test_parallel_batch_matches_in_process_run(simulation_managers, scenario_paths, tmp_path):
+    serial = _run(simulation_managers, scenario_paths, tmp_path / "serial", workers=1)
+    parallel = _run(simulation_managers, scenario_paths, tmp_path / "parallel", workers=2)
+
+    assert list(parallel["status"]) == list(serial["status"])
+    assert list(parallel["error"]) == list(serial["error"])
+    for name in ("kpis.csv", "economics.csv"):
+        pd.testing.assert_frame_equal(
+            pd.read_csv(tmp_path / "parallel" / name), pd.read_csv(tmp_path / "serial" / name)
+        )
+    part = "results/balance_post_flex/scenario=Ohne_Speicher/year=2030/part-0.csv"
+    pd.testing.assert_frame_equal(
+        pd.read_csv(tmp_path / "parallel" / part), pd.read_csv(tmp_path / "serial" / part)
+    )
+
+
+def test_workers_receive_only_required_datasets(simulation_managers, scenario_paths):
+    _, dm = simulation_managers
+    names = batch_runner._batch_datasets(scenario_paths)
+
+    assert names == [
+        "Verbrauchsprofil Haushalte BDEW",
+        "Verbrauchsprofil Gewerbe BDEW",
+        "Verbrauchsprofil Landwirtschaft BDEW",
+        "SMARD_2015-2019_Erzeugung",
+        "SMARD_2020-2025_Erzeugung",
+        "SMARD_Installierte Leistung 2015-2019",
+        "SMARD_Installierte Leistung 2020-2025",
+        "Wärmepumpen Lastprofile",
+        "Lufttemperatur-2019",
+    ]
+    snapshot = batch_runner.snapshot_datasets(dm, names + ["Fehlt"])
+    assert sorted(snapshot.dataframes) == sorted(names)
+    assert snapshot.get("Lufttemperatur-2019") is dm.get("Lufttemperatur-2019")
+    with pytest.raises(KeyError):
+        snapshot.get("Erzeugungs/Verbrauchs Prognose Daten")
+
+
+def test_output_format_resolution():
+    expected = "parquet" if batch_runner.PARQUET_AVAILABLE else "csv"
+    assert batch_runner._resolve_format("auto") == expected
+    assert batch_runner._resolve_format("csv") == "csv"
+    with pytest.raises(ValueError):
+        batch_runner._resolve_format("xlsx")
+    if not batch_runner.PARQUET_AVAILABLE:
+        with pytest.raises(ImportError):
+            batch_runner._resolve_format("parquet")
+
+
+@pytest.mark.skipif(not batch_runner.PARQUET_AVAILABLE, reason="benötigt pyarrow")
+def test_run_batch_writes_parquet(simulation_managers, scenario_paths, tmp_path):
+    from scenario_manager import ScenarioManager
+
+    cfg, dm = simulation_managers
+    output_dir = tmp_path / "batch"
+    batch_runner.run_batch(
+        cfg, dm, ScenarioManager(), scenario_paths[:1], output_dir,
+        calculation_mode="numpy", file_format="parquet"
+    )
+
+    assert (output_dir / "summary.parquet").is_file()
+    balance = pd.read_parquet(output_dir / "results" / "balance_post_flex")
+    assert len(balance) >= 35040
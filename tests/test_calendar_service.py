@@ -0,0 +1,104 @@
+"""
+Tests für den Kalender-Service: Jahreslänge, Schaltjahre, Zeitumstellung,
+Feiertage/Tagestypen und Caching.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing.calendar_service import (
+    DAY_TYPE_FT,
+    DAY_TYPE_SA,
+    DAY_TYPE_WT,
+    _CALENDAR_CACHE,
+    get_calendar,
+    is_leap_year,
+    quarter_hour_index,
+    rebase_to_year,
+)
+
+
+@pytest.mark.parametrize("year, n_steps", [(2030, 35040), (2024, 35136), (2100, 35040), (2000, 35136)])
+def test_year_length(year, n_steps):
+    cal = get_calendar(year)
+
+    assert cal.n_steps == n_steps
+    assert cal.index[0] == pd.Timestamp(f"{year}-01-01 00:00")
+    assert cal.index[-1] == pd.Timestamp(f"{year}-12-31 23:45")
+    assert (np.diff(cal.index.values) == np.timedelta64(15, "m")).all()
+    assert cal.day_of_year[-1] == (366 if n_steps == 35136 else 365)
+    assert np.array_equal(np.unique(cal.slot), np.arange(96))
+
+
+def test_is_leap_year():
+    years = np.array([1900, 2000, 2023, 2024, 2100])
+    assert list(is_leap_year(years)) == [False, True, False, True, False]
+    assert bool(is_leap_year(2028))
+
+
+def test_grid_ignores_dst():
+    """Das Raster ist Ortszeit ohne Zeitumstellung: keine Lücke im März, kein Duplikat im Oktober."""
+    cal = get_calendar(2030)
+
+    assert pd.Timestamp("2030-03-31 02:00") in cal.index
+    assert (cal.index == pd.Timestamp("2030-10-27 02:00")).sum() == 1
+    assert cal.index.is_unique
+
+
+def test_leisure_mask_on_timestamps_with_dst_duplicate():
+    """Verbrauchsdaten mit doppelter Stunde (35041 Zeilen) erhalten die Maske elementweise."""
+    cal = get_calendar(2030)
+    dup = pd.Timestamp("2030-10-27 02:00")
+    pos = cal.index.get_loc(dup)
+    timestamps = pd.Series(np.insert(cal.index.values, pos, dup.to_datetime64()))
+    assert len(timestamps) == 35041
+
+    mask = cal.leisure_mask(timestamps)
+
+    assert len(mask) == 35041
+    # 27.10.2030 ist ein Sonntag
+    assert mask[pos] and mask[pos + 1]
+    assert np.array_equal(np.delete(mask, pos), cal.is_leisure_day)
+    assert cal.leisure_mask(cal.index) is cal.is_leisure_day
+
+
+def test_holidays_and_day_types():
+    cal = get_calendar(2030)
+
+    def day_type(date):
+        return cal.day_type[cal.index.get_loc(pd.Timestamp(date))]
+
+    # Ostermontag 2030: 22.04.
+    assert cal.is_holiday[cal.index.get_loc(pd.Timestamp("2030-04-22 12:00"))]
+    assert day_type("2030-04-22 12:00") == DAY_TYPE_FT
+    assert day_type("2030-04-23 12:00") == DAY_TYPE_WT
+    # 24.12.2030 ist ein Dienstag und zählt wie ein Samstag
+    assert day_type("2030-12-24 12:00") == DAY_TYPE_SA
+    assert day_type("2030-12-25 12:00") == DAY_TYPE_FT
+    assert day_type("2030-01-05 12:00") == DAY_TYPE_SA
+    assert day_type("2030-01-06 12:00") == DAY_TYPE_FT
+
+
+def test_rebase_to_year_matches_timestamp_replace():
+    source = get_calendar(2023).index[::97]
+
+    rebased = rebase_to_year(source, 2024)
+
+    expected = np.array([ts.replace(year=2024) for ts in source], dtype="datetime64[ns]")
+    assert np.array_equal(rebased, expected)
+    assert np.array_equal(rebase_to_year(rebased, 2023), source.values)
+
+    with pytest.raises(ValueError):
+        rebase_to_year(pd.DatetimeIndex(["2024-02-29 12:00"]), 2030)
+
+
+def test_calendar_is_cached_and_read_only():
+    first = get_calendar(2031)
+    hits = _CALENDAR_CACHE.info()["hits"]
+
+    assert get_calendar(np.int64(2031)) is first
+    assert quarter_hour_index(2031) is first.index
+    assert _CALENDAR_CACHE.info()["hits"] == hits + 2
+    with pytest.raises(ValueError):
+        first.is_leisure_day[0] = True
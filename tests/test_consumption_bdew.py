@@ -0,0 +1,159 @@
+"""
+Paritätstests: vektorisierte BDEW-Verbrauchssimulation gegen die ursprüngliche
+Umsetzung mit Tagestyp je Zeile (DataFrame.apply) und Merge je Sektor.
+
+Verwendet die BDEW-Lastprofile aus raw-data. Alle Spalten müssen bitgleich sein.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from data_processing.consumption_simulation import (
+    CONSUMPTION_SHAPE_CACHE,
+    get_consumption_shapes,
+    scale_consumption_shapes,
+    simulate_consumption_BDEW,
+)
+
+RAW_DATA = Path(__file__).resolve().parents[1] / "raw-data"
+
+RESULT_COLUMNS = ['Zeitpunkt', 'Haushalte [MWh]', 'Gewerbe [MWh]', 'Landwirtschaft [MWh]', 'Gesamt [MWh]']
+
+
+def _load_profile(sector: str) -> pd.DataFrame:
+    """BDEW-Lastprofil wie in raw-data (Tab-getrennt, Dezimalkomma als Text)."""
+    return pd.read_csv(
+        RAW_DATA / f"BDEW-Standardlastprofile-{sector}25.csv",
+        sep="\t", usecols=[0, 1, 2, 3], dtype=str, encoding="latin-1"
+    )
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    return _load_profile("H"), _load_profile("G"), _load_profile("L")
+
+
+def _reference_consumption_BDEW(lastH, lastG, lastL, lastZielH, lastZielG, lastZielL, simu_jahr):
+    """Ursprüngliches simulate_consumption_BDEW (Stand vor Kalender-Service und Lookup-Array)."""
+    import holidays
+
+    def _prepare_load_profile(df):
+        df = df.copy()
+        if 'value_kWh' in df.columns:
+            if df['value_kWh'].dtype == 'object':
+                df['value_kWh'] = df['value_kWh'].astype(str).str.replace(',', '.')
+            df['value_kWh'] = pd.to_numeric(df['value_kWh'], errors='coerce')
+        if 'timestamp' in df.columns:
+            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+        if 'month' in df.columns:
+            df['month'] = pd.to_numeric(df['month'], errors='coerce').astype('Int64')
+        return df
+
+    lastH = _prepare_load_profile(lastH)
+    lastG = _prepare_load_profile(lastG)
+    lastL = _prepare_load_profile(lastL)
+
+    zeitpunkte = pd.date_range(
+        start=pd.Timestamp(f'{simu_jahr}-01-01 00:00:00'),
+        end=pd.Timestamp(f'{simu_jahr}-12-31 23:45:00'),
+        freq='15min'
+    )
+    df_result = pd.DataFrame({'Zeitpunkt': zeitpunkte})
+    df_result['month'] = df_result['Zeitpunkt'].dt.month
+    df_result['weekday'] = df_result['Zeitpunkt'].dt.weekday
+    df_result['day'] = df_result['Zeitpunkt'].dt.day
+
+    de_holidays = holidays.Germany(years=simu_jahr, language='de')
+    feiertage = [pd.Timestamp(date) for date in de_holidays.keys()]
+
+    def _get_day_type(row):
+        date = row['Zeitpunkt'].date()
+        is_holiday = pd.Timestamp(date) in feiertage
+        is_sunday = row['weekday'] == 6
+        is_heiligabend_silvester = (row['month'] == 12) and (row['day'] in [24, 31])
+        if is_holiday or is_sunday:
+            return 'FT'
+        elif row['weekday'] == 5 or is_heiligabend_silvester:
+            return 'SA'
+        else:
+            return 'WT'
+
+    df_result['day_type'] = df_result.apply(_get_day_type, axis=1)
+
+    def _map_load_profile(df_result, df_profile):
+        df_work = df_result.copy()
+        df_work['hour'] = df_work['Zeitpunkt'].dt.hour
+        df_work['minute'] = df_work['Zeitpunkt'].dt.minute
+        df_prof = df_profile.copy()
+        df_prof['hour'] = df_prof['timestamp'].dt.hour
+        df_prof['minute'] = df_prof['timestamp'].dt.minute
+        df_merged = df_work.merge(
+            df_prof[['month', 'day_type', 'hour', 'minute', 'value_kWh']],
+            on=['month', 'day_type', 'hour', 'minute'],
+            how='left'
+        )
+        return df_merged['value_kWh'].fillna(0.0)
+
+    df_result['Haushalte_kWh'] = _map_load_profile(df_result, lastH)
+
+    t = df_result['Zeitpunkt'].dt.dayofyear.astype(float)
+    dyn_faktor = (
+        -3.92e-10 * t**4 +
+        3.20e-7 * t**3 -
+        7.02e-5 * t**2 +
+        2.10e-3 * t +
+        1.24
+    )
+    dyn_faktor = dyn_faktor.round(4)
+    df_result['Haushalte_kWh'] = (df_result['Haushalte_kWh'] * dyn_faktor).round(3)
+
+    df_result['Gewerbe_kWh'] = _map_load_profile(df_result, lastG)
+    df_result['Landwirtschaft_kWh'] = _map_load_profile(df_result, lastL)
+
+    sum_H_kWh = df_result['Haushalte_kWh'].sum()
+    sum_G_kWh = df_result['Gewerbe_kWh'].sum()
+    sum_L_kWh = df_result['Landwirtschaft_kWh'].sum()
+    faktor_H = lastZielH * 1e9 / sum_H_kWh if sum_H_kWh > 0 else 0
+    faktor_G = lastZielG * 1e9 / sum_G_kWh if sum_G_kWh > 0 else 0
+    faktor_L = lastZielL * 1e9 / sum_L_kWh if sum_L_kWh > 0 else 0
+
+    df_result['Haushalte [MWh]'] = df_result['Haushalte_kWh'] * faktor_H / 1000.0
+    df_result['Gewerbe [MWh]'] = df_result['Gewerbe_kWh'] * faktor_G / 1000.0
+    df_result['Landwirtschaft [MWh]'] = df_result['Landwirtschaft_kWh'] * faktor_L / 1000.0
+    df_result['Gesamt [MWh]'] = (
+        df_result['Haushalte [MWh]'] +
+        df_result['Gewerbe [MWh]'] +
+        df_result['Landwirtschaft [MWh]']
+    )
+    return df_result[RESULT_COLUMNS]
+
+
+@pytest.mark.parametrize("year", [2024, 2030, 2045])
+def test_bdew_gather_matches_reference(profiles, year):
+    targets = (130.0, 140.0, 4.5)
+
+    expected = _reference_consumption_BDEW(*profiles, *targets, year)
+    result = simulate_consumption_BDEW(*profiles, *targets, year)
+
+    assert list(result.columns) == RESULT_COLUMNS
+    assert len(result) == (35136 if year % 4 == 0 else 35040)
+    pd.testing.assert_frame_equal(result, expected, check_exact=True, check_freq=False)
+
+
+def test_shapes_are_shared_across_targets(profiles):
+    """Szenarien mit gleichem Jahr teilen die unskalierten Profile, nur die Skalierung ist neu."""
+    CONSUMPTION_SHAPE_CACHE.clear()
+
+    first = simulate_consumption_BDEW(*profiles, 130.0, 140.0, 4.5, 2030)
+    second = simulate_consumption_BDEW(*profiles, 100.0, 150.0, 3.0, 2030)
+    uncached = scale_consumption_shapes(
+        get_consumption_shapes(*profiles, 2030, use_cache=False), 100.0, 150.0, 3.0
+    )
+
+    info = CONSUMPTION_SHAPE_CACHE.info()
+    assert (info["hits"], info["misses"]) == (1, 1)
+    pd.testing.assert_frame_equal(second, uncached, check_exact=True)
+    assert first["Haushalte [MWh]"].sum() == pytest.approx(130.0e6)
+    assert second["Gewerbe [MWh]"].sum() == pytest.approx(150.0e6)
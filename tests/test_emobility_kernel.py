@@ -0,0 +1,322 @@
+"""
+Paritätstests: kompilierter Flotten-Kernel (_fleet_kernel) gegen die
+Python-Referenzimplementierung (_simulate_fleet_reference).
+
+simulate_emobility_fleet wird mit use_numba=True und use_numba=False auf
+identischen Eingaben ausgeführt; SOC, Laden, Entladen und Restbilanz müssen
+bitgleich sein. Dazu kommen Paritätstests für den EV-Profil-Cache (gegen die
+eingefrorene Profilberechnung), die Kohorten-Simulation (gegen verkettete
+Einzelläufe) und den V2G-Sweep (gegen Einzelläufe je Variante).
+"""
+
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing import e_mobility_simulation as ev
+from data_processing.e_mobility_simulation import (
+    EV_PROFILE_CACHE,
+    EVConfigParams,
+    EVScenarioParams,
+    generate_ev_profile,
+    get_ev_profile_arrays,
+    simulate_emobility_cohorts,
+    simulate_emobility_fleet,
+    sweep_v2g_parameters,
+)
+
+PARITY_COLUMNS = [
+    "EMobility SOC [MWh]",
+    "EMobility Charge [MWh]",
+    "EMobility Discharge [MWh]",
+    "Rest Bilanz [MWh]",
+]
+
+
+def _balance_frame(year: int, seed: int) -> pd.DataFrame:
+    """Synthetische Viertelstunden-Bilanz eines Jahres (Überschüsse und Defizite um die Schwellwerte)."""
+    timestamps = pd.date_range(f"{year}-01-01", f"{year + 1}-01-01", freq="15min", inclusive="left")
+    rng = np.random.default_rng(seed)
+    n = len(timestamps)
+    daily = np.sin(np.arange(n) * 2 * np.pi / 96)
+    balance = 3000.0 * daily + rng.normal(0.0, 1500.0, n)
+    balance[rng.integers(0, n, n // 100)] = 0.0
+    return pd.DataFrame({"Zeitpunkt": timestamps, "Bilanz [MWh]": balance})
+
+
+SCENARIOS = {
+    "default": EVScenarioParams(),
+    "small_fleet_high_v2g": EVScenarioParams(N_cars=800_000, v2g_share=0.8, E_batt_car=40.0),
+    "no_v2g_late_shift": EVScenarioParams(v2g_share=0.0, t_depart="09:15", t_arrive="21:45"),
+    "night_shift": EVScenarioParams(t_depart="22:00", t_arrive="06:00", thr_surplus=50_000.0),
+}
+
+
+def _assert_parity(df_balance, scenario_params, config_params):
+    df_kernel = simulate_emobility_fleet(
+        df_balance, scenario_params, config_params, use_numba=True
+    )
+    df_reference = simulate_emobility_fleet(
+        df_balance, scenario_params, config_params, use_numba=False
+    )
+    for col in PARITY_COLUMNS:
+        assert np.array_equal(df_kernel[col].to_numpy(), df_reference[col].to_numpy()), col
+
+
+@pytest.mark.parametrize("year", [2024, 2030])
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_fleet_kernel_matches_reference(scenario, year):
+    _assert_parity(_balance_frame(year, seed=year), SCENARIOS[scenario], EVConfigParams())
+
+
+def test_fleet_kernel_matches_reference_on_rest_balance():
+    """Eingang über 'Rest Bilanz [MWh]' (nach vorgelagerten Stufen) mit abweichender Config."""
+    df_balance = _balance_frame(2030, seed=7)
+    df_balance["Rest Bilanz [MWh]"] = df_balance["Bilanz [MWh]"] * 0.6
+    config_params = EVConfigParams(SOC0=0.3, eta_ch=0.9, eta_dis=0.92, P_ch_car_max=7.4, P_dis_car_max=5.0)
+    _assert_parity(df_balance, EVScenarioParams(), config_params)
+
+
+def test_reference_path_uses_reference_implementation(monkeypatch):
+    """use_numba=False muss tatsächlich _simulate_fleet_reference aufrufen."""
+    calls = []
+    original = ev._simulate_fleet_reference
+
+    def spy(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(ev, "_simulate_fleet_reference", spy)
+    df_balance = _balance_frame(2030, seed=1).iloc[:96 * 7].reset_index(drop=True)
+    simulate_emobility_fleet(df_balance, EVScenarioParams(), EVConfigParams(), use_numba=False)
+    simulate_emobility_fleet(df_balance, EVScenarioParams(), EVConfigParams(), use_numba=True)
+    assert calls == [1]
+
+
+# --- EV-Profil-Cache ---------------------------------------------------------
+
+def _reference_ev_profile(
+    timestamps: pd.Series,
+    scenario_params: EVScenarioParams,
+    config_params: EVConfigParams
+) -> pd.DataFrame:
+    """Ursprüngliches generate_ev_profile (Stand vor dem Profil-Cache, Kommentare gekürzt)."""
+    import holidays
+
+    t_depart_dec = ev._time_str_to_decimal(scenario_params.t_depart)
+    t_arrive_dec = ev._time_str_to_decimal(scenario_params.t_arrive)
+
+    t_preload_start_dec = t_depart_dec - (2.0 / 24.0)
+    if t_preload_start_dec < 0:
+        t_preload_start_dec += 1.0
+
+    n_ev = scenario_params.s_EV * scenario_params.N_cars
+
+    ts_hour = timestamps.dt.hour + timestamps.dt.minute / 60.0
+    ts_vals = ts_hour.values
+
+    simu_jahr = timestamps.iloc[0].year
+    de_holidays = holidays.Germany(years=simu_jahr, language='de')
+    feiertage_set = set(de_holidays.keys())
+    is_holiday = timestamps.dt.date.isin(feiertage_set).values
+
+    is_weekend = (timestamps.dt.dayofweek >= 5).values
+    da = timestamps.dt.day.values
+    mo = timestamps.dt.month.values
+    is_heiligabend_silvester = (mo == 12) & ((da == 24) | (da == 31))
+    is_leisure_day = is_weekend | is_holiday | is_heiligabend_silvester
+
+    peak_morning = ev._skewed_gaussian(ts_vals, mu=7.75, sig_left=1.5, sig_right=2.5)
+    peak_evening = ev._skewed_gaussian(ts_vals, mu=17.25, sig_left=2.5, sig_right=2.0)
+    profile_workday = (peak_morning * 0.9) + (peak_evening * 1.1) + 0.1
+    peak_leisure = ev._skewed_gaussian(ts_vals, mu=13.0, sig_left=5.0, sig_right=5.0)
+    profile_leisure = (peak_leisure * 0.8) + 0.1
+    activity_profile = np.where(is_leisure_day, profile_leisure, profile_workday)
+
+    dt_h = config_params.dt_h
+    total_activity_sum = np.sum(activity_profile) * dt_h
+    if total_activity_sum == 0:
+        total_activity_sum = 1.0
+    target_energy_year = n_ev * scenario_params.E_drive_car_year
+    power_scaling_factor = target_energy_year / total_activity_sum
+    drive_power = activity_profile * power_scaling_factor
+
+    act_min = np.min(activity_profile)
+    act_max = np.max(activity_profile)
+    if act_max > act_min:
+        activity_norm = (activity_profile - act_min) / (act_max - act_min)
+    else:
+        activity_norm = np.zeros_like(activity_profile)
+    plug_share_raw = np.clip(1.0 - (activity_norm * 0.9), 0.0, 1.0)
+    plug_share = plug_share_raw * scenario_params.plug_share_max
+
+    n = len(timestamps)
+    soc_min = np.zeros(n)
+    preload_flag = np.zeros(n, dtype=int)
+    soc_target = np.full(n, np.nan)
+    time_of_day_series = ts_vals / 24.0
+
+    if t_depart_dec < t_arrive_dec:
+        is_driving_window = (time_of_day_series >= t_depart_dec) & (time_of_day_series < t_arrive_dec)
+    else:
+        is_driving_window = (time_of_day_series >= t_depart_dec) | (time_of_day_series < t_arrive_dec)
+    is_parking_window = ~is_driving_window
+
+    soc_min[is_driving_window] = scenario_params.SOC_min_day
+    soc_min[is_parking_window] = scenario_params.SOC_min_night
+
+    if t_preload_start_dec < t_depart_dec:
+        is_preload = (time_of_day_series >= t_preload_start_dec) & (time_of_day_series < t_depart_dec)
+    else:
+        is_preload = (time_of_day_series >= t_preload_start_dec) | (time_of_day_series < t_depart_dec)
+    preload_flag[is_preload] = 1
+
+    soc_target[is_parking_window] = scenario_params.SOC_target_depart
+
+    diff = t_depart_dec - time_of_day_series
+    diff[diff < 0] += 1.0
+    time_to_depart = diff * 24.0
+    time_to_depart[is_driving_window] = 0.0
+
+    return pd.DataFrame({
+        'Zeitpunkt': timestamps.values,
+        'plug_share': plug_share,
+        'drive_power_kw': drive_power,
+        'soc_min_share': soc_min,
+        'preload_flag': preload_flag,
+        'soc_target_share': soc_target,
+        'time_to_depart_h': time_to_depart,
+        'is_leisure_day': is_leisure_day,
+    })
+
+
+@pytest.mark.parametrize("year", [2024, 2030])
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_ev_profile_matches_reference(scenario, year, use_cache):
+    timestamps = _balance_frame(year, seed=0)["Zeitpunkt"]
+    params, config = SCENARIOS[scenario], EVConfigParams()
+
+    expected = _reference_ev_profile(timestamps, params, config)
+    # Zweiter Aufruf kommt mit use_cache=True aus dem Cache
+    for _ in range(2):
+        profile = generate_ev_profile(timestamps, params, config, use_cache=use_cache)
+        assert list(profile.columns) == list(expected.columns)
+        for col in expected.columns:
+            assert np.array_equal(
+                profile[col].to_numpy(), expected[col].to_numpy(), equal_nan=col == 'soc_target_share'
+            ), col
+
+
+def test_ev_profile_cache_key_ignores_dispatch_parameters():
+    """V2G-Quote, Schwellwerte und Batteriegröße teilen sich ein Profil, Abfahrtszeiten nicht."""
+    timestamps = _balance_frame(2030, seed=0)["Zeitpunkt"]
+    config = EVConfigParams()
+    EV_PROFILE_CACHE.clear()
+
+    first = get_ev_profile_arrays(timestamps, EVScenarioParams(), config)
+    same = get_ev_profile_arrays(
+        timestamps, EVScenarioParams(v2g_share=0.9, thr_surplus=1.0, thr_deficit=2.0, E_batt_car=80.0), config
+    )
+    other = get_ev_profile_arrays(timestamps, EVScenarioParams(t_depart="06:30"), config)
+
+    assert same is first
+    assert other is not first
+    info = EV_PROFILE_CACHE.info()
+    assert (info["hits"], info["misses"]) == (1, 2)
+    with pytest.raises(ValueError):
+        first["plug_share"][0] = 0.0
+
+
+# --- Kohorten -----------------------------------------------------------------
+
+FLEET_COLUMNS = ["SOC [MWh]", "Charge [MWh]", "Discharge [MWh]", "Drive [MWh]", "Power [MW]"]
+
+COHORTS = {
+    "Pendler": EVScenarioParams(N_cars=20_000_000, v2g_share=0.3),
+    "Schicht": EVScenarioParams(N_cars=3_000_000, t_depart="21:30", t_arrive="06:15", v2g_share=0.6),
+    "Leer": EVScenarioParams(N_cars=0),
+    "Flotte": EVScenarioParams(N_cars=1_500_000, E_batt_car=90.0, v2g_share=0.0, thr_surplus=50_000.0),
+}
+
+
+@pytest.mark.parametrize("year", [2024, 2030])
+def test_cohorts_match_chained_reference_runs(year):
+    """Kohorte k entspricht einem Einzellauf (Python-Referenz) auf der Restbilanz nach Kohorte k-1."""
+    df_balance = _balance_frame(year, seed=year + 5)
+    config = EVConfigParams()
+
+    result = simulate_emobility_cohorts(df_balance, COHORTS, config)
+
+    # Die Kette rechnet die Residuallast je Lauf von kW in die MWh-Bilanz und zurück,
+    # der Kohorten-Kernel bleibt in kW - ab der zweiten Kohorte nur Rundungsdifferenzen
+    current = df_balance
+    totals = {col: np.zeros(len(df_balance)) for col in FLEET_COLUMNS}
+    for k, (name, params) in enumerate(COHORTS.items()):
+        if params.N_cars == 0:
+            for col in FLEET_COLUMNS:
+                assert not result[f"EMobility {name} {col}"].any(), (name, col)
+            continue
+        single = simulate_emobility_fleet(current, params, config, use_numba=False)
+        for col in FLEET_COLUMNS:
+            expected = single[f"EMobility {col}"].to_numpy()
+            got = result[f"EMobility {name} {col}"].to_numpy()
+            if k == 0:
+                assert np.array_equal(got, expected), (name, col)
+            else:
+                assert np.allclose(got, expected, rtol=1e-12, atol=1e-9), (name, col)
+            totals[col] = totals[col] + expected
+        current = single
+
+    assert np.allclose(
+        result["Rest Bilanz [MWh]"].to_numpy(), current["Rest Bilanz [MWh]"].to_numpy(), rtol=1e-12, atol=1e-9
+    )
+    for col in FLEET_COLUMNS:
+        assert np.allclose(result[f"EMobility {col}"].to_numpy(), totals[col], rtol=1e-12, atol=1e-9), col
+
+
+def test_single_cohort_matches_fleet():
+    df_balance = _balance_frame(2030, seed=9)
+    params = SCENARIOS["small_fleet_high_v2g"]
+
+    result = simulate_emobility_cohorts(df_balance, {"Alle": params})
+    fleet = simulate_emobility_fleet(df_balance, params, EVConfigParams(), use_numba=False)
+
+    for col in FLEET_COLUMNS + ["Rest Bilanz"]:
+        name = "Rest Bilanz [MWh]" if col == "Rest Bilanz" else f"EMobility {col}"
+        assert np.array_equal(result[name].to_numpy(), fleet[name].to_numpy()), name
+
+
+# --- V2G-Sweep ----------------------------------------------------------------
+
+def test_v2g_sweep_matches_single_reference_runs():
+    """Jede Sweep-Variante entspricht einem Einzellauf (Python-Referenz) mit denselben Parametern."""
+    df_balance = _balance_frame(2030, seed=21)
+    base, config = SCENARIOS["small_fleet_high_v2g"], EVConfigParams()
+    v2g_share = np.array([0.0, 0.4, 0.9])[:, None]
+    soc_target = np.array([0.6, 0.85])[None, :]
+
+    sweep = sweep_v2g_parameters(
+        df_balance, base, config, v2g_share=v2g_share, thr_deficit=5_000.0, SOC_target_depart=soc_target
+    )
+    assert len(sweep) == 6
+    assert (sweep["thr_surplus"] == base.thr_surplus).all()
+    assert sweep["Entladene Energie [MWh]"].nunique() > 1
+
+    for _, row in sweep.iterrows():
+        params = replace(
+            base, v2g_share=row["v2g_share"], thr_surplus=row["thr_surplus"],
+            thr_deficit=row["thr_deficit"], SOC_target_depart=row["SOC_target_depart"]
+        )
+        single = simulate_emobility_fleet(df_balance, params, config, use_numba=False)
+        rest = single["Rest Bilanz [MWh]"].to_numpy()
+        expected = {
+            "Spitzen-Residuallast [MW]": np.max(-rest) / config.dt_h,
+            "Ungedeckte Energie [MWh]": -rest[rest < 0].sum(),
+            "Entladene Energie [MWh]": single["EMobility Discharge [MWh]"].sum(),
+            "Geladene Energie [MWh]": single["EMobility Charge [MWh]"].sum(),
+        }
+        for column, value in expected.items():
+            assert np.isclose(row[column], value, rtol=1e-9), (column, row["v2g_share"], row["SOC_target_depart"])
@@ -0,0 +1,255 @@
+"""
+Tests für die Erzeugungssimulation (generation_simulation).
+
+simulate_production baut die Erzeugung über ProductionMatrix aus gecachten
+Kapazitätsfaktor-Profilen auf. Ergebnis (Werte und Spaltenreihenfolge) muss
+bitgleich zur ursprünglichen Berechnung je Technologie sein, die hier als
+Referenz eingefroren ist. simulate_production_batch muss je Szenario die
+Summe der Einzelsimulation liefern, die Profile werden über CF_PROFILE_CACHE
+geteilt. Die SMARD-Daten werden synthetisch erzeugt, da die Rohdaten nicht
+im Repository liegen.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config_manager import ConfigManager
+from data_processing.generation_simulation import (
+    CF_PROFILE_CACHE,
+    _generate_generation_profile,
+    build_production_matrix,
+    get_capacity_factor_profiles,
+    simulate_production,
+    simulate_production_batch,
+)
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "source-code" / "config.json"
+
+SMARD_COLUMNS = [
+    "Biomasse", "Wasserkraft", "Wind Offshore", "Wind Onshore", "Photovoltaik",
+    "Sonstige Erneuerbare", "Kernenergie", "Braunkohle", "Steinkohle", "Erdgas",
+    "Pumpspeicher", "Sonstige Konventionelle",
+]
+
+CAPACITY_DICTS = {
+    "voll": {
+        "Wind_Onshore": {"2030": 115000, "2032": 125000},
+        "Wind_Offshore": {"2030": 30000, "2032": 35000},
+        "Photovoltaik": {"2030": 215000, "2032": 250000},
+        "Biomasse": {"2030": 8400, "2032": 8000},
+        "Wasserkraft": {"2030": 5300, "2032": 5300},
+        "Erdgas": {"2030": 35000, "2032": 36000},
+        "Steinkohle": {"2030": 8000, "2032": 0},
+        "Braunkohle": {"2030": 9000, "2032": 0},
+        "Kernenergie": {"2030": 0, "2032": 0},
+        "Sonstige Erneuerbare": {"2030": 500, "2032": 500},
+    },
+    # Jahresschlüssel als int, fehlende Technologien und Nullkapazitäten
+    "teilweise": {
+        "Photovoltaik": {2030: 150000, 2032: 180000},
+        "Wind_Onshore": {2030: 0, 2032: 90000},
+        "Erdgas": {2030: 20000, 2032: 20000},
+    },
+}
+
+WEATHER = [("good", "good", "good"), ("average", "bad", "bad"), ("bad", "average", "average")]
+
+
+def _synthetic_smard(start_year: int, end_year: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range(f"{start_year}-01-01 00:00", f"{end_year}-12-31 23:45", freq="15min")
+    data = {"Zeitpunkt": idx}
+    for k, name in enumerate(SMARD_COLUMNS):
+        data[f"{name} [MWh]"] = (500.0 + 100.0 * k) * rng.random(len(idx))
+    # Einzelne Ausreißer über der installierten Leistung (werden auf CF 1 begrenzt)
+    df = pd.DataFrame(data)
+    df.loc[::9973, "Wind Onshore [MWh]"] = 1.0e6
+    return df
+
+
+def _synthetic_capacity(start_year: int, end_year: int) -> pd.DataFrame:
+    years = list(range(start_year, end_year + 1))
+    data = {"Jahr": years}
+    for k, name in enumerate(SMARD_COLUMNS):
+        data[f"{name} [MW]"] = [4.0 * (500.0 + 100.0 * k) * (1.0 + 0.05 * (y - start_year)) for y in years]
+    return pd.DataFrame(data)
+
+
+@pytest.fixture(scope="module")
+def cfg() -> ConfigManager:
+    return ConfigManager(CONFIG_PATH)
+
+
+@pytest.fixture(scope="module")
+def smard():
+    generation = _synthetic_smard(2015, 2024, 7)
+    capacity = _synthetic_capacity(2015, 2024)
+    return generation, capacity
+
+
+def _reference_simulate_production(cfg, smardGeneration, smardCapacity, capacity_dict,
+                                   wind_on_weather, wind_off_weather, pv_weather, simu_jahr):
+    """Ursprüngliche Erzeugungssimulation je Technologie (Stand vor ProductionMatrix)."""
+    windOn_smard_ref_jahr = cfg.get_generation_year("Wind_Onshore", wind_on_weather)
+    windOff_smard_ref_jahr = cfg.get_generation_year("Wind_Offshore", wind_off_weather)
+    pv_smard_ref_jahr = cfg.get_generation_year("Photovoltaik", pv_weather)
+    ref_jahr = cfg.config["GENERATION_SIMULATION"]["optimal_reference_years_by_technology"]["default"]
+
+    smardGeneration = smardGeneration.set_index("Zeitpunkt")
+    smardGeneration.index = pd.to_datetime(smardGeneration.index)
+
+    df_windOn_ref = smardGeneration.loc[str(windOn_smard_ref_jahr)].copy()
+    df_windOff_ref = smardGeneration.loc[str(windOff_smard_ref_jahr)].copy()
+    df_pv_ref = smardGeneration.loc[str(pv_smard_ref_jahr)].copy()
+    df_ref = smardGeneration.loc[str(ref_jahr)].copy()
+
+    df_windOn_refCap = smardCapacity[smardCapacity["Jahr"] == windOn_smard_ref_jahr]
+    df_windOff_refCap = smardCapacity[smardCapacity["Jahr"] == windOff_smard_ref_jahr]
+    df_pv_refCap = smardCapacity[smardCapacity["Jahr"] == pv_smard_ref_jahr]
+    df_refCap = smardCapacity[smardCapacity["Jahr"] == ref_jahr]
+
+    df_windOn_Profile = _generate_generation_profile(df_windOn_ref, df_windOn_refCap, False)
+    df_windOff_Profile = _generate_generation_profile(df_windOff_ref, df_windOff_refCap, False)
+    df_pv_Profile = _generate_generation_profile(df_pv_ref, df_pv_refCap, False)
+    df_other_Profile = _generate_generation_profile(df_ref, df_refCap, True)
+
+    start_date = pd.Timestamp(year=simu_jahr, month=1, day=1)
+    end_date = pd.Timestamp(year=simu_jahr, month=12, day=31, hour=23, minute=45)
+    target_time_index = pd.date_range(start=start_date, end=end_date, freq='15min')
+
+    def align_profile_to_target_year(df_profile, target_index):
+        profile_len = len(df_profile)
+        target_len = len(target_index)
+        if profile_len == target_len:
+            return df_profile
+        elif profile_len > target_len:
+            return df_profile.iloc[:target_len].copy()
+        else:
+            repeat_data = df_profile.iloc[-96:].copy()
+            df_extended = pd.concat([df_profile, repeat_data], ignore_index=True)
+            return df_extended.iloc[:target_len].copy()
+
+    df_windOn_Profile = align_profile_to_target_year(df_windOn_Profile, target_time_index)
+    df_windOff_Profile = align_profile_to_target_year(df_windOff_Profile, target_time_index)
+    df_pv_Profile = align_profile_to_target_year(df_pv_Profile, target_time_index)
+    df_other_Profile = align_profile_to_target_year(df_other_Profile, target_time_index)
+
+    target_year_str = str(simu_jahr)
+    target_year_int = int(simu_jahr)
+    df_result = pd.DataFrame({'Zeitpunkt': target_time_index})
+    quarter_hour_factor = 0.25
+
+    for tech, col, df_profile in (
+        ("Wind_Onshore", "Wind Onshore [MWh]", df_windOn_Profile),
+        ("Wind_Offshore", "Wind Offshore [MWh]", df_windOff_Profile),
+        ("Photovoltaik", "Photovoltaik [MWh]", df_pv_Profile),
+    ):
+        if tech in capacity_dict:
+            target_capacity = capacity_dict[tech].get(target_year_str,
+                              capacity_dict[tech].get(target_year_int, 0))
+            if target_capacity > 0 and col in df_profile.columns:
+                df_result[col] = df_profile[col].values * target_capacity * quarter_hour_factor
+
+    other_technologies = [
+        'Biomasse', 'Wasserkraft', 'Erdgas', 'Steinkohle', 'Braunkohle',
+        'Kernenergie', 'Sonstige Erneuerbare'
+    ]
+    for tech in other_technologies:
+        tech_col_name = f'{tech} [MWh]'
+        if tech in capacity_dict and tech_col_name in df_other_Profile.columns:
+            target_capacity = capacity_dict[tech].get(target_year_str,
+                             capacity_dict[tech].get(target_year_int, 0))
+            if target_capacity > 0:
+                df_result[tech_col_name] = (
+                    df_other_Profile[tech_col_name].values * target_capacity * quarter_hour_factor
+                )
+
+    df_result['Zeitpunkt'] = pd.to_datetime(df_result['Zeitpunkt'])
+    df_result['Zeitpunkt'] = df_result['Zeitpunkt'].apply(lambda x: x.replace(year=simu_jahr))
+    return df_result
+
+
+@pytest.mark.parametrize("weather", WEATHER)
+@pytest.mark.parametrize("year", [2030, 2032])
+@pytest.mark.parametrize("scenario", list(CAPACITY_DICTS))
+def test_simulate_production_matches_reference(cfg, smard, scenario, year, weather):
+    generation, capacity = smard
+    capacity_dict = CAPACITY_DICTS[scenario]
+
+    expected = _reference_simulate_production(cfg, generation, capacity, capacity_dict, *weather, year)
+    result = simulate_production(cfg, generation, capacity, capacity_dict, *weather, year)
+
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(result, expected, check_exact=True, check_freq=False)
+
+
+@pytest.mark.parametrize("year", [2030, 2032])
+def test_batch_matches_single_simulations(cfg, smard, year):
+    generation, capacity = smard
+    weather = WEATHER[1]
+
+    batch = simulate_production_batch(cfg, generation, capacity, CAPACITY_DICTS, *weather, year)
+
+    assert list(batch.columns) == ["Zeitpunkt"] + list(CAPACITY_DICTS)
+    for name, capacity_dict in CAPACITY_DICTS.items():
+        single = simulate_production(cfg, generation, capacity, capacity_dict, *weather, year)
+        assert np.array_equal(batch["Zeitpunkt"].to_numpy(), single["Zeitpunkt"].to_numpy())
+        # Matrixprodukt statt Spaltensumme: nur Rundungsunterschiede
+        total = single.drop(columns="Zeitpunkt").sum(axis=1).to_numpy()
+        np.testing.assert_allclose(batch[name].to_numpy(), total, rtol=1e-12, atol=1e-9)
+
+
+def test_batch_without_scenarios(cfg, smard):
+    generation, capacity = smard
+    batch = simulate_production_batch(cfg, generation, capacity, {}, *WEATHER[0], 2030)
+    assert list(batch.columns) == ["Zeitpunkt"]
+    assert len(batch) == 35040
+
+
+def test_capacity_factor_profiles_are_cached(cfg, smard):
+    generation, capacity = smard
+    weather = WEATHER[0]
+    CF_PROFILE_CACHE.clear()
+
+    # Vier Profilgruppen: Wind Onshore, Wind Offshore, PV und Standardjahr
+    simulate_production(cfg, generation, capacity, CAPACITY_DICTS["voll"], *weather, 2030)
+    assert (CF_PROFILE_CACHE.hits, CF_PROFILE_CACHE.misses) == (0, 4)
+
+    # Anderes Szenario und anderes Jahr gleicher Länge: alle Profile wiederverwendet
+    simulate_production(cfg, generation, capacity, CAPACITY_DICTS["teilweise"], *weather, 2030)
+    simulate_production_batch(cfg, generation, capacity, CAPACITY_DICTS, *weather, 2031)
+    assert (CF_PROFILE_CACHE.hits, CF_PROFILE_CACHE.misses) == (8, 4)
+
+    # Schaltjahr: neue Rasterlänge
+    simulate_production(cfg, generation, capacity, CAPACITY_DICTS["voll"], *weather, 2032)
+    assert (CF_PROFILE_CACHE.hits, CF_PROFILE_CACHE.misses) == (8, 8)
+
+    matrix = build_production_matrix(cfg, generation, capacity, *weather, 2030)
+    assert CF_PROFILE_CACHE.misses == 8
+    ref_year = cfg.get_generation_year("Photovoltaik", weather[2])
+    profiles = get_capacity_factor_profiles(generation, capacity, ref_year, False, 35040)
+    assert np.array_equal(matrix.cf[:, matrix.technologies.index("Photovoltaik")],
+                          profiles["Photovoltaik [MWh]"])
+    with pytest.raises(ValueError):
+        profiles["Photovoltaik [MWh]"][0] = 0.0
+
+
+def test_capacity_factor_cache_detects_changed_data(cfg, smard):
+    generation, capacity = smard
+    CF_PROFILE_CACHE.clear()
+    ref_year = cfg.get_generation_year("Photovoltaik", "good")
+
+    before = get_capacity_factor_profiles(generation, capacity, ref_year, False, 35040)
+    changed = generation.copy()
+    changed["Photovoltaik [MWh]"] *= 0.5
+    after = get_capacity_factor_profiles(changed, capacity, ref_year, False, 35040)
+
+    assert CF_PROFILE_CACHE.misses == 2
+    np.testing.assert_allclose(after["Photovoltaik [MWh]"], 0.5 * before["Photovoltaik [MWh]"], rtol=1e-12)
+
+    uncached = get_capacity_factor_profiles(generation, capacity, ref_year, False, 35040, use_cache=False)
+    assert CF_PROFILE_CACHE.misses == 2
+    assert np.array_equal(uncached["Photovoltaik [MWh]"], before["Photovoltaik [MWh]"])
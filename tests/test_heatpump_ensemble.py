@@ -0,0 +1,116 @@
+"""
+Tests für das Wärmepumpen-Ensemble über mehrere Wetterjahre
+(calculate_heatpump_ensemble, HeatPumpEnsemble).
+
+Jede Ensemble-Reihe muss dem Einzellauf mit demselben Wetterdatensatz
+entsprechen; auf dem Zeitraster des Verbrauchs (inkl. doppeltem Zeitstempel der
+Zeitumstellung) darf apply_to_consumption keine Viertelstunde doppelt zählen.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing.calculation_engine import CalculationEngine
+from data_processing.heat_pump_simulation import HeatPumpSimulation
+
+RAW_DATA = Path(__file__).resolve().parent.parent / "raw-data"
+
+N_HEATPUMPS = 1_000_000
+Q_TH_A = 51000.0
+COP_AVG = 3.4
+DT = 0.25
+TARGET_MWH = Q_TH_A * N_HEATPUMPS / COP_AVG / 1000.0
+
+
+@pytest.fixture(scope="module")
+def weather_dfs():
+    return {
+        f"Wetter {year}": pd.read_csv(
+            RAW_DATA / f"Lufttemperatur-{year}.csv", sep=";", decimal=",", encoding="latin-1"
+        )
+        for year in (2019, 2021)
+    }
+
+
+@pytest.fixture(scope="module")
+def hp_profile_matrix() -> pd.DataFrame:
+    return pd.read_csv(RAW_DATA / "Waermepumpen-Standartlastprofile.csv", sep="\t", encoding="latin-1")
+
+
+def _modes():
+    modes = ["numpy"]
+    try:
+        import numba  # noqa: F401
+        modes.append("cpu_optimized")
+    except ImportError:
+        pass
+    return modes
+
+
+def _ensemble(mode, weather_dfs, hp_profile_matrix, zeitpunkte=None):
+    return CalculationEngine(mode).calculate_heatpump_ensemble(
+        weather_dfs, hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, 2030, zeitpunkte=zeitpunkte
+    )
+
+
+@pytest.mark.parametrize("mode", _modes())
+def test_members_match_single_simulation(weather_dfs, hp_profile_matrix, mode):
+    ensemble = _ensemble(mode, weather_dfs, hp_profile_matrix)
+
+    assert ensemble.n_members == 2
+    assert len(ensemble.zeitpunkte) == 35040
+    for name, weather in weather_dfs.items():
+        single = HeatPumpSimulation(calculation_mode=mode).simulate(
+            weather, hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, 2030
+        )
+        member = ensemble.member_frame(name)
+        assert np.array_equal(member["Zeitpunkt"].to_numpy(), single["Zeitpunkt"].to_numpy())
+        assert np.array_equal(member["Wärmepumpen [MWh]"].to_numpy(), single["Wärmepumpen [MWh]"].to_numpy())
+
+    assert ensemble.annual_twh().to_numpy() == pytest.approx(TARGET_MWH / 1e6, rel=1e-12)
+    assert list(ensemble.to_frame().columns) == ["Zeitpunkt", *weather_dfs]
+    assert ensemble.peak_mw(DT).to_numpy() == pytest.approx(ensemble.energy_mwh.max(axis=1) / DT)
+
+
+@pytest.mark.parametrize("mode", _modes())
+def test_consumption_grid_keeps_dst_duplicate(weather_dfs, hp_profile_matrix, mode):
+    """Auf dem Raster des AVERAGE-Pfads entspricht das eigene Wetterjahr calculate_heatpump_load."""
+    engine = CalculationEngine(mode)
+    df_hp = engine.calculate_heatpump_load(
+        weather_dfs["Wetter 2019"], hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, 2030
+    )
+    assert len(df_hp) == 35041
+
+    ensemble = _ensemble(mode, weather_dfs, hp_profile_matrix, zeitpunkte=df_hp["Zeitpunkt"])
+
+    assert np.array_equal(ensemble.zeitpunkte.values, df_hp["Zeitpunkt"].to_numpy())
+    assert np.array_equal(ensemble.energy_mwh[0], df_hp["Wärmepumpen [MWh]"].to_numpy())
+    # Das andere Wetterjahr wird über das gesamte Raster (inkl. Duplikat) normiert
+    assert ensemble.energy_mwh[1].sum() == pytest.approx(TARGET_MWH, rel=1e-12)
+
+
+def test_apply_to_consumption_counts_dst_duplicate_once(weather_dfs, hp_profile_matrix):
+    engine = CalculationEngine("numpy")
+    df_hp = engine.calculate_heatpump_load(
+        weather_dfs["Wetter 2019"], hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, 2030
+    )
+    df_consumption = df_hp.copy()
+    df_consumption["Haushalte [MWh]"] = 1000.0
+    df_consumption["Gesamt [MWh]"] = df_consumption["Haushalte [MWh]"] + df_consumption["Wärmepumpen [MWh]"]
+    before = df_consumption.copy()
+
+    ensemble = _ensemble("numpy", weather_dfs, hp_profile_matrix, zeitpunkte=df_consumption["Zeitpunkt"])
+    df_new = ensemble.apply_to_consumption(df_consumption, "Wetter 2021")
+
+    pd.testing.assert_frame_equal(df_consumption, before)
+    assert len(df_new) == 35041
+    assert np.array_equal(df_new["Wärmepumpen [MWh]"].to_numpy(), ensemble.energy_mwh[1])
+    assert df_new["Wärmepumpen [MWh]"].sum() == pytest.approx(TARGET_MWH, rel=1e-12)
+    assert np.allclose(df_new["Gesamt [MWh]"], 1000.0 + df_new["Wärmepumpen [MWh]"], rtol=1e-12)
+
+    # Ensemble auf dem Jahresraster ohne Duplikat passt nicht zeilengenau
+    with pytest.raises(ValueError):
+        _ensemble("numpy", weather_dfs, hp_profile_matrix).apply_to_consumption(df_consumption, "Wetter 2021")
@@ -0,0 +1,95 @@
+"""
+Tests für HeatPumpSimulation.simulate.
+
+Die Simulation nutzt Lookup und Normierung der CalculationEngine und muss auf
+derselben Temperaturreihe bitgleich zu calculate_heatpump_load sein.
+HeatPumpSimulation entfernt den doppelten Zeitstempel der Zeitumstellung,
+daher wird die Engine mit Wetterdaten ohne diese Zeile verglichen.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing.calculation_engine import CalculationEngine, prepare_weather_temperatures
+from data_processing.heat_pump_simulation import HeatPumpSimulation
+
+RAW_DATA = Path(__file__).resolve().parent.parent / "raw-data"
+
+N_HEATPUMPS = 1_000_000
+Q_TH_A = 51000.0
+COP_AVG = 3.4
+DT = 0.25
+
+DETAILED_COLUMNS = [
+    "Zeitpunkt", "Temperatur [°C]", "P_th [kW]", "P_el [kW]",
+    "P_el_ges [kW]", "P_el_ges [MW]", "Wärmepumpen [MWh]",
+]
+
+
+@pytest.fixture(scope="module")
+def weather_df() -> pd.DataFrame:
+    return pd.read_csv(RAW_DATA / "Lufttemperatur-2019.csv", sep=";", decimal=",", encoding="latin-1")
+
+
+@pytest.fixture(scope="module")
+def hp_profile_matrix() -> pd.DataFrame:
+    return pd.read_csv(RAW_DATA / "Waermepumpen-Standartlastprofile.csv", sep="\t", encoding="latin-1")
+
+
+def _modes():
+    modes = ["numpy"]
+    try:
+        import numba  # noqa: F401
+        modes.append("cpu_optimized")
+    except ImportError:
+        pass
+    return modes
+
+
+@pytest.mark.parametrize("year", [2030, 2032])
+@pytest.mark.parametrize("mode", _modes())
+def test_simulation_matches_calculation_engine(weather_df, hp_profile_matrix, mode, year):
+    weather_unique = weather_df.drop_duplicates("Zeitpunkt").reset_index(drop=True)
+    assert len(weather_unique) == len(weather_df) - 1
+
+    df_sim = HeatPumpSimulation(calculation_mode=mode).simulate(
+        weather_df, hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, year
+    )
+    df_engine = CalculationEngine(mode).calculate_heatpump_load(
+        weather_unique, hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, year
+    )
+
+    assert list(df_sim.columns) == ["Zeitpunkt", "Wärmepumpen [MWh]"]
+    # Das Wetterjahr 2019 hat 365 Tage, auch im Schaltjahr 2032
+    assert len(df_sim) == 35040
+    assert np.array_equal(df_sim["Zeitpunkt"].to_numpy(), df_engine["Zeitpunkt"].to_numpy())
+    assert np.array_equal(df_sim["Wärmepumpen [MWh]"].to_numpy(), df_engine["Wärmepumpen [MWh]"].to_numpy())
+
+
+@pytest.mark.parametrize("mode", _modes())
+def test_detailed_columns(weather_df, hp_profile_matrix, mode):
+    sim = HeatPumpSimulation(calculation_mode=mode)
+    matrix_before = hp_profile_matrix.copy()
+
+    df = sim.simulate(
+        weather_df, hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, 2030, detailed=True
+    )
+    df_plain = sim.simulate(weather_df, hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, 2030)
+
+    assert list(df.columns) == DETAILED_COLUMNS
+    pd.testing.assert_frame_equal(hp_profile_matrix, matrix_before)
+    assert np.array_equal(df["Wärmepumpen [MWh]"].to_numpy(), df_plain["Wärmepumpen [MWh]"].to_numpy())
+
+    _, temps = prepare_weather_temperatures(weather_df, 2030, location="AVERAGE", drop_duplicates=True)
+    assert np.array_equal(df["Temperatur [°C]"].to_numpy(), temps)
+
+    p_th = df["P_th [kW]"].to_numpy()
+    assert np.sum(p_th) * DT == pytest.approx(Q_TH_A, rel=1e-12)
+    assert np.array_equal(df["P_el [kW]"].to_numpy(), p_th / COP_AVG)
+    assert np.array_equal(df["P_el_ges [kW]"].to_numpy(), df["P_el [kW]"].to_numpy() * N_HEATPUMPS)
+    assert np.array_equal(df["P_el_ges [MW]"].to_numpy(), df["P_el_ges [kW]"].to_numpy() / 1000)
+    assert np.array_equal(df["Wärmepumpen [MWh]"].to_numpy(), df["P_el_ges [MW]"].to_numpy() * DT)
+    assert df["Wärmepumpen [MWh]"].sum() / 1e6 == pytest.approx(Q_TH_A * N_HEATPUMPS / (COP_AVG * 1e9))
@@ -0,0 +1,133 @@
+"""
+Tests für die Wärmepumpen-Last je Wetterstation (calculate_heatpump_load_by_station).
+
+Eine einzelne Station muss dasselbe Ergebnis liefern wie der AVERAGE-Pfad
+(calculate_heatpump_load) auf derselben Temperaturreihe - gleiche Länge, gleicher
+doppelter Zeitstempel der Zeitumstellung, gleiche Normierung.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing.calculation_engine import (
+    CalculationEngine,
+    prepare_weather_temperature_matrix,
+    prepare_weather_temperatures,
+)
+
+RAW_DATA = Path(__file__).resolve().parent.parent / "raw-data"
+
+N_HEATPUMPS = 1_000_000
+Q_TH_A = 51000.0
+COP_AVG = 3.4
+DT = 0.25
+
+
+@pytest.fixture(scope="module")
+def weather_df() -> pd.DataFrame:
+    return pd.read_csv(RAW_DATA / "Lufttemperatur-2019.csv", sep=";", decimal=",", encoding="latin-1")
+
+
+@pytest.fixture(scope="module")
+def hp_profile_matrix() -> pd.DataFrame:
+    return pd.read_csv(RAW_DATA / "Waermepumpen-Standartlastprofile.csv", sep="\t", encoding="latin-1")
+
+
+def _modes():
+    modes = ["numpy"]
+    try:
+        import numba  # noqa: F401
+        modes.append("cpu_optimized")
+    except ImportError:
+        pass
+    return modes
+
+
+def _run_both(engine, weather, hp_profile_matrix, station, year):
+    """AVERAGE-Pfad auf der Stationsspalte und Stationspfad mit Gewicht 1."""
+    weather_avg = weather.copy()
+    weather_avg["AVERAGE"] = weather[station]
+    df_single = engine.calculate_heatpump_load(
+        weather_avg, hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, year
+    )
+    df_station = engine.calculate_heatpump_load_by_station(
+        weather, hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, year,
+        station_weights={station: 1.0}
+    )
+    return df_single, df_station
+
+
+@pytest.mark.parametrize("year", [2030, 2032])
+@pytest.mark.parametrize("station", ["AVERAGE", "Berlin"])
+@pytest.mark.parametrize("mode", _modes())
+def test_single_station_matches_average_path(weather_df, hp_profile_matrix, mode, station, year):
+    engine = CalculationEngine(mode)
+    df_single, df_station = _run_both(engine, weather_df, hp_profile_matrix, station, year)
+
+    assert len(df_station) == len(df_single)
+    assert np.array_equal(df_station["Zeitpunkt"].to_numpy(), df_single["Zeitpunkt"].to_numpy())
+    assert np.array_equal(
+        df_station["Wärmepumpen [MWh]"].to_numpy(), df_single["Wärmepumpen [MWh]"].to_numpy()
+    )
+
+
+def test_station_path_keeps_dst_duplicate(weather_df, hp_profile_matrix):
+    engine = CalculationEngine("numpy")
+    df_station = engine.calculate_heatpump_load_by_station(
+        weather_df, hp_profile_matrix, N_HEATPUMPS, Q_TH_A, COP_AVG, DT, 2030
+    )
+    zeitpunkte = df_station["Zeitpunkt"]
+    # 35040 Viertelstunden + doppelte Stunde 02:00 der Herbst-Zeitumstellung
+    assert len(df_station) == 35041
+    assert zeitpunkte.duplicated().sum() == 1
+    assert zeitpunkte[zeitpunkte.duplicated()].iloc[0] == pd.Timestamp("2030-10-27 02:00")
+
+
+def test_matrix_rows_match_single_column_preparation(weather_df):
+    stations = ["Berlin", "Hamburg", "AVERAGE"]
+    zeitpunkte, temps = prepare_weather_temperature_matrix(weather_df, 2030, stations, use_cache=False)
+    for row, station in zip(temps, stations):
+        z_single, t_single = prepare_weather_temperatures(weather_df, 2030, station, use_cache=False)
+        assert np.array_equal(zeitpunkte, z_single)
+        assert np.array_equal(row, t_single)
+
+
+def test_matrix_aligns_station_missing_at_dst_duplicate(weather_df):
+    """Fehlt eine Station an einem doppelten Zeitstempel, bleibt das gemeinsame Raster erhalten."""
+    weather = weather_df.copy()
+    duplicate_rows = weather.index[weather["Zeitpunkt"].duplicated(keep=False)]
+    weather.loc[duplicate_rows[1], "Berlin"] = np.nan
+
+    zeitpunkte, temps = prepare_weather_temperature_matrix(
+        weather, 2030, ["Hamburg", "Berlin"], use_cache=False
+    )
+    z_hamburg, t_hamburg = prepare_weather_temperatures(weather, 2030, "Hamburg", use_cache=False)
+    assert np.array_equal(zeitpunkte, z_hamburg)
+    assert np.array_equal(temps[0], t_hamburg)
+    assert temps.shape == (2, len(zeitpunkte))
+    assert not np.isnan(temps).any()
+
+
+@pytest.mark.parametrize("matrix", [False, True])
+def test_weather_cache_detects_changed_data_under_same_name(weather_df, matrix):
+    """Gleiche Länge und Spaltensumme, aber andere Werte: kein veralteter Cache-Treffer."""
+    changed = weather_df.copy()
+    # Zwei Werte tauschen - Länge und Summe bleiben gleich
+    changed.loc[[100, 5000], "Berlin"] = weather_df.loc[[5000, 100], "Berlin"].to_numpy()
+    assert changed["Berlin"].sum() == weather_df["Berlin"].sum()
+
+    def prepare(df):
+        if matrix:
+            return prepare_weather_temperature_matrix(df, 2030, ["Berlin"], dataset_name="Wetter")[1]
+        return prepare_weather_temperatures(df, 2030, location="Berlin", dataset_name="Wetter")[1]
+
+    original = prepare(weather_df)
+    updated = prepare(changed)
+
+    expected = prepare_weather_temperatures(changed, 2030, location="Berlin", use_cache=False)[1]
+    assert not np.array_equal(original, updated)
+    assert np.array_equal(updated.reshape(-1), expected)
+    assert prepare(weather_df) is original
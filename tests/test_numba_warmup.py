@@ -0,0 +1,60 @@
+"""
+Tests für das Hintergrund-Warm-up der Wärmepumpen-Kernel.
+
+Das Warm-up läuft in einem Daemon-Thread (start_background_warmup). Die beiden
+WP-Kernel müssen dort tatsächlich kompiliert werden, sonst zahlt der erste
+cpu_optimized-Lauf die volle JIT-Zeit.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+from data_processing import calculation_engine  # noqa: E402
+from data_processing.calculation_engine import (  # noqa: E402
+    _calculate_hp_factors_numba,
+    _numba_calculate_power,
+    _lookup_hp_factors,
+)
+from data_processing.numba_compat import warm_up_kernels  # noqa: E402
+
+
+@pytest.mark.parametrize("kernel", [_calculate_hp_factors_numba, _numba_calculate_power])
+def test_hp_kernels_are_serial(kernel):
+    assert not kernel.targetoptions.get("parallel")
+
+
+def test_background_warmup_compiles_hp_kernels():
+    thread = threading.Thread(target=warm_up_kernels, name="numba-warmup-test", daemon=True)
+    thread.start()
+    thread.join(timeout=600)
+    assert not thread.is_alive()
+
+    assert _calculate_hp_factors_numba.signatures
+    assert _numba_calculate_power.signatures
+
+
+def test_hp_factors_kernel_matches_vectorized_lookup():
+    rng = np.random.default_rng(0)
+    n = 35040
+    temps = rng.uniform(-25.0, 30.0, n)
+    temps[::97] = np.round(temps[::97]) + 0.5  # Halbe Grade: Banker's Rounding
+    steps = np.arange(n) % 96
+    hours = (steps // 4).astype(np.int64)
+    minutes = (steps % 4 * 15).astype(np.int64)
+    profile_array = rng.uniform(0.0, 2.0, (96, 34))
+
+    expected = _lookup_hp_factors(temps, hours, minutes, profile_array)
+    factors = _calculate_hp_factors_numba(temps, hours, minutes, profile_array)
+    assert np.array_equal(factors, expected)
+
+    power = _numba_calculate_power(factors, 1.5, 3.2, 1000.0)
+    assert np.array_equal(power, factors * 1.5 / 3.2 * 1000.0 / 1000.0)
+
+
+def test_hp_warmup_is_registered():
+    from data_processing.numba_compat import _WARMUP_REGISTRY
+    assert _WARMUP_REGISTRY.get("heatpump") is calculation_engine._warmup_hp_kernels
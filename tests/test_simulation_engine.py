@@ -0,0 +1,76 @@
+"""
+Tests für die Jahresverarbeitung der SimulationEngine.
+
+Die Jahre eines Szenarios sind unabhängig; run_scenario(parallel=True) verteilt
+sie auf einen Prozess-Pool und muss dieselben Ergebnisse in derselben
+Reihenfolge liefern wie der sequentielle Lauf.
+"""
+
+import pandas as pd
+import pytest
+
+from data_processing.simulation_engine import SimulationEngine
+
+YEARS = [2030, 2045]
+
+
+def _engine(simulation_managers, scenario_manager, progress=None) -> SimulationEngine:
+    cfg, dm = simulation_managers
+    return SimulationEngine(
+        cfg, dm, scenario_manager,
+        calculation_mode="numpy",
+        progress_callback=progress,
+        stage_cache=None
+    )
+
+
+def _assert_same_results(result, expected):
+    assert list(result) == list(expected)
+    for name in expected:
+        if isinstance(expected[name], pd.DataFrame):
+            pd.testing.assert_frame_equal(result[name], expected[name], check_exact=True)
+        else:
+            assert result[name] == expected[name]
+
+
+def test_parallel_years_match_serial_run(simulation_managers, scenario_manager):
+    serial = _engine(simulation_managers, scenario_manager).run_scenario(years=YEARS)
+
+    messages = []
+    engine = _engine(simulation_managers, scenario_manager, lambda p, m: messages.append((p, m)))
+    engine._load_base_data()
+    parallel = engine._run_years_parallel(YEARS, max_workers=2)
+
+    assert list(parallel) == YEARS
+    for year in YEARS:
+        _assert_same_results(parallel[year], serial[year])
+
+    progress = [p for p, _ in messages]
+    assert progress == sorted(progress)
+    assert [m for _, m in messages[1:]] == [
+        f"Jahr {year} abgeschlossen ({idx}/{len(YEARS)})" for idx, year in enumerate(YEARS, 1)
+    ]
+
+
+def test_parallel_request_with_one_worker_is_reported(simulation_managers, scenario_manager, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("Prozess-Pool darf bei einem Worker nicht gestartet werden")
+
+    messages = []
+    engine = _engine(simulation_managers, scenario_manager, lambda p, m: messages.append(m))
+    monkeypatch.setattr(engine, "_run_years_parallel", fail)
+
+    results = engine.run_scenario(years=YEARS, parallel=True, max_workers=1)
+
+    assert list(results) == YEARS
+    assert "2 Jahre werden sequentiell simuliert (max_workers=1)..." in messages
+
+
+def test_parallel_request_on_single_cpu_is_reported(simulation_managers, scenario_manager, monkeypatch):
+    monkeypatch.setattr("data_processing.simulation_engine.os.cpu_count", lambda: 1)
+    messages = []
+    engine = _engine(simulation_managers, scenario_manager, lambda p, m: messages.append(m))
+
+    engine.run_scenario(years=YEARS, parallel=True)
+
+    assert "2 Jahre werden sequentiell simuliert (nur 1 CPU-Kern verfügbar)..." in messages
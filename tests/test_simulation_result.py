@@ -0,0 +1,160 @@
+"""
+Tests für den Ergebnis-Container SimulationResult.
+
+Gepackte DataFrames müssen über to_dict unverändert (Spalten, Reihenfolge,
+Datentypen, Werte) zurückkommen; alle anderen Werte werden durchgereicht.
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing.simulation_result import SimulationResult
+
+N_STEPS = 96
+
+
+@pytest.fixture
+def frames():
+    rng = np.random.default_rng(0)
+    times = pd.date_range("2030-01-01", periods=N_STEPS, freq="15min")
+    production = rng.random(N_STEPS) * 100.0
+    consumption = rng.random(N_STEPS) * 80.0
+    bilanz = production - consumption
+    return {
+        "consumption": pd.DataFrame({"Zeitpunkt": times, "Haushalte [MWh]": consumption}),
+        # Zeitpunkt nicht an erster Stelle
+        "production": pd.DataFrame({"Wind Onshore [MWh]": production, "Zeitpunkt": times}),
+        "balance_pre_flex": pd.DataFrame({
+            "Zeitpunkt": times,
+            "Produktion [MWh]": production,
+            "Verbrauch [MWh]": consumption,
+            "Bilanz [MWh]": bilanz,
+        }),
+        "balance_post_flex": pd.DataFrame({
+            "Zeitpunkt": times,
+            "Produktion [MWh]": production,
+            "Verbrauch [MWh]": consumption,
+            "Rest Bilanz [MWh]": np.where(bilanz > 0, 0.0, bilanz),
+        }),
+        # Andere Zeitachse (eigener Puffer)
+        "storage": pd.DataFrame({
+            "Zeitpunkt": pd.date_range("2030-06-01", periods=4, freq="15min"),
+            "SOC [MWh]": [1.0, 2.0, np.nan, 4.0],
+        }),
+        # Nicht packbar: Integer-Spalte, eigener Index, leer, kein DataFrame
+        "counts": pd.DataFrame({"Zeitpunkt": times, "Anzahl": np.arange(N_STEPS)}),
+        "indexed": pd.DataFrame({"Zeitpunkt": times, "x [MWh]": production}, index=np.arange(1, N_STEPS + 1)),
+        "emobility": pd.DataFrame(),
+        "economics": {"lcoe": 81.5, "capex": [1, 2, 3]},
+    }
+
+
+def test_round_trip_preserves_frames_and_objects(frames):
+    result = SimulationResult.from_frames(frames)
+    restored = result.to_dict()
+
+    assert list(restored) == list(frames)
+    for name, value in frames.items():
+        if isinstance(value, pd.DataFrame):
+            assert list(restored[name].columns) == list(value.columns)
+            assert restored[name].dtypes.equals(value.dtypes)
+            pd.testing.assert_frame_equal(restored[name], value, check_exact=True)
+        else:
+            assert restored[name] == value
+
+    for name in ("counts", "indexed", "emobility", "economics"):
+        assert result[name] is frames[name]
+    assert len(result) == len(frames)
+    assert "storage" in result and "missing" not in result
+
+
+def test_equal_columns_are_stored_once(frames):
+    result = SimulationResult.from_frames(frames)
+
+    # Zeitachse 1: Haushalte, Wind, Bilanz, Rest Bilanz (Produktion/Verbrauch geteilt);
+    # Zeitachse 2: SOC
+    assert [b.shape for b in result._buffers] == [(4, N_STEPS), (1, 4)]
+    assert len(result._time_indices) == 2
+    assert np.shares_memory(
+        result.column("balance_pre_flex", "Produktion [MWh]"),
+        result.column("production", "Wind Onshore [MWh]"),
+    )
+    assert np.shares_memory(
+        result.column("balance_post_flex", "Verbrauch [MWh]"),
+        result.column("consumption", "Haushalte [MWh]"),
+    )
+    assert result.time_index("production").equals(result.time_index("consumption"))
+
+
+def test_float32_storage(frames):
+    result = SimulationResult.from_frames(frames, dtype="float32")
+
+    assert result.dtype == np.dtype("float32")
+    df = result["balance_pre_flex"]
+    assert (df.dtypes.drop("Zeitpunkt") == np.float32).all()
+    assert df["Zeitpunkt"].dtype == np.dtype("datetime64[ns]")
+    np.testing.assert_allclose(df["Bilanz [MWh]"], frames["balance_pre_flex"]["Bilanz [MWh]"], rtol=1e-6)
+    assert np.isnan(result["storage"]["SOC [MWh]"].iloc[2])
+
+    with pytest.raises(ValueError):
+        SimulationResult.from_frames(frames, dtype="float16")
+
+
+def test_views_are_read_only_and_copies_writable(frames):
+    result = SimulationResult.from_frames(frames)
+
+    view = result["balance_pre_flex"]
+    with pytest.raises(ValueError, match="read-only"):
+        view.loc[0, "Bilanz [MWh]"] = 0.0
+    with pytest.raises(ValueError, match="read-only"):
+        result.column("consumption", "Haushalte [MWh]")[0] = 0.0
+
+    copy = result.frame("balance_pre_flex", copy=True)
+    copy.loc[0, "Bilanz [MWh]"] = -1.0
+    assert copy.loc[0, "Bilanz [MWh]"] == -1.0
+    assert result["balance_pre_flex"].loc[0, "Bilanz [MWh]"] == frames["balance_pre_flex"].loc[0, "Bilanz [MWh]"]
+
+    with pytest.raises(KeyError):
+        result.frame("economics")
+    with pytest.raises(KeyError):
+        result.column("consumption", "Fehlt [MWh]")
+
+
+def test_nbytes_and_frames_nbytes(frames):
+    result = SimulationResult.from_frames(frames)
+    unpacked = sum(
+        int(frames[name].memory_usage(index=True, deep=True).sum())
+        for name in ("counts", "indexed", "emobility")
+    )
+
+    # Zeitindizes (8 Byte je Schritt) + Puffer (4 bzw. 1 Spalte)
+    packed = (N_STEPS + 4) * 8 + (4 * N_STEPS + 1 * 4) * 8
+    assert result.nbytes == packed + unpacked
+
+    # Jede Spalte einzeln (inkl. Zeitpunkt) als float64
+    columns = 2 * N_STEPS + 2 * N_STEPS + 4 * N_STEPS + 4 * N_STEPS + 2 * 4
+    assert result.frames_nbytes() == columns * 8 + unpacked
+
+    result32 = SimulationResult.from_frames(frames, dtype="float32")
+    assert result32.nbytes == (N_STEPS + 4) * 8 + (4 * N_STEPS + 1 * 4) * 4 + unpacked
+    assert result32.frames_nbytes() == result.frames_nbytes()
+
+
+def test_pickle_restores_read_only_buffers(frames):
+    result = SimulationResult.from_frames(frames, dtype="float32")
+    restored = pickle.loads(pickle.dumps(result))
+
+    assert list(restored) == list(result)
+    assert restored.dtype == np.dtype("float32")
+    for name in ("consumption", "production", "balance_pre_flex", "balance_post_flex", "storage"):
+        pd.testing.assert_frame_equal(restored[name], result[name], check_exact=True)
+    assert restored["economics"] == frames["economics"]
+
+    assert all(not b.flags.writeable for b in restored._buffers)
+    assert all(not t.flags.writeable for t in restored._time_indices)
+    storage = restored["storage"]
+    with pytest.raises(ValueError, match="read-only"):
+        storage.loc[0, "SOC [MWh]"] = 0.0
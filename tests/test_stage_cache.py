@@ -0,0 +1,131 @@
+"""
+Tests für den inhaltsadressierten Stufen-Cache (StageCache) und die
+Stufen-Schlüssel der SimulationEngine.
+"""
+
+import threading
+
+from data_processing import stage_cache
+from data_processing.simulation_engine import SimulationEngine
+from data_processing.stage_cache import StageCache, configure_stage_cache
+
+STAGES = ["consumption", "production", "emobility_consumption", "balance", "v2g", "storage", "economics"]
+
+
+def test_memory_hit_returns_copy_and_counts():
+    cache = StageCache(maxsize=4)
+    key = StageCache.make_key("storage", 2030, {"battery": 1.0})
+
+    first = cache.get_or_compute("storage", key, lambda: {"soc": [1.0, 2.0]})
+    first["soc"].append(3.0)
+    second = cache.get_or_compute("storage", key, lambda: {"soc": []})
+
+    assert second == {"soc": [1.0, 2.0]}
+    stats = cache.stats()["storage"]
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+
+
+def test_none_result_is_cached():
+    cache = StageCache(maxsize=4)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return None
+
+    key = StageCache.make_key("economics", 2030)
+    assert cache.get_or_compute("economics", key, factory) is None
+    assert cache.get_or_compute("economics", key, factory) is None
+    assert calls == [1]
+
+
+def test_disk_level_survives_memory_clear(tmp_path):
+    cache = StageCache(maxsize=4, disk_dir=tmp_path)
+    key = StageCache.make_key("production", 2030)
+    cache.get_or_compute("production", key, lambda: [1, 2, 3])
+    cache.memory.clear()
+
+    assert cache.get_or_compute("production", key, lambda: []) == [1, 2, 3]
+    assert cache.stats()["production"]["disk_hits"] == 1
+
+
+def test_concurrent_eviction_never_returns_missing_entry():
+    """Verdrängt ein anderer Thread den Eintrag, wird neu berechnet statt None geliefert."""
+    cache = StageCache(maxsize=1)
+    keys = [StageCache.make_key("stage", i) for i in range(4)]
+    errors = []
+
+    def worker(offset):
+        for i in range(2000):
+            k = (i + offset) % len(keys)
+            value = cache.get_or_compute("stage", keys[k], lambda k=k: ("value", k))
+            if value != ("value", k):
+                errors.append(value)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+
+def test_version_salt_invalidates_disk_entries(tmp_path, monkeypatch):
+    cache = StageCache(maxsize=4, disk_dir=tmp_path)
+    key = StageCache.make_key("storage", 2030)
+    cache.get_or_compute("storage", key, lambda: "alt")
+
+    monkeypatch.setattr(stage_cache, "STAGE_CACHE_VERSION", stage_cache.STAGE_CACHE_VERSION + 1)
+    new_key = StageCache.make_key("storage", 2030)
+    cache.memory.clear()
+
+    assert new_key != key
+    assert cache.get_or_compute("storage", new_key, lambda: "neu") == "neu"
+    stats = cache.stats()["storage"]
+    assert (stats["disk_hits"], stats["misses"]) == (0, 2)
+
+
+def test_configure_stage_cache_switches_disk_level(tmp_path):
+    cache = StageCache(maxsize=4)
+    disk_dir = tmp_path / "stage_cache"
+
+    configure_stage_cache({"disk_enabled": True, "disk_dir": str(disk_dir), "max_disk_gb": 0.5}, cache)
+    assert cache.disk_dir == disk_dir and disk_dir.is_dir()
+    assert cache.max_disk_bytes == 512 * 1024 ** 2
+
+    cache.get_or_compute("production", StageCache.make_key("production", 2030), lambda: [1, 2, 3])
+    assert cache.disk_usage() > 0
+
+    configure_stage_cache({"disk_enabled": False}, cache)
+    assert cache.disk_dir is None
+    configure_stage_cache({}, cache)
+    assert cache.disk_dir is None
+
+
+def test_storage_change_reuses_upstream_stages(simulation_managers, scenario_manager):
+    cfg, dm = simulation_managers
+    cache = StageCache(maxsize=32)
+    engine = SimulationEngine(cfg, dm, scenario_manager, calculation_mode="numpy", stage_cache=cache)
+
+    first = engine.run_scenario(years=[2030])[2030]
+    keys_before = engine._stage_keys(2030)
+
+    battery = scenario_manager.scenario_data["target_storage_capacities"]["battery_storage"][2030]
+    battery["installed_capacity_mwh"] *= 2
+    cache.reset_stats()
+    second = engine.run_scenario(years=[2030])[2030]
+    keys_after = engine._stage_keys(2030)
+
+    changed = {stage for stage in STAGES if keys_before[stage] != keys_after[stage]}
+    assert changed == {"storage", "economics"}
+
+    stats = cache.stats()
+    for stage in STAGES:
+        expected = (0, 1) if stage in changed else (1, 0)
+        assert (stats[stage]["memory_hits"], stats[stage]["misses"]) == expected, stage
+
+    assert second["production"].equals(first["production"])
+    assert second["consumption"].equals(first["consumption"])
+    assert not second["storage"].equals(first["storage"])
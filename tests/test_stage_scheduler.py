@@ -0,0 +1,179 @@
+"""
+Tests für den Stufen-Scheduler (StageScheduler).
+"""
+
+import threading
+
+import pytest
+
+from data_processing.stage_scheduler import PipelineStage, StageScheduler
+
+
+def _diamond(calls=None):
+    """a, b unabhängig; c braucht a und b; d braucht c und a (mehrere Ausgaben in c)."""
+    def record(name, func):
+        def run(*args):
+            if calls is not None:
+                calls.append(name)
+            return func(*args)
+        return run
+
+    return [
+        PipelineStage("d", record("d", lambda c1, a: c1 * a), inputs=("c1", "a"), outputs=("d",)),
+        PipelineStage("c", record("c", lambda a, b: (a + b, a - b)), inputs=("a", "b"), outputs=("c1", "c2")),
+        PipelineStage("a", record("a", lambda: 3), outputs=("a",)),
+        PipelineStage("b", record("b", lambda: 2), outputs=("b",)),
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2, 4])
+def test_stages_run_after_their_dependencies(max_workers):
+    calls = []
+    scheduler = StageScheduler(_diamond(calls), max_workers=max_workers)
+
+    values = scheduler.run()
+
+    assert values == {"a": 3, "b": 2, "c1": 5, "c2": 1, "d": 15}
+    assert sorted(calls) == ["a", "b", "c", "d"]
+    timing = {entry.name: entry for entry in scheduler.timeline}
+    for stage, deps in {"c": ("a", "b"), "d": ("a", "c")}.items():
+        for dep in deps:
+            assert timing[dep].end_s <= timing[stage].start_s
+
+
+def test_sequential_run_follows_declaration_order():
+    calls = []
+    StageScheduler(_diamond(calls), max_workers=1).run()
+    assert calls == ["a", "b", "c", "d"]
+
+
+def test_independent_stages_run_concurrently():
+    # Beide Stufen warten aufeinander - nur bei gleichzeitiger Ausführung erfüllbar
+    barrier = threading.Barrier(2, timeout=10)
+
+    def meet(name):
+        barrier.wait()
+        return name
+
+    scheduler = StageScheduler([
+        PipelineStage("a", lambda: meet("a"), outputs=("a",)),
+        PipelineStage("b", lambda: meet("b"), outputs=("b",)),
+    ], max_workers=2)
+
+    assert scheduler.run() == {"a": "a", "b": "b"}
+    threads = {entry.name: entry.thread for entry in scheduler.timeline}
+    assert threads["a"] == threading.current_thread().name
+    assert threads["b"].startswith("stage")
+
+
+def test_main_thread_stage_runs_in_calling_thread():
+    scheduler = StageScheduler([
+        PipelineStage("worker", lambda: 1, outputs=("x",)),
+        PipelineStage("numba", lambda: 2, outputs=("y",), main_thread=True),
+    ], max_workers=3)
+
+    scheduler.run()
+
+    threads = {entry.name: entry.thread for entry in scheduler.timeline}
+    assert threads["numba"] == threading.current_thread().name
+    assert threads["worker"] != threads["numba"]
+
+
+def test_cycle_is_rejected():
+    stages = [
+        PipelineStage("a", lambda b: b, inputs=("b",), outputs=("a",)),
+        PipelineStage("b", lambda a: a, inputs=("a",), outputs=("b",)),
+        PipelineStage("c", lambda: 1, outputs=("c",)),
+    ]
+    with pytest.raises(ValueError, match="Zyklische Abhängigkeit") as exc_info:
+        StageScheduler(stages)
+    assert "'c'" not in str(exc_info.value)
+
+
+@pytest.mark.parametrize("stages, message", [
+    ([PipelineStage("a", lambda: 1, outputs=("x",)), PipelineStage("a", lambda: 2, outputs=("y",))],
+     "Doppelter Stufenname"),
+    ([PipelineStage("a", lambda: 1, outputs=("x",)), PipelineStage("b", lambda: 2, outputs=("x",))],
+     "Ausgabe 'x'"),
+])
+def test_invalid_graph_is_rejected(stages, message):
+    with pytest.raises(ValueError, match=message):
+        StageScheduler(stages)
+
+
+def test_invalid_worker_count_is_rejected():
+    with pytest.raises(ValueError, match="max_workers"):
+        StageScheduler([], max_workers=0)
+
+
+def test_unknown_dependency_must_be_provided():
+    calls = []
+    scheduler = StageScheduler([
+        PipelineStage("a", lambda: calls.append("a") or 1, outputs=("a",)),
+        PipelineStage("b", lambda a, weather: a + weather, inputs=("a", "weather"), outputs=("b",)),
+    ])
+
+    assert scheduler.external_inputs == ["weather"]
+    with pytest.raises(ValueError, match="Fehlende Eingaben.*weather"):
+        scheduler.run()
+    assert calls == []
+
+    assert scheduler.run({"weather": 10})["b"] == 11
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_stage_exception_propagates_and_stops_dependants(max_workers):
+    failed = threading.Event()
+    calls = []
+
+    def inline():
+        # Läuft im aufrufenden Thread, bis die Pool-Stufe fehlgeschlagen ist
+        if max_workers > 1:
+            failed.wait(timeout=10)
+        calls.append("inline")
+        return 1
+
+    def broken():
+        try:
+            raise RuntimeError("Stufe defekt")
+        finally:
+            failed.set()
+
+    scheduler = StageScheduler([
+        PipelineStage("inline", inline, outputs=("a",)),
+        PipelineStage("broken", broken, outputs=("b",)),
+        PipelineStage("after", lambda a, b: calls.append("after"), inputs=("a", "b"), outputs=("c",)),
+    ], max_workers=max_workers)
+
+    with pytest.raises(RuntimeError, match="Stufe defekt"):
+        scheduler.run()
+
+    assert "after" not in calls
+    threads = {entry.name: entry.thread for entry in scheduler.timeline}
+    if max_workers > 1:
+        assert threads["broken"].startswith("stage")
+    assert "broken" in threads
+
+
+def test_wrong_number_of_outputs_is_rejected():
+    scheduler = StageScheduler([
+        PipelineStage("pair", lambda: (1, 2, 3), outputs=("x", "y")),
+    ], max_workers=1)
+    with pytest.raises(ValueError, match="muss 2 Werte liefern"):
+        scheduler.run()
+
+
+def test_format_timeline():
+    scheduler = StageScheduler(_diamond(), max_workers=2)
+    assert scheduler.format_timeline() == ""
+
+    scheduler.run()
+    lines = scheduler.format_timeline().splitlines()
+
+    assert len(lines) == 4
+    ordered = sorted(scheduler.timeline, key=lambda e: e.start_s)
+    for line, entry in zip(lines, ordered):
+        assert line.startswith(f"{entry.name:<24} ")
+        assert line.endswith(f"ms, {entry.thread})")
+        assert f"{entry.start_s * 1000:8.1f} ms -> {entry.end_s * 1000:8.1f} ms" in line
+        assert entry.duration_s >= 0
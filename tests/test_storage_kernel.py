@@ -0,0 +1,368 @@
+"""
+Paritätstests: Speicherkernel gegen die ursprünglichen Python-Schleifen.
+
+Die Referenzen sind die Zeitschleifen aus simulate_generic_storage und
+simulate_hydrogen_storage vor der Umstellung auf die kompilierten Kernel
+(unverändert eingefroren). SOC, geladene und entladene Energie müssen
+bitgleich sein - einzeln wie in der Kaskade.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing.storage_simulation import STORAGE_PRESETS, StorageConfig, StorageSimulation
+
+
+def _reference_generic_storage(
+    balance_series: pd.Series,
+    max_charge_mw: float,
+    max_discharge_mw: float,
+    charge_efficiency: float,
+    discharge_efficiency: float,
+    initial_soc_mwh: float,
+    min_soc_mwh: float,
+    max_soc_mwh: float
+):
+    """Ursprüngliche Zeitschleife aus simulate_generic_storage (Stand vor dem Numba-Kernel)."""
+    n = len(balance_series)
+    soc = np.zeros(n)
+    charged = np.zeros(n)
+    discharged = np.zeros(n)
+
+    current_soc = initial_soc_mwh
+    dt = 0.25
+
+    max_charge_energy_per_step = max_charge_mw * dt
+    max_discharge_energy_per_step = max_discharge_mw * dt
+
+    for i in range(n):
+        bal = balance_series.iloc[i]
+
+        if bal > 0:
+            free_space = max_soc_mwh - current_soc
+            max_grid_intake_by_capacity = free_space / charge_efficiency
+            energy_in_from_grid = min(bal, max_charge_energy_per_step, max_grid_intake_by_capacity)
+
+            current_soc += energy_in_from_grid * charge_efficiency
+            charged[i] = energy_in_from_grid
+
+        elif bal < 0:
+            deficit = abs(bal)
+            available_energy_above_min = current_soc - min_soc_mwh
+            max_grid_output_by_power = max_discharge_energy_per_step
+            max_grid_output_by_content = available_energy_above_min * discharge_efficiency
+            energy_out_to_grid = min(deficit, max_grid_output_by_power, max_grid_output_by_content)
+
+            current_soc -= energy_out_to_grid / discharge_efficiency
+            discharged[i] = energy_out_to_grid
+
+        soc[i] = current_soc
+
+    return soc, charged, discharged
+
+
+def _reference_hydrogen_storage(
+    balance_series: np.ndarray,
+    timestamps: pd.Series,
+    capacity_mwh: float,
+    max_charge_mw: float,
+    max_discharge_mw: float,
+    initial_soc_mwh: float
+):
+    """Ursprüngliche Zeitschleife aus simulate_hydrogen_storage (Stand vor dem Numba-Kernel)."""
+    ETA_EL = 0.67
+    ETA_FC = 0.58
+    SOC_TARGET_RATIO = 0.80
+
+    initial_soc_absolute = initial_soc_mwh * capacity_mwh
+    target_soc_mwh = capacity_mwh * SOC_TARGET_RATIO
+
+    n = len(balance_series)
+    dt = 0.25
+    soc = np.zeros(n)
+    charged = np.zeros(n)
+    discharged = np.zeros(n)
+
+    current_soc = initial_soc_absolute
+
+    for i in range(n):
+        ts = timestamps.iloc[i]
+        bal = balance_series[i]
+
+        is_summer = (ts.month >= 5) and (ts.month < 11)
+
+        p_el_actual = 0.0
+        p_fc_actual = 0.0
+
+        if is_summer:
+            t_winter_start = pd.Timestamp(year=ts.year, month=11, day=1)
+            delta_t = t_winter_start - ts
+            t_rem_h = delta_t.total_seconds() / 3600.0
+            if t_rem_h < dt:
+                t_rem_h = dt
+
+            e_missing = max(0.0, target_soc_mwh - current_soc)
+            p_el_req = e_missing / (t_rem_h * ETA_EL)
+            p_el_must = min(p_el_req, max_charge_mw)
+            bal_eff = bal - (p_el_must * dt)
+
+            if bal_eff > 0:
+                surplus_mw = bal_eff / dt
+                p_el_free_cap = max_charge_mw - p_el_must
+                p_el_add = min(p_el_free_cap, surplus_mw)
+                p_el_actual = p_el_must + p_el_add
+                p_fc_actual = 0.0
+            else:
+                p_el_actual = p_el_must
+                p_fc_actual = 0.0
+        else:
+            if bal > 0:
+                surplus_mw = bal / dt
+                p_el_actual = min(surplus_mw, max_charge_mw)
+                p_fc_actual = 0.0
+            else:
+                deficit_mw = abs(bal) / dt
+                p_el_actual = 0.0
+                p_fc_actual = min(deficit_mw, max_discharge_mw)
+
+        e_in_el = p_el_actual * dt
+        e_out_el = p_fc_actual * dt
+
+        delta_soc = (e_in_el * ETA_EL) - (e_out_el / ETA_FC)
+        next_soc = current_soc + delta_soc
+
+        if next_soc > capacity_mwh:
+            overflow = next_soc - capacity_mwh
+            reduce_in = overflow / ETA_EL
+            e_in_el -= reduce_in
+            next_soc = capacity_mwh
+
+        if next_soc < 0.0:
+            underflow = 0.0 - next_soc
+            reduce_out_chem = underflow
+            reduce_out_el = reduce_out_chem * ETA_FC
+            e_out_el -= reduce_out_el
+            next_soc = 0.0
+
+        current_soc = next_soc
+
+        soc[i] = current_soc
+        charged[i] = e_in_el
+        discharged[i] = e_out_el
+
+    return soc, charged, discharged
+
+
+def _balance_frame(year: int, seed: int) -> pd.DataFrame:
+    """Synthetische Viertelstunden-Bilanz eines Jahres (Tagesgang + Rauschen, exakte Nullen)."""
+    timestamps = pd.date_range(f"{year}-01-01", f"{year + 1}-01-01", freq="15min", inclusive="left")
+    rng = np.random.default_rng(seed)
+    n = len(timestamps)
+    daily = np.sin(np.arange(n) * 2 * np.pi / 96)
+    balance = 4000.0 * daily + rng.normal(0.0, 2500.0, n)
+    balance[rng.integers(0, n, n // 50)] = 0.0
+    return pd.DataFrame({"Zeitpunkt": timestamps, "Bilanz [MWh]": balance})
+
+
+PRESETS = {
+    "battery": StorageConfig.battery(40000.0, 15000.0, 15000.0, initial_soc=0.5),
+    "pumped_hydro": StorageConfig.pump(35000.0, 9000.0, 9500.0, initial_soc=0.3),
+    "h2": StorageConfig.hydrogen(500000.0, 12000.0, 10000.0, initial_soc=0.1),
+}
+
+# Schaltjahr (35136 Viertelstunden) und Nicht-Schaltjahr (35040)
+YEARS = [2024, 2030]
+
+
+@pytest.mark.parametrize("year", YEARS)
+@pytest.mark.parametrize("preset", sorted(PRESETS))
+def test_generic_storage_matches_reference_loop(preset, year):
+    config = PRESETS[preset]
+    df_balance = _balance_frame(year, seed=year)
+    expected_len = 35136 if year % 4 == 0 else 35040
+    assert len(df_balance) == expected_len
+
+    result = StorageSimulation().simulate_generic_storage(
+        df_balance,
+        type_name=config.type_name,
+        capacity_mwh=config.capacity_mwh,
+        max_charge_mw=config.max_charge_mw,
+        max_discharge_mw=config.max_discharge_mw,
+        charge_efficiency=config.charge_efficiency,
+        discharge_efficiency=config.discharge_efficiency,
+        initial_soc_mwh=config.initial_soc_mwh,
+        min_soc_mwh=config.min_soc_mwh,
+        max_soc_mwh=config.max_soc_mwh,
+    )
+    soc, charged, discharged = _reference_generic_storage(
+        df_balance["Bilanz [MWh]"],
+        config.max_charge_mw,
+        config.max_discharge_mw,
+        config.charge_efficiency,
+        config.discharge_efficiency,
+        config.initial_soc_mwh,
+        config.min_soc_mwh,
+        config.max_soc_mwh,
+    )
+
+    name = config.type_name
+    assert np.array_equal(result[f"{name} SOC MWh"].to_numpy(), soc)
+    assert np.array_equal(result[f"{name} Geladene MWh"].to_numpy(), charged)
+    assert np.array_equal(result[f"{name} Entladene MWh"].to_numpy(), discharged)
+    assert np.array_equal(
+        result["Rest Bilanz [MWh]"].to_numpy(),
+        (df_balance["Bilanz [MWh]"] - charged + discharged).to_numpy()
+    )
+
+
+@pytest.mark.parametrize("year", YEARS)
+def test_chained_storage_uses_rest_balance(year):
+    """Zweiter Speicher einer Kette rechnet auf 'Rest Bilanz [MWh]' des ersten."""
+    sim = StorageSimulation()
+    df_balance = _balance_frame(year, seed=year + 1)
+    battery, pump = PRESETS["battery"], PRESETS["pumped_hydro"]
+
+    after_battery = sim.simulate_battery_storage(
+        df_balance, battery.capacity_mwh, battery.max_charge_mw, battery.max_discharge_mw, 0.5
+    )
+    after_pump = sim.simulate_pump_storage(
+        after_battery, pump.capacity_mwh, pump.max_charge_mw, pump.max_discharge_mw, 0.3
+    )
+    soc, charged, discharged = _reference_generic_storage(
+        after_battery["Rest Bilanz [MWh]"],
+        pump.max_charge_mw,
+        pump.max_discharge_mw,
+        pump.charge_efficiency,
+        pump.discharge_efficiency,
+        pump.initial_soc_mwh,
+        pump.min_soc_mwh,
+        pump.max_soc_mwh,
+    )
+
+    assert np.array_equal(after_pump["Pumpspeicher SOC MWh"].to_numpy(), soc)
+    assert np.array_equal(after_pump["Pumpspeicher Geladene MWh"].to_numpy(), charged)
+    assert np.array_equal(after_pump["Pumpspeicher Entladene MWh"].to_numpy(), discharged)
+
+
+@pytest.mark.parametrize("year", YEARS)
+@pytest.mark.parametrize("initial_soc", [0.0, 0.6])
+def test_hydrogen_storage_matches_reference_loop(year, initial_soc):
+    """H2-Speicher mit Sommer-Fill: Must-Run, Überlauf-Klemme und Winter-Dispatch."""
+    df_balance = _balance_frame(year, seed=year + 2)
+    capacity, charge, discharge = 500000.0, 12000.0, 10000.0
+
+    result = StorageSimulation().simulate_hydrogen_storage(
+        df_balance, capacity, charge, discharge, initial_soc
+    )
+    soc, charged, discharged = _reference_hydrogen_storage(
+        df_balance["Bilanz [MWh]"].to_numpy(), df_balance["Zeitpunkt"],
+        capacity, charge, discharge, initial_soc
+    )
+
+    assert np.array_equal(result["Wasserstoffspeicher SOC MWh"].to_numpy(), soc)
+    assert np.array_equal(result["Wasserstoffspeicher Geladene MWh"].to_numpy(), charged)
+    assert np.array_equal(result["Wasserstoffspeicher Entladene MWh"].to_numpy(), discharged)
+    assert np.array_equal(
+        result["Rest Bilanz [MWh]"].to_numpy(),
+        df_balance["Bilanz [MWh]"].to_numpy() - charged + discharged
+    )
+
+
+@pytest.mark.parametrize("year", YEARS)
+def test_cascade_matches_chained_reference_loops(year):
+    """simulate_cascade entspricht der alten Kette Batterie -> Pumpspeicher -> H2."""
+    df_balance = _balance_frame(year, seed=year + 3)
+    battery, pump = PRESETS["battery"], PRESETS["pumped_hydro"]
+    h2 = StorageConfig.hydrogen(500000.0, 12000.0, 10000.0, initial_soc=0.1)
+
+    columns, rest = StorageSimulation().simulate_cascade(
+        df_balance["Bilanz [MWh]"].to_numpy(), df_balance["Zeitpunkt"], [battery, pump, h2]
+    )
+
+    # Alte Verkettung: jeder Speicher rechnet auf der Restbilanz des vorherigen
+    balance = df_balance["Bilanz [MWh]"]
+    expected = {}
+    for config in (battery, pump):
+        soc, charged, discharged = _reference_generic_storage(
+            balance,
+            config.max_charge_mw,
+            config.max_discharge_mw,
+            config.charge_efficiency,
+            config.discharge_efficiency,
+            config.initial_soc_mwh,
+            config.min_soc_mwh,
+            config.max_soc_mwh,
+        )
+        expected[config.type_name] = (soc, charged, discharged)
+        balance = balance - charged + discharged
+    soc, charged, discharged = _reference_hydrogen_storage(
+        balance.to_numpy(), df_balance["Zeitpunkt"], 500000.0, 12000.0, 10000.0, 0.1
+    )
+    expected[h2.type_name] = (soc, charged, discharged)
+    expected_rest = balance.to_numpy() - charged + discharged
+
+    for name, (soc, charged, discharged) in expected.items():
+        assert np.array_equal(columns[f"{name} SOC MWh"], soc), name
+        assert np.array_equal(columns[f"{name} Geladene MWh"], charged), name
+        assert np.array_equal(columns[f"{name} Entladene MWh"], discharged), name
+    assert np.array_equal(rest, expected_rest)
+
+
+def _single_run_stats(columns: dict, rest: np.ndarray, config: StorageConfig) -> dict:
+    """Sweep-Kennzahlen aus einer Einzelsimulation (Zeitreihen von simulate_cascade)."""
+    name = config.type_name
+    charged = columns[f"{name} Geladene MWh"]
+    return {
+        "Ungedeckte Energie [MWh]": -rest[rest < 0].sum(),
+        "Abregelung [MWh]": rest[rest >= 0].sum(),
+        "Geladene Energie [MWh]": charged.sum(),
+        "Entladene Energie [MWh]": columns[f"{name} Entladene MWh"].sum(),
+        "Vollzyklen": (charged * config.charge_efficiency).sum()
+                      / (config.max_soc_mwh - config.min_soc_mwh),
+        "End-SOC [MWh]": columns[f"{name} SOC MWh"][-1],
+    }
+
+
+@pytest.mark.parametrize("storage_type", ["battery_storage", "pumped_hydro_storage", "h2_storage"])
+def test_sweep_matches_single_simulations(storage_type):
+    """Jede Zeile des Sweeps entspricht einer Einzelsimulation mit denselben Parametern."""
+    sim = StorageSimulation()
+    df_balance = _balance_frame(2030, seed=11)
+    capacity, power = np.meshgrid([20000.0, 80000.0, 300000.0], [2000.0, 9000.0])
+
+    sweep = sim.sweep_storage_sizing(df_balance, storage_type, capacity, power, power, initial_soc=0.2)
+    assert len(sweep) == capacity.size
+
+    for row, cap, pw in zip(sweep.itertuples(index=False), capacity.ravel(), power.ravel()):
+        config = STORAGE_PRESETS[storage_type](cap, pw, pw, 0.2)
+        columns, rest = sim.simulate_cascade(
+            df_balance["Bilanz [MWh]"].to_numpy(), df_balance["Zeitpunkt"], [config]
+        )
+        expected = _single_run_stats(columns, rest, config)
+        got = dict(zip(sweep.columns, row))
+        assert got["Kapazität [MWh]"] == cap and got["Ladeleistung [MW]"] == pw
+        for column, value in expected.items():
+            # Summen werden im Kernel sequentiell akkumuliert, NumPy summiert paarweise
+            assert np.isclose(got[column], value, rtol=1e-9, atol=1e-6), column
+
+
+def test_sweep_with_upstream_matches_cascade():
+    """Vorgelagerte Speicher werden einmalig disponiert, der Sweep rechnet auf deren Restbilanz."""
+    sim = StorageSimulation()
+    df_balance = _balance_frame(2024, seed=12)
+    battery = PRESETS["battery"]
+
+    sweep = sim.sweep_storage_sizing(
+        df_balance, "h2_storage", [100000.0, 400000.0], 8000.0, 6000.0, upstream=[battery]
+    )
+
+    for row in sweep.itertuples(index=False):
+        h2 = StorageConfig.hydrogen(row[0], 8000.0, 6000.0)
+        columns, rest = sim.simulate_cascade(
+            df_balance["Bilanz [MWh]"].to_numpy(), df_balance["Zeitpunkt"], [battery, h2]
+        )
+        expected = _single_run_stats(columns, rest, h2)
+        got = dict(zip(sweep.columns, row))
+        for column, value in expected.items():
+            assert np.isclose(got[column], value, rtol=1e-9, atol=1e-6), column
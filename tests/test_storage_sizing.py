@@ -0,0 +1,115 @@
+"""
+Tests für StorageSimulation.find_min_capacity.
+
+Die Bilanzen sind so konstruiert, dass die minimale Kapazität analytisch
+bekannt ist: ein einzelner Überschuss lädt den Speicher, danach folgt ein
+Defizitblock mit bekannter Energie.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing.storage_simulation import STORAGE_PRESETS, StorageSimulation
+
+REL_TOL = 1e-3
+
+
+def _frame(year: int, balance: np.ndarray) -> pd.DataFrame:
+    timestamps = pd.date_range(f"{year}-01-01", f"{year + 1}-01-01", freq="15min", inclusive="left")
+    return pd.DataFrame({"Zeitpunkt": timestamps, "Bilanz [MWh]": balance})
+
+
+def _unserved(df_balance: pd.DataFrame, storage_type: str, capacity: float, **kwargs) -> float:
+    sweep = StorageSimulation().sweep_storage_sizing(
+        df_balance, storage_type, capacity, kwargs["charge"], kwargs["discharge"], kwargs.get("initial_soc", 0.0)
+    )
+    return float(sweep["Ungedeckte Energie [MWh]"].iloc[0])
+
+
+def _battery_case():
+    """Leerer Start, ein Überschuss von 50 GWh, danach 10 GWh Defizit in 40 Schritten."""
+    balance = np.zeros(35040)
+    balance[100] = 50000.0
+    balance[200:240] = -250.0
+    # Laden bis 95%, Entladen bis 5% (beides bezogen auf die Kapazität), je 95% Wirkungsgrad
+    expected = 10000.0 / (0.95 * 0.90)
+    return _frame(2030, balance), expected
+
+
+def _h2_case():
+    """Sommer-Überschuss füllt den Speicher, Defizit von 100 GWh im November/Dezember."""
+    df = _frame(2030, np.zeros(35040))
+    month = df["Zeitpunkt"].dt.month
+    summer = (month >= 5) & (month < 11)
+    winter_end = month >= 11
+    deficit_step = 100000.0 / winter_end.sum()
+    balance = np.where(summer, 100.0, 0.0) - np.where(winter_end, deficit_step, 0.0)
+    df["Bilanz [MWh]"] = balance
+    # Sommerüberschuss (100 MWh je Schritt) deckt die Must-Run-Elektrolyse immer ab
+    return df, 100000.0 / 0.58, 400.0, deficit_step / 0.25
+
+
+def test_battery_min_capacity_matches_analytic_minimum():
+    df_balance, expected = _battery_case()
+
+    result = StorageSimulation().find_min_capacity(df_balance, "battery_storage", rel_tol=REL_TOL)
+
+    assert result["converged"]
+    assert expected <= result["capacity_mwh"] <= expected * (1.0 + 2 * REL_TOL)
+    assert result["unserved_mwh"] == 0.0
+    assert result["binding_start"] == df_balance["Zeitpunkt"].iloc[199]
+    assert result["binding_end"] == df_balance["Zeitpunkt"].iloc[239]
+
+    # Knapp darunter reicht die Kapazität nicht
+    peak = 50000.0 / 0.25
+    assert _unserved(df_balance, "battery_storage", expected * 0.99, charge=peak, discharge=peak) > 0.0
+
+
+def test_battery_min_capacity_with_large_surplus_is_not_oversized():
+    """Leerer Start mit wachsendem Mindestband: die Suche läuft von unten und bleibt klein."""
+    df_balance, expected = _battery_case()
+    balance = df_balance["Bilanz [MWh]"].to_numpy().copy()
+    balance[5000:5100] = 20000.0
+    df_balance["Bilanz [MWh]"] = balance
+
+    result = StorageSimulation().find_min_capacity(df_balance, "battery_storage", rel_tol=REL_TOL)
+
+    assert result["converged"]
+    assert expected <= result["capacity_mwh"] <= expected * (1.0 + 2 * REL_TOL)
+
+
+def test_h2_min_capacity_matches_analytic_minimum():
+    df_balance, expected, charge, discharge = _h2_case()
+
+    result = StorageSimulation().find_min_capacity(
+        df_balance, "h2_storage", max_charge_mw=charge, max_discharge_mw=discharge, rel_tol=REL_TOL
+    )
+
+    assert result["converged"]
+    assert expected <= result["capacity_mwh"] <= expected * (1.0 + 2 * REL_TOL)
+    assert result["unserved_mwh"] == 0.0
+    assert _unserved(df_balance, "h2_storage", expected * 0.99, charge=charge, discharge=discharge) > 0.0
+
+
+def test_min_capacity_is_zero_without_deficit():
+    df_balance = _frame(2030, np.full(35040, 10.0))
+
+    result = StorageSimulation().find_min_capacity(df_balance, "pumped_hydro_storage")
+
+    assert result["converged"]
+    assert result["capacity_mwh"] == 0.0
+    assert result["iterations"] == 1
+
+
+@pytest.mark.parametrize("storage_type", sorted(STORAGE_PRESETS))
+def test_unreachable_target_returns_nan(storage_type):
+    """Reines Defizit ohne Überschuss: keine Kapazität erreicht das Ziel."""
+    df_balance = _frame(2030, np.full(35040, -5.0))
+
+    result = StorageSimulation().find_min_capacity(df_balance, storage_type)
+
+    assert not result["converged"]
+    assert np.isnan(result["capacity_mwh"])
+    assert result["unserved_mwh"] > 0.0
+    assert result["binding_start"] is None